@@ -2,22 +2,34 @@
 Test execution API endpoints.
 """
 
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.schema import TestSpec
+from ..core.schema import TestSpec, TestSuite
+from ..executor import CacheMode
 from ..providers.base import ExecutionResult
-from ..storage import RunRepository, TestRepository, get_database
-from ..validators.assertion_validator import ValidationResult, validate_assertions
+from ..storage import AsyncRunRepository, AsyncTestRepository, get_database
+from ..validators.assertion_validator import (
+    StreamingAssertionChecker,
+    ValidationResult,
+    validate_assertions,
+)
 
 router = APIRouter()
 
 
-def get_db_session():
-    """Dependency to get database session."""
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get async database session."""
     db = get_database()
-    yield from db.get_session()
+    async for session in db.get_async_session():
+        yield session
 
 
 class ExecuteRequest(BaseModel):
@@ -26,6 +38,7 @@ class ExecuteRequest(BaseModel):
     test_spec: TestSpec
     test_id: int | None = None  # Optional: Link run to saved test
     provider: str | None = None  # Future: override provider selection
+    cache_mode: CacheMode | None = None  # Override executor's response cache mode
 
 
 class ExecuteResponse(BaseModel):
@@ -35,13 +48,97 @@ class ExecuteResponse(BaseModel):
     assertions: list[ValidationResult]
     all_assertions_passed: bool
     run_id: int | None = None  # ID of the created run record (if test_id provided)
+    cancelled: bool = False  # True when streaming stopped early on a failed assertion
+
+
+class ExecuteSuiteRequest(BaseModel):
+    """Request to execute a test suite."""
+
+    suite: TestSuite
+    max_concurrency: int | None = None  # Override executor's global limit
+    max_concurrency_per_provider: int | None = None  # Override executor's per-provider limit
+    cache_mode: CacheMode | None = None  # Override executor's response cache mode
+
+
+class SuiteTestResponse(BaseModel):
+    """Result of a single test within a suite execution."""
+
+    index: int
+    name: str
+    result: ExecutionResult | None = None
+    assertions: list[ValidationResult] = []
+    all_assertions_passed: bool = False
+    error: str | None = None
+
+
+async def _create_run(session: AsyncSession, request: ExecuteRequest) -> int:
+    """Create a run record for a saved test.
+
+    Raises:
+        HTTPException: If the test does not exist
+    """
+    test_repo = AsyncTestRepository(session)
+    run_repo = AsyncRunRepository(session)
+
+    # Verify test exists
+    test = await test_repo.get_by_id(request.test_id)
+    if not test:
+        raise HTTPException(status_code=404, detail=f"Test {request.test_id} not found")
+
+    run = await run_repo.create(
+        test_definition_id=request.test_id,
+        provider=request.test_spec.provider or "anthropic",
+        model=request.test_spec.model,
+    )
+    return run.id
+
+
+async def _record_run_results(
+    session: AsyncSession,
+    run_id: int,
+    result: ExecutionResult,
+    assertion_results: list[ValidationResult],
+) -> None:
+    """Store execution metrics, output and assertion results on a run record.
+
+    Everything is written in a single transaction.
+    """
+    await AsyncRunRepository(session).create_results_bulk(
+        run_id=run_id,
+        results=[
+            {
+                "assertion_type": ar.assertion_type,
+                "passed": ar.passed,
+                "assertion_value": str(ar.expected) if ar.expected else None,
+                "actual_value": str(ar.actual) if ar.actual else None,
+                "failure_reason": ar.message if not ar.passed else None,
+            }
+            for ar in assertion_results
+        ],
+        status="completed" if result.success else "failed",
+        output_text=result.output,
+        tool_calls=result.tool_calls,
+        raw_response=result.raw_response,
+        latency_ms=result.latency_ms,
+        ttft_ms=result.ttft_ms,
+        tokens_per_second=result.tokens_per_second,
+        tokens_input=result.tokens_input,
+        tokens_output=result.tokens_output,
+        cost_usd=result.cost_usd,
+        error_message=result.error if not result.success else None,
+    )
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 @router.post("/execute", response_model=ExecuteResponse)
 async def execute_test(
     request: ExecuteRequest,
     app_request: Request,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session),
 ):
     """Execute a test specification and validate assertions.
 
@@ -64,24 +161,10 @@ async def execute_test(
 
         # If test_id provided, create a run record
         if request.test_id:
-            test_repo = TestRepository(session)
-            run_repo = RunRepository(session)
-
-            # Verify test exists
-            test = test_repo.get_by_id(request.test_id)
-            if not test:
-                raise HTTPException(status_code=404, detail=f"Test {request.test_id} not found")
-
-            # Create run record
-            run = run_repo.create(
-                test_definition_id=request.test_id,
-                provider=request.test_spec.provider or "anthropic",
-                model=request.test_spec.model,
-            )
-            run_id = run.id
+            run_id = await _create_run(session, request)
 
         # Execute the test
-        result = await executor.execute(request.test_spec)
+        result = await executor.execute(request.test_spec, cache_mode=request.cache_mode)
 
         # Validate assertions if any
         assertion_results = []
@@ -93,32 +176,7 @@ async def execute_test(
 
         # Update run record with results
         if run_id:
-            run_repo = RunRepository(session)
-            run_repo.update_status(
-                run_id=run_id,
-                status="completed" if result.success else "failed",
-                latency_ms=result.latency_ms,
-                tokens_input=result.tokens_input,
-                tokens_output=result.tokens_output,
-                cost_usd=result.cost_usd,
-                error_message=result.error if not result.success else None,
-            )
-
-            # Store assertion results
-            for ar in assertion_results:
-                run_repo.create_result(
-                    run_id=run_id,
-                    assertion_type=ar.assertion_type,
-                    passed=ar.passed,
-                    assertion_value=str(ar.expected) if ar.expected else None,
-                    actual_value=str(ar.actual) if ar.actual else None,
-                    failure_reason=ar.message if not ar.passed else None,
-                    output_text=result.output,
-                )
-
-            # Update test's last_run_at timestamp
-            test_repo = TestRepository(session)
-            test_repo.update_last_run(request.test_id)
+            await _record_run_results(session, run_id, result, assertion_results)
 
         return ExecuteResponse(
             result=result,
@@ -132,17 +190,164 @@ async def execute_test(
     except ValueError as e:
         # Update run record with failure if created
         if run_id:
-            run_repo = RunRepository(session)
-            run_repo.update_status(run_id=run_id, status="failed", error_message=str(e))
+            run_repo = AsyncRunRepository(session)
+            await run_repo.update_status(run_id=run_id, status="failed", error_message=str(e))
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Update run record with failure if created
         if run_id:
-            run_repo = RunRepository(session)
-            run_repo.update_status(run_id=run_id, status="failed", error_message=str(e))
+            run_repo = AsyncRunRepository(session)
+            await run_repo.update_status(run_id=run_id, status="failed", error_message=str(e))
         raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
 
 
+@router.post("/execute-stream")
+async def execute_test_stream(
+    request: ExecuteRequest,
+    app_request: Request,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Execute a test specification, streaming output as server-sent events.
+
+    Events:
+        first_token: {"ttft_ms": ...} once, when the first output arrives
+        delta: {"text": ...} for each output chunk
+        assertion_failed: a ValidationResult that failed before the stream
+            ended (must_not_contain, max_tokens, max_latency_ms); generation is
+            cancelled immediately
+        result: the final ExecuteResponse
+        error: {"detail": ...} if the test could not be executed
+
+    Args:
+        request: Test execution request with test specification
+        app_request: FastAPI request object to access app state
+        session: Database session for storing run records
+
+    Returns:
+        StreamingResponse with a text/event-stream body
+
+    Raises:
+        HTTPException: If test_id refers to a test that does not exist
+    """
+    executor = app_request.app.state.executor
+    spec = request.test_spec
+    run_id = await _create_run(session, request) if request.test_id else None
+
+    async def stream_events() -> AsyncIterator[str]:
+        checker = StreamingAssertionChecker(spec.assertions)
+        start = time.perf_counter()
+        output_parts: list[str] = []
+        ttft_ms: int | None = None
+        early_failure: tuple[int, ValidationResult] | None = None
+        result: ExecutionResult | None = None
+
+        events = executor.stream(spec, cache_mode=request.cache_mode)
+        try:
+            async for event in events:
+                elapsed_ms = int((time.perf_counter() - start) * 1000)
+                if event.type == "done":
+                    result = event.result
+                    break
+
+                if ttft_ms is None:
+                    ttft_ms = elapsed_ms
+                    yield _sse("first_token", {"ttft_ms": elapsed_ms})
+                output_parts.append(event.text)
+                yield _sse("delta", {"text": event.text})
+
+                early_failure = checker.feed(event.text, elapsed_ms)
+                if early_failure:
+                    break
+            else:
+                raise RuntimeError("Stream ended without a result")
+        except Exception as e:
+            if run_id:
+                async with get_database().async_session_factory() as run_session:
+                    await AsyncRunRepository(run_session).update_status(
+                        run_id=run_id, status="failed", error_message=str(e)
+                    )
+            yield _sse("error", {"detail": str(e)})
+            return
+        finally:
+            # Closing the generator closes the provider stream, stopping generation
+            await events.aclose()
+
+        if early_failure:
+            index, failure = early_failure
+            yield _sse("assertion_failed", failure.model_dump())
+            # Replayed cache entries may stream without a configured provider
+            provider = executor._get_provider_for_model(spec.model)
+            result = ExecutionResult(
+                success=False,
+                output="".join(output_parts),
+                model=spec.model,
+                provider=provider.provider_name if provider else spec.provider or "anthropic",
+                latency_ms=int((time.perf_counter() - start) * 1000),
+                ttft_ms=ttft_ms,
+                error=f"Cancelled: {failure.message}",
+            )
+
+        assertion_results = validate_assertions(spec.assertions, result) if spec.assertions else []
+        if early_failure:
+            assertion_results[index] = failure
+        all_passed = all(ar.passed for ar in assertion_results) if assertion_results else True
+
+        if run_id:
+            # The request's session may already be closed while the body streams
+            async with get_database().async_session_factory() as run_session:
+                await _record_run_results(run_session, run_id, result, assertion_results)
+
+        response = ExecuteResponse(
+            result=result,
+            assertions=assertion_results,
+            all_assertions_passed=all_passed,
+            run_id=run_id,
+            cancelled=early_failure is not None,
+        )
+        yield _sse("result", response.model_dump(mode="json"))
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/execute-suite")
+async def execute_suite(request: ExecuteSuiteRequest, app_request: Request):
+    """Execute all tests of a suite concurrently and stream results.
+
+    Results are streamed as newline-delimited JSON (one SuiteTestResponse per
+    line) in completion order, so clients can render each test as it finishes.
+
+    Args:
+        request: Suite execution request with concurrency limits
+        app_request: FastAPI request object to access app state
+
+    Returns:
+        StreamingResponse with one JSON object per executed test
+    """
+    executor = app_request.app.state.executor
+    specs_by_index = dict(enumerate(request.suite.tests))
+
+    async def stream_results() -> AsyncIterator[str]:
+        async for item in executor.execute_suite(
+            request.suite,
+            max_concurrency=request.max_concurrency,
+            max_concurrency_per_provider=request.max_concurrency_per_provider,
+            cache_mode=request.cache_mode,
+        ):
+            response = SuiteTestResponse(index=item.index, name=item.name, error=item.error)
+            if item.result is not None:
+                spec = specs_by_index[item.index]
+                response.result = item.result
+                response.assertions = validate_assertions(spec.assertions, item.result)
+                response.all_assertions_passed = all(a.passed for a in response.assertions)
+            yield response.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/status")
 async def get_execution_status():
     """Get execution service status.
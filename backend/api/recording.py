@@ -8,24 +8,43 @@ This module provides endpoints for:
 - Generating tests from recordings
 """
 
+import asyncio
 import json
-import re
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..services.recording_analysis import (
+    RecordingAnalysisState,
+    detect_output_format,  # noqa: F401 (re-exported)
+)
+from ..storage.async_repositories import AsyncRecordingRepository, AsyncTestRepository
 from ..storage.database import get_database
-from ..storage.repositories import RecordingRepository, TestRepository
 
 router = APIRouter(prefix="/api/recording", tags=["recording"])
 
+# WebSocket ingest: flush buffered events when either bound is reached
+WS_MAX_BATCH_EVENTS = 500
+WS_FLUSH_INTERVAL_MS = 50
+
 
-def get_db_session():
-    """Dependency to get database session."""
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get async database session."""
     db = get_database()
-    yield from db.get_session()
+    async for session in db.get_async_session():
+        yield session
 
 
 # =============================================================================
@@ -72,6 +91,16 @@ class RecordingEventResponse(BaseModel):
     data: dict[str, Any] | None
 
 
+class RecordingEventBatchResponse(BaseModel):
+    """Response for a batch of events added to a recording session."""
+
+    session_id: int
+    added: int
+    first_sequence_number: int | None
+    last_sequence_number: int | None
+    event_count: int  # Total events in the session after the batch
+
+
 class SuggestedAssertion(BaseModel):
     """A suggested assertion detected from recording."""
 
@@ -122,47 +151,52 @@ class RecordingListResponse(BaseModel):
 # =============================================================================
 
 
-def detect_output_format(output: str) -> str | None:
-    """Detect the format of model output.
+_EVENT_LIST = TypeAdapter(list[RecordingEventRequest])
+
+
+async def read_event_batch(request: Request) -> list[RecordingEventRequest]:
+    """Parse a batch of events from a JSON array or NDJSON request body.
+
+    NDJSON (``application/x-ndjson``) is parsed line by line as the body
+    streams in, so large traces are never held as one JSON document.
 
     Args:
-        output: Model output text
+        request: Incoming request
 
     Returns:
-        Detected format (json, markdown, code, text) or None
-    """
-    output_stripped = output.strip()
+        Parsed events in order
 
-    # Try to parse as JSON
-    try:
-        json.loads(output_stripped)
-        return "json"
-    except json.JSONDecodeError:
-        pass
-
-    # Check for markdown patterns
-    markdown_patterns = [
-        r"^#{1,6}\s",  # Headers
-        r"```[\s\S]*```",  # Code blocks
-        r"\*\*.*\*\*",  # Bold
-        r"^\s*[-*+]\s",  # Bullet lists
-        r"^\s*\d+\.\s",  # Numbered lists
-    ]
-    for pattern in markdown_patterns:
-        if re.search(pattern, output_stripped, re.MULTILINE):
-            return "markdown"
-
-    # Check for code patterns (without markdown code blocks)
-    code_patterns = [
-        r"^(def|class|function|import|from|const|let|var|if|for|while)\s",
-        r"^\s*[{}[\]();]",
-        r"^\s*(return|yield|async|await)\s",
-    ]
-    for pattern in code_patterns:
-        if re.search(pattern, output_stripped, re.MULTILINE):
-            return "code"
-
-    return "text"
+    Raises:
+        HTTPException: If the body or any event is invalid (422)
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" not in content_type and "jsonl" not in content_type:
+        try:
+            return _EVENT_LIST.validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid event batch: {e}")
+
+    events: list[RecordingEventRequest] = []
+    line_number = 0
+
+    def parse_line(line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            events.append(RecordingEventRequest.model_validate_json(line))
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid event on line {line_number}: {e}")
+
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            parse_line(line)
+    line_number += 1
+    parse_line(buffer)
+    return events
 
 
 def analyze_recording_for_suggestions(
@@ -176,30 +210,23 @@ def analyze_recording_for_suggestions(
     Returns:
         SmartDetectionResult with detected patterns and suggestions
     """
-    tool_calls: list[dict[str, Any]] = []
-    output_text: str | None = None
+    return suggestions_from_analysis(RecordingAnalysisState.from_events(events))
+
+
+def suggestions_from_analysis(analysis: RecordingAnalysisState) -> SmartDetectionResult:
+    """Build smart detection results from a recording's analysis state.
+
+    Args:
+        analysis: Incremental analysis state of the recording
+
+    Returns:
+        SmartDetectionResult with detected patterns and suggestions
+    """
     detected_patterns: list[str] = []
     suggested_assertions: list[SuggestedAssertion] = []
 
-    # Extract data from events
-    for event in events:
-        event_type = event.get("event_type", "")
-        data = event.get("data", {})
-
-        if event_type == "model_call":
-            pass  # model_info could be used for future enhancements
-        elif event_type == "tool_call":
-            tool_calls.append(data)
-        elif event_type == "output":
-            output_text = data.get("text", "")
-        elif event_type == "execution_complete":
-            if "tool_calls" in data:
-                tool_calls.extend(data.get("tool_calls", []))
-            if "output" in data:
-                output_text = data.get("output", "")
-
     # Detect tool calls
-    tool_names = list({tc.get("name", "") for tc in tool_calls if tc.get("name")})
+    tool_names = list(analysis.tool_names)
     has_tool_calls = len(tool_names) > 0
 
     if has_tool_calls:
@@ -214,7 +241,7 @@ def analyze_recording_for_suggestions(
         )
 
     # Detect output format
-    output_format = detect_output_format(output_text) if output_text else None
+    output_format = analysis.output_format
 
     if output_format:
         detected_patterns.append(f"Output format: {output_format}")
@@ -229,18 +256,13 @@ def analyze_recording_for_suggestions(
             )
 
     # Detect common patterns in output
-    if output_text:
-        # Check for common keywords that might indicate expected content
-        output_lower = output_text.lower()
-
+    if analysis.output_text:
         # Detect structured responses
-        if any(phrase in output_lower for phrase in ["here is", "here are", "the answer is"]):
+        if analysis.structured_response:
             detected_patterns.append("Structured response detected")
 
-        # Extract potential keywords for must_contain suggestions
-        # Look for capitalized words, quoted strings, numbers
-        quoted_strings = re.findall(r'"([^"]+)"', output_text)
-        for qs in quoted_strings[:3]:  # Limit to 3 suggestions
+        # Quoted strings are potential must_contain suggestions
+        for qs in analysis.quoted_strings:
             if len(qs) > 3 and len(qs) < 50:
                 suggested_assertions.append(
                     SuggestedAssertion(
@@ -270,40 +292,35 @@ def generate_canvas_from_events(
         events: List of recording events
         suggestions: Optional smart detection results
 
+    Returns:
+        Canvas state with nodes and edges
+    """
+    return generate_canvas_from_analysis(RecordingAnalysisState.from_events(events), suggestions)
+
+
+def generate_canvas_from_analysis(
+    analysis: RecordingAnalysisState,
+    suggestions: SmartDetectionResult | None = None,
+) -> dict[str, Any]:
+    """Generate canvas state (nodes and edges) from a recording's analysis state.
+
+    Args:
+        analysis: Incremental analysis state of the recording
+        suggestions: Optional smart detection results
+
     Returns:
         Canvas state with nodes and edges
     """
     nodes: list[dict[str, Any]] = []
     edges: list[dict[str, Any]] = []
 
-    # Extract data from events
-    query = ""
-    system_prompt = ""
-    model = "gpt-5.1"
-    provider = "openai"
-    temperature = 0.7
-    max_tokens = 1000
-    tools: list[dict[str, Any]] = []
-
-    for event in events:
-        event_type = event.get("event_type", "")
-        data = event.get("data", {})
-
-        if event_type == "model_call":
-            query = data.get("query", query)
-            system_prompt = data.get("system_prompt", system_prompt)
-            model = data.get("model", model)
-            provider = data.get("provider", provider)
-            temperature = data.get("temperature", temperature)
-            max_tokens = data.get("max_tokens", max_tokens)
-            if data.get("tools"):
-                tools = data.get("tools", [])
-
-        elif event_type == "tool_call":
-            tool_name = data.get("name", "")
-            tool_desc = data.get("description", "")
-            if tool_name and not any(t.get("name") == tool_name for t in tools):
-                tools.append({"name": tool_name, "description": tool_desc})
+    query = analysis.query
+    system_prompt = analysis.system_prompt
+    model = analysis.model
+    provider = analysis.provider
+    temperature = analysis.temperature
+    max_tokens = analysis.max_tokens
+    tools = analysis.canvas_tools
 
     # Create nodes with positions
     node_id = 1
@@ -468,33 +485,38 @@ def generate_yaml_from_events(
         test_name: Name for the generated test
         suggestions: Optional smart detection results
 
+    Returns:
+        YAML string
+    """
+    return generate_yaml_from_analysis(
+        RecordingAnalysisState.from_events(events), test_name, suggestions
+    )
+
+
+def generate_yaml_from_analysis(
+    analysis: RecordingAnalysisState,
+    test_name: str,
+    suggestions: SmartDetectionResult | None = None,
+) -> str:
+    """Generate YAML test specification from a recording's analysis state.
+
+    Args:
+        analysis: Incremental analysis state of the recording
+        test_name: Name for the generated test
+        suggestions: Optional smart detection results
+
     Returns:
         YAML string
     """
     import yaml
 
-    # Extract data from events
-    query = ""
-    system_prompt = ""
-    model = "gpt-5.1"
-    provider = "openai"
-    temperature = 0.7
-    max_tokens = 1000
-    tools: list[dict[str, Any]] = []
-
-    for event in events:
-        event_type = event.get("event_type", "")
-        data = event.get("data", {})
-
-        if event_type == "model_call":
-            query = data.get("query", query)
-            system_prompt = data.get("system_prompt", system_prompt)
-            model = data.get("model", model)
-            provider = data.get("provider", provider)
-            temperature = data.get("temperature", temperature)
-            max_tokens = data.get("max_tokens", max_tokens)
-            if data.get("tools"):
-                tools = data.get("tools", [])
+    query = analysis.query
+    system_prompt = analysis.system_prompt
+    model = analysis.model
+    provider = analysis.provider
+    temperature = analysis.temperature
+    max_tokens = analysis.max_tokens
+    tools = analysis.model_tools
 
     # Build test spec
     spec: dict[str, Any] = {
@@ -539,7 +561,7 @@ def generate_yaml_from_events(
 @router.post("/start", response_model=RecordingSessionResponse)
 async def start_recording(
     request: StartRecordingRequest,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse:
     """Start a new recording session.
 
@@ -550,17 +572,17 @@ async def start_recording(
     Returns:
         Created recording session
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
     # Check if there's already an active recording
-    active = repo.get_active_session()
+    active = await repo.get_active_session()
     if active:
         raise HTTPException(
             status_code=400,
             detail=f"Recording session '{active.name}' is already active. Stop it first.",
         )
 
-    recording = repo.create_session(
+    recording = await repo.create_session(
         name=request.name,
         description=request.description,
     )
@@ -571,7 +593,7 @@ async def start_recording(
 @router.post("/{session_id}/stop", response_model=RecordingSessionResponse)
 async def stop_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse:
     """Stop a recording session.
 
@@ -582,9 +604,9 @@ async def stop_recording(
     Returns:
         Updated recording session
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
-    recording = repo.update_session_status(session_id, "stopped")
+    recording = await repo.update_session_status(session_id, "stopped")
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
@@ -594,7 +616,7 @@ async def stop_recording(
 @router.post("/{session_id}/pause", response_model=RecordingSessionResponse)
 async def pause_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse:
     """Pause a recording session.
 
@@ -605,9 +627,9 @@ async def pause_recording(
     Returns:
         Updated recording session
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
-    recording = repo.update_session_status(session_id, "paused")
+    recording = await repo.update_session_status(session_id, "paused")
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
@@ -617,7 +639,7 @@ async def pause_recording(
 @router.post("/{session_id}/resume", response_model=RecordingSessionResponse)
 async def resume_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse:
     """Resume a paused recording session.
 
@@ -628,9 +650,9 @@ async def resume_recording(
     Returns:
         Updated recording session
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
-    recording = repo.update_session_status(session_id, "recording")
+    recording = await repo.update_session_status(session_id, "recording")
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
@@ -639,7 +661,7 @@ async def resume_recording(
 
 @router.get("/active", response_model=RecordingSessionResponse | None)
 async def get_active_recording(
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse | None:
     """Get the currently active recording session.
 
@@ -649,8 +671,8 @@ async def get_active_recording(
     Returns:
         Active recording session or None
     """
-    repo = RecordingRepository(db)
-    recording = repo.get_active_session()
+    repo = AsyncRecordingRepository(db)
+    recording = await repo.get_active_session()
 
     if not recording:
         return None
@@ -658,10 +680,35 @@ async def get_active_recording(
     return RecordingSessionResponse(**recording.to_dict())
 
 
+@router.get("/list", response_model=RecordingListResponse)
+async def list_recordings(
+    limit: int = 50,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_db_session),
+) -> RecordingListResponse:
+    """List all recording sessions.
+
+    Args:
+        limit: Maximum number of sessions to return
+        offset: Number of sessions to skip
+        db: Database session
+
+    Returns:
+        List of recording sessions
+    """
+    repo = AsyncRecordingRepository(db)
+    sessions = await repo.get_all_sessions(limit=limit, offset=offset)
+
+    return RecordingListResponse(
+        sessions=[RecordingSessionResponse(**s.to_dict()) for s in sessions],
+        total=len(sessions),
+    )
+
+
 @router.get("/{session_id}", response_model=RecordingSessionResponse)
 async def get_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingSessionResponse:
     """Get a recording session by ID.
 
@@ -672,8 +719,8 @@ async def get_recording(
     Returns:
         Recording session details
     """
-    repo = RecordingRepository(db)
-    recording = repo.get_session_by_id(session_id)
+    repo = AsyncRecordingRepository(db)
+    recording = await repo.get_session_by_id(session_id)
 
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
@@ -685,7 +732,7 @@ async def get_recording(
 async def add_recording_event(
     session_id: int,
     request: RecordingEventRequest,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> RecordingEventResponse:
     """Add an event to a recording session.
 
@@ -697,10 +744,10 @@ async def add_recording_event(
     Returns:
         Created recording event
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
     # Verify session exists and is active
-    recording = repo.get_session_by_id(session_id)
+    recording = await repo.get_session_by_id(session_id)
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
@@ -710,7 +757,7 @@ async def add_recording_event(
             detail=f"Cannot add events to a {recording.status} recording",
         )
 
-    event = repo.add_event(
+    event = await repo.add_event(
         session_id=session_id,
         event_type=request.event_type,
         data=request.data,
@@ -719,10 +766,159 @@ async def add_recording_event(
     return RecordingEventResponse(**event.to_dict())
 
 
+@router.post("/{session_id}/events", response_model=RecordingEventBatchResponse)
+async def add_recording_events(
+    session_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+) -> RecordingEventBatchResponse:
+    """Add a batch of events to a recording session in one transaction.
+
+    The body is a JSON array of events, or NDJSON (one event per line) with
+    ``Content-Type: application/x-ndjson``.
+
+    Args:
+        session_id: Recording session ID
+        request: Request whose body holds the events
+        db: Database session
+
+    Returns:
+        Number of events added and their sequence number range
+    """
+    repo = AsyncRecordingRepository(db)
+
+    recording = await repo.get_session_by_id(session_id)
+    if not recording:
+        raise HTTPException(status_code=404, detail="Recording session not found")
+
+    if recording.status not in ("recording", "paused"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot add events to a {recording.status} recording",
+        )
+
+    batch = await read_event_batch(request)
+    try:
+        events = await repo.add_events(
+            session_id, [(event.event_type, event.data) for event in batch]
+        )
+    except ValueError as e:  # Session deleted while the body was streaming
+        raise HTTPException(status_code=404, detail=str(e))
+
+    recording = await repo.get_session_by_id(session_id)
+    return RecordingEventBatchResponse(
+        session_id=session_id,
+        added=len(events),
+        first_sequence_number=events[0].sequence_number if events else None,
+        last_sequence_number=events[-1].sequence_number if events else None,
+        event_count=recording.event_count if recording else len(events),
+    )
+
+
+@router.websocket("/{session_id}/ws")
+async def ingest_recording_events(
+    websocket: WebSocket,
+    session_id: int,
+    max_batch: int = Query(WS_MAX_BATCH_EVENTS, ge=1, le=10_000),
+    flush_ms: int = Query(WS_FLUSH_INTERVAL_MS, ge=1, le=10_000),
+) -> None:
+    """Stream events into a recording session over a WebSocket.
+
+    The session is checked once when the socket opens. Each message is one
+    event or a JSON array of events (``{"event_type": ..., "data": {...}}``).
+    Events are buffered and written in one transaction once ``max_batch``
+    events are waiting or ``flush_ms`` has passed since the first one, or
+    when the client sends ``{"type": "flush"}``. Every write is acknowledged
+    in order::
+
+        {"type": "ack", "count": 3, "first_sequence_number": 1, "last_sequence_number": 3}
+
+    Invalid messages get ``{"type": "error", "detail": ...}`` and are skipped.
+    Events still buffered when the client disconnects are written.
+
+    Args:
+        websocket: WebSocket connection
+        session_id: Recording session ID
+        max_batch: Flush once this many events are buffered
+        flush_ms: Flush this many milliseconds after the first buffered event
+    """
+    await websocket.accept()
+
+    async with get_database().async_session_factory() as db:
+        repo = AsyncRecordingRepository(db)
+
+        recording = await repo.get_session_by_id(session_id)
+        if not recording or recording.status not in ("recording", "paused"):
+            detail = (
+                f"Cannot add events to a {recording.status} recording"
+                if recording
+                else "Recording session not found"
+            )
+            await websocket.send_json({"type": "error", "detail": detail})
+            await websocket.close(code=1008)
+            return
+
+        buffer: list[tuple[str, dict[str, Any]]] = []
+        deadline: float | None = None  # When the oldest buffered event must be written
+
+        async def flush(acknowledge: bool = True) -> bool:
+            nonlocal deadline
+            batch, deadline = buffer.copy(), None
+            buffer.clear()
+            try:
+                events = await repo.add_events(session_id, batch)
+            except ValueError as e:  # Session deleted while connected
+                if acknowledge:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    await websocket.close(code=1008)
+                return False
+            if acknowledge and events:
+                await websocket.send_json(
+                    {
+                        "type": "ack",
+                        "count": len(events),
+                        "first_sequence_number": events[0].sequence_number,
+                        "last_sequence_number": events[-1].sequence_number,
+                    }
+                )
+            return True
+
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    message = await asyncio.wait_for(websocket.receive_text(), timeout)
+                except TimeoutError:
+                    if not await flush():
+                        return
+                    continue
+
+                try:
+                    payload = json.loads(message)
+                    if isinstance(payload, dict) and payload.get("type") == "flush":
+                        if buffer and not await flush():
+                            return
+                        continue
+                    items = payload if isinstance(payload, list) else [payload]
+                    events = [RecordingEventRequest.model_validate(item) for item in items]
+                except (ValueError, ValidationError) as e:
+                    await websocket.send_json({"type": "error", "detail": f"Invalid event: {e}"})
+                    continue
+
+                if events and deadline is None:
+                    deadline = time.monotonic() + flush_ms / 1000
+                buffer.extend((event.event_type, event.data) for event in events)
+                if len(buffer) >= max_batch and not await flush():
+                    return
+        except WebSocketDisconnect:
+            if buffer:
+                await flush(acknowledge=False)
+
+
 @router.get("/{session_id}/events", response_model=list[RecordingEventResponse])
 async def get_recording_events(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> list[RecordingEventResponse]:
     """Get all events for a recording session.
 
@@ -733,21 +929,21 @@ async def get_recording_events(
     Returns:
         List of recording events
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
     # Verify session exists
-    recording = repo.get_session_by_id(session_id)
+    recording = await repo.get_session_by_id(session_id)
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
-    events = repo.get_events(session_id)
+    events = await repo.get_events(session_id)
     return [RecordingEventResponse(**e.to_dict()) for e in events]
 
 
 @router.get("/{session_id}/analyze", response_model=SmartDetectionResult)
 async def analyze_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> SmartDetectionResult:
     """Analyze a recording session for smart detection.
 
@@ -758,23 +954,19 @@ async def analyze_recording(
     Returns:
         Smart detection results with suggested assertions
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
-    # Verify session exists
-    recording = repo.get_session_by_id(session_id)
-    if not recording:
+    analysis = await repo.get_analysis(session_id)
+    if analysis is None:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
-    events = repo.get_events(session_id)
-    event_dicts = [e.to_dict() for e in events]
-
-    return analyze_recording_for_suggestions(event_dicts)
+    return suggestions_from_analysis(analysis)
 
 
 @router.post("/generate-test", response_model=GeneratedTestResponse)
 async def generate_test_from_recording(
     request: GenerateTestRequest,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> GeneratedTestResponse:
     """Generate a test from a recording session.
 
@@ -785,25 +977,24 @@ async def generate_test_from_recording(
     Returns:
         Generated test details
     """
-    recording_repo = RecordingRepository(db)
-    test_repo = TestRepository(db)
+    recording_repo = AsyncRecordingRepository(db)
+    test_repo = AsyncTestRepository(db)
 
     # Verify session exists
-    recording = recording_repo.get_session_by_id(request.session_id)
+    recording = await recording_repo.get_session_by_id(request.session_id)
     if not recording:
         raise HTTPException(status_code=404, detail="Recording session not found")
 
-    events = recording_repo.get_events(request.session_id)
-    event_dicts = [e.to_dict() for e in events]
+    analysis = await recording_repo.get_analysis(request.session_id)
 
-    if not event_dicts:
+    if analysis is None or not analysis.event_count:
         raise HTTPException(status_code=400, detail="Recording has no events")
 
     # Analyze for suggestions
     suggestions = None
     suggestions_applied = 0
     if request.include_suggestions:
-        suggestions = analyze_recording_for_suggestions(event_dicts)
+        suggestions = suggestions_from_analysis(analysis)
         suggestions_applied = len(
             [s for s in suggestions.suggested_assertions if s.confidence >= 0.7]
         )
@@ -812,8 +1003,8 @@ async def generate_test_from_recording(
     test_name = request.test_name or f"Test from Recording: {recording.name}"
 
     # Generate YAML and canvas state
-    yaml_content = generate_yaml_from_events(event_dicts, test_name, suggestions)
-    canvas_state = generate_canvas_from_events(event_dicts, suggestions)
+    yaml_content = generate_yaml_from_analysis(analysis, test_name, suggestions)
+    canvas_state = generate_canvas_from_analysis(analysis, suggestions)
 
     # Parse YAML to get spec
     import yaml
@@ -821,7 +1012,7 @@ async def generate_test_from_recording(
     spec = yaml.safe_load(yaml_content)
 
     # Create test in database
-    test = test_repo.create(
+    test = await test_repo.create(
         name=test_name,
         spec=spec,
         spec_yaml=yaml_content,
@@ -831,7 +1022,7 @@ async def generate_test_from_recording(
     )
 
     # Link recording to generated test
-    recording_repo.set_generated_test(request.session_id, test.id)
+    await recording_repo.set_generated_test(request.session_id, test.id)
 
     return GeneratedTestResponse(
         test_id=test.id,
@@ -842,35 +1033,10 @@ async def generate_test_from_recording(
     )
 
 
-@router.get("/list", response_model=RecordingListResponse)
-async def list_recordings(
-    limit: int = 50,
-    offset: int = 0,
-    db: Session = Depends(get_db_session),
-) -> RecordingListResponse:
-    """List all recording sessions.
-
-    Args:
-        limit: Maximum number of sessions to return
-        offset: Number of sessions to skip
-        db: Database session
-
-    Returns:
-        List of recording sessions
-    """
-    repo = RecordingRepository(db)
-    sessions = repo.get_all_sessions(limit=limit, offset=offset)
-
-    return RecordingListResponse(
-        sessions=[RecordingSessionResponse(**s.to_dict()) for s in sessions],
-        total=len(sessions),
-    )
-
-
 @router.delete("/{session_id}")
 async def delete_recording(
     session_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> dict[str, str]:
     """Delete a recording session.
 
@@ -881,9 +1047,9 @@ async def delete_recording(
     Returns:
         Success message
     """
-    repo = RecordingRepository(db)
+    repo = AsyncRecordingRepository(db)
 
-    if not repo.delete_session(session_id):
+    if not await repo.delete_session(session_id):
         raise HTTPException(status_code=404, detail="Recording session not found")
 
     return {"message": f"Recording session {session_id} deleted"}
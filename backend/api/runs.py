@@ -2,14 +2,56 @@
 Test run management and comparison API endpoints.
 """
 
-from typing import Any
-
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from ..regression import RegressionEngine, RunComparator
-from ..storage import RunRepository, get_database
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..regression import (
+    HistoryRegressionEngine,
+    RegressionEngine,
+    RunComparator,
+    SimilarityBackend,
+    analyze_run_groups,
+    get_similarity_backend,
+    rank_output_drift,
+)
+from ..services import RevalidationSummary, StoredOutput, revalidate_stream
+from ..storage import (
+    AsyncOutputVectorRepository,
+    AsyncRollupRepository,
+    AsyncRunRepository,
+    AsyncTestRepository,
+    QuantileSketch,
+    RunRollup,
+    TestResult,
+    TestRun,
+    get_database,
+    next_cursor,
+)
+from ..validators import ValidationResult
+
+# Most stored runs a single re-validation request replays
+MAX_REVALIDATION_RUNS = 10000
+
+# Most runs per model a history regression analysis loads
+MAX_HISTORY_RUNS = 1000
+
+# Time range of /stats when no start is given
+STATS_DEFAULT_DAYS = 30
+
+# Most runs per group in a batch regression report
+MAX_BATCH_REGRESSION_RUNS = 5000
+
+# Most runs an output drift query ranks
+MAX_DRIFT_RUNS = 10000
 
 router = APIRouter()
 
@@ -25,6 +67,8 @@ class RunResponse(BaseModel):
     provider: str
     model: str
     latency_ms: int | None
+    ttft_ms: int | None = None
+    tokens_per_second: float | None = None
     tokens_input: int | None
     tokens_output: int | None
     cost_usd: float | None
@@ -42,6 +86,7 @@ class RunResultResponse(BaseModel):
     actual_value: str | None
     failure_reason: str | None
     output_text: str | None
+    output_hash: str | None = None  # Content hash of output_text
     tool_calls: list[dict[str, Any]] | None
     raw_response: dict[str, Any] | None
 
@@ -50,7 +95,8 @@ class RunListResponse(BaseModel):
     """List of runs response."""
 
     runs: list[RunResponse]
-    total: int
+    total: int  # Total matching runs, not just this page
+    next_cursor: str | None = None  # Pass as `cursor` to fetch the next page
 
 
 class MetricDeltaResponse(BaseModel):
@@ -87,15 +133,41 @@ class AssertionComparisonResponse(BaseModel):
     status: str
 
 
+class DiffOpResponse(BaseModel):
+    """One run of an output diff."""
+
+    op: Literal["equal", "insert", "delete"]
+    count: int | None = None  # Tokens in an equal run
+    text: str | None = None  # Inserted or deleted text (clipped)
+    length: int | None = None  # Full length of clipped text
+
+
+class OutputDiffResponse(BaseModel):
+    """Compact output diff response."""
+
+    granularity: Literal["word", "line"]
+    ops: list[DiffOpResponse]
+    edit_distance: int | None
+    similarity: float | None
+    complete: bool  # False when the diff was capped or cut short
+
+
 class OutputComparisonResponse(BaseModel):
-    """Output comparison response."""
+    """Output comparison response (excerpts and a compact diff, not full outputs)."""
 
-    baseline_output: str | None
-    current_output: str | None
+    baseline_excerpt: str | None
+    current_excerpt: str | None
+    excerpt_start: int
     outputs_differ: bool
     baseline_length: int
     current_length: int
     length_delta: int
+    similarity: float | None = None
+    token_jaccard: float | None = None
+    token_jaccard_method: str | None = None
+    diff: OutputDiffResponse | None = None
+    semantic_similarity: float | None = None  # Cosine similarity of the output vectors
+    similarity_backend: str | None = None
 
 
 class RunMetricsResponse(BaseModel):
@@ -107,6 +179,8 @@ class RunMetricsResponse(BaseModel):
     provider: str
     model: str
     latency_ms: int | None
+    ttft_ms: int | None = None
+    tokens_per_second: float | None = None
     tokens_input: int | None
     tokens_output: int | None
     cost_usd: float | None
@@ -127,36 +201,284 @@ class ComparisonResponse(BaseModel):
     provider_changed: bool
 
 
-def get_db_session():
-    """Dependency to get database session."""
+class BatchRegressionRequest(BaseModel):
+    """Batch regression request comparing two groups of runs."""
+
+    baseline_run_ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_REGRESSION_RUNS)
+    current_run_ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_REGRESSION_RUNS)
+    latency_threshold: float = 20.0
+    cost_threshold: float = 10.0
+    tokens_threshold: float = 15.0
+
+
+class BatchRegressionEntryResponse(BaseModel):
+    """Regression analysis of one test in a batch report."""
+
+    test_id: int
+    test_name: str | None
+    baseline_run_id: int
+    current_run_id: int
+    regression_analysis: RegressionAnalysisResponse
+
+
+class BatchRegressionResponse(BaseModel):
+    """Suite-wide regression report, most severe tests first."""
+
+    has_regressions: bool
+    severity: str
+    severity_counts: dict[str, int]
+    entries: list[BatchRegressionEntryResponse]
+    missing_baseline: list[int]  # Test IDs with a current run but no baseline run
+    missing_current: list[int]  # Test IDs with a baseline run but no current run
+    unknown_run_ids: list[int]  # Requested run IDs that do not exist
+    summary: str
+
+
+class RobustStatsResponse(BaseModel):
+    """Robust statistics of one metric over a window of runs."""
+
+    n: int
+    median: float
+    mad: float  # Median absolute deviation
+    p90: float
+    p95: float
+
+
+class HistoryMetricResponse(BaseModel):
+    """Significance-tested metric change response."""
+
+    metric_name: str
+    unit: str
+    baseline: RobustStatsResponse | None
+    current: RobustStatsResponse | None
+    median_delta: float | None
+    median_delta_percent: float | None
+    p_value: float | None  # Mann-Whitney U test
+    ci_low: float | None  # Bootstrap CI of the median shift
+    ci_high: float | None
+    significant: bool
+    severity: str
+    description: str
+
+
+class FailureRateResponse(BaseModel):
+    """Failure rate change response."""
+
+    baseline_rate: float
+    current_rate: float
+    p_value: float | None  # Two-proportion z-test
+    significant: bool
+    severity: str
+
+
+class HistoryRegressionResponse(BaseModel):
+    """History regression analysis for one provider and model."""
+
+    provider: str
+    model: str
+    baseline_runs: int
+    current_runs: int
+    has_regressions: bool
+    severity: str
+    metrics: list[HistoryMetricResponse]
+    failure_rate: FailureRateResponse
+    summary: str
+
+
+class HistoryRegressionListResponse(BaseModel):
+    """History regression analyses of a test, one per provider and model."""
+
+    test_id: int
+    analyses: list[HistoryRegressionResponse]
+
+
+class DriftRunResponse(BaseModel):
+    """Output drift of one run."""
+
+    run_id: int
+    provider: str
+    model: str
+    status: str
+    started_at: str | None
+    output_hash: str
+    similarity: float  # Cosine similarity to the reference outputs
+    drift: float  # 1 - similarity
+
+
+class OutputDriftResponse(BaseModel):
+    """Runs of a test ranked by how far their output drifted from a reference."""
+
+    test_id: int
+    similarity_backend: str
+    reference_run_ids: list[int]
+    runs_compared: int
+    indexed: int  # Outputs vectorized by this request (the rest were cached)
+    runs: list[DriftRunResponse]
+
+
+class MetricStatsResponse(BaseModel):
+    """Aggregated run metrics over a time range."""
+
+    runs: int
+    failed: int  # Runs with status failed
+    pass_rate: float | None  # Share of runs completed with no failed assertion
+    latency_avg_ms: float | None
+    latency_p50_ms: float | None  # Estimated within 1% (quantile sketch)
+    latency_p95_ms: float | None
+    cost_usd: float  # Total cost
+    cost_avg_usd: float | None
+    tokens_input: int
+    tokens_output: int
+
+
+class BucketStatsResponse(MetricStatsResponse):
+    """Aggregated run metrics of one hour or day."""
+
+    bucket_start: str
+
+
+class StatsSeriesResponse(BaseModel):
+    """Metric trend of one test and model."""
+
+    test_id: int
+    model: str
+    buckets: list[BucketStatsResponse]
+    total: MetricStatsResponse  # Over all buckets of the series
+
+
+class RunStatsResponse(BaseModel):
+    """Metric trends per test and model."""
+
+    granularity: str
+    start: str
+    end: str | None
+    series: list[StatsSeriesResponse]
+
+
+class RevalidateRequest(BaseModel):
+    """Re-validation request."""
+
+    assertions: list[dict[str, Any]] | None = None  # Defaults to the test's stored assertions
+    limit: int = Field(default=100, ge=1, le=MAX_REVALIDATION_RUNS)  # Latest completed runs
+
+
+class RevalidatedRunResponse(BaseModel):
+    """Re-validation result for one stored run (one NDJSON line)."""
+
+    type: Literal["run"] = "run"
+    run_id: int
+    started_at: str | None
+    provider: str
+    model: str
+    passed: bool
+    previously_passed: bool | None
+    assertions: list[ValidationResult]
+
+
+class RevalidationSummaryResponse(BaseModel):
+    """Totals over all re-validated runs (last NDJSON line)."""
+
+    type: Literal["summary"] = "summary"
+    runs: int
+    passed: int
+    failed: int
+    newly_failing: int
+    newly_passing: int
+    failures_by_assertion: list[int]
+    skipped_runs: int  # Completed runs without a stored output
+
+
+def _with_run_output(result: dict[str, Any], run: dict[str, Any]) -> dict[str, Any]:
+    """Fill a result's output fields from its run when stored once per run."""
+    for key in ("output_text", "output_hash", "tool_calls", "raw_response"):
+        if result.get(key) is None:
+            result[key] = run.get(key)
+    return result
+
+
+def _run_output(run: TestRun, results: list[TestResult]) -> tuple[str | None, str | None]:
+    """Get a run's output text and content hash.
+
+    Falls back to the per-result copy of older runs.
+    """
+    if run.output_text:
+        return str(run.output_text), run.output_hash
+    if results and results[0].output_text:
+        return str(results[0].output_text), results[0].output_hash
+    return None, None
+
+
+def _rollup_stats(rollups: list[RunRollup]) -> dict[str, Any]:
+    """Merge rollup buckets (at least one) into MetricStatsResponse fields."""
+    runs = sum(r.run_count for r in rollups)
+    latency_count = sum(r.latency_count for r in rollups)
+    cost_count = sum(r.cost_count for r in rollups)
+    cost = sum(r.cost_sum for r in rollups)
+
+    sketch = QuantileSketch.from_json(rollups[0].latency_sketch)
+    for rollup in rollups[1:]:
+        sketch.merge(QuantileSketch.from_json(rollup.latency_sketch))
+    latency_p50, latency_p95 = sketch.quantiles([0.5, 0.95])
+
+    return {
+        "runs": runs,
+        "failed": sum(r.failed_count for r in rollups),
+        "pass_rate": sum(r.passed_count for r in rollups) / runs if runs else None,
+        "latency_avg_ms": (
+            sum(r.latency_sum for r in rollups) / latency_count if latency_count else None
+        ),
+        "latency_p50_ms": latency_p50,
+        "latency_p95_ms": latency_p95,
+        "cost_usd": cost,
+        "cost_avg_usd": cost / cost_count if cost_count else None,
+        "tokens_input": sum(r.tokens_input_sum for r in rollups),
+        "tokens_output": sum(r.tokens_output_sum for r in rollups),
+    }
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """Convert a timestamp to naive UTC, as stored in the database."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get async database session."""
     db = get_database()
-    yield from db.get_session()
+    async for session in db.get_async_session():
+        yield session
 
 
 @router.get("/list", response_model=RunListResponse)
 async def list_runs(
     limit: int = 100,
     offset: int = 0,
-    session: Session = Depends(get_db_session),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
 ):
-    """List all test runs.
+    """List all test runs, newest first.
 
     Args:
         limit: Maximum number of runs to return
-        offset: Number of runs to skip
+        offset: Number of runs to skip (ignored when `cursor` is given)
+        cursor: `next_cursor` from the previous page
         session: Database session
 
     Returns:
         List of test runs
     """
     try:
-        repo = RunRepository(session)
-        runs = repo.get_all(limit=limit, offset=offset)
+        repo = AsyncRunRepository(session)
+        runs = await repo.get_all(limit=limit, offset=offset, cursor=cursor)
         return RunListResponse(
             runs=[RunResponse(**run.to_dict()) for run in runs],
-            total=len(runs),
+            total=await repo.count(),
+            next_cursor=next_cursor(runs, limit, "started_at"),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list runs: {str(e)}")
 
@@ -166,33 +488,146 @@ async def list_runs_for_test(
     test_id: int,
     limit: int = 50,
     offset: int = 0,
-    session: Session = Depends(get_db_session),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
 ):
-    """List all runs for a specific test.
+    """List all runs for a specific test, newest first.
 
     Args:
         test_id: Test definition ID
         limit: Maximum number of runs to return
-        offset: Number of runs to skip
+        offset: Number of runs to skip (ignored when `cursor` is given)
+        cursor: `next_cursor` from the previous page
         session: Database session
 
     Returns:
         List of test runs for the specified test
     """
     try:
-        repo = RunRepository(session)
-        runs = repo.get_by_test(test_definition_id=test_id, limit=limit, offset=offset)
+        repo = AsyncRunRepository(session)
+        runs = await repo.get_by_test(
+            test_definition_id=test_id, limit=limit, offset=offset, cursor=cursor
+        )
         return RunListResponse(
             runs=[RunResponse(**run.to_dict()) for run in runs],
-            total=len(runs),
+            total=await repo.count(test_definition_id=test_id),
+            next_cursor=next_cursor(runs, limit, "started_at"),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list runs: {str(e)}")
 
 
+@router.get("/stats", response_model=RunStatsResponse)
+async def get_run_stats(
+    test_id: int | None = None,
+    model: str | None = None,
+    granularity: Literal["hour", "day"] = "day",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Get metric trends per test and model from the run rollups.
+
+    Served from hourly or daily buckets maintained as runs finish, so the
+    cost does not grow with the number of runs in the range. Buckets are
+    in UTC and keyed by when their runs started.
+
+    Args:
+        test_id: Only this test
+        model: Only this model
+        granularity: Bucket size (hour or day)
+        start: Earliest bucket (default: STATS_DEFAULT_DAYS days ago)
+        end: End of the range, exclusive (default: now)
+        session: Database session
+
+    Returns:
+        One series of buckets per test and model
+    """
+    end = _naive_utc(end)
+    start = _naive_utc(start) or ((end or datetime.utcnow()) - timedelta(days=STATS_DEFAULT_DAYS))
+    rollups = await AsyncRollupRepository(session).get_buckets(
+        granularity, test_definition_id=test_id, model=model, start=start, end=end
+    )
+
+    series: dict[tuple[int, str], list[RunRollup]] = {}
+    for rollup in rollups:
+        series.setdefault((rollup.test_definition_id, rollup.model), []).append(rollup)
+
+    return RunStatsResponse(
+        granularity=granularity,
+        start=start.isoformat(),
+        end=end.isoformat() if end else None,
+        series=[
+            StatsSeriesResponse(
+                test_id=series_test_id,
+                model=series_model,
+                buckets=[
+                    BucketStatsResponse(
+                        bucket_start=rollup.bucket_start.isoformat(), **_rollup_stats([rollup])
+                    )
+                    for rollup in buckets
+                ],
+                total=MetricStatsResponse(**_rollup_stats(buckets)),
+            )
+            for (series_test_id, series_model), buckets in series.items()
+        ],
+    )
+
+
+@router.post("/test/{test_id}/revalidate")
+async def revalidate_runs(
+    test_id: int,
+    request: RevalidateRequest,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Replay assertions against the stored outputs of a test's latest runs.
+
+    No provider is called: each completed run's stored output and tool calls
+    are validated as if the run had just finished. Results are streamed as
+    newline-delimited JSON, one RevalidatedRunResponse per run in completion
+    order, followed by a RevalidationSummaryResponse.
+
+    Args:
+        test_id: Test definition ID
+        request: Assertions to replay and how many runs to replay them on
+        session: Database session
+
+    Returns:
+        StreamingResponse with one JSON object per line
+
+    Raises:
+        HTTPException: If the test is not found
+    """
+    test = await AsyncTestRepository(session).get_by_id(test_id)
+    if not test:
+        raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
+
+    assertions = request.assertions
+    if assertions is None:
+        spec = json.loads(test.spec_json) if test.spec_json else {}
+        assertions = spec.get("assertions") or []
+
+    runs = await AsyncRunRepository(session).get_completed_by_test(test_id, limit=request.limit)
+    outputs = [stored for run in runs if (stored := StoredOutput.from_run(run)) is not None]
+
+    async def stream_results() -> AsyncIterator[str]:
+        summary = RevalidationSummary()
+        async for revalidated in revalidate_stream(assertions, outputs):
+            summary.add(revalidated)
+            yield RevalidatedRunResponse(**vars(revalidated)).model_dump_json() + "\n"
+        response = RevalidationSummaryResponse(
+            **asdict(summary), skipped_runs=len(runs) - len(outputs)
+        )
+        yield response.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/{run_id}", response_model=RunResponse)
-async def get_run(run_id: int, session: Session = Depends(get_db_session)):
+async def get_run(run_id: int, session: AsyncSession = Depends(get_db_session)):
     """Get a specific test run.
 
     Args:
@@ -206,8 +641,8 @@ async def get_run(run_id: int, session: Session = Depends(get_db_session)):
         HTTPException: If run not found
     """
     try:
-        repo = RunRepository(session)
-        run = repo.get_by_id(run_id)
+        repo = AsyncRunRepository(session)
+        run = await repo.get_by_id(run_id)
         if not run:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
@@ -220,7 +655,7 @@ async def get_run(run_id: int, session: Session = Depends(get_db_session)):
 
 
 @router.get("/{run_id}/results", response_model=list[RunResultResponse])
-async def get_run_results(run_id: int, session: Session = Depends(get_db_session)):
+async def get_run_results(run_id: int, session: AsyncSession = Depends(get_db_session)):
     """Get assertion results for a test run.
 
     Args:
@@ -231,13 +666,16 @@ async def get_run_results(run_id: int, session: Session = Depends(get_db_session
         List of assertion results
     """
     try:
-        repo = RunRepository(session)
-        run = repo.get_by_id(run_id)
+        repo = AsyncRunRepository(session)
+        run = await repo.get_by_id(run_id, with_output=True)
         if not run:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
-        results = repo.get_results_by_run(run_id)
-        return [RunResultResponse(**result.to_dict()) for result in results]
+        results = await repo.get_results_by_run(run_id)
+        run_dict = run.to_detail_dict()
+        return [
+            RunResultResponse(**_with_run_output(result.to_dict(), run_dict)) for result in results
+        ]
 
     except HTTPException:
         raise
@@ -245,17 +683,45 @@ async def get_run_results(run_id: int, session: Session = Depends(get_db_session
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
 
 
+def _similarity_backend(name: str | None) -> SimilarityBackend:
+    """Get a similarity backend for a request.
+
+    Raises:
+        HTTPException: If the backend is unknown or its dependency is missing
+    """
+    try:
+        return get_similarity_backend(name)
+    except (ValueError, ImportError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _output_vectors(
+    session: AsyncSession, hashes: list[str], backend: SimilarityBackend
+) -> tuple[dict[str, np.ndarray], int]:
+    """Get the vectors of stored outputs, vectorizing the ones not in the index yet.
+
+    Returns:
+        Tuple of (vectors by output hash, number of outputs vectorized)
+    """
+    repo = AsyncOutputVectorRepository(session)
+    indexed = await repo.index_outputs(hashes, backend)
+    return await repo.get_vectors(hashes, backend.name), indexed
+
+
 @router.get("/compare/{baseline_id}/{current_id}", response_model=ComparisonResponse)
 async def compare_runs(
     baseline_id: int,
     current_id: int,
-    session: Session = Depends(get_db_session),
+    similarity_backend: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
 ):
     """Compare two test runs.
 
     Args:
         baseline_id: Baseline run ID
         current_id: Current run ID
+        similarity_backend: Backend scoring semantic output similarity
+            (default: SENTINEL_SIMILARITY_BACKEND, or hashed-ngram)
         session: Database session
 
     Returns:
@@ -265,35 +731,32 @@ async def compare_runs(
         HTTPException: If either run not found
     """
     try:
-        repo = RunRepository(session)
+        repo = AsyncRunRepository(session)
 
         # Get runs
-        baseline_run = repo.get_by_id(baseline_id)
+        baseline_run = await repo.get_by_id(baseline_id, with_output=True)
         if not baseline_run:
             raise HTTPException(status_code=404, detail=f"Baseline run {baseline_id} not found")
 
-        current_run = repo.get_by_id(current_id)
+        current_run = await repo.get_by_id(current_id, with_output=True)
         if not current_run:
             raise HTTPException(status_code=404, detail=f"Current run {current_id} not found")
 
         # Get results
-        baseline_results = repo.get_results_by_run(baseline_id)
-        current_results = repo.get_results_by_run(current_id)
-
-        # Extract outputs from results (if available)
-        baseline_output: str | None = None
-        current_output: str | None = None
-        if baseline_results:
-            baseline_output = (
-                str(baseline_results[0].output_text) if baseline_results[0].output_text else None
-            )
-        if current_results:
-            current_output = (
-                str(current_results[0].output_text) if current_results[0].output_text else None
-            )
+        baseline_results = await repo.get_results_by_run(baseline_id)
+        current_results = await repo.get_results_by_run(current_id)
+
+        # Outputs are stored on the run (older runs have them on each result)
+        baseline_output, baseline_output_hash = _run_output(baseline_run, baseline_results)
+        current_output, current_output_hash = _run_output(current_run, current_results)
+
+        # Output vectors come from the index (outputs without a hash are vectorized inline)
+        backend = _similarity_backend(similarity_backend)
+        hashes = [h for h in (baseline_output_hash, current_output_hash) if h]
+        vectors, _ = await _output_vectors(session, hashes, backend)
 
         # Perform comparison
-        comparator = RunComparator()
+        comparator = RunComparator(similarity_backend=backend)
         comparison = comparator.compare(
             baseline_run=baseline_run.to_dict(),
             current_run=current_run.to_dict(),
@@ -301,6 +764,10 @@ async def compare_runs(
             current_results=[r.to_dict() for r in current_results],
             baseline_output=baseline_output,
             current_output=current_output,
+            baseline_output_hash=baseline_output_hash,
+            current_output_hash=current_output_hash,
+            baseline_output_vector=vectors.get(baseline_output_hash),
+            current_output_vector=vectors.get(current_output_hash),
         )
 
         # Convert to response
@@ -312,6 +779,206 @@ async def compare_runs(
         raise HTTPException(status_code=500, detail=f"Failed to compare runs: {str(e)}")
 
 
+@router.post("/regression/batch", response_model=BatchRegressionResponse)
+async def analyze_batch_regression(
+    request: BatchRegressionRequest,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Compare two groups of runs test by test, e.g. two suite executions.
+
+    Runs are paired by test (the latest run of each test in each group).
+    All runs and assertion results are loaded with a few set-based queries,
+    then every pair is analyzed as by /regression/{baseline_id}/{current_id}.
+
+    Args:
+        request: Run IDs of both groups and regression thresholds
+        session: Database session
+
+    Returns:
+        Regression report sorted by severity
+    """
+    repo = AsyncRunRepository(session)
+    requested = set(request.baseline_run_ids) | set(request.current_run_ids)
+    runs = {run["id"]: run for run in await repo.get_metrics_by_ids(list(requested))}
+    results_by_run = await repo.get_assertion_results_by_runs(list(runs))
+
+    engine = RegressionEngine(
+        latency_threshold_percent=request.latency_threshold,
+        cost_threshold_percent=request.cost_threshold,
+        tokens_threshold_percent=request.tokens_threshold,
+    )
+    report = analyze_run_groups(
+        engine,
+        baseline_runs=[runs[i] for i in set(request.baseline_run_ids) if i in runs],
+        current_runs=[runs[i] for i in set(request.current_run_ids) if i in runs],
+        results_by_run=results_by_run,
+    )
+    return BatchRegressionResponse(
+        **report.to_dict(), unknown_run_ids=sorted(requested - runs.keys())
+    )
+
+
+# Registered before /regression/{baseline_id}/{current_id}, which would match it first
+@router.get("/regression/history/{test_id}", response_model=HistoryRegressionListResponse)
+async def analyze_history_regression(
+    test_id: int,
+    model: str | None = None,
+    limit: int = Query(default=100, ge=2, le=MAX_HISTORY_RUNS),
+    window: int = Query(default=10, ge=1),
+    alpha: float = Query(default=0.05, gt=0, lt=1),
+    min_effect: float = Query(default=10.0, ge=0),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Detect regressions from a test's run history.
+
+    For each provider and model, the latest `limit` finished runs are
+    split into the current window (the latest `window` runs) and the
+    baseline (the runs before them). Metrics are compared with a
+    Mann-Whitney U test and a bootstrap interval of the median shift, so
+    ordinary run-to-run noise is not reported as a regression.
+
+    Args:
+        test_id: Test definition ID
+        model: Only analyze this model
+        limit: Runs per provider and model to analyze
+        window: Latest runs forming the current window
+        alpha: Significance level
+        min_effect: Smallest median shift (percent) reported as a change
+        session: Database session
+
+    Returns:
+        One analysis per provider and model
+
+    Raises:
+        HTTPException: If the test is not found or the window leaves no baseline
+    """
+    if window >= limit:
+        raise HTTPException(status_code=400, detail="window must be smaller than limit")
+
+    test = await AsyncTestRepository(session).get_by_id(test_id)
+    if not test:
+        raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
+
+    runs = await AsyncRunRepository(session).get_history_by_test(
+        test_id, limit_per_model=limit, model=model
+    )
+
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for run in runs:
+        run_dict = run.to_dict()
+        run_dict["all_passed"] = all(r.passed for r in run.results) if run.results else None
+        groups.setdefault((run.provider, run.model), []).append(run_dict)
+
+    engine = HistoryRegressionEngine(alpha=alpha, min_effect_percent=min_effect)
+    analyses = [engine.analyze(group, current_window=window) for group in groups.values()]
+    return HistoryRegressionListResponse(
+        test_id=test_id,
+        analyses=[HistoryRegressionResponse(**a.to_dict()) for a in analyses],
+    )
+
+
+@router.get("/drift/{test_id}", response_model=OutputDriftResponse)
+async def find_output_drift(
+    test_id: int,
+    model: str | None = None,
+    baseline_run_id: int | None = None,
+    baseline: int = Query(default=10, ge=1),
+    limit: int = Query(default=1000, ge=2, le=MAX_DRIFT_RUNS),
+    top: int = Query(default=20, ge=1, le=MAX_DRIFT_RUNS),
+    similarity_backend: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Find the runs of a test whose output drifted most.
+
+    Loads the latest `limit` finished runs with an output and ranks them by
+    cosine similarity of their output vector to the reference: the output
+    of `baseline_run_id`, or the centroid of the oldest `baseline` runs
+    loaded. Vectors are read from the output vector index; only outputs not
+    indexed yet are vectorized, once.
+
+    Args:
+        test_id: Test definition ID
+        model: Only rank runs of this model
+        baseline_run_id: Run whose output is the reference
+        baseline: Oldest runs forming the reference (without baseline_run_id)
+        limit: Latest runs to rank
+        top: Most drifted runs to return
+        similarity_backend: Backend vectorizing outputs
+        session: Database session
+
+    Returns:
+        Most drifted runs first
+
+    Raises:
+        HTTPException: If the test or baseline run is not found, or there
+            are not enough runs to form a reference
+    """
+    backend = _similarity_backend(similarity_backend)
+    test = await AsyncTestRepository(session).get_by_id(test_id)
+    if not test:
+        raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
+
+    run_repo = AsyncRunRepository(session)
+    runs = await run_repo.get_output_hashes_by_test(test_id, model=model, limit=limit)
+
+    if baseline_run_id is not None:
+        reference_run = await run_repo.get_by_id(baseline_run_id)
+        if not reference_run or not reference_run.output_hash:
+            raise HTTPException(
+                status_code=404, detail=f"Baseline run {baseline_run_id} has no stored output"
+            )
+        reference_ids, reference_hashes = [baseline_run_id], [reference_run.output_hash]
+        candidates = [run for run in runs if run["id"] != baseline_run_id]
+    else:
+        if len(runs) <= baseline:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Need more than {baseline} runs with output (found {len(runs)})",
+            )
+        # Runs are newest first: the reference is the tail
+        candidates, reference = runs[:-baseline], runs[-baseline:]
+        reference_ids = [run["id"] for run in reference]
+        reference_hashes = [run["output_hash"] for run in reference]
+
+    vectors, indexed = await _output_vectors(
+        session, reference_hashes + [run["output_hash"] for run in candidates], backend
+    )
+    candidates = [run for run in candidates if run["output_hash"] in vectors]
+    drifts = (
+        rank_output_drift(
+            [run["id"] for run in candidates],
+            np.stack([vectors[run["output_hash"]] for run in candidates]),
+            np.stack([vectors[h] for h in reference_hashes]),
+            top=top,
+        )
+        if candidates
+        else []
+    )
+
+    runs_by_id = {run["id"]: run for run in candidates}
+    drifted = []
+    for drift in drifts:
+        run = runs_by_id[drift.run_id]
+        drifted.append(
+            DriftRunResponse(
+                provider=run["provider"],
+                model=run["model"],
+                status=run["status"],
+                started_at=run["started_at"],
+                output_hash=run["output_hash"],
+                **drift.to_dict(),
+            )
+        )
+    return OutputDriftResponse(
+        test_id=test_id,
+        similarity_backend=backend.name,
+        reference_run_ids=reference_ids,
+        runs_compared=len(candidates),
+        indexed=indexed,
+        runs=drifted,
+    )
+
+
 @router.get("/regression/{baseline_id}/{current_id}", response_model=RegressionAnalysisResponse)
 async def analyze_regression(
     baseline_id: int,
@@ -319,7 +986,7 @@ async def analyze_regression(
     latency_threshold: float = 20.0,
     cost_threshold: float = 10.0,
     tokens_threshold: float = 15.0,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session),
 ):
     """Perform regression analysis between two runs.
 
@@ -338,20 +1005,20 @@ async def analyze_regression(
         HTTPException: If either run not found
     """
     try:
-        repo = RunRepository(session)
+        repo = AsyncRunRepository(session)
 
         # Get runs
-        baseline_run = repo.get_by_id(baseline_id)
+        baseline_run = await repo.get_by_id(baseline_id)
         if not baseline_run:
             raise HTTPException(status_code=404, detail=f"Baseline run {baseline_id} not found")
 
-        current_run = repo.get_by_id(current_id)
+        current_run = await repo.get_by_id(current_id)
         if not current_run:
             raise HTTPException(status_code=404, detail=f"Current run {current_id} not found")
 
         # Get results
-        baseline_results = repo.get_results_by_run(baseline_id)
-        current_results = repo.get_results_by_run(current_id)
+        baseline_results = await repo.get_results_by_run(baseline_id)
+        current_results = await repo.get_results_by_run(current_id)
 
         # Perform regression analysis
         engine = RegressionEngine(
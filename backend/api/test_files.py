@@ -4,9 +4,9 @@ Test file management API endpoints.
 Provides REST API for managing test files stored as YAML in artifacts/tests/.
 """
 
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from ..services import TestFileService
@@ -34,6 +34,7 @@ class TestFileResponse(BaseModel):
     category: str | None
     provider: str | None
     model: str | None
+    tags: list[str] = []
     created_at: str | None = None
     updated_at: str | None = None
 
@@ -42,7 +43,7 @@ class TestFileListResponse(BaseModel):
     """List of test files response."""
 
     tests: list[TestFileResponse]
-    total: int
+    total: int  # Total matching tests, not just this page
     path: str
 
 
@@ -90,16 +91,46 @@ async def save_test_file(request: SaveTestFileRequest):
 
 
 @router.get("", response_model=TestFileListResponse)
-async def list_test_files():
-    """List all test files.
+async def list_test_files(
+    category: str | None = None,
+    provider: str | None = None,
+    model: str | None = None,
+    tag: list[str] | None = Query(default=None),
+    sort: str = "filename",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int | None = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+):
+    """List test files.
+
+    Returns YAML test files in artifacts/tests/ with metadata. Only files
+    changed since the previous listing are re-parsed.
 
-    Returns all YAML test files in artifacts/tests/ with metadata.
+    Args:
+        category: Only tests in this category
+        provider: Only tests for this provider
+        model: Only tests for this model
+        tag: Only tests having all of these tags (repeat for several)
+        sort: Field to sort by (filename, name, category, provider, model,
+            created_at, updated_at)
+        order: Sort order (asc or desc)
+        limit: Maximum number of tests to return (default: all)
+        offset: Number of matching tests to skip
 
     Returns:
         List of test file metadata
     """
     try:
-        tests = file_service.list_tests()
+        tests, total = file_service.query_tests(
+            category=category,
+            provider=provider,
+            model=model,
+            tags=tag,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            offset=offset,
+        )
 
         return TestFileListResponse(
             tests=[
@@ -110,15 +141,18 @@ async def list_test_files():
                     category=t.get("category"),
                     provider=t.get("provider"),
                     model=t.get("model"),
+                    tags=t.get("tags", []),
                     created_at=t.get("created_at"),
                     updated_at=t.get("updated_at"),
                 )
                 for t in tests
             ],
-            total=len(tests),
+            total=total,
             path=file_service.get_tests_path(),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list test files: {str(e)}")
 
@@ -2,13 +2,14 @@
 Test management API endpoints (CRUD operations).
 """
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..storage import TestRepository, get_database
+from ..storage import AsyncTestRepository, get_database, next_cursor
 
 router = APIRouter()
 
@@ -63,17 +64,19 @@ class TestListResponse(BaseModel):
     """List of tests response."""
 
     tests: list[TestResponse]
-    total: int
+    total: int  # Total tests, not just this page
+    next_cursor: str | None = None  # Pass as `cursor` to fetch the next page
 
 
-def get_db_session():
-    """Dependency to get database session."""
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get async database session."""
     db = get_database()
-    yield from db.get_session()
+    async for session in db.get_async_session():
+        yield session
 
 
 @router.post("/create", response_model=TestResponse)
-async def create_test(request: CreateTestRequest, session: Session = Depends(get_db_session)):
+async def create_test(request: CreateTestRequest, session: AsyncSession = Depends(get_db_session)):
     """Create a new test definition.
 
     Args:
@@ -87,8 +90,8 @@ async def create_test(request: CreateTestRequest, session: Session = Depends(get
         HTTPException: If test creation fails
     """
     try:
-        repo = TestRepository(session)
-        test = repo.create(
+        repo = AsyncTestRepository(session)
+        test = await repo.create(
             name=request.name,
             spec=request.spec,
             spec_yaml=request.spec_yaml,
@@ -108,32 +111,37 @@ async def create_test(request: CreateTestRequest, session: Session = Depends(get
 async def list_tests(
     limit: int = 100,
     offset: int = 0,
-    session: Session = Depends(get_db_session),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
 ):
-    """List all test definitions.
+    """List all test definitions, most recently updated first.
 
     Args:
         limit: Maximum number of tests to return
-        offset: Number of tests to skip
+        offset: Number of tests to skip (ignored when `cursor` is given)
+        cursor: `next_cursor` from the previous page
         session: Database session
 
     Returns:
         List of test definitions
     """
     try:
-        repo = TestRepository(session)
-        tests = repo.get_all(limit=limit, offset=offset)
+        repo = AsyncTestRepository(session)
+        tests = await repo.get_all(limit=limit, offset=offset, cursor=cursor)
         return TestListResponse(
             tests=[TestResponse(**test.to_dict()) for test in tests],
-            total=len(tests),
+            total=await repo.count(),
+            next_cursor=next_cursor(tests, limit, "updated_at"),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list tests: {str(e)}")
 
 
 @router.get("/{test_id}", response_model=TestResponse)
-async def get_test(test_id: int, session: Session = Depends(get_db_session)):
+async def get_test(test_id: int, session: AsyncSession = Depends(get_db_session)):
     """Get a specific test definition.
 
     Args:
@@ -147,8 +155,8 @@ async def get_test(test_id: int, session: Session = Depends(get_db_session)):
         HTTPException: If test not found
     """
     try:
-        repo = TestRepository(session)
-        test = repo.get_by_id(test_id)
+        repo = AsyncTestRepository(session)
+        test = await repo.get_by_id(test_id)
         if not test:
             raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
 
@@ -164,7 +172,7 @@ async def get_test(test_id: int, session: Session = Depends(get_db_session)):
 async def update_test(
     test_id: int,
     request: UpdateTestRequest,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session),
 ):
     """Update a test definition.
 
@@ -180,8 +188,8 @@ async def update_test(
         HTTPException: If test not found or update fails
     """
     try:
-        repo = TestRepository(session)
-        test = repo.update(
+        repo = AsyncTestRepository(session)
+        test = await repo.update(
             test_id=test_id,
             name=request.name,
             spec=request.spec,
@@ -204,7 +212,7 @@ async def update_test(
 
 
 @router.delete("/{test_id}")
-async def delete_test(test_id: int, session: Session = Depends(get_db_session)):
+async def delete_test(test_id: int, session: AsyncSession = Depends(get_db_session)):
     """Delete a test definition.
 
     Args:
@@ -218,8 +226,8 @@ async def delete_test(test_id: int, session: Session = Depends(get_db_session)):
         HTTPException: If test not found or deletion fails
     """
     try:
-        repo = TestRepository(session)
-        deleted = repo.delete(test_id)
+        repo = AsyncTestRepository(session)
+        deleted = await repo.delete(test_id)
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
 
@@ -0,0 +1,42 @@
+"""
+Micro-benchmarks for Sentinel's local performance paths.
+
+Run a benchmark as a module from the project root, e.g.:
+
+    python -m backend.benchmarks.bench_sqlite_profile
+"""
+
+import random
+
+# Vocabulary of generated model outputs
+WORDS = [
+    "the",
+    "model",
+    "returned",
+    "a",
+    "response",
+    "with",
+    "tool",
+    "calls",
+    "and",
+    "structured",
+    "output",
+    "for",
+    "the",
+    "user",
+    "query",
+    "about",
+    "weather",
+    "forecasts",
+    "database",
+    "migrations",
+    "and",
+    "python",
+    "code",
+    "review",
+]
+
+
+def random_words(rng: random.Random, count: int) -> str:
+    """Space-separated text of `count` words drawn from WORDS."""
+    return " ".join(rng.choice(WORDS) for _ in range(count))
@@ -0,0 +1,131 @@
+"""
+Benchmark payload compression: database size and read latency.
+
+Writes the same synthetic run history (runs with full raw provider responses
+and per-assertion results) once with plain TEXT payloads and once with the
+compressed format, then compares file size and the time to list runs and to
+serialize them with to_dict (which decodes the payloads).
+
+Usage:
+    python -m backend.benchmarks.bench_compression [--runs 2000] [--assertions 5]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from ..storage import Database, RunRepository, TestRepository
+from . import random_words
+
+
+def fake_response(rng: random.Random, words: int) -> dict:
+    """Build an Anthropic-style raw response with `words` words of output."""
+    output = random_words(rng, words)
+    return {
+        "id": f"msg_01{rng.getrandbits(64):016x}",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-5-20250929",
+        "content": [{"type": "text", "text": output}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": rng.randint(50, 500), "output_tokens": words},
+    }
+
+
+def populate(db: Database, runs: int, assertions: int, seed: int) -> None:
+    """Write `runs` completed runs with raw responses."""
+    rng = random.Random(seed)
+    session = db.SessionLocal()
+    test = TestRepository(session).create(name="bench", spec={"model": "bench"})
+    run_repo = RunRepository(session)
+    for _ in range(runs):
+        raw = fake_response(rng, rng.randint(100, 800))
+        run = run_repo.create(test.id, "anthropic", raw["model"])
+        run_repo.create_results_bulk(
+            run.id,
+            [{"assertion_type": "must_contain", "passed": True} for _ in range(assertions)],
+            status="completed",
+            output_text=raw["content"][0]["text"],
+            raw_response=raw,
+        )
+    session.close()
+
+
+def decompress_all(db: Database) -> None:
+    """Rewrite compressed payloads as plain TEXT (the pre-compression format)."""
+    session = db.SessionLocal()
+    rows = session.execute(text("SELECT id FROM test_runs")).scalars().all()
+    for run in RunRepository(session).get_all(limit=len(rows)):
+        session.execute(
+            text("UPDATE test_runs SET raw_response_json = :value WHERE id = :id"),
+            {"value": run.raw_response_json, "id": run.id},
+        )
+    session.commit()
+    session.close()
+
+
+def measure(db: Database, path: Path, runs: int, repeats: int) -> dict[str, float]:
+    """Measure file size and read latency."""
+    with db.engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+        payload_bytes = conn.execute(
+            text("SELECT SUM(LENGTH(raw_response_json)) FROM test_runs")
+        ).scalar()
+
+    list_times, dict_times = [], []
+    for _ in range(repeats):
+        session = db.SessionLocal()
+        start = time.perf_counter()
+        page = RunRepository(session).get_all(limit=runs)
+        list_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for run in page:
+            run.to_dict()
+        dict_times.append(time.perf_counter() - start)
+        session.close()
+
+    return {
+        "file_mb": path.stat().st_size / 1e6,
+        "payload_mb": payload_bytes / 1e6,
+        "list_ms": min(list_times) * 1000,
+        "to_dict_ms": min(dict_times) * 1000,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=2000, help="Runs to write")
+    parser.add_argument("--assertions", type=int, default=5, help="Assertion results per run")
+    parser.add_argument("--repeats", type=int, default=5, help="Read repetitions (best is kept)")
+    args = parser.parse_args()
+
+    stats = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("plain", "compressed"):
+            path = Path(tmp) / f"{name}.db"
+            db = Database(f"sqlite:///{path}")
+            db.create_tables()
+            populate(db, args.runs, args.assertions, seed=42)
+            if name == "plain":
+                decompress_all(db)
+            stats[name] = measure(db, path, args.runs, args.repeats)
+            db.engine.dispose()
+
+    print(f"{'format':<12} {'file MB':>9} {'payload MB':>11} {'list ms':>9} {'to_dict ms':>11}")
+    for name, s in stats.items():
+        print(
+            f"{name:<12} {s['file_mb']:>9.2f} {s['payload_mb']:>11.2f} "
+            f"{s['list_ms']:>9.1f} {s['to_dict_ms']:>11.1f}"
+        )
+    ratio = stats["plain"]["payload_mb"] / stats["compressed"]["payload_mb"]
+    print(f"\ncompressed payloads: {ratio:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
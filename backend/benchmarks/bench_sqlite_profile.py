@@ -0,0 +1,131 @@
+"""
+Benchmark SQLite write throughput for the compat and performance profiles.
+
+Each iteration writes what a completed test execution writes: one run record
+plus its assertion results, committed together. A reader thread polls the
+run list concurrently, like the UI does during suite runs.
+
+Usage:
+    python -m backend.benchmarks.bench_sqlite_profile [--runs 500] [--assertions 10]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from ..storage import Database, RunRepository, SQLiteProfile, TestRepository
+
+
+def run_benchmark(
+    profile: SQLiteProfile, runs: int, assertions: int, poll_interval: float
+) -> dict[str, float]:
+    """Write `runs` completed runs and measure throughput.
+
+    Args:
+        profile: SQLite profile to benchmark
+        runs: Number of runs to write
+        assertions: Assertion results per run
+        poll_interval: Seconds between reader polls
+
+    Returns:
+        Dictionary with write throughput and concurrent read statistics
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}", sqlite_profile=profile)
+        db.create_tables()
+
+        session = db.SessionLocal()
+        test = TestRepository(session).create(name="bench", spec={"model": "bench"})
+        run_repo = RunRepository(session)
+
+        stop = threading.Event()
+        reads = 0
+        read_errors = 0
+        write_errors = 0
+
+        def poll_runs() -> None:
+            nonlocal reads, read_errors
+            reader = db.SessionLocal()
+            while not stop.is_set():
+                try:
+                    RunRepository(reader).get_all(limit=50)
+                    reads += 1
+                except OperationalError:
+                    read_errors += 1
+                finally:
+                    reader.rollback()
+                stop.wait(poll_interval)
+            reader.close()
+
+        poller = threading.Thread(target=poll_runs)
+        poller.start()
+
+        results = [
+            {"assertion_type": "must_contain", "passed": True, "assertion_value": f"value {i}"}
+            for i in range(assertions)
+        ]
+        start = time.perf_counter()
+        for _ in range(runs):
+            try:
+                run = run_repo.create(test.id, "anthropic", "bench")
+                run_repo.create_results_bulk(
+                    run.id,
+                    results,
+                    status="completed",
+                    output_text="output " * 200,
+                    latency_ms=100,
+                )
+            except OperationalError:  # "database is locked" after busy_timeout
+                session.rollback()
+                write_errors += 1
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        poller.join()
+        session.close()
+        db.engine.dispose()
+
+    return {
+        "runs_per_second": runs / elapsed,
+        "elapsed_seconds": elapsed,
+        "reads": reads,
+        "read_errors": read_errors,
+        "write_errors": write_errors,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for both profiles and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=500, help="Runs to write per profile")
+    parser.add_argument("--assertions", type=int, default=10, help="Assertion results per run")
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.01, help="Seconds between reader polls"
+    )
+    args = parser.parse_args()
+
+    profiles = {"compat": SQLiteProfile.compat(), "performance": SQLiteProfile()}
+    stats = {
+        name: run_benchmark(profile, args.runs, args.assertions, args.poll_interval)
+        for name, profile in profiles.items()
+    }
+
+    print(
+        f"{'profile':<12} {'runs/s':>10} {'elapsed s':>10} {'reads':>8} "
+        f"{'read errors':>12} {'write errors':>13}"
+    )
+    for name, s in stats.items():
+        print(
+            f"{name:<12} {s['runs_per_second']:>10.1f} {s['elapsed_seconds']:>10.2f} "
+            f"{s['reads']:>8} {s['read_errors']:>12} {s['write_errors']:>13}"
+        )
+    speedup = stats["performance"]["runs_per_second"] / stats["compat"]["runs_per_second"]
+    print(f"\nperformance profile: {speedup:.1f}x write throughput")
+
+
+if __name__ == "__main__":
+    main()
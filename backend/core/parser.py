@@ -6,9 +6,17 @@ This module provides parsing and serialization for test specs, enabling:
 2. DSL → Visual: Import YAML/JSON files to canvas
 3. Validation: Ensure specs are valid before execution
 4. Round-trip: Parse → Serialize should be lossless
+5. Bulk import: Parse whole directories of specs in parallel, with a cache
+   that skips unchanged files
 """
 
+import hashlib
 import json
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
@@ -16,6 +24,21 @@ from pydantic import ValidationError
 
 from .schema import TestSpec, TestSpecOrSuite, TestSuite
 
+# libyaml's C loader is several times faster than the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SPEC_FILE_SUFFIXES = (".yaml", ".yml", ".json")
+
+# Directories with fewer uncached files than this are parsed in-process
+# (starting spawned workers costs about as much as parsing 1000 specs)
+PARALLEL_PARSE_MIN_FILES = 1000
+
+# Files sent to a worker at a time
+PARALLEL_PARSE_CHUNK_SIZE = 64
+
+# Bump when cached entries can no longer be loaded (e.g. schema changes)
+PARSE_CACHE_VERSION = 1
+
 
 class ParsingError(Exception):
     """Raised when parsing or validation fails.
@@ -42,6 +65,160 @@ class ParsingError(Exception):
 
         return f"{self.message}\n" + "\n".join(error_details)
 
+    def __reduce__(self):
+        # Keep the detailed errors when sent back from a parse worker
+        return (ParsingError, (self.message, self.errors))
+
+
+@dataclass
+class _CacheEntry:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    spec: TestSpecOrSuite
+
+
+class SpecParseCache:
+    """Parsed specs keyed by file path, invalidated when the file changes.
+
+    A file whose modification time and size match its entry is not read
+    again. If either changed, the file is read and hashed, and it is only
+    parsed again when the content hash differs too (e.g. after a checkout
+    that touched every file).
+
+    Cached specs are shared between lookups; treat them as read-only.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: dict[str, _CacheEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path, stat: os.stat_result | None = None) -> TestSpecOrSuite | None:
+        """Get the cached spec if the file is unchanged since it was parsed.
+
+        Args:
+            path: Spec file path
+            stat: Result of path.stat(), if already known
+
+        Returns:
+            Cached spec, or None if missing or stale
+        """
+        entry = self._entries.get(str(path))
+        if entry is None:
+            return None
+        stat = stat or path.stat()
+        if (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            return entry.spec
+        return None
+
+    def get_by_content(
+        self, path: Path, stat: os.stat_result, content_hash: str
+    ) -> TestSpecOrSuite | None:
+        """Get the cached spec if the content is unchanged, refreshing its stat.
+
+        Args:
+            path: Spec file path
+            stat: Current stat of the file
+            content_hash: content_hash of the current file content
+
+        Returns:
+            Cached spec, or None if missing or the content changed
+        """
+        entry = self._entries.get(str(path))
+        if entry is None or entry.content_hash != content_hash:
+            return None
+        entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+        return entry.spec
+
+    def put(
+        self, path: Path, stat: os.stat_result, content_hash: str, spec: TestSpecOrSuite
+    ) -> None:
+        """Store a parsed spec.
+
+        Args:
+            path: Spec file path
+            stat: Stat of the file at the time it was read
+            content_hash: content_hash of the parsed content
+            spec: Parsed spec
+        """
+        self._entries[str(path)] = _CacheEntry(stat.st_mtime_ns, stat.st_size, content_hash, spec)
+
+    def discard(self, path: Path) -> None:
+        """Remove a file's entry."""
+        self._entries.pop(str(path), None)
+
+    def prune(self, paths: set[str]) -> None:
+        """Remove entries for files not in paths (deleted files)."""
+        for key in self._entries.keys() - paths:
+            del self._entries[key]
+
+    def save(self, cache_file: str | Path) -> None:
+        """Write the cache to disk (e.g. to reuse it across CI runs).
+
+        Args:
+            cache_file: Output file path
+        """
+        path = Path(cache_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(pickle.dumps((PARSE_CACHE_VERSION, self._entries)))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, cache_file: str | Path) -> "SpecParseCache":
+        """Read a cache written by save.
+
+        The file is a pickle: only load caches this process or a trusted
+        job wrote. A missing, corrupt or outdated file gives an empty cache.
+
+        Args:
+            cache_file: Cache file path
+
+        Returns:
+            Loaded cache
+        """
+        cache = cls()
+        try:
+            version, entries = pickle.loads(Path(cache_file).read_bytes())
+        except Exception:
+            return cache
+        if version == PARSE_CACHE_VERSION:
+            cache._entries = entries
+        return cache
+
+
+@dataclass
+class DirectoryParseResult:
+    """Specs parsed from a directory."""
+
+    specs: dict[Path, TestSpecOrSuite] = field(default_factory=dict)
+    errors: dict[Path, ParsingError] = field(default_factory=dict)
+    cache_hits: int = 0
+
+
+def _content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _parse_content(suffix: str, content: bytes) -> TestSpecOrSuite | ParsingError:
+    """Parse file content, returning the error instead of raising (pool worker)."""
+    try:
+        text = content.decode("utf-8")
+        if suffix == ".json":
+            return TestSpecParser.parse_json(text)
+        return TestSpecParser.parse_yaml(text)
+    except UnicodeDecodeError as e:
+        return ParsingError(f"File is not valid UTF-8: {str(e)}")
+    except ParsingError as e:
+        return e
+
+
+def _parse_chunk(items: list[tuple[str, bytes]]) -> list[TestSpecOrSuite | ParsingError]:
+    return [_parse_content(suffix, content) for suffix, content in items]
+
 
 class TestSpecParser:
     """Parser for test specifications.
@@ -90,7 +267,7 @@ class TestSpecParser:
             ParsingError: If YAML is invalid or validation fails
         """
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=YAML_LOADER)
         except yaml.YAMLError as e:
             raise ParsingError(f"Invalid YAML: {str(e)}")
 
@@ -153,6 +330,93 @@ class TestSpecParser:
                 f"Unsupported file extension: {path.suffix}. " "Use .yaml, .yml, or .json"
             )
 
+    @staticmethod
+    def parse_directory(
+        directory: str | Path,
+        recursive: bool = True,
+        cache: SpecParseCache | None = None,
+        max_workers: int | None = None,
+        parallel_min_files: int = PARALLEL_PARSE_MIN_FILES,
+    ) -> DirectoryParseResult:
+        """Parse every spec file (.yaml, .yml, .json) in a directory.
+
+        Unchanged files are served from the cache. The remaining files are
+        read and hashed here and, when there are at least
+        `parallel_min_files` of them, parsed across a process pool.
+
+        Args:
+            directory: Directory to scan
+            recursive: Include subdirectories
+            cache: Parse cache to consult and update (entries for files no
+                longer in the directory are removed)
+            max_workers: Worker processes (default: CPU count)
+            parallel_min_files: Fewest files to parse that use the pool (it
+                is never used with a single CPU)
+
+        Returns:
+            DirectoryParseResult with specs and per-file errors
+
+        Raises:
+            FileNotFoundError: If the directory doesn't exist
+        """
+        root = Path(directory)
+        if not root.is_dir():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        pattern = "**/*" if recursive else "*"
+        paths = sorted(
+            p for p in root.glob(pattern) if p.suffix in SPEC_FILE_SUFFIXES and p.is_file()
+        )
+        result = DirectoryParseResult()
+        pending: list[tuple[Path, os.stat_result, bytes, str]] = []  # + content hash
+
+        for path in paths:
+            try:
+                stat = path.stat()
+                cached = cache.get(path, stat) if cache is not None else None
+                if cached is None:
+                    content = path.read_bytes()
+                    content_hash = _content_hash(content)
+                    if cache is not None:
+                        cached = cache.get_by_content(path, stat, content_hash)
+            except OSError as e:
+                result.errors[path] = ParsingError(f"Cannot read file: {str(e)}")
+                continue
+            if cached is not None:
+                result.specs[path] = cached
+                result.cache_hits += 1
+            else:
+                pending.append((path, stat, content, content_hash))
+
+        items = [(path.suffix, content) for path, _, content, _ in pending]
+        workers = max_workers or os.cpu_count() or 1
+        if len(items) >= parallel_min_files and workers > 1:
+            # Spawned, not forked: callers may be running threads or an event loop
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                chunks = [
+                    items[i : i + PARALLEL_PARSE_CHUNK_SIZE]
+                    for i in range(0, len(items), PARALLEL_PARSE_CHUNK_SIZE)
+                ]
+                parsed = [spec for chunk in pool.map(_parse_chunk, chunks) for spec in chunk]
+        else:
+            parsed = _parse_chunk(items)
+
+        for (path, stat, _, content_hash), parsed_spec in zip(pending, parsed, strict=True):
+            if isinstance(parsed_spec, ParsingError):
+                result.errors[path] = parsed_spec
+                if cache is not None:
+                    cache.discard(path)
+            else:
+                result.specs[path] = parsed_spec
+                if cache is not None:
+                    cache.put(path, stat, content_hash, parsed_spec)
+
+        if cache is not None:
+            cache.prune({str(p) for p in paths})
+        return result
+
     @staticmethod
     def _parse_dict(data: dict) -> TestSpecOrSuite:
         """Parse a dictionary into TestSpec or TestSuite.
@@ -2,6 +2,14 @@
 Test execution engine for Sentinel.
 """
 
-from .executor import ExecutorConfig, TestExecutor
+from .cache import CacheMissError, CacheMode, ResponseCache
+from .executor import ExecutorConfig, SuiteTestResult, TestExecutor
 
-__all__ = ["TestExecutor", "ExecutorConfig"]
+__all__ = [
+    "TestExecutor",
+    "ExecutorConfig",
+    "SuiteTestResult",
+    "ResponseCache",
+    "CacheMode",
+    "CacheMissError",
+]
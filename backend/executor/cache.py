@@ -0,0 +1,192 @@
+"""
+Content-addressed response cache for provider calls.
+
+Responses are keyed by a hash of the normalized request (model, messages,
+sampling parameters, tools, seed) and stored in a SQLite file under
+~/.sentinel, with TTL expiry and LRU eviction once the cache exceeds its
+size budget.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from ..providers.base import ExecutionResult
+
+CacheMode = Literal["live", "record", "replay", "replay-or-live"]
+"""How the executor uses the response cache.
+
+- live: always call the provider, never touch the cache
+- record: always call the provider and store successful responses
+- replay: serve from the cache only (a miss is an error)
+- replay-or-live: serve from the cache, fall back to the provider and record
+"""
+
+
+class CacheMissError(ValueError):
+    """Raised in replay mode when no cached response exists for a request."""
+
+
+class ResponseCache:
+    """SQLite-backed cache of execution results."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl_seconds: int | None = 7 * 24 * 3600,
+        max_size_bytes: int = 512 * 1024 * 1024,
+    ):
+        """Open (or create) the cache.
+
+        Args:
+            path: Cache file (default: ~/.sentinel/response_cache.db)
+            ttl_seconds: Entry lifetime in seconds (None: never expire)
+            max_size_bytes: Total payload size before LRU eviction starts
+        """
+        if path is None:
+            sentinel_dir = Path.home() / ".sentinel"
+            sentinel_dir.mkdir(exist_ok=True)
+            path = sentinel_dir / "response_cache.db"
+
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(request: dict[str, Any]) -> str:
+        """Hash a request into a cache key.
+
+        None-valued parameters are dropped so that omitting a parameter and
+        passing None produce the same key.
+
+        Args:
+            request: Provider request parameters (model, messages, temperature,
+                tools, top_p, top_k, stop_sequences, seed, ...)
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON form
+        """
+        normalized = {k: v for k, v in request.items() if v is not None}
+        canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ExecutionResult | None:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached ExecutionResult (marked cached=True) or None on miss/expiry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, size, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        result = ExecutionResult.model_validate_json(payload)
+        return result.model_copy(update={"cached": True})
+
+    def put(self, key: str, result: ExecutionResult) -> None:
+        """Store a result, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key from make_key()
+            result: Execution result to store
+        """
+        payload = result.model_dump_json()
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_size_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under budget."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+
+        # Keep the most recently used entries that fit in 90% of the budget so
+        # eviction is not triggered again by the very next insert
+        target = int(self.max_size_bytes * 0.9)
+        kept = 0
+        evict_before: float | None = None
+        for size, accessed_at in self._conn.execute(
+            "SELECT size, accessed_at FROM responses ORDER BY accessed_at DESC"
+        ):
+            if kept + size > target:
+                evict_before = accessed_at
+                break
+            kept += size
+        if evict_before is not None:
+            self._conn.execute("DELETE FROM responses WHERE accessed_at <= ?", (evict_before,))
+
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get entry count and total payload size."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"entries": count, "size_bytes": self._total_bytes, "path": str(self.path)}
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -2,12 +2,18 @@
 Core test execution engine.
 """
 
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, get_args
+
 from pydantic import BaseModel
 
-from ..core.schema import InputSpec, TestSpec
+from ..core.schema import InputSpec, TestSpec, TestSuite
 from ..providers.anthropic_provider import AnthropicProvider
-from ..providers.base import ExecutionResult, ModelProvider, ProviderConfig
+from ..providers.base import ExecutionResult, ModelProvider, ProviderConfig, StreamEvent
 from ..providers.openai_provider import OpenAIProvider
+from ..providers.rate_limit import RateLimitConfig
+from .cache import CacheMissError, CacheMode, ResponseCache
 
 
 class ExecutorConfig(BaseModel):
@@ -16,6 +22,33 @@ class ExecutorConfig(BaseModel):
     anthropic_api_key: str | None = None
     openai_api_key: str | None = None
 
+    # Suite execution limits
+    max_concurrency: int = 4  # Tests in flight across all providers
+    max_concurrency_per_provider: int | None = None  # Tests in flight per provider
+
+    # Provider rate limits, keyed by provider name ("anthropic", "openai")
+    rate_limits: dict[str, RateLimitConfig] = {}
+    # Model-specific rate limit overrides, keyed by model identifier
+    model_rate_limits: dict[str, RateLimitConfig] = {}
+
+    # Use provider streaming APIs so time-to-first-token and decoding speed are measured
+    stream_responses: bool = True
+
+    # Response cache
+    cache_mode: CacheMode = "live"
+    cache_path: str | None = None  # Default: ~/.sentinel/response_cache.db
+    cache_ttl_seconds: int | None = 7 * 24 * 3600
+    cache_max_bytes: int = 512 * 1024 * 1024
+
+
+class SuiteTestResult(BaseModel):
+    """Outcome of a single test within a suite execution."""
+
+    index: int  # Position of the test in the suite
+    name: str
+    result: ExecutionResult | None = None
+    error: str | None = None  # Set when the test could not be executed
+
 
 class TestExecutor:
     """Executes tests against model providers."""
@@ -28,15 +61,24 @@ class TestExecutor:
         """
         self.config = config
         self.providers: dict[str, ModelProvider] = {}
+        self._cache: ResponseCache | None = None
 
         # Initialize Anthropic provider if API key is provided
         if config.anthropic_api_key:
-            anthropic_config = ProviderConfig(api_key=config.anthropic_api_key)
+            anthropic_config = ProviderConfig(
+                api_key=config.anthropic_api_key,
+                rate_limit=config.rate_limits.get("anthropic"),
+                model_rate_limits=config.model_rate_limits,
+            )
             self.providers["anthropic"] = AnthropicProvider(anthropic_config)
 
         # Initialize OpenAI provider if API key is provided
         if config.openai_api_key:
-            openai_config = ProviderConfig(api_key=config.openai_api_key)
+            openai_config = ProviderConfig(
+                api_key=config.openai_api_key,
+                rate_limit=config.rate_limits.get("openai"),
+                model_rate_limits=config.model_rate_limits,
+            )
             self.providers["openai"] = OpenAIProvider(openai_config)
 
     def _get_provider_for_model(self, model: str) -> ModelProvider | None:
@@ -85,26 +127,15 @@ class TestExecutor:
 
         return messages
 
-    async def execute(self, test_spec: TestSpec) -> ExecutionResult:
-        """Execute a test specification.
+    def _build_request(self, test_spec: TestSpec) -> dict[str, Any]:
+        """Build provider request parameters from a test specification.
 
         Args:
-            test_spec: Test specification to execute
+            test_spec: Test specification
 
         Returns:
-            ExecutionResult with output and metrics
-
-        Raises:
-            ValueError: If provider is not configured or model is not supported
+            Keyword arguments for ModelProvider.execute
         """
-        # Get provider for the model
-        provider = self._get_provider_for_model(test_spec.model)
-        if not provider:
-            raise ValueError(
-                f"No provider configured for model '{test_spec.model}'. "
-                f"Please configure the appropriate API key."
-            )
-
         # Build messages from inputs
         messages = self._build_messages_from_input(test_spec.inputs)
 
@@ -141,16 +172,198 @@ class TestExecutor:
                         tool_dict["input_schema"] = tool.parameters
                     tools.append(tool_dict)
 
+        return {
+            "model": test_spec.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": tools,
+            "top_p": top_p,
+            "top_k": top_k,
+            "stop_sequences": stop_sequences,
+        }
+
+    @property
+    def cache(self) -> ResponseCache:
+        """Response cache, opened on first use."""
+        if self._cache is None:
+            self._cache = ResponseCache(
+                path=self.config.cache_path,
+                ttl_seconds=self.config.cache_ttl_seconds,
+                max_size_bytes=self.config.cache_max_bytes,
+            )
+        return self._cache
+
+    def _lookup_cache(
+        self, test_spec: TestSpec, request: dict[str, Any], cache_mode: CacheMode | None
+    ) -> tuple[str | None, ExecutionResult | None]:
+        """Look up the response cache for a request.
+
+        Args:
+            test_spec: Test specification being executed
+            request: Provider request built by _build_request()
+            cache_mode: Response cache mode (default: config.cache_mode)
+
+        Returns:
+            Tuple of (cache key to record under or None, cached result or None)
+
+        Raises:
+            ValueError: If the mode is not a known CacheMode
+            CacheMissError: If the mode is "replay" and no cached response exists
+        """
+        mode = cache_mode or self.config.cache_mode
+        if mode not in get_args(CacheMode):
+            raise ValueError(f"Unknown cache mode: {mode!r}")
+        if mode == "live":
+            return None, None
+
+        cache_key = ResponseCache.make_key({**request, "seed": test_spec.seed})
+        if mode in ("replay", "replay-or-live"):
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cache_key, cached
+            if mode == "replay":
+                raise CacheMissError(
+                    f"No cached response for test '{test_spec.name}' (replay mode)"
+                )
+        return cache_key, None
+
+    def _require_provider(self, test_spec: TestSpec) -> ModelProvider:
+        """Get the provider for a test's model or raise if none is configured."""
+        provider = self._get_provider_for_model(test_spec.model)
+        if not provider:
+            raise ValueError(
+                f"No provider configured for model '{test_spec.model}'. "
+                f"Please configure the appropriate API key."
+            )
+        return provider
+
+    async def execute(
+        self, test_spec: TestSpec, cache_mode: CacheMode | None = None
+    ) -> ExecutionResult:
+        """Execute a test specification.
+
+        Args:
+            test_spec: Test specification to execute
+            cache_mode: Response cache mode (default: config.cache_mode)
+
+        Returns:
+            ExecutionResult with output and metrics
+
+        Raises:
+            ValueError: If provider is not configured or model is not supported
+            CacheMissError: If cache_mode is "replay" and no cached response exists
+            RuntimeError: If the provider's stream ends without a result
+        """
+        request = self._build_request(test_spec)
+        cache_key, cached = self._lookup_cache(test_spec, request, cache_mode)
+        if cached is not None:
+            return cached
+
         # Execute the test
-        result = await provider.execute(
-            model=test_spec.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            tools=tools,
-            top_p=top_p,
-            top_k=top_k,
-            stop_sequences=stop_sequences,
-        )
+        provider = self._require_provider(test_spec)
+        result: ExecutionResult | None = None
+        if self.config.stream_responses:
+            async for event in provider.stream(**request):
+                if event.type == "done":
+                    result = event.result
+            if result is None:
+                raise RuntimeError(
+                    f"Provider '{provider.provider_name}' stream ended without a done event"
+                )
+        else:
+            result = await provider.execute(**request)
+
+        # Record successful responses for later replay
+        if cache_key is not None and result.success:
+            self.cache.put(cache_key, result)
 
         return result
+
+    async def stream(
+        self, test_spec: TestSpec, cache_mode: CacheMode | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        """Execute a test specification, streaming output as it is generated.
+
+        Cached responses are replayed as a single delta. Closing the iterator
+        early cancels the provider call, in which case nothing is cached.
+
+        Args:
+            test_spec: Test specification to execute
+            cache_mode: Response cache mode (default: config.cache_mode)
+
+        Yields:
+            StreamEvent deltas followed by a final "done" event
+
+        Raises:
+            ValueError: If provider is not configured or model is not supported
+            CacheMissError: If cache_mode is "replay" and no cached response exists
+        """
+        request = self._build_request(test_spec)
+        cache_key, cached = self._lookup_cache(test_spec, request, cache_mode)
+        if cached is not None:
+            if cached.output:
+                yield StreamEvent(type="delta", text=cached.output)
+            yield StreamEvent(type="done", result=cached)
+            return
+
+        async for event in self._require_provider(test_spec).stream(**request):
+            if event.type == "done" and cache_key is not None and event.result.success:
+                self.cache.put(cache_key, event.result)
+            yield event
+
+    async def execute_suite(
+        self,
+        suite: TestSuite | list[TestSpec],
+        max_concurrency: int | None = None,
+        max_concurrency_per_provider: int | None = None,
+        cache_mode: CacheMode | None = None,
+    ) -> AsyncIterator[SuiteTestResult]:
+        """Execute all tests of a suite concurrently.
+
+        Tests are fanned out over asyncio with a global concurrency limit and an
+        optional per-provider limit. Results are yielded in completion order, so
+        callers can report each test as soon as it finishes.
+
+        Args:
+            suite: Test suite (or plain list of test specifications) to execute
+            max_concurrency: Global limit (default: config.max_concurrency)
+            max_concurrency_per_provider: Per-provider limit
+                (default: config.max_concurrency_per_provider, unlimited if None)
+            cache_mode: Response cache mode (default: config.cache_mode)
+
+        Yields:
+            SuiteTestResult for each test as it completes
+        """
+        specs = suite.tests if isinstance(suite, TestSuite) else list(suite)
+        global_limit = asyncio.Semaphore(max_concurrency or self.config.max_concurrency)
+        provider_limit = max_concurrency_per_provider or self.config.max_concurrency_per_provider
+        provider_semaphores: dict[str, asyncio.Semaphore] = {}
+
+        async def run_one(index: int, spec: TestSpec) -> SuiteTestResult:
+            try:
+                # Acquire the provider slot first so a saturated provider does not
+                # hold global slots that tests for other providers could use
+                provider = self._get_provider_for_model(spec.model)
+                provider_key = provider.provider_name if provider else spec.model
+                if provider_limit:
+                    semaphore = provider_semaphores.setdefault(
+                        provider_key, asyncio.Semaphore(provider_limit)
+                    )
+                    async with semaphore, global_limit:
+                        result = await self.execute(spec, cache_mode=cache_mode)
+                else:
+                    async with global_limit:
+                        result = await self.execute(spec, cache_mode=cache_mode)
+                return SuiteTestResult(index=index, name=spec.name, result=result)
+            except Exception as e:
+                return SuiteTestResult(index=index, name=spec.name, error=str(e))
+
+        tasks = [asyncio.create_task(run_one(i, spec)) for i, spec in enumerate(specs)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding tests if the consumer goes away early
+            for task in tasks:
+                task.cancel()
@@ -4,7 +4,10 @@ Sentinel Backend API Server.
 FastAPI application for test execution and provider management.
 """
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
+from typing import cast, get_args
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,16 +16,64 @@ from .api.execution import router as execution_router
 from .api.providers import router as providers_router
 from .api.recording import router as recording_router
 from .api.runs import router as runs_router
+from .api.test_files import file_service
 from .api.test_files import router as test_files_router
 from .api.tests import router as tests_router
-from .executor import ExecutorConfig, TestExecutor
+from .executor import CacheMode, ExecutorConfig, TestExecutor
+from .providers import RateLimitConfig
+from .services import TestFileSync, shutdown_revalidation_pool
 from .storage import get_database
 
+
+def _rate_limit_from_env(provider: str) -> RateLimitConfig | None:
+    """Read a provider's rate limits from SENTINEL_<PROVIDER>_* variables."""
+    prefix = f"SENTINEL_{provider.upper()}_"
+    values = {
+        "requests_per_minute": os.getenv(prefix + "RPM"),
+        "tokens_per_minute": os.getenv(prefix + "TPM"),
+        "max_concurrency": os.getenv(prefix + "MAX_CONCURRENCY"),
+    }
+    configured = {key: int(value) for key, value in values.items() if value}
+    return RateLimitConfig(**configured) if configured else None
+
+
+def _cache_mode_from_env() -> CacheMode:
+    """Read the response cache mode from SENTINEL_CACHE_MODE.
+
+    Raises:
+        ValueError: If the mode is not a known CacheMode
+    """
+    mode = os.getenv("SENTINEL_CACHE_MODE", "live")
+    modes = get_args(CacheMode)
+    if mode not in modes:
+        raise ValueError(
+            f"Unknown SENTINEL_CACHE_MODE: {mode!r} (expected one of {', '.join(modes)})"
+        )
+    return cast(CacheMode, mode)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background database maintenance while the server is up."""
+    maintenance = asyncio.create_task(database.maintenance_loop())
+    migration = asyncio.create_task(database.migrate_legacy_payloads_in_background())
+    file_sync = None
+    if os.getenv("SENTINEL_TEST_FILE_SYNC", "1") != "0":
+        file_sync = asyncio.create_task(TestFileSync(file_service.tests_path).run())
+    yield
+    maintenance.cancel()
+    migration.cancel()
+    if file_sync:
+        file_sync.cancel()
+    shutdown_revalidation_pool()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Sentinel API",
     description="AI Agent Testing and Evaluation Platform",
     version="0.33.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS for Tauri frontend
@@ -38,6 +89,12 @@ app.add_middleware(
 executor_config = ExecutorConfig(
     anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
     openai_api_key=os.getenv("OPENAI_API_KEY"),
+    cache_mode=_cache_mode_from_env(),
+    rate_limits={
+        provider: limits
+        for provider in ("anthropic", "openai")
+        if (limits := _rate_limit_from_env(provider)) is not None
+    },
 )
 executor = TestExecutor(executor_config)
 
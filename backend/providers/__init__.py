@@ -5,13 +5,17 @@ Provides a pluggable architecture for different AI model providers.
 """
 
 from .anthropic_provider import AnthropicProvider
-from .base import ExecutionResult, ModelProvider, ProviderConfig
+from .base import ExecutionResult, ModelProvider, ProviderConfig, StreamEvent
 from .openai_provider import OpenAIProvider
+from .rate_limit import ProviderRateLimiter, RateLimitConfig
 
 __all__ = [
     "ModelProvider",
     "ProviderConfig",
     "ExecutionResult",
+    "StreamEvent",
     "AnthropicProvider",
     "OpenAIProvider",
+    "RateLimitConfig",
+    "ProviderRateLimiter",
 ]
@@ -2,17 +2,21 @@
 Anthropic (Claude) provider implementation.
 """
 
+import json
 import time
+from collections.abc import AsyncIterator
 from typing import Any
 
-from anthropic import AsyncAnthropic
+from anthropic import APIConnectionError, AsyncAnthropic
 
-from .base import ExecutionResult, ModelProvider, ProviderConfig
+from .base import ExecutionResult, ModelProvider, ProviderConfig, StreamEvent
 
 
 class AnthropicProvider(ModelProvider):
     """Provider for Anthropic's Claude models."""
 
+    transient_errors = (APIConnectionError,)
+
     AVAILABLE_MODELS = [
         # Latest (Recommended - Claude 4.x)
         "claude-sonnet-4-5-20250929",  # Claude Sonnet 4.5 (Latest, best balance)
@@ -27,7 +31,8 @@ class AnthropicProvider(ModelProvider):
             config: Provider configuration with API key
         """
         super().__init__(config)
-        self.client = AsyncAnthropic(api_key=config.api_key, timeout=config.timeout)
+        # Retries are handled by the shared rate limiter so throttling is visible to it
+        self.client = AsyncAnthropic(api_key=config.api_key, timeout=config.timeout, max_retries=0)
 
     @property
     def provider_name(self) -> str:
@@ -42,6 +47,60 @@ class AnthropicProvider(ModelProvider):
         """
         return self.AVAILABLE_MODELS
 
+    def _build_request_params(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Build Messages API parameters from provider-neutral arguments.
+
+        Raises:
+            ValueError: If the conversation does not start with a user message
+        """
+        # Separate system message from conversation messages
+        system_message = None
+        conversation_messages = []
+
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            else:
+                conversation_messages.append({"role": msg["role"], "content": msg["content"]})
+
+        # Ensure we have at least one user message
+        if not conversation_messages or conversation_messages[0]["role"] != "user":
+            raise ValueError("Conversation must start with a user message")
+
+        # Build request parameters
+        request_params: dict[str, Any] = {
+            "model": model,
+            "messages": conversation_messages,
+            "max_tokens": max_tokens or 1024,
+            "temperature": min(max(temperature, 0.0), 1.0),  # Claude: 0.0-1.0
+        }
+
+        # Add system message if present
+        if system_message:
+            request_params["system"] = system_message
+
+        # Add tools if present
+        if tools:
+            request_params["tools"] = tools
+
+        # Add optional parameters (only if not None)
+        if "top_p" in kwargs and kwargs["top_p"] is not None:
+            request_params["top_p"] = kwargs["top_p"]
+        if "top_k" in kwargs and kwargs["top_k"] is not None:
+            request_params["top_k"] = kwargs["top_k"]
+        if "stop_sequences" in kwargs and kwargs["stop_sequences"] is not None:
+            request_params["stop_sequences"] = kwargs["stop_sequences"]
+
+        return request_params
+
     async def execute(
         self,
         model: str,
@@ -64,52 +123,23 @@ class AnthropicProvider(ModelProvider):
         Returns:
             ExecutionResult with response and metrics
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Separate system message from conversation messages
-            system_message = None
-            conversation_messages = []
-
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    conversation_messages.append({"role": msg["role"], "content": msg["content"]})
-
-            # Ensure we have at least one user message
-            if not conversation_messages or conversation_messages[0]["role"] != "user":
-                raise ValueError("Conversation must start with a user message")
-
-            # Build request parameters
-            request_params: dict[str, Any] = {
-                "model": model,
-                "messages": conversation_messages,
-                "max_tokens": max_tokens or 1024,
-                "temperature": min(max(temperature, 0.0), 1.0),  # Claude: 0.0-1.0
-            }
-
-            # Add system message if present
-            if system_message:
-                request_params["system"] = system_message
-
-            # Add tools if present
-            if tools:
-                request_params["tools"] = tools
-
-            # Add optional parameters (only if not None)
-            if "top_p" in kwargs and kwargs["top_p"] is not None:
-                request_params["top_p"] = kwargs["top_p"]
-            if "top_k" in kwargs and kwargs["top_k"] is not None:
-                request_params["top_k"] = kwargs["top_k"]
-            if "stop_sequences" in kwargs and kwargs["stop_sequences"] is not None:
-                request_params["stop_sequences"] = kwargs["stop_sequences"]
+            request_params = self._build_request_params(
+                model, messages, temperature, max_tokens, tools, **kwargs
+            )
 
             # Call Anthropic API
-            response = await self.client.messages.create(**request_params)
+            response = await self._call_with_rate_limit(
+                model,
+                self._estimate_tokens(messages, max_tokens),
+                lambda: self.client.messages.with_raw_response.create(**request_params),
+                lambda r: r.usage.input_tokens + r.usage.output_tokens,
+            )
 
             # Calculate latency
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
 
             # Extract response text
             output_text = ""
@@ -158,7 +188,7 @@ class AnthropicProvider(ModelProvider):
             )
 
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return ExecutionResult(
                 success=False,
                 output="",
@@ -168,6 +198,135 @@ class AnthropicProvider(ModelProvider):
                 error=str(e),
             )
 
+    async def stream(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a test execution against a Claude model.
+
+        Args:
+            model: Claude model identifier
+            messages: List of messages (must have at least one user message)
+            temperature: Sampling temperature (0.0-1.0 for Claude)
+            max_tokens: Maximum tokens to generate (default 1024)
+            tools: Available tools for the model
+            **kwargs: Additional parameters (top_p, top_k, stop_sequences, etc.)
+
+        Yields:
+            Text deltas followed by a "done" event with the full ExecutionResult
+        """
+        start_time = time.perf_counter()
+
+        try:
+            request_params = self._build_request_params(
+                model, messages, temperature, max_tokens, tools, **kwargs
+            )
+            estimated_tokens = self._estimate_tokens(messages, max_tokens)
+
+            message_id = None
+            stop_reason = None
+            input_tokens = 0
+            output_tokens = 0
+            ttft_ms = None
+            blocks: dict[int, dict[str, Any]] = {}
+
+            async with self._rate_limited_call(
+                model,
+                estimated_tokens,
+                lambda: self.client.messages.with_raw_response.create(
+                    **request_params, stream=True
+                ),
+            ) as events:
+                try:
+                    async for event in events:
+                        if event.type == "message_start":
+                            message_id = event.message.id
+                            input_tokens = event.message.usage.input_tokens
+                        elif event.type == "content_block_start":
+                            block = event.content_block
+                            blocks[event.index] = {
+                                "type": block.type,
+                                "text": "",
+                                "id": getattr(block, "id", None),
+                                "name": getattr(block, "name", None),
+                                "input_json": "",
+                            }
+                        elif event.type == "content_block_delta":
+                            if ttft_ms is None:
+                                ttft_ms = int((time.perf_counter() - start_time) * 1000)
+                            if event.delta.type == "text_delta":
+                                blocks[event.index]["text"] += event.delta.text
+                                yield StreamEvent(type="delta", text=event.delta.text)
+                            elif event.delta.type == "input_json_delta":
+                                blocks[event.index]["input_json"] += event.delta.partial_json
+                        elif event.type == "message_delta":
+                            stop_reason = event.delta.stop_reason
+                            output_tokens = event.usage.output_tokens
+                finally:
+                    await events.close()
+
+                self.rate_limiter.for_model(model).record_usage(
+                    estimated_tokens, input_tokens + output_tokens
+                )
+
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+
+            ordered_blocks = [blocks[index] for index in sorted(blocks)]
+            output_text = "".join(b["text"] for b in ordered_blocks if b["type"] == "text")
+            tool_calls = [
+                {
+                    "id": b["id"],
+                    "name": b["name"],
+                    "input": json.loads(b["input_json"]) if b["input_json"] else {},
+                }
+                for b in ordered_blocks
+                if b["type"] == "tool_use"
+            ]
+
+            result = ExecutionResult(
+                success=True,
+                output=output_text,
+                model=model,
+                provider=self.provider_name,
+                latency_ms=latency_ms,
+                ttft_ms=ttft_ms,
+                tokens_per_second=self._tokens_per_second(output_tokens, latency_ms, ttft_ms),
+                tokens_input=input_tokens,
+                tokens_output=output_tokens,
+                cost_usd=self._calculate_cost(model, input_tokens, output_tokens),
+                tool_calls=tool_calls,
+                raw_response={
+                    "id": message_id,
+                    "type": "message",
+                    "role": "assistant",
+                    "stop_reason": stop_reason,
+                    "content": [
+                        {
+                            "type": b["type"],
+                            "text": b["text"] if b["type"] == "text" else None,
+                        }
+                        for b in ordered_blocks
+                    ],
+                },
+            )
+
+        except Exception as e:
+            result = ExecutionResult(
+                success=False,
+                output="",
+                model=model,
+                provider=self.provider_name,
+                latency_ms=int((time.perf_counter() - start_time) * 1000),
+                error=str(e),
+            )
+
+        yield StreamEvent(type="done", result=result)
+
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate approximate cost in USD.
 
@@ -2,12 +2,23 @@
 Base provider interface for all model providers.
 """
 
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
+from .rate_limit import ProviderRateLimiter, RateLimitConfig, parse_reset_seconds
+
+# HTTP statuses that signal the provider is throttling or overloaded
+RATE_LIMIT_STATUSES = {429, 529}
+# HTTP statuses worth retrying without backing off concurrency
+TRANSIENT_STATUSES = {408, 409, 500, 502, 503, 504}
+
 
 class ProviderConfig(BaseModel):
     """Configuration for a model provider."""
@@ -17,6 +28,10 @@ class ProviderConfig(BaseModel):
     timeout: int = 60
     max_retries: int = 3
 
+    # Rate limiting (per provider default and per model overrides)
+    rate_limit: RateLimitConfig | None = None
+    model_rate_limits: dict[str, RateLimitConfig] = {}
+
 
 class ExecutionResult(BaseModel):
     """Result of executing a test against a model."""
@@ -25,7 +40,9 @@ class ExecutionResult(BaseModel):
     output: str
     model: str
     provider: str
-    latency_ms: int
+    latency_ms: int  # Total wall-clock time of the call
+    ttft_ms: int | None = None  # Time to first output token (streaming only)
+    tokens_per_second: float | None = None  # Output tokens per second after the first token
     tokens_input: int | None = None
     tokens_output: int | None = None
     cost_usd: float | None = None
@@ -33,11 +50,27 @@ class ExecutionResult(BaseModel):
     error: str | None = None
     timestamp: str = datetime.now().isoformat()
     raw_response: dict[str, Any] | None = None
+    cached: bool = False  # True when served from the response cache
+
+
+class StreamEvent(BaseModel):
+    """Event emitted while streaming a model response.
+
+    A stream yields zero or more "delta" events carrying output text followed
+    by exactly one "done" event carrying the complete ExecutionResult.
+    """
+
+    type: Literal["delta", "done"]
+    text: str = ""
+    result: ExecutionResult | None = None
 
 
 class ModelProvider(ABC):
     """Abstract base class for all model providers."""
 
+    # SDK exception types (besides HTTP status errors) that are safe to retry
+    transient_errors: tuple[type[Exception], ...] = ()
+
     def __init__(self, config: ProviderConfig):
         """Initialize the provider with configuration.
 
@@ -45,6 +78,116 @@ class ModelProvider(ABC):
             config: Provider configuration including API keys
         """
         self.config = config
+        self.rate_limiter = ProviderRateLimiter(config.rate_limit, config.model_rate_limits)
+
+    @staticmethod
+    def _estimate_tokens(messages: list[dict[str, str]], max_tokens: int | None) -> int:
+        """Estimate total tokens for a call (~4 characters per input token)."""
+        input_chars = sum(len(str(msg.get("content", ""))) for msg in messages)
+        return input_chars // 4 + (max_tokens or 1024)
+
+    @staticmethod
+    def _tokens_per_second(
+        tokens_output: int | None, latency_ms: int, ttft_ms: int | None
+    ) -> float | None:
+        """Compute decoding throughput from the time between first token and completion.
+
+        Args:
+            tokens_output: Number of output tokens
+            latency_ms: Total time of the call in milliseconds
+            ttft_ms: Time to first token in milliseconds
+
+        Returns:
+            Output tokens per second, or None if it cannot be measured
+        """
+        if not tokens_output or ttft_ms is None or latency_ms <= ttft_ms:
+            return None
+        return round(tokens_output / ((latency_ms - ttft_ms) / 1000), 2)
+
+    @asynccontextmanager
+    async def _rate_limited_call(
+        self,
+        model: str,
+        estimated_tokens: int,
+        call: Callable[[], Awaitable[Any]],
+    ) -> AsyncIterator[Any]:
+        """Run an SDK call under the model's rate limiter, retrying throttled calls.
+
+        The call must return a raw SDK response (``with_raw_response``) so that
+        rate-limit headers can be read before parsing. The concurrency slot is
+        held until the context exits, so streamed responses count as in flight
+        while they are consumed.
+
+        Args:
+            model: Model identifier (selects the limiter)
+            estimated_tokens: Token estimate reserved before the call
+            call: Zero-argument coroutine factory performing the SDK request
+
+        Yields:
+            Parsed SDK response (a stream for streaming requests)
+
+        Raises:
+            Exception: The last SDK error once retries are exhausted
+        """
+        limiter = self.rate_limiter.for_model(model)
+        attempt = 0
+
+        while True:
+            async with limiter.slot(estimated_tokens):
+                try:
+                    raw = await call()
+                except Exception as e:
+                    status = getattr(e, "status_code", None)
+                    retryable = status in RATE_LIMIT_STATUSES or status in TRANSIENT_STATUSES
+                    if attempt >= self.config.max_retries or not (
+                        retryable or isinstance(e, self.transient_errors)
+                    ):
+                        raise
+
+                    retry_after = None
+                    response = getattr(e, "response", None)
+                    if response is not None and "retry-after" in response.headers:
+                        retry_after = parse_reset_seconds(response.headers["retry-after"])
+
+                    if status in RATE_LIMIT_STATUSES:
+                        limiter.on_rate_limited(retry_after)
+                    else:
+                        backoff = retry_after if retry_after is not None else 0.5 * 2**attempt
+                        await asyncio.sleep(min(backoff, 30.0))
+                    attempt += 1
+                    continue
+
+                limiter.update_from_headers(raw.headers)
+                response = raw.parse()
+                if inspect.isawaitable(response):  # Async in newer SDK releases
+                    response = await response
+                yield response
+                limiter.on_success()
+                return
+
+    async def _call_with_rate_limit(
+        self,
+        model: str,
+        estimated_tokens: int,
+        call: Callable[[], Awaitable[Any]],
+        count_tokens: Callable[[Any], int],
+    ) -> Any:
+        """Run a non-streaming SDK call under the model's rate limiter.
+
+        Args:
+            model: Model identifier (selects the limiter)
+            estimated_tokens: Token estimate reserved before the call
+            call: Zero-argument coroutine factory performing the SDK request
+            count_tokens: Returns the actual tokens used by a parsed response
+
+        Returns:
+            Parsed SDK response
+        """
+        async with self._rate_limited_call(model, estimated_tokens, call) as response:
+            self.rate_limiter.for_model(model).record_usage(
+                estimated_tokens, count_tokens(response)
+            )
+        return response
 
     @abstractmethod
     async def execute(
@@ -71,6 +214,37 @@ class ModelProvider(ABC):
         """
         pass
 
+    async def stream(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a test execution against the model.
+
+        The default implementation executes without streaming and emits the
+        whole output as a single delta. Providers override this with their
+        SDK's streaming API. Closing the iterator early cancels generation.
+
+        Args:
+            model: Model identifier
+            messages: List of messages in the conversation
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            tools: Available tools for the model
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            StreamEvent deltas followed by a final "done" event
+        """
+        result = await self.execute(model, messages, temperature, max_tokens, tools, **kwargs)
+        if result.output:
+            yield StreamEvent(type="delta", text=result.output)
+        yield StreamEvent(type="done", result=result)
+
     @abstractmethod
     def list_models(self) -> list[str]:
         """List available models for this provider.
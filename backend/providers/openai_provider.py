@@ -3,16 +3,19 @@ OpenAI provider implementation.
 """
 
 import time
+from collections.abc import AsyncIterator
 from typing import Any
 
-from openai import AsyncOpenAI
+from openai import APIConnectionError, AsyncOpenAI
 
-from .base import ExecutionResult, ModelProvider, ProviderConfig
+from .base import ExecutionResult, ModelProvider, ProviderConfig, StreamEvent
 
 
 class OpenAIProvider(ModelProvider):
     """Provider for OpenAI's GPT models."""
 
+    transient_errors = (APIConnectionError,)
+
     AVAILABLE_MODELS = [
         # GPT-5 Series (Latest Frontier Models - August 2025+)
         "gpt-5.1",  # GPT-5.1 (Latest, best for coding and agentic tasks)
@@ -36,7 +39,8 @@ class OpenAIProvider(ModelProvider):
             config: Provider configuration with API key
         """
         super().__init__(config)
-        self.client = AsyncOpenAI(api_key=config.api_key, timeout=config.timeout)
+        # Retries are handled by the shared rate limiter so throttling is visible to it
+        self.client = AsyncOpenAI(api_key=config.api_key, timeout=config.timeout, max_retries=0)
 
     @property
     def provider_name(self) -> str:
@@ -51,6 +55,53 @@ class OpenAIProvider(ModelProvider):
         """
         return self.AVAILABLE_MODELS
 
+    def _build_request_params(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Build Chat Completions parameters from provider-neutral arguments."""
+        # Build request parameters
+        request_params: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+        }
+
+        # Temperature support varies by model
+        # gpt-5, gpt-5-mini, gpt-5-nano: Don't support custom temperature
+        # gpt-5.1, gpt-4.x, gpt-3.5-turbo: Support temperature (0.0-2.0)
+        models_without_temperature = ["gpt-5", "gpt-5-mini", "gpt-5-nano"]
+        if model not in models_without_temperature:
+            request_params["temperature"] = min(max(temperature, 0.0), 2.0)
+
+        # Add max_tokens if specified
+        # Note: GPT-5 series use 'max_completion_tokens' exclusively
+        # GPT-4/3.5 series support both, but max_completion_tokens is universal
+        if max_tokens:
+            # Use max_completion_tokens for GPT-5 series (required)
+            # Also works for all other models, so use it universally for consistency
+            request_params["max_completion_tokens"] = max_tokens
+
+        # Add tools if present
+        if tools:
+            request_params["tools"] = tools
+
+        # Add optional parameters (only if not None)
+        if "top_p" in kwargs and kwargs["top_p"] is not None:
+            request_params["top_p"] = kwargs["top_p"]
+        if "frequency_penalty" in kwargs and kwargs["frequency_penalty"] is not None:
+            request_params["frequency_penalty"] = kwargs["frequency_penalty"]
+        if "presence_penalty" in kwargs and kwargs["presence_penalty"] is not None:
+            request_params["presence_penalty"] = kwargs["presence_penalty"]
+        if "stop" in kwargs and kwargs["stop"] is not None:
+            request_params["stop"] = kwargs["stop"]
+
+        return request_params
+
     async def execute(
         self,
         model: str,
@@ -73,49 +124,23 @@ class OpenAIProvider(ModelProvider):
         Returns:
             ExecutionResult with response and metrics
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Build request parameters
-            request_params: dict[str, Any] = {
-                "model": model,
-                "messages": messages,
-            }
-
-            # Temperature support varies by model
-            # gpt-5, gpt-5-mini, gpt-5-nano: Don't support custom temperature
-            # gpt-5.1, gpt-4.x, gpt-3.5-turbo: Support temperature (0.0-2.0)
-            models_without_temperature = ["gpt-5", "gpt-5-mini", "gpt-5-nano"]
-            if model not in models_without_temperature:
-                request_params["temperature"] = min(max(temperature, 0.0), 2.0)
-
-            # Add max_tokens if specified
-            # Note: GPT-5 series use 'max_completion_tokens' exclusively
-            # GPT-4/3.5 series support both, but max_completion_tokens is universal
-            if max_tokens:
-                # Use max_completion_tokens for GPT-5 series (required)
-                # Also works for all other models, so use it universally for consistency
-                request_params["max_completion_tokens"] = max_tokens
-
-            # Add tools if present
-            if tools:
-                request_params["tools"] = tools
-
-            # Add optional parameters (only if not None)
-            if "top_p" in kwargs and kwargs["top_p"] is not None:
-                request_params["top_p"] = kwargs["top_p"]
-            if "frequency_penalty" in kwargs and kwargs["frequency_penalty"] is not None:
-                request_params["frequency_penalty"] = kwargs["frequency_penalty"]
-            if "presence_penalty" in kwargs and kwargs["presence_penalty"] is not None:
-                request_params["presence_penalty"] = kwargs["presence_penalty"]
-            if "stop" in kwargs and kwargs["stop"] is not None:
-                request_params["stop"] = kwargs["stop"]
+            request_params = self._build_request_params(
+                model, messages, temperature, max_tokens, tools, **kwargs
+            )
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(**request_params)
+            response = await self._call_with_rate_limit(
+                model,
+                self._estimate_tokens(messages, max_tokens),
+                lambda: self.client.chat.completions.with_raw_response.create(**request_params),
+                lambda r: r.usage.prompt_tokens + r.usage.completion_tokens,
+            )
 
             # Calculate latency
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
 
             # Extract response text and tool calls
             message = response.choices[0].message
@@ -160,7 +185,7 @@ class OpenAIProvider(ModelProvider):
             )
 
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return ExecutionResult(
                 success=False,
                 output="",
@@ -170,6 +195,127 @@ class OpenAIProvider(ModelProvider):
                 error=str(e),
             )
 
+    async def stream(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a test execution against a GPT model.
+
+        Args:
+            model: GPT model identifier
+            messages: List of messages (supports system, user, assistant)
+            temperature: Sampling temperature (0.0-2.0 for GPT)
+            max_tokens: Maximum tokens to generate
+            tools: Available tools for the model
+            **kwargs: Additional parameters (top_p, frequency_penalty, presence_penalty, etc.)
+
+        Yields:
+            Text deltas followed by a "done" event with the full ExecutionResult
+        """
+        start_time = time.perf_counter()
+
+        try:
+            request_params = self._build_request_params(
+                model, messages, temperature, max_tokens, tools, **kwargs
+            )
+            request_params["stream"] = True
+            request_params["stream_options"] = {"include_usage": True}
+            estimated_tokens = self._estimate_tokens(messages, max_tokens)
+
+            response_id = None
+            created = None
+            finish_reason = None
+            output_text = ""
+            prompt_tokens = 0
+            completion_tokens = 0
+            ttft_ms = None
+            tool_call_parts: dict[int, dict[str, Any]] = {}
+
+            async with self._rate_limited_call(
+                model,
+                estimated_tokens,
+                lambda: self.client.chat.completions.with_raw_response.create(**request_params),
+            ) as chunks:
+                try:
+                    async for chunk in chunks:
+                        response_id = chunk.id
+                        created = chunk.created
+                        if chunk.usage:
+                            prompt_tokens = chunk.usage.prompt_tokens
+                            completion_tokens = chunk.usage.completion_tokens
+                        if not chunk.choices:
+                            continue
+
+                        choice = chunk.choices[0]
+                        if choice.finish_reason:
+                            finish_reason = choice.finish_reason
+                        delta = choice.delta
+                        if ttft_ms is None and (delta.content or delta.tool_calls):
+                            ttft_ms = int((time.perf_counter() - start_time) * 1000)
+                        if delta.content:
+                            output_text += delta.content
+                            yield StreamEvent(type="delta", text=delta.content)
+                        for tool_delta in delta.tool_calls or []:
+                            part = tool_call_parts.setdefault(
+                                tool_delta.index, {"id": None, "name": "", "arguments": ""}
+                            )
+                            if tool_delta.id:
+                                part["id"] = tool_delta.id
+                            if tool_delta.function and tool_delta.function.name:
+                                part["name"] += tool_delta.function.name
+                            if tool_delta.function and tool_delta.function.arguments:
+                                part["arguments"] += tool_delta.function.arguments
+                finally:
+                    await chunks.close()
+
+                self.rate_limiter.for_model(model).record_usage(
+                    estimated_tokens, prompt_tokens + completion_tokens
+                )
+
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            tool_calls = [tool_call_parts[index] for index in sorted(tool_call_parts)]
+
+            result = ExecutionResult(
+                success=True,
+                output=output_text,
+                model=model,
+                provider=self.provider_name,
+                latency_ms=latency_ms,
+                ttft_ms=ttft_ms,
+                tokens_per_second=self._tokens_per_second(completion_tokens, latency_ms, ttft_ms),
+                tokens_input=prompt_tokens,
+                tokens_output=completion_tokens,
+                cost_usd=self._calculate_cost(model, prompt_tokens, completion_tokens),
+                tool_calls=tool_calls,
+                raw_response={
+                    "id": response_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "finish_reason": finish_reason,
+                    "message": {
+                        "role": "assistant",
+                        "content": output_text or None,
+                    },
+                },
+            )
+
+        except Exception as e:
+            result = ExecutionResult(
+                success=False,
+                output="",
+                model=model,
+                provider=self.provider_name,
+                latency_ms=int((time.perf_counter() - start_time) * 1000),
+                error=str(e),
+            )
+
+        yield StreamEvent(type="done", result=result)
+
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate approximate cost in USD.
 
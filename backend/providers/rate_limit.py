@@ -0,0 +1,306 @@
+"""
+Rate limiting for model providers.
+
+Keeps request throughput at the provider ceiling without tripping 429s:
+- Token buckets for requests/min and tokens/min
+- Pacing from rate-limit response headers (remaining/reset/retry-after)
+- AIMD adaptive concurrency (additive increase, multiplicative decrease)
+
+One ModelRateLimiter exists per (provider, model) and is shared by every
+call made through that provider instance.
+"""
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class RateLimitConfig(BaseModel):
+    """Rate limits for a provider or a single model.
+
+    Example:
+        ```python
+        RateLimitConfig(requests_per_minute=50, tokens_per_minute=40_000)
+        ```
+    """
+
+    requests_per_minute: int | None = None  # None: learn from response headers
+    tokens_per_minute: int | None = None  # None: learn from response headers
+    max_concurrency: int = 16  # Upper bound for adaptive concurrency
+    min_concurrency: int = 1  # Lower bound after repeated rate limiting
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute: float):
+        """Initialize a full bucket.
+
+        Args:
+            rate_per_minute: Refill rate (and capacity) per minute
+        """
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self._rate_per_second = self.capacity / 60.0
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self._rate_per_second)
+
+    def time_until_available(self, amount: float) -> float:
+        """Seconds until `amount` tokens can be taken (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self._rate_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket (may go negative to record overspend)."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens that were reserved but not used."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self) -> None:
+        """Empty the bucket (the provider reported no remaining quota)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted AIMD-style from call outcomes.
+
+    Each success raises the limit by 1/limit (about +1 per window of `limit`
+    calls); each rate-limit response halves it.
+    """
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1):
+        """Initialize limiter at its maximum.
+
+        Args:
+            max_concurrency: Upper bound for in-flight calls
+            min_concurrency: Lower bound for in-flight calls
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        """Release a slot acquired with acquire()."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Additive increase after a successful call."""
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def on_rate_limited(self) -> None:
+        """Multiplicative decrease after a rate-limit response."""
+        self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+
+
+def parse_reset_seconds(value: str) -> float | None:
+    """Parse a rate-limit reset header into seconds from now.
+
+    Supports plain seconds ("1.5"), Go-style durations used by OpenAI
+    ("6m0s", "20ms") and RFC 3339 timestamps used by Anthropic.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds until reset, or None if the value is not understood
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(n) * scale[u] for n, u in parts)
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max(0.0, reset_at.timestamp() - time.time())
+
+
+# Header names as (remaining, reset, limit) for requests and tokens
+_REQUEST_HEADERS = [
+    (
+        "anthropic-ratelimit-requests-remaining",
+        "anthropic-ratelimit-requests-reset",
+        "anthropic-ratelimit-requests-limit",
+    ),
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests", "x-ratelimit-limit-requests"),
+]
+_TOKEN_HEADERS = [
+    (
+        "anthropic-ratelimit-tokens-remaining",
+        "anthropic-ratelimit-tokens-reset",
+        "anthropic-ratelimit-tokens-limit",
+    ),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens", "x-ratelimit-limit-tokens"),
+]
+
+
+class ModelRateLimiter:
+    """Rate limiter for a single (provider, model) pair."""
+
+    def __init__(self, config: RateLimitConfig):
+        """Initialize limiter from configuration.
+
+        Args:
+            config: Rate limits for this model
+        """
+        self.config = config
+        self.request_bucket = (
+            TokenBucket(config.requests_per_minute) if config.requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(config.tokens_per_minute) if config.tokens_per_minute else None
+        )
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            config.max_concurrency, config.min_concurrency
+        )
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new calls for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> None:
+        # Serialize bucket checks so waiting callers are served in arrival order
+        async with self._lock:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if self.request_bucket:
+                    wait = max(wait, self.request_bucket.time_until_available(1))
+                if self.token_bucket:
+                    wait = max(wait, self.token_bucket.time_until_available(estimated_tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(estimated_tokens)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Reserve budget and a concurrency slot for one call.
+
+        Args:
+            estimated_tokens: Expected input + output tokens for the call
+        """
+        await self.concurrency.acquire()
+        try:
+            await self._wait_for_budget(estimated_tokens)
+            yield
+        finally:
+            await self.concurrency.release()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Reconcile the token bucket once the real usage is known."""
+        if not self.token_bucket:
+            return
+        if actual_tokens < estimated_tokens:
+            self.token_bucket.refund(estimated_tokens - actual_tokens)
+        elif actual_tokens > estimated_tokens:
+            self.token_bucket.consume(actual_tokens - estimated_tokens)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Adjust pacing from provider rate-limit response headers.
+
+        Learns bucket sizes from limit headers when none are configured and
+        pauses until reset when the provider reports no remaining quota.
+        """
+        for header_names, bucket_attr in (
+            (_REQUEST_HEADERS, "request_bucket"),
+            (_TOKEN_HEADERS, "token_bucket"),
+        ):
+            for remaining_name, reset_name, limit_name in header_names:
+                limit = headers.get(limit_name)
+                if limit and getattr(self, bucket_attr) is None:
+                    with suppress(ValueError):
+                        setattr(self, bucket_attr, TokenBucket(float(limit)))
+
+                remaining = headers.get(remaining_name)
+                if remaining is None or remaining.strip() not in ("0", "0.0"):
+                    continue
+                bucket = getattr(self, bucket_attr)
+                if bucket:
+                    bucket.drain()
+                reset = headers.get(reset_name)
+                seconds = parse_reset_seconds(reset) if reset else None
+                if seconds:
+                    self.pause(seconds)
+
+    def on_success(self) -> None:
+        """Record a successful call."""
+        self.concurrency.on_success()
+
+    def on_rate_limited(self, retry_after: float | None) -> None:
+        """Record a rate-limit response and back off.
+
+        Args:
+            retry_after: Seconds the provider asked us to wait, if given
+        """
+        self.concurrency.on_rate_limited()
+        if self.request_bucket:
+            self.request_bucket.drain()
+        self.pause(retry_after if retry_after is not None else 1.0)
+
+
+class ProviderRateLimiter:
+    """Per-model rate limiters for one provider."""
+
+    def __init__(
+        self,
+        default: RateLimitConfig | None = None,
+        per_model: dict[str, RateLimitConfig] | None = None,
+    ):
+        """Initialize provider limiter.
+
+        Args:
+            default: Limits applied to each model without an override
+            per_model: Model-specific limit overrides
+        """
+        self.default = default or RateLimitConfig()
+        self.per_model = per_model or {}
+        self._limiters: dict[str, ModelRateLimiter] = {}
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        """Get (or create) the limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = ModelRateLimiter(self.per_model.get(model, self.default))
+            self._limiters[model] = limiter
+        return limiter
@@ -2,8 +2,19 @@
 Regression detection engine for comparing test runs.
 """
 
-from .comparator import ComparisonResult, RunComparator
+from .batch import BatchRegressionEntry, BatchRegressionReport, analyze_run_groups
+from .comparator import ComparisonResult, OutputComparison, RunComparator
+from .diff import TextDiff, diff_texts, shingle_similarity
 from .engine import MetricDelta, RegressionEngine, RegressionResult, RegressionSeverity
+from .history import HistoryMetricResult, HistoryRegressionEngine, HistoryRegressionResult
+from .similarity import (
+    EmbeddingBackend,
+    HashedNgramBackend,
+    OutputDrift,
+    SimilarityBackend,
+    get_similarity_backend,
+    rank_output_drift,
+)
 
 __all__ = [
     "RegressionEngine",
@@ -12,4 +23,20 @@ __all__ = [
     "RegressionSeverity",
     "RunComparator",
     "ComparisonResult",
+    "OutputComparison",
+    "TextDiff",
+    "diff_texts",
+    "shingle_similarity",
+    "HistoryRegressionEngine",
+    "HistoryRegressionResult",
+    "HistoryMetricResult",
+    "BatchRegressionReport",
+    "BatchRegressionEntry",
+    "analyze_run_groups",
+    "SimilarityBackend",
+    "HashedNgramBackend",
+    "EmbeddingBackend",
+    "get_similarity_backend",
+    "OutputDrift",
+    "rank_output_drift",
 ]
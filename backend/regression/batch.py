@@ -0,0 +1,153 @@
+"""
+Suite-wide regression reports over two groups of runs.
+
+A run group is any set of runs, such as those of two suite executions or of
+two commits. Runs are paired by test: for each test in both groups, the
+latest baseline run is compared with the latest current run using
+RegressionEngine.analyze.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from .engine import RegressionEngine, RegressionResult, RegressionSeverity
+
+# Report order: most severe first
+SEVERITY_RANK = {
+    RegressionSeverity.CRITICAL: 0,
+    RegressionSeverity.WARNING: 1,
+    RegressionSeverity.IMPROVEMENT: 2,
+    RegressionSeverity.INFO: 3,
+}
+
+
+@dataclass
+class BatchRegressionEntry:
+    """Regression analysis of one test between the two groups."""
+
+    test_id: int
+    test_name: str | None
+    baseline_run_id: int
+    current_run_id: int
+    result: RegressionResult
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "test_id": self.test_id,
+            "test_name": self.test_name,
+            "baseline_run_id": self.baseline_run_id,
+            "current_run_id": self.current_run_id,
+            "regression_analysis": self.result.to_dict(),
+        }
+
+
+@dataclass
+class BatchRegressionReport:
+    """Regression analyses of every test in two run groups, most severe first."""
+
+    entries: list[BatchRegressionEntry] = field(default_factory=list)
+    missing_baseline: list[int] = field(default_factory=list)  # Tests only in the current group
+    missing_current: list[int] = field(default_factory=list)  # Tests only in the baseline group
+
+    @property
+    def severity_counts(self) -> dict[str, int]:
+        """Number of tests per severity."""
+        counts = {severity.value: 0 for severity in SEVERITY_RANK}
+        for entry in self.entries:
+            counts[entry.result.severity.value] += 1
+        return counts
+
+    @property
+    def severity(self) -> RegressionSeverity:
+        """Most severe result (INFO when nothing was compared)."""
+        return self.entries[0].result.severity if self.entries else RegressionSeverity.INFO
+
+    @property
+    def has_regressions(self) -> bool:
+        """Whether any test regressed."""
+        return any(entry.result.has_regressions for entry in self.entries)
+
+    @property
+    def summary(self) -> str:
+        """One-line summary of the report."""
+        counts = self.severity_counts
+        regressed = counts["critical"] + counts["warning"]
+        parts = [f"{len(self.entries)} test(s) compared: {regressed} regressed"]
+        parts.append(f"({counts['critical']} critical, {counts['warning']} warning)")
+        parts.append(f"{counts['improvement']} improved.")
+        if self.missing_baseline or self.missing_current:
+            parts.append(
+                f"{len(self.missing_baseline)} test(s) without a baseline run, "
+                f"{len(self.missing_current)} without a current run."
+            )
+        return " ".join(parts)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "has_regressions": self.has_regressions,
+            "severity": self.severity.value,
+            "severity_counts": self.severity_counts,
+            "entries": [entry.to_dict() for entry in self.entries],
+            "missing_baseline": self.missing_baseline,
+            "missing_current": self.missing_current,
+            "summary": self.summary,
+        }
+
+
+def _latest_by_test(runs: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+    """Latest run of each test (by started_at, then id)."""
+    latest: dict[int, dict[str, Any]] = {}
+    for run in sorted(runs, key=lambda r: (r.get("started_at") or "", r["id"])):
+        latest[run["test_definition_id"]] = run
+    return latest
+
+
+def analyze_run_groups(
+    engine: RegressionEngine,
+    baseline_runs: list[dict[str, Any]],
+    current_runs: list[dict[str, Any]],
+    results_by_run: dict[int, list[dict[str, Any]]],
+) -> BatchRegressionReport:
+    """
+    Compare two groups of runs test by test.
+
+    Args:
+        engine: Engine with the regression thresholds to apply
+        baseline_runs: Baseline run dicts (need id, test_definition_id and
+            metrics; test_name and started_at are used when present)
+        current_runs: Current run dicts
+        results_by_run: Assertion result dicts by run ID (runs without
+            results compare without assertion changes)
+
+    Returns:
+        BatchRegressionReport sorted by severity, then test ID
+    """
+    baseline_by_test = _latest_by_test(baseline_runs)
+    current_by_test = _latest_by_test(current_runs)
+
+    report = BatchRegressionReport(
+        missing_baseline=sorted(current_by_test.keys() - baseline_by_test.keys()),
+        missing_current=sorted(baseline_by_test.keys() - current_by_test.keys()),
+    )
+    for test_id in baseline_by_test.keys() & current_by_test.keys():
+        baseline, current = baseline_by_test[test_id], current_by_test[test_id]
+        result = engine.analyze(
+            baseline_run=baseline,
+            current_run=current,
+            baseline_results=results_by_run.get(baseline["id"], []),
+            current_results=results_by_run.get(current["id"], []),
+        )
+        report.entries.append(
+            BatchRegressionEntry(
+                test_id=test_id,
+                test_name=current.get("test_name") or baseline.get("test_name"),
+                baseline_run_id=baseline["id"],
+                current_run_id=current["id"],
+                result=result,
+            )
+        )
+
+    report.entries.sort(key=lambda e: (SEVERITY_RANK[e.result.severity], e.test_id))
+    return report
@@ -5,7 +5,15 @@ Run comparator for side-by-side comparison of test runs.
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
+from .diff import TextDiff, diff_texts, shingle_similarity
 from .engine import RegressionEngine, RegressionResult
+from .similarity import SimilarityBackend, cosine_similarity
+
+# Characters of each output returned with a comparison, from just before the first change
+OUTPUT_EXCERPT_CHARS = 500
+OUTPUT_EXCERPT_CONTEXT_CHARS = 100
 
 
 @dataclass
@@ -24,6 +32,8 @@ class RunMetrics:
     started_at: str | None
     completed_at: str | None
     error_message: str | None = None
+    ttft_ms: int | None = None
+    tokens_per_second: float | None = None
 
     @classmethod
     def from_run_dict(cls, run: dict[str, Any]) -> "RunMetrics":
@@ -41,6 +51,8 @@ class RunMetrics:
             started_at=run.get("started_at"),
             completed_at=run.get("completed_at"),
             error_message=run.get("error_message"),
+            ttft_ms=run.get("ttft_ms"),
+            tokens_per_second=run.get("tokens_per_second"),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -52,6 +64,8 @@ class RunMetrics:
             "provider": self.provider,
             "model": self.model,
             "latency_ms": self.latency_ms,
+            "ttft_ms": self.ttft_ms,
+            "tokens_per_second": self.tokens_per_second,
             "tokens_input": self.tokens_input,
             "tokens_output": self.tokens_output,
             "cost_usd": self.cost_usd,
@@ -86,24 +100,42 @@ class AssertionComparison:
 
 @dataclass
 class OutputComparison:
-    """Comparison of output text between runs."""
+    """Comparison of output text between runs.
+
+    Carries excerpts around the first change and a compact diff rather
+    than the full outputs.
+    """
 
-    baseline_output: str | None
-    current_output: str | None
+    baseline_excerpt: str | None
+    current_excerpt: str | None
+    excerpt_start: int  # Character offset of both excerpts
     outputs_differ: bool
     baseline_length: int
     current_length: int
     length_delta: int
+    similarity: float | None = None  # Diff ratio: 1.0 identical, 0.0 nothing in common
+    token_jaccard: float | None = None  # Jaccard similarity of word shingles
+    token_jaccard_method: str | None = None  # exact, minhash
+    diff: TextDiff | None = None
+    semantic_similarity: float | None = None  # Cosine similarity of the output vectors
+    similarity_backend: str | None = None  # SimilarityBackend.name of semantic_similarity
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {
-            "baseline_output": self.baseline_output,
-            "current_output": self.current_output,
+            "baseline_excerpt": self.baseline_excerpt,
+            "current_excerpt": self.current_excerpt,
+            "excerpt_start": self.excerpt_start,
             "outputs_differ": self.outputs_differ,
             "baseline_length": self.baseline_length,
             "current_length": self.current_length,
             "length_delta": self.length_delta,
+            "similarity": self.similarity,
+            "token_jaccard": self.token_jaccard,
+            "token_jaccard_method": self.token_jaccard_method,
+            "diff": self.diff.to_dict() if self.diff else None,
+            "semantic_similarity": self.semantic_similarity,
+            "similarity_backend": self.similarity_backend,
         }
 
 
@@ -139,14 +171,21 @@ class RunComparator:
     Comparator for detailed side-by-side comparison of test runs.
     """
 
-    def __init__(self, regression_engine: RegressionEngine | None = None):
+    def __init__(
+        self,
+        regression_engine: RegressionEngine | None = None,
+        similarity_backend: SimilarityBackend | None = None,
+    ):
         """
         Initialize comparator.
 
         Args:
             regression_engine: Optional custom regression engine
+            similarity_backend: Optional backend scoring the semantic
+                similarity of outputs (when no cached vectors are given)
         """
         self.engine = regression_engine or RegressionEngine()
+        self.similarity_backend = similarity_backend
 
     def compare_assertions(
         self,
@@ -215,31 +254,101 @@ class RunComparator:
         self,
         baseline_output: str | None,
         current_output: str | None,
+        baseline_hash: str | None = None,
+        current_hash: str | None = None,
+        baseline_vector: np.ndarray | None = None,
+        current_vector: np.ndarray | None = None,
     ) -> OutputComparison:
         """
         Compare output text between runs.
 
+        When both content hashes are known, equal hashes mean identical
+        outputs and the text itself is not compared. Otherwise the outputs
+        are diffed (see diff_texts) and their word shingles compared.
+
+        Semantic similarity is the cosine of the output vectors: the given
+        (cached) ones, or ones computed with the comparator's similarity
+        backend. It is None when neither is available.
+
         Args:
             baseline_output: Output from baseline run
             current_output: Output from current run
+            baseline_hash: Optional content hash of the baseline output
+            current_hash: Optional content hash of the current output
+            baseline_vector: Optional similarity vector of the baseline output
+            current_vector: Optional similarity vector of the current output
 
         Returns:
             Output comparison result
         """
-        baseline_len = len(baseline_output) if baseline_output else 0
-        current_len = len(current_output) if current_output else 0
+        baseline_text = baseline_output or ""
+        current_text = current_output or ""
+        baseline_len = len(baseline_text)
+        current_len = len(current_text)
+
+        if baseline_hash is not None and current_hash is not None:
+            outputs_differ = baseline_hash != current_hash
+        else:
+            outputs_differ = baseline_output != current_output
+
+        semantic_similarity = None
+        if baseline_vector is not None and current_vector is not None:
+            semantic_similarity = cosine_similarity(baseline_vector, current_vector)
+        elif self.similarity_backend is not None and outputs_differ:
+            vectors = self.similarity_backend.embed([baseline_text, current_text])
+            semantic_similarity = cosine_similarity(vectors[0], vectors[1])
+        elif self.similarity_backend is not None:
+            semantic_similarity = 1.0
+        backend_name = self.similarity_backend.name if self.similarity_backend else None
+
+        if not outputs_differ:
+            return OutputComparison(
+                baseline_excerpt=self._excerpt(baseline_output, 0),
+                current_excerpt=self._excerpt(current_output, 0),
+                excerpt_start=0,
+                outputs_differ=False,
+                baseline_length=baseline_len,
+                current_length=baseline_len,
+                length_delta=0,
+                similarity=1.0,
+                token_jaccard=1.0,
+                token_jaccard_method="exact",
+                semantic_similarity=semantic_similarity,
+                similarity_backend=backend_name if semantic_similarity is not None else None,
+            )
+
+        first_change = 0
+        limit = min(baseline_len, current_len)
+        while first_change < limit and baseline_text[first_change] == current_text[first_change]:
+            first_change += 1
+        start = max(0, first_change - OUTPUT_EXCERPT_CONTEXT_CHARS)
 
-        outputs_differ = baseline_output != current_output
+        diff = diff_texts(baseline_text, current_text)
+        token_jaccard, method = shingle_similarity(baseline_text, current_text)
 
         return OutputComparison(
-            baseline_output=baseline_output,
-            current_output=current_output,
-            outputs_differ=outputs_differ,
+            baseline_excerpt=self._excerpt(baseline_output, start),
+            current_excerpt=self._excerpt(current_output, start),
+            excerpt_start=start,
+            outputs_differ=True,
             baseline_length=baseline_len,
             current_length=current_len,
             length_delta=current_len - baseline_len,
+            similarity=diff.similarity,
+            token_jaccard=token_jaccard,
+            token_jaccard_method=method,
+            diff=diff,
+            semantic_similarity=semantic_similarity,
+            similarity_backend=backend_name if semantic_similarity is not None else None,
         )
 
+    @staticmethod
+    def _excerpt(output: str | None, start: int) -> str | None:
+        """OUTPUT_EXCERPT_CHARS characters of an output from start."""
+        if output is None:
+            return None
+        return output[start : start + OUTPUT_EXCERPT_CHARS]
+
     def compare(
         self,
         baseline_run: dict[str, Any],
@@ -248,6 +357,10 @@ class RunComparator:
         current_results: list[dict[str, Any]] | None = None,
         baseline_output: str | None = None,
         current_output: str | None = None,
+        baseline_output_hash: str | None = None,
+        current_output_hash: str | None = None,
+        baseline_output_vector: np.ndarray | None = None,
+        current_output_vector: np.ndarray | None = None,
     ) -> ComparisonResult:
         """
         Perform full comparison between two runs.
@@ -259,6 +372,10 @@ class RunComparator:
             current_results: Optional assertion results for current
             baseline_output: Optional output text from baseline
             current_output: Optional output text from current
+            baseline_output_hash: Optional content hash of the baseline output
+            current_output_hash: Optional content hash of the current output
+            baseline_output_vector: Optional similarity vector of the baseline output
+            current_output_vector: Optional similarity vector of the current output
 
         Returns:
             Complete comparison result
@@ -283,7 +400,14 @@ class RunComparator:
         # Compare outputs
         output_comparison = None
         if baseline_output is not None or current_output is not None:
-            output_comparison = self.compare_outputs(baseline_output, current_output)
+            output_comparison = self.compare_outputs(
+                baseline_output,
+                current_output,
+                baseline_output_hash,
+                current_output_hash,
+                baseline_output_vector,
+                current_output_vector,
+            )
 
         # Check for model/provider changes
         model_changed = baseline_metrics.model != current_metrics.model
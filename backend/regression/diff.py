@@ -0,0 +1,253 @@
+"""
+Output diffing and similarity for run comparison.
+
+diff_texts computes a word- or line-level Myers diff of two outputs. The
+common prefix and suffix are trimmed first, and the diff gives up beyond
+DIFF_MAX_TOKENS tokens or DIFF_MAX_EDITS edits, so comparing long outputs
+costs about the same as comparing short ones. Its result is compact: equal
+runs are reported as token counts and changed text is clipped.
+
+shingle_similarity measures token-level overlap (Jaccard similarity of word
+shingles). Short outputs are compared exactly; long ones are compared
+through MinHash signatures.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# Most tokens per side (after trimming the common prefix and suffix) to diff
+DIFF_MAX_TOKENS = 5000
+
+# Most insertions plus deletions before the diff gives up
+DIFF_MAX_EDITS = 300
+
+# Most diff operations returned, and most characters of changed text per operation
+DIFF_MAX_OPS = 100
+DIFF_MAX_OP_CHARS = 200
+
+# Outputs with at most this many lines are diffed word by word
+WORD_DIFF_MAX_LINES = 20
+
+# Words per shingle for Jaccard similarity
+SHINGLE_SIZE = 3
+
+# Shingle sets larger than this are compared through MinHash signatures
+MINHASH_MIN_SHINGLES = 256
+MINHASH_PERMUTATIONS = 128
+_MINHASH_PRIME = np.uint64(2**31 - 1)  # Keeps a * hash + b below 2**64
+_MINHASH_RNG = np.random.default_rng(0x5E17)
+_MINHASH_A = _MINHASH_RNG.integers(1, int(_MINHASH_PRIME), MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _MINHASH_RNG.integers(0, int(_MINHASH_PRIME), MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+_WORD_TOKEN = re.compile(r"\s+|\w+|[^\w\s]")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class TextDiff:
+    """Compact diff of two texts."""
+
+    granularity: str  # word, line
+    ops: list[dict[str, Any]] = field(default_factory=list)
+    edit_distance: int | None = None  # Inserted plus deleted tokens (None if not computed)
+    similarity: float | None = None  # 2 * equal tokens / all tokens (None if not computed)
+    complete: bool = True  # False when the size or edit cap was hit or ops were dropped
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "granularity": self.granularity,
+            "ops": self.ops,
+            "edit_distance": self.edit_distance,
+            "similarity": self.similarity,
+            "complete": self.complete,
+        }
+
+
+def tokenize(text: str, granularity: str) -> list[str]:
+    """Split text into diff tokens (words, whitespace and punctuation, or lines)."""
+    if granularity == "line":
+        return text.splitlines(keepends=True)
+    return _WORD_TOKEN.findall(text)
+
+
+def _step_down(v: list[int], offset: int, k: int, d: int) -> bool:
+    """Whether diagonal k is reached from k + 1 (an insertion) rather than k - 1."""
+    return k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1])
+
+
+def _myers(a: list[str], b: list[str], max_edits: int) -> list[tuple[str, int, int]] | None:
+    """Shortest edit script from a to b (Myers' O(ND) algorithm).
+
+    Returns:
+        (op, a index, b index) per token with op in equal/delete/insert, in
+        order, or None when more than max_edits edits are needed
+    """
+    n, m = len(a), len(b)
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        trace.append(v[:])
+        for k in range(-d, d + 1, 2):
+            x = v[offset + k + 1] if _step_down(v, offset, k, d) else v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m, offset)
+    return None
+
+
+def _backtrack(trace: list[list[int]], n: int, m: int, offset: int) -> list[tuple[str, int, int]]:
+    """Recover the edit script from the saved frontier of each edit distance."""
+    script = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        prev_k = k + 1 if _step_down(v, offset, k, d) else k - 1
+        prev_x = v[offset + prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            script.append(("equal", x, y))
+        if d > 0:
+            if x == prev_x:
+                script.append(("insert", x, prev_y))
+            else:
+                script.append(("delete", prev_x, y))
+        x, y = prev_x, prev_y
+    script.reverse()
+    return script
+
+
+def _clip(text: str) -> dict[str, Any]:
+    """Changed text of an operation, clipped to DIFF_MAX_OP_CHARS."""
+    if len(text) <= DIFF_MAX_OP_CHARS:
+        return {"text": text}
+    return {"text": text[:DIFF_MAX_OP_CHARS], "length": len(text)}
+
+
+def _compact_ops(
+    a: list[str], b: list[str], script: list[tuple[str, int, int]], prefix: int, suffix: int
+) -> list[dict[str, Any]]:
+    """Merge an edit script into runs: equal runs as counts, changes as text."""
+    runs: list[list[Any]] = []  # [op, tokens]
+    if prefix:
+        runs.append(["equal", prefix])
+    for op, i, j in script:
+        token = a[i] if op in ("equal", "delete") else b[j]
+        if runs and runs[-1][0] == op:
+            if op == "equal":
+                runs[-1][1] += 1
+            else:
+                runs[-1][1].append(token)
+        else:
+            runs.append([op, 1 if op == "equal" else [token]])
+    if suffix:
+        if runs and runs[-1][0] == "equal":
+            runs[-1][1] += suffix
+        else:
+            runs.append(["equal", suffix])
+
+    return [
+        {"op": op, "count": value} if op == "equal" else {"op": op, **_clip("".join(value))}
+        for op, value in runs
+    ]
+
+
+def diff_texts(baseline: str, current: str, granularity: str | None = None) -> TextDiff:
+    """
+    Diff two texts.
+
+    Args:
+        baseline: Baseline text
+        current: Current text
+        granularity: "word" or "line" (default: word for texts of up to
+            WORD_DIFF_MAX_LINES lines, line otherwise)
+
+    Returns:
+        TextDiff with ops, edit distance and similarity ratio (ops are empty
+        and complete is False when the diff exceeded its caps)
+    """
+    if granularity is None:
+        lines = max(baseline.count("\n"), current.count("\n")) + 1
+        granularity = "word" if lines <= WORD_DIFF_MAX_LINES else "line"
+    a, b = tokenize(baseline, granularity), tokenize(current, granularity)
+
+    # Trim the common prefix and suffix: typical reruns differ in a small part
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    middle_a, middle_b = a[prefix : len(a) - suffix], b[prefix : len(b) - suffix]
+
+    result = TextDiff(granularity=granularity)
+    if max(len(middle_a), len(middle_b)) > DIFF_MAX_TOKENS:
+        result.complete = False
+        return result
+    script = _myers(middle_a, middle_b, DIFF_MAX_EDITS)
+    if script is None:
+        result.complete = False
+        return result
+
+    equal = prefix + suffix + sum(1 for op, _, _ in script if op == "equal")
+    total = len(a) + len(b)
+    result.edit_distance = total - 2 * equal
+    result.similarity = 2 * equal / total if total else 1.0
+    ops = _compact_ops(middle_a, middle_b, script, prefix, suffix)
+    if len(ops) > DIFF_MAX_OPS:
+        ops = ops[:DIFF_MAX_OPS]
+        result.complete = False
+    result.ops = ops
+    return result
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Lowercased word n-grams of a text (the words themselves if fewer)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(items: set[str]) -> np.ndarray:
+    """MinHash signature (MINHASH_PERMUTATIONS minimums) of a non-empty set."""
+    hashes = np.fromiter(
+        (zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items)
+    )
+    hashes %= _MINHASH_PRIME
+    return ((np.outer(hashes, _MINHASH_A) + _MINHASH_B) % _MINHASH_PRIME).min(axis=0)
+
+
+def shingle_similarity(baseline: str, current: str) -> tuple[float, str]:
+    """
+    Jaccard similarity of the word shingles of two texts.
+
+    Args:
+        baseline: Baseline text
+        current: Current text
+
+    Returns:
+        Tuple of (similarity between 0 and 1, method: "exact" or "minhash")
+    """
+    a, b = shingles(baseline), shingles(current)
+    if not a or not b:
+        return (1.0 if a == b else 0.0), "exact"
+    if max(len(a), len(b)) <= MINHASH_MIN_SHINGLES:
+        return len(a & b) / len(a | b), "exact"
+    matches = np.count_nonzero(minhash_signature(a) == minhash_signature(b))
+    return matches / MINHASH_PERMUTATIONS, "minhash"
@@ -285,6 +285,34 @@ class RegressionEngine:
         )
         metric_deltas.append(latency_delta)
 
+        # Break latency down into time to first token and decoding speed, so a
+        # regression can be attributed to slower first responses or slower
+        # generation (only for runs that were streamed)
+        if baseline_run.get("ttft_ms") is not None or current_run.get("ttft_ms") is not None:
+            ttft_delta = self.calculate_delta(
+                metric_name="Time to First Token",
+                baseline=baseline_run.get("ttft_ms"),
+                current=current_run.get("ttft_ms"),
+                unit="ms",
+                threshold_percent=self.latency_threshold,
+                higher_is_worse=True,
+            )
+            metric_deltas.append(ttft_delta)
+
+        if (
+            baseline_run.get("tokens_per_second") is not None
+            or current_run.get("tokens_per_second") is not None
+        ):
+            throughput_delta = self.calculate_delta(
+                metric_name="Output Throughput",
+                baseline=baseline_run.get("tokens_per_second"),
+                current=current_run.get("tokens_per_second"),
+                unit=" tokens/s",
+                threshold_percent=self.latency_threshold,
+                higher_is_worse=False,
+            )
+            metric_deltas.append(throughput_delta)
+
         # Compare input tokens
         input_tokens_delta = self.calculate_delta(
             metric_name="Input Tokens",
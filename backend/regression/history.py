@@ -0,0 +1,446 @@
+"""
+History-aware regression detection.
+
+Comparing one run against another flags ordinary LLM latency noise as a
+regression. HistoryRegressionEngine instead compares the latest runs of a
+test (the current window) against the runs before them (the baseline
+window). It uses robust statistics and flags a metric only when the shift
+is statistically significant and large enough to matter:
+
+- Mann-Whitney U test on the two windows (no normality assumption)
+- Bootstrap confidence interval for the shift of the median
+- Two-proportion z-test for the failure rate
+
+All computations are vectorized with NumPy.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .engine import RegressionSeverity
+
+# Fewest runs per window for a metric to be tested
+MIN_SAMPLES = 5
+
+SEVERITY_ORDER = [
+    RegressionSeverity.INFO,
+    RegressionSeverity.IMPROVEMENT,
+    RegressionSeverity.WARNING,
+    RegressionSeverity.CRITICAL,
+]
+
+# (metric name, run key, unit, higher is worse)
+HISTORY_METRICS = [
+    ("Latency", "latency_ms", "ms", True),
+    ("Time to First Token", "ttft_ms", "ms", True),
+    ("Output Throughput", "tokens_per_second", " tokens/s", False),
+    ("Input Tokens", "tokens_input", " tokens", True),
+    ("Output Tokens", "tokens_output", " tokens", True),
+    ("Cost", "cost_usd", " USD", True),
+]
+
+
+def _rank_with_ties(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rank values (1-based, ties get their average rank).
+
+    Returns:
+        Tuple of (ranks in input order, size of each group of tied values)
+    """
+    order = np.argsort(values, kind="mergesort")
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    bounds = np.r_[starts, len(values)]
+    group_ranks = (bounds[:-1] + bounds[1:] + 1) / 2  # Mean of 1-based ranks in each group
+    group_of_sorted = np.cumsum(np.r_[True, sorted_values[1:] != sorted_values[:-1]]) - 1
+    ranks = np.empty(len(values))
+    ranks[order] = group_ranks[group_of_sorted]
+    return ranks, np.diff(bounds)
+
+
+def mann_whitney_u(baseline: np.ndarray, current: np.ndarray) -> tuple[float, float]:
+    """Two-sided Mann-Whitney U test.
+
+    Uses the normal approximation with tie and continuity corrections.
+
+    Args:
+        baseline: Baseline sample
+        current: Current sample
+
+    Returns:
+        Tuple of (U statistic of the current sample, p-value)
+    """
+    n1, n2 = len(current), len(baseline)
+    n = n1 + n2
+    ranks, ties = _rank_with_ties(np.concatenate([current, baseline]))
+    u = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2)
+
+    mean_u = n1 * n2 / 2
+    tie_term = float((ties**3 - ties).sum()) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u, 1.0
+
+    diff = u - mean_u
+    z = (abs(diff) - 0.5) / math.sqrt(variance) if diff else 0.0
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_median_shift(
+    baseline: np.ndarray,
+    current: np.ndarray,
+    resamples: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> tuple[float, float]:
+    """Bootstrap confidence interval for median(current) - median(baseline).
+
+    Args:
+        baseline: Baseline sample
+        current: Current sample
+        resamples: Number of bootstrap resamples
+        confidence: Confidence level (e.g. 0.95)
+        rng: Random generator
+
+    Returns:
+        Tuple of (lower bound, upper bound)
+    """
+    baseline_medians = np.median(
+        baseline[rng.integers(0, len(baseline), (resamples, len(baseline)))], axis=1
+    )
+    current_medians = np.median(
+        current[rng.integers(0, len(current), (resamples, len(current)))], axis=1
+    )
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(current_medians - baseline_medians, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def two_proportion_test(
+    baseline_events: int, baseline_total: int, current_events: int, current_total: int
+) -> float:
+    """Two-sided z-test for a difference between two proportions.
+
+    Returns:
+        p-value (1.0 when the pooled proportion is 0 or 1)
+    """
+    pooled = (baseline_events + current_events) / (baseline_total + current_total)
+    variance = pooled * (1 - pooled) * (1 / baseline_total + 1 / current_total)
+    if variance <= 0:
+        return 1.0
+    z = (current_events / current_total - baseline_events / baseline_total) / math.sqrt(variance)
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def robust_summary(values: np.ndarray) -> dict[str, float | int]:
+    """Median, median absolute deviation and percentiles of a sample."""
+    median = float(np.median(values))
+    p90, p95 = np.percentile(values, [90, 95])
+    return {
+        "n": int(len(values)),
+        "median": median,
+        "mad": float(np.median(np.abs(values - median))),
+        "p90": float(p90),
+        "p95": float(p95),
+    }
+
+
+@dataclass
+class HistoryMetricResult:
+    """Significance-tested change of one metric between two windows of runs."""
+
+    metric_name: str
+    unit: str
+    baseline: dict[str, float | int] | None  # robust_summary of the baseline window
+    current: dict[str, float | int] | None  # robust_summary of the current window
+    median_delta: float | None
+    median_delta_percent: float | None
+    p_value: float | None
+    ci_low: float | None  # Bootstrap CI of the median shift
+    ci_high: float | None
+    significant: bool
+    severity: RegressionSeverity
+    description: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "metric_name": self.metric_name,
+            "unit": self.unit,
+            "baseline": self.baseline,
+            "current": self.current,
+            "median_delta": self.median_delta,
+            "median_delta_percent": self.median_delta_percent,
+            "p_value": self.p_value,
+            "ci_low": self.ci_low,
+            "ci_high": self.ci_high,
+            "significant": self.significant,
+            "severity": self.severity.value,
+            "description": self.description,
+        }
+
+
+@dataclass
+class HistoryRegressionResult:
+    """Result of history-aware regression analysis for one test and model."""
+
+    provider: str
+    model: str
+    baseline_runs: int
+    current_runs: int
+    has_regressions: bool
+    severity: RegressionSeverity
+    metrics: list[HistoryMetricResult]
+    failure_rate: dict[str, Any]
+    summary: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "baseline_runs": self.baseline_runs,
+            "current_runs": self.current_runs,
+            "has_regressions": self.has_regressions,
+            "severity": self.severity.value,
+            "metrics": [m.to_dict() for m in self.metrics],
+            "failure_rate": self.failure_rate,
+            "summary": self.summary,
+        }
+
+
+class HistoryRegressionEngine:
+    """
+    Detects regressions by comparing windows of run history.
+
+    A metric is a regression when the Mann-Whitney test is significant, the
+    bootstrap interval of the median shift excludes zero and the median
+    moved by more than min_effect_percent in the worse direction. Shifts
+    above 50% are critical.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        min_effect_percent: float = 10.0,
+        bootstrap_resamples: int = 2000,
+        seed: int | None = 0,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            alpha: Significance level (the bootstrap interval uses 1 - alpha)
+            min_effect_percent: Smallest median shift reported as a change
+            bootstrap_resamples: Number of bootstrap resamples
+            seed: Random seed for the bootstrap (None for nondeterministic)
+        """
+        self.alpha = alpha
+        self.min_effect_percent = min_effect_percent
+        self.bootstrap_resamples = bootstrap_resamples
+        self.seed = seed
+
+    def compare_metric(
+        self,
+        metric_name: str,
+        baseline_values: list[float | int | None],
+        current_values: list[float | int | None],
+        unit: str,
+        higher_is_worse: bool = True,
+    ) -> HistoryMetricResult:
+        """
+        Test whether a metric changed between two windows of runs.
+
+        Args:
+            metric_name: Name of the metric
+            baseline_values: Values of the baseline runs (None values are ignored)
+            current_values: Values of the current runs (None values are ignored)
+            unit: Unit string (e.g., "ms")
+            higher_is_worse: If True, an increase is a regression
+
+        Returns:
+            HistoryMetricResult with significance and severity
+        """
+        baseline = np.array([v for v in baseline_values if v is not None], dtype=float)
+        current = np.array([v for v in current_values if v is not None], dtype=float)
+
+        if len(baseline) < MIN_SAMPLES or len(current) < MIN_SAMPLES:
+            return HistoryMetricResult(
+                metric_name=metric_name,
+                unit=unit,
+                baseline=robust_summary(baseline) if len(baseline) else None,
+                current=robust_summary(current) if len(current) else None,
+                median_delta=None,
+                median_delta_percent=None,
+                p_value=None,
+                ci_low=None,
+                ci_high=None,
+                significant=False,
+                severity=RegressionSeverity.INFO,
+                description=(
+                    f"{metric_name}: Not enough data ({len(baseline)} baseline, "
+                    f"{len(current)} current runs; need {MIN_SAMPLES} each)"
+                ),
+            )
+
+        baseline_summary = robust_summary(baseline)
+        current_summary = robust_summary(current)
+        delta = current_summary["median"] - baseline_summary["median"]
+        if baseline_summary["median"]:
+            delta_percent = delta / abs(baseline_summary["median"]) * 100
+        else:
+            delta_percent = 100.0 if delta else 0.0
+
+        _, p_value = mann_whitney_u(baseline, current)
+        ci_low, ci_high = bootstrap_median_shift(
+            baseline,
+            current,
+            self.bootstrap_resamples,
+            1 - self.alpha,
+            np.random.default_rng(self.seed),
+        )
+        significant = p_value < self.alpha and (ci_low > 0 or ci_high < 0)
+        is_worse = (delta > 0) == higher_is_worse and delta != 0
+
+        severity = RegressionSeverity.INFO
+        if significant and abs(delta_percent) > self.min_effect_percent:
+            if not is_worse:
+                severity = RegressionSeverity.IMPROVEMENT
+            elif abs(delta_percent) > 50:
+                severity = RegressionSeverity.CRITICAL
+            else:
+                severity = RegressionSeverity.WARNING
+
+        direction = "increased" if delta > 0 else "decreased"
+        sign = "+" if delta > 0 else ""
+        verdict = "significant" if significant else "not significant"
+        description = (
+            f"{metric_name}: median {direction} by {sign}{delta_percent:.1f}% "
+            f"({baseline_summary['median']:g}{unit} → {current_summary['median']:g}{unit}, "
+            f"p={p_value:.3g}, {verdict})"
+        )
+
+        return HistoryMetricResult(
+            metric_name=metric_name,
+            unit=unit,
+            baseline=baseline_summary,
+            current=current_summary,
+            median_delta=delta,
+            median_delta_percent=delta_percent,
+            p_value=p_value,
+            ci_low=ci_low,
+            ci_high=ci_high,
+            significant=significant,
+            severity=severity,
+            description=description,
+        )
+
+    def compare_failure_rate(
+        self, baseline_failed: list[bool], current_failed: list[bool]
+    ) -> dict[str, Any]:
+        """
+        Test whether the share of failed runs changed.
+
+        Args:
+            baseline_failed: Whether each baseline run failed
+            current_failed: Whether each current run failed
+
+        Returns:
+            Dictionary with rates, p-value and severity
+        """
+        baseline_rate = sum(baseline_failed) / len(baseline_failed) if baseline_failed else 0.0
+        current_rate = sum(current_failed) / len(current_failed) if current_failed else 0.0
+        p_value = None
+        severity = RegressionSeverity.INFO
+
+        if len(baseline_failed) >= MIN_SAMPLES and len(current_failed) >= MIN_SAMPLES:
+            p_value = two_proportion_test(
+                sum(baseline_failed), len(baseline_failed), sum(current_failed), len(current_failed)
+            )
+            if p_value < self.alpha:
+                severity = (
+                    RegressionSeverity.CRITICAL
+                    if current_rate > baseline_rate
+                    else RegressionSeverity.IMPROVEMENT
+                )
+
+        return {
+            "baseline_rate": baseline_rate,
+            "current_rate": current_rate,
+            "p_value": p_value,
+            "significant": p_value is not None and p_value < self.alpha,
+            "severity": severity.value,
+        }
+
+    def analyze(self, runs: list[dict[str, Any]], current_window: int) -> HistoryRegressionResult:
+        """
+        Compare the latest runs of a test and model against the runs before them.
+
+        Args:
+            runs: Run dictionaries (TestRun.to_dict() plus an optional
+                "all_passed" flag), newest first
+            current_window: Number of latest runs forming the current window
+
+        Returns:
+            HistoryRegressionResult with per-metric tests
+        """
+        current, baseline = runs[:current_window], runs[current_window:]
+
+        metrics = []
+        for metric_name, key, unit, higher_is_worse in HISTORY_METRICS:
+            baseline_values = [run.get(key) for run in baseline]
+            current_values = [run.get(key) for run in current]
+            if all(v is None for v in baseline_values + current_values):
+                continue
+            metrics.append(
+                self.compare_metric(
+                    metric_name, baseline_values, current_values, unit, higher_is_worse
+                )
+            )
+
+        def failed(run: dict[str, Any]) -> bool:
+            return run.get("status") == "failed" or run.get("all_passed") is False
+
+        failure_rate = self.compare_failure_rate(
+            [failed(run) for run in baseline], [failed(run) for run in current]
+        )
+
+        worst = RegressionSeverity(failure_rate["severity"])
+        for metric in metrics:
+            if SEVERITY_ORDER.index(metric.severity) > SEVERITY_ORDER.index(worst):
+                worst = metric.severity
+        has_regressions = worst in (RegressionSeverity.WARNING, RegressionSeverity.CRITICAL)
+
+        if worst == RegressionSeverity.CRITICAL:
+            summary_parts = ["Critical regression detected!"]
+        elif worst == RegressionSeverity.WARNING:
+            summary_parts = ["Performance regression detected."]
+        elif worst == RegressionSeverity.IMPROVEMENT:
+            summary_parts = ["Performance improved!"]
+        else:
+            summary_parts = ["No significant changes detected."]
+        if failure_rate["significant"]:
+            summary_parts.append(
+                f"Failure rate {failure_rate['baseline_rate']:.0%} → "
+                f"{failure_rate['current_rate']:.0%}."
+            )
+        summary_parts.extend(
+            m.description
+            for m in metrics
+            if m.severity in (RegressionSeverity.WARNING, RegressionSeverity.CRITICAL)
+        )
+
+        latest = runs[0] if runs else {}
+        return HistoryRegressionResult(
+            provider=latest.get("provider", ""),
+            model=latest.get("model", ""),
+            baseline_runs=len(baseline),
+            current_runs=len(current),
+            has_regressions=has_regressions,
+            severity=worst,
+            metrics=metrics,
+            failure_rate=failure_rate,
+            summary=" ".join(summary_parts),
+        )
@@ -0,0 +1,213 @@
+"""
+Semantic similarity of model outputs.
+
+A similarity backend turns output texts into unit-length vectors, so the
+similarity of two outputs is the dot product (cosine) of their vectors.
+Backends work offline:
+
+- HashedNgramBackend (default): word unigrams and bigrams hashed into a
+  fixed number of dimensions with sublinear term frequencies. Cheap and
+  dependency-free beyond NumPy.
+- EmbeddingBackend: a local sentence-transformers model, for paraphrase-
+  aware similarity (pip install sentinel-backend[embeddings]).
+
+Vectors depend only on the output text and the backend, so they are cached
+per stored output (see storage.OutputVectorRepository) and never recomputed.
+"""
+
+import math
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+import numpy as np
+
+# Backend used when none is requested
+DEFAULT_SIMILARITY_BACKEND = os.getenv("SENTINEL_SIMILARITY_BACKEND", "hashed-ngram")
+
+# Dimensions of hashed n-gram vectors
+HASHED_NGRAM_DIMENSIONS = 1024
+
+# Local sentence-transformers model of the embedding backend
+DEFAULT_EMBEDDING_MODEL = os.getenv("SENTINEL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+_WORD = re.compile(r"\w+")
+
+
+class SimilarityBackend(ABC):
+    """Turns texts into unit-length vectors whose dot product is their similarity."""
+
+    name: str  # Identifies the vectors in the cache (include anything that changes them)
+    dimensions: int
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Vectorize texts.
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            float32 array of shape (len(texts), dimensions) with unit-length
+            rows (zero rows for texts without words)
+        """
+
+
+class HashedNgramBackend(SimilarityBackend):
+    """Hashed word unigram and bigram vectors (sublinear TF, signed hashing)."""
+
+    def __init__(self, dimensions: int = HASHED_NGRAM_DIMENSIONS):
+        """Initialize backend.
+
+        Args:
+            dimensions: Vector dimensions (hash buckets)
+        """
+        self.dimensions = dimensions
+        self.name = f"hashed-ngram-{dimensions}"
+
+    def _vectorize(self, text: str, row: np.ndarray) -> None:
+        """Fill one (zeroed) row with the hashed n-gram counts of a text."""
+        words = _WORD.findall(text.lower())
+        counts = Counter(words)
+        counts.update(f"{a} {b}" for a, b in zip(words, words[1:], strict=False))
+        for term, count in counts.items():
+            digest = zlib.crc32(term.encode("utf-8"))
+            # The top bit picks the sign, so colliding terms tend to cancel out
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            row[digest % self.dimensions] += sign * (1.0 + math.log(count))
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Vectorize texts (see SimilarityBackend.embed)."""
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for text, row in zip(texts, vectors, strict=True):
+            self._vectorize(text, row)
+        return normalize(vectors)
+
+
+class EmbeddingBackend(SimilarityBackend):
+    """Local sentence-transformers embedding model."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL):
+        """Load the model (from the local cache when available).
+
+        Args:
+            model_name: sentence-transformers model name or path
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The embedding similarity backend requires sentence-transformers "
+                "(pip install sentinel-backend[embeddings])"
+            ) from e
+        self.model = SentenceTransformer(model_name)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"embedding-{model_name}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Vectorize texts (see SimilarityBackend.embed)."""
+        vectors = self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dimensions)
+
+
+SIMILARITY_BACKENDS: dict[str, type[SimilarityBackend]] = {
+    "hashed-ngram": HashedNgramBackend,
+    "embedding": EmbeddingBackend,
+}
+
+
+@cache
+def _load_backend(name: str) -> SimilarityBackend:
+    """Create a backend once per process."""
+    return SIMILARITY_BACKENDS[name]()
+
+
+def get_similarity_backend(name: str | None = None) -> SimilarityBackend:
+    """
+    Get a shared backend instance by name.
+
+    Args:
+        name: Key of SIMILARITY_BACKENDS (default: DEFAULT_SIMILARITY_BACKEND)
+
+    Returns:
+        Backend instance (models are loaded once per process)
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the backend's optional dependency is missing
+    """
+    name = name or DEFAULT_SIMILARITY_BACKEND
+    if name not in SIMILARITY_BACKENDS:
+        raise ValueError(
+            f"Unknown similarity backend: {name} (available: {', '.join(SIMILARITY_BACKENDS)})"
+        )
+    return _load_backend(name)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two unit-length vectors (0.0 if either is zero)."""
+    return float(np.clip(np.dot(a, b), -1.0, 1.0))
+
+
+@dataclass
+class OutputDrift:
+    """Semantic distance of one run's output from the reference outputs."""
+
+    run_id: int
+    similarity: float  # Cosine similarity to the reference
+    drift: float  # 1 - similarity
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {"run_id": self.run_id, "similarity": self.similarity, "drift": self.drift}
+
+
+def rank_output_drift(
+    run_ids: list[int],
+    vectors: np.ndarray,
+    reference: np.ndarray,
+    top: int | None = None,
+) -> list[OutputDrift]:
+    """
+    Rank runs by how far their outputs drifted from a reference.
+
+    Args:
+        run_ids: Run IDs, one per row of vectors
+        vectors: Unit-length output vectors, shape (len(run_ids), dimensions)
+        reference: Reference vectors (e.g. of baseline runs), shape
+            (n, dimensions); their normalized mean (centroid) is compared
+        top: Return only the top most drifted runs
+
+    Returns:
+        Drift per run, most drifted first (ties by run ID)
+    """
+    if not run_ids:
+        return []
+    centroid = normalize(np.asarray(reference, dtype=np.float32).mean(axis=0))
+    similarities = np.clip(vectors @ centroid, -1.0, 1.0)
+    order = np.lexsort((np.asarray(run_ids), similarities))
+    if top is not None:
+        order = order[:top]
+    return [
+        OutputDrift(
+            run_id=run_ids[i],
+            similarity=float(similarities[i]),
+            drift=1.0 - float(similarities[i]),
+        )
+        for i in order
+    ]
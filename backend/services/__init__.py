@@ -2,6 +2,28 @@
 Services module for Sentinel backend.
 """
 
+from .recording_analysis import RecordingAnalysisState, detect_output_format
+from .revalidation import (
+    RevalidatedRun,
+    RevalidationSummary,
+    StoredOutput,
+    revalidate_outputs,
+    revalidate_stream,
+    shutdown_revalidation_pool,
+)
+from .test_file_sync import SyncStats, TestFileSync
 from .test_files import TestFileService
 
-__all__ = ["TestFileService"]
+__all__ = [
+    "RecordingAnalysisState",
+    "RevalidatedRun",
+    "RevalidationSummary",
+    "StoredOutput",
+    "SyncStats",
+    "TestFileService",
+    "TestFileSync",
+    "detect_output_format",
+    "revalidate_outputs",
+    "revalidate_stream",
+    "shutdown_revalidation_pool",
+]
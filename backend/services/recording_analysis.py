@@ -0,0 +1,169 @@
+"""
+Incremental analysis state for recording sessions.
+
+Smart detection and test generation only need a summary of a recording:
+the tools called, the last output and the latest model call settings. The
+summary is folded in as events arrive and stored on the session, so
+analyzing a recording doesn't decode every event again.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# Defaults used when a recording has no model_call event
+DEFAULT_MODEL = "gpt-5.1"
+DEFAULT_PROVIDER = "openai"
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_MAX_TOKENS = 1000
+
+# Quoted strings in the output considered for must_contain suggestions
+MAX_QUOTED_STRINGS = 3
+
+STRUCTURED_RESPONSE_PHRASES = ("here is", "here are", "the answer is")
+
+
+def detect_output_format(output: str) -> str | None:
+    """Detect the format of model output.
+
+    Args:
+        output: Model output text
+
+    Returns:
+        Detected format (json, markdown, code, text) or None
+    """
+    output_stripped = output.strip()
+
+    # Try to parse as JSON
+    try:
+        json.loads(output_stripped)
+        return "json"
+    except json.JSONDecodeError:
+        pass
+
+    # Check for markdown patterns
+    markdown_patterns = [
+        r"^#{1,6}\s",  # Headers
+        r"```[\s\S]*```",  # Code blocks
+        r"\*\*.*\*\*",  # Bold
+        r"^\s*[-*+]\s",  # Bullet lists
+        r"^\s*\d+\.\s",  # Numbered lists
+    ]
+    for pattern in markdown_patterns:
+        if re.search(pattern, output_stripped, re.MULTILINE):
+            return "markdown"
+
+    # Check for code patterns (without markdown code blocks)
+    code_patterns = [
+        r"^(def|class|function|import|from|const|let|var|if|for|while)\s",
+        r"^\s*[{}[\]();]",
+        r"^\s*(return|yield|async|await)\s",
+    ]
+    for pattern in code_patterns:
+        if re.search(pattern, output_stripped, re.MULTILINE):
+            return "code"
+
+    return "text"
+
+
+@dataclass
+class RecordingAnalysisState:
+    """Summary of a recording, updated one event at a time."""
+
+    event_count: int = 0
+
+    # Smart detection
+    tool_names: list[str] = field(default_factory=list)  # Unique, in first-call order
+    output_text: str | None = None  # Last output
+    output_format: str | None = None
+    quoted_strings: list[str] = field(default_factory=list)  # From the last output
+    structured_response: bool = False
+
+    # Latest model call settings (for the generated test)
+    query: str = ""
+    system_prompt: str = ""
+    model: str = DEFAULT_MODEL
+    provider: str = DEFAULT_PROVIDER
+    temperature: float = DEFAULT_TEMPERATURE
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    model_tools: list[dict[str, Any]] = field(default_factory=list)  # Tools passed to the model
+    canvas_tools: list[dict[str, Any]] = field(default_factory=list)  # Model tools + tools called
+
+    def apply(self, event_type: str, data: dict[str, Any]) -> None:
+        """Fold one event into the state.
+
+        Args:
+            event_type: Event type (model_call, tool_call, output, execution_complete)
+            data: Event data
+        """
+        self.event_count += 1
+
+        if event_type == "model_call":
+            self.query = data.get("query", self.query)
+            self.system_prompt = data.get("system_prompt", self.system_prompt)
+            self.model = data.get("model", self.model)
+            self.provider = data.get("provider", self.provider)
+            self.temperature = data.get("temperature", self.temperature)
+            self.max_tokens = data.get("max_tokens", self.max_tokens)
+            if data.get("tools"):
+                self.model_tools = list(data["tools"])
+                self.canvas_tools = list(data["tools"])
+        elif event_type == "tool_call":
+            self._add_tool_name(data.get("name"))
+            tool_name = data.get("name", "")
+            if tool_name and not any(t.get("name") == tool_name for t in self.canvas_tools):
+                self.canvas_tools.append(
+                    {"name": tool_name, "description": data.get("description", "")}
+                )
+        elif event_type == "output":
+            self._set_output(data.get("text", ""))
+        elif event_type == "execution_complete":
+            for tool_call in data.get("tool_calls", []):
+                self._add_tool_name(tool_call.get("name"))
+            if "output" in data:
+                self._set_output(data.get("output", ""))
+
+    def _add_tool_name(self, name: str | None) -> None:
+        if name and name not in self.tool_names:
+            self.tool_names.append(name)
+
+    def _set_output(self, output_text: str) -> None:
+        self.output_text = output_text
+        self.output_format = detect_output_format(output_text) if output_text else None
+        self.quoted_strings = (
+            re.findall(r'"([^"]+)"', output_text)[:MAX_QUOTED_STRINGS] if output_text else []
+        )
+        output_lower = output_text.lower() if output_text else ""
+        self.structured_response = any(p in output_lower for p in STRUCTURED_RESPONSE_PHRASES)
+
+    @classmethod
+    def from_events(cls, events: list[dict[str, Any]]) -> "RecordingAnalysisState":
+        """Build the state from a full list of events.
+
+        Args:
+            events: Event dictionaries with event_type and data
+
+        Returns:
+            Analysis state
+        """
+        state = cls()
+        for event in events:
+            state.apply(event.get("event_type", ""), event.get("data") or {})
+        return state
+
+    def to_json(self) -> str:
+        """Serialize the state for storage."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, value: str) -> "RecordingAnalysisState":
+        """Load a state stored with to_json.
+
+        Args:
+            value: JSON string
+
+        Returns:
+            Analysis state
+        """
+        return cls(**json.loads(value))
@@ -0,0 +1,231 @@
+"""
+Bulk re-validation of stored run outputs.
+
+Replays a set of assertions against the outputs and tool calls recorded for
+past runs, without calling a provider. This answers "how many past runs
+would this assertion have failed" for free.
+
+Large batches are split into chunks validated in a process pool, so
+regex-heavy assertion lists use every core. Each worker compiles the
+assertions once (see compile_assertions) and validates its whole chunk.
+Chunks are yielded in completion order.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..providers.base import ExecutionResult
+from ..validators import ValidationResult, compile_assertions
+
+# Outputs validated per worker task
+REVALIDATION_CHUNK_SIZE = 200
+
+# Batches up to this size are validated in-process (spawning workers costs more)
+INLINE_REVALIDATION_MAX = 500
+
+_pool: ProcessPoolExecutor | None = None
+
+
+@dataclass(frozen=True)
+class StoredOutput:
+    """What a past run produced, as needed to re-validate it."""
+
+    run_id: int
+    started_at: str | None
+    provider: str
+    model: str
+    output: str
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    latency_ms: int = 0
+    tokens_input: int | None = None
+    tokens_output: int | None = None
+    previously_passed: bool | None = None  # All stored assertion results passed
+
+    @classmethod
+    def from_run(cls, run: Any) -> "StoredOutput | None":
+        """Build from a TestRun with its results loaded.
+
+        Older runs stored the output and tool calls on each result, so the
+        first result's copy is used when the run has none.
+
+        Args:
+            run: TestRun
+
+        Returns:
+            StoredOutput, or None if the run has no stored output
+        """
+        results = list(run.results)
+        output = run.output_text
+        tool_calls_json = run.tool_calls_json
+        if output is None and results:
+            output = results[0].output_text
+            tool_calls_json = tool_calls_json or results[0].tool_calls_json
+        if output is None:
+            return None
+
+        return cls(
+            run_id=run.id,
+            started_at=run.started_at.isoformat() if run.started_at else None,
+            provider=run.provider,
+            model=run.model,
+            output=output,
+            tool_calls=json.loads(tool_calls_json) if tool_calls_json else [],
+            latency_ms=run.latency_ms or 0,
+            tokens_input=run.tokens_input,
+            tokens_output=run.tokens_output,
+            previously_passed=all(r.passed for r in results) if results else None,
+        )
+
+    def to_execution_result(self) -> ExecutionResult:
+        """Rebuild the ExecutionResult the assertions are validated against."""
+        return ExecutionResult(
+            success=True,
+            output=self.output,
+            model=self.model,
+            provider=self.provider,
+            latency_ms=self.latency_ms,
+            tokens_input=self.tokens_input,
+            tokens_output=self.tokens_output,
+            tool_calls=self.tool_calls,
+        )
+
+
+@dataclass
+class RevalidatedRun:
+    """Assertion results for one stored run."""
+
+    run_id: int
+    started_at: str | None
+    provider: str
+    model: str
+    passed: bool
+    previously_passed: bool | None
+    assertions: list[ValidationResult]
+
+
+@dataclass
+class RevalidationSummary:
+    """Totals over all re-validated runs."""
+
+    runs: int = 0
+    passed: int = 0
+    failed: int = 0
+    newly_failing: int = 0  # Passed when recorded, fail now
+    newly_passing: int = 0  # Failed when recorded, pass now
+    failures_by_assertion: list[int] = field(default_factory=list)  # Per assertion index
+
+    def add(self, run: RevalidatedRun) -> None:
+        """Count one re-validated run."""
+        self.runs += 1
+        if run.passed:
+            self.passed += 1
+            self.newly_passing += run.previously_passed is False
+        else:
+            self.failed += 1
+            self.newly_failing += run.previously_passed is True
+
+        if len(self.failures_by_assertion) < len(run.assertions):
+            self.failures_by_assertion.extend(
+                [0] * (len(run.assertions) - len(self.failures_by_assertion))
+            )
+        for index, result in enumerate(run.assertions):
+            self.failures_by_assertion[index] += not result.passed
+
+
+def revalidate_outputs(
+    assertions: list[dict[str, Any]], outputs: list[StoredOutput]
+) -> list[RevalidatedRun]:
+    """Validate stored outputs against assertions (runs in pool workers).
+
+    Args:
+        assertions: List of assertion specifications
+        outputs: Stored run outputs
+
+    Returns:
+        One RevalidatedRun per output, in input order
+    """
+    plan = compile_assertions(assertions)
+    revalidated = []
+    for stored in outputs:
+        results = plan.run(stored.to_execution_result())
+        revalidated.append(
+            RevalidatedRun(
+                run_id=stored.run_id,
+                started_at=stored.started_at,
+                provider=stored.provider,
+                model=stored.model,
+                passed=all(r.passed for r in results),
+                previously_passed=stored.previously_passed,
+                assertions=results,
+            )
+        )
+    return revalidated
+
+
+def get_revalidation_pool() -> ProcessPoolExecutor:
+    """Get the shared worker pool, starting it on first use.
+
+    Workers are spawned rather than forked: the server process runs an
+    event loop and threads that must not be duplicated.
+    """
+    global _pool
+    if _pool is None:
+        workers = int(os.getenv("SENTINEL_REVALIDATION_WORKERS", "0")) or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_revalidation_pool() -> None:
+    """Stop the worker pool if it was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def revalidate_stream(
+    assertions: list[dict[str, Any]],
+    outputs: list[StoredOutput],
+    chunk_size: int = REVALIDATION_CHUNK_SIZE,
+    inline_max: int = INLINE_REVALIDATION_MAX,
+) -> AsyncIterator[RevalidatedRun]:
+    """Re-validate stored outputs, yielding runs as their chunk completes.
+
+    Args:
+        assertions: List of assertion specifications
+        outputs: Stored run outputs
+        chunk_size: Outputs per worker task
+        inline_max: Largest batch validated without the process pool
+
+    Yields:
+        RevalidatedRun per output, in chunk completion order
+    """
+    loop = asyncio.get_running_loop()
+    if len(outputs) <= inline_max:
+        # Still off the event loop, but without the cost of starting workers
+        for revalidated in await loop.run_in_executor(
+            None, revalidate_outputs, assertions, outputs
+        ):
+            yield revalidated
+        return
+
+    pool = get_revalidation_pool()
+    tasks = [
+        loop.run_in_executor(pool, revalidate_outputs, assertions, outputs[i : i + chunk_size])
+        for i in range(0, len(outputs), chunk_size)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for revalidated in await next_done:
+                yield revalidated
+    finally:
+        for task in tasks:
+            task.cancel()
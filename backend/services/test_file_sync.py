@@ -0,0 +1,202 @@
+"""
+Keeps test definitions in the database in sync with test YAML files.
+
+Test files in artifacts/tests/ are the source of truth for file-based
+tests. TestFileSync mirrors them into test_definitions (matched by
+filename), so listing, search and run history can be served from indexed
+SQL. It runs a full reconciliation on start, then applies changes as files
+are created, modified or deleted: through filesystem notifications when
+the optional watchfiles package is installed, or by polling file stats.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ..core.parser import YAML_LOADER
+
+try:
+    import watchfiles
+except ImportError:  # Optional: pip install sentinel-backend[watch]
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+# Quiet period before a burst of file changes is applied
+SYNC_DEBOUNCE_MS = 300
+
+# Seconds between directory scans when watchfiles is not installed
+SYNC_POLL_INTERVAL_SECONDS = 2.0
+
+
+@dataclass
+class SyncStats:
+    """Outcome of applying a set of file changes."""
+
+    upserted: int = 0  # Tests created or updated
+    detached: int = 0  # Tests whose file was deleted
+    unchanged: int = 0  # Files whose content matched the database
+    invalid: int = 0  # Files that are not a YAML mapping
+
+
+class TestFileSync:
+    """Mirrors test YAML files into test_definitions."""
+
+    def __init__(
+        self,
+        tests_path: str | Path,
+        debounce_ms: int = SYNC_DEBOUNCE_MS,
+        poll_interval: float = SYNC_POLL_INTERVAL_SECONDS,
+    ):
+        """Initialize the sync.
+
+        Args:
+            tests_path: Directory holding the test YAML files
+            debounce_ms: Quiet period before a burst of changes is applied
+            poll_interval: Seconds between scans when polling
+        """
+        self.tests_path = Path(tests_path)
+        self.debounce_ms = debounce_ms
+        self.poll_interval = poll_interval
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """Get (mtime_ns, size) of every test file, keyed by filename."""
+        stats = {}
+        with os.scandir(self.tests_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".yaml") and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    stats[entry.name[: -len(".yaml")]] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def sync_files(self, filenames: set[str]) -> SyncStats:
+        """Apply the current state of some test files to the database.
+
+        Files are matched to tests by filename (without extension). Missing
+        files detach their test; files whose content matches what was last
+        synced are skipped without parsing.
+
+        Args:
+            filenames: Filenames (without extension) that may have changed
+
+        Returns:
+            SyncStats for the applied changes
+        """
+        # Imported here: storage imports this package (recording_analysis)
+        from ..storage import TestRepository, get_database
+
+        stats = SyncStats()
+        if not filenames:
+            return stats
+
+        session = get_database().SessionLocal()
+        try:
+            repo = TestRepository(session)
+            stored = repo.get_file_contents(filenames)
+            files: dict[str, tuple[dict[str, Any], str] | None] = {}
+
+            for filename in filenames:
+                path = self.tests_path / f"{filename}.yaml"
+                try:
+                    content = path.read_text(encoding="utf-8")
+                except FileNotFoundError:
+                    files[filename] = None
+                    continue
+                except OSError as e:
+                    logger.warning("Cannot read test file %s: %s", path.name, e)
+                    continue
+
+                if stored.get(filename) == content:
+                    stats.unchanged += 1
+                    continue
+                try:
+                    spec = yaml.load(content, Loader=YAML_LOADER)
+                except yaml.YAMLError as e:
+                    logger.warning("Skipping invalid test file %s: %s", path.name, e)
+                    stats.invalid += 1
+                    continue
+                if not isinstance(spec, dict):
+                    logger.warning("Skipping test file %s: not a YAML mapping", path.name)
+                    stats.invalid += 1
+                    continue
+                files[filename] = (spec, content)
+
+            stats.upserted, stats.detached = repo.sync_files(files)
+        finally:
+            session.close()
+        return stats
+
+    def full_sync(self) -> SyncStats:
+        """Reconcile every test file and every test linked to a file.
+
+        Returns:
+            SyncStats for the applied changes
+        """
+        from ..storage import TestRepository, get_database
+
+        session = get_database().SessionLocal()
+        try:
+            linked = set(TestRepository(session).get_file_contents())
+        finally:
+            session.close()
+        return self.sync_files(set(self._scan()) | linked)
+
+    async def run(self) -> None:
+        """Reconcile once, then apply file changes until cancelled."""
+        try:
+            stats = await asyncio.to_thread(self.full_sync)
+            logger.info("Test file sync: %s", stats)
+        except Exception:
+            logger.exception("Initial test file sync failed")
+
+        if watchfiles is not None:
+            await self._watch()
+        else:
+            await self._poll()
+
+    async def _apply(self, filenames: set[str]) -> None:
+        try:
+            stats = await asyncio.to_thread(self.sync_files, filenames)
+            logger.debug("Test file sync: %s", stats)
+        except Exception:
+            logger.exception("Test file sync failed")
+
+    async def _watch(self) -> None:
+        """Apply changes reported by filesystem notifications."""
+        async for changes in watchfiles.awatch(
+            self.tests_path,
+            debounce=self.debounce_ms,
+            recursive=False,
+            watch_filter=lambda _, path: path.endswith(".yaml"),
+        ):
+            await self._apply({Path(path).stem for _, path in changes})
+
+    async def _poll(self) -> None:
+        """Apply changes found by comparing file stats between scans."""
+        previous = await asyncio.to_thread(self._scan)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._scan)
+            if _changed(previous, current):
+                # Debounce: wait for writes in progress to settle, then rescan
+                await asyncio.sleep(self.debounce_ms / 1000)
+                current = await asyncio.to_thread(self._scan)
+                await self._apply(_changed(previous, current))
+            previous = current
+
+
+def _changed(previous: dict[str, tuple[int, int]], current: dict[str, tuple[int, int]]) -> set[str]:
+    """Filenames added, removed or modified between two scans."""
+    return {
+        filename
+        for filename in previous.keys() | current.keys()
+        if previous.get(filename) != current.get(filename)
+    }
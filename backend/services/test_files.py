@@ -5,16 +5,36 @@ This service provides file-based storage for tests, making them git-friendly
 and version-controllable. Tests are stored as YAML files in artifacts/tests/.
 """
 
+import os
 import re
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from ..core.parser import YAML_LOADER
+
+# Fields list results can be sorted by
+SORT_FIELDS = ("filename", "name", "category", "provider", "model", "created_at", "updated_at")
+
+
+@dataclass
+class _IndexEntry:
+    mtime_ns: int
+    size: int
+    metadata: dict[str, Any]
+
 
 class TestFileService:
-    """Service for managing test YAML files."""
+    """Service for managing test YAML files.
+
+    Listing is served from an in-memory metadata index keyed by filename.
+    Each listing stats the directory's files and only re-parses those whose
+    modification time or size changed, so listing cost stays flat as the
+    number of tests grows.
+    """
 
     def __init__(self, tests_path: str | None = None):
         """Initialize service with tests directory path.
@@ -32,6 +52,8 @@ class TestFileService:
         # Ensure directory exists
         self.tests_path.mkdir(parents=True, exist_ok=True)
 
+        self._index: dict[str, _IndexEntry] = {}
+
     def generate_filename(self, name: str) -> str:
         """Generate unique kebab-case filename from test name.
 
@@ -125,6 +147,7 @@ class TestFileService:
         # Write file
         file_path = self.tests_path / f"{filename}.yaml"
         file_path.write_text(yaml_content, encoding="utf-8")
+        self._index.pop(filename, None)  # Don't rely on mtime resolution
 
         # Return filename and parsed metadata
         metadata = {
@@ -181,48 +204,123 @@ class TestFileService:
         """List all test files with metadata.
 
         Returns:
-            List of test metadata dictionaries
+            List of test metadata dictionaries, sorted by filename
         """
-        tests = []
-
-        for file_path in sorted(self.tests_path.glob("*.yaml")):
-            try:
-                yaml_content = file_path.read_text(encoding="utf-8")
-                parsed = yaml.safe_load(yaml_content) or {}
-
-                # Get file stats
-                stat = file_path.stat()
-
-                tests.append(
-                    {
-                        "filename": file_path.stem,
-                        "name": parsed.get("name", file_path.stem),
-                        "description": parsed.get("description", ""),
-                        "category": parsed.get("category"),
-                        "provider": parsed.get("provider"),
-                        "model": parsed.get("model"),
-                        "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        "updated_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    }
-                )
-            except (yaml.YAMLError, OSError) as e:
-                # Log error but continue listing
-                print(f"Warning: Could not parse {file_path.name}: {e}")
-                tests.append(
-                    {
-                        "filename": file_path.stem,
-                        "name": file_path.stem,
-                        "description": "Error loading test",
-                        "category": None,
-                        "provider": None,
-                        "model": None,
-                        "created_at": None,
-                        "updated_at": None,
-                        "error": str(e),
-                    }
+        return self.query_tests()[0]
+
+    def query_tests(
+        self,
+        category: str | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        tags: list[str] | None = None,
+        sort: str = "filename",
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Filter, sort and page test files using the metadata index.
+
+        Args:
+            category: Only tests in this category
+            provider: Only tests for this provider
+            model: Only tests for this model
+            tags: Only tests having all of these tags
+            sort: Field to sort by (one of SORT_FIELDS); missing values sort last
+            descending: Sort in descending order
+            limit: Maximum number of tests to return (None for all)
+            offset: Number of matching tests to skip
+
+        Returns:
+            Tuple of (page of test metadata dictionaries, total matching tests)
+
+        Raises:
+            ValueError: If sort is not a sortable field
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort!r}. Use one of: {', '.join(SORT_FIELDS)}")
+
+        self._refresh_index()
+        required_tags = set(tags or [])
+        tests = [
+            entry.metadata
+            for entry in self._index.values()
+            if (category is None or entry.metadata["category"] == category)
+            and (provider is None or entry.metadata["provider"] == provider)
+            and (model is None or entry.metadata["model"] == model)
+            and required_tags.issubset(entry.metadata["tags"])
+        ]
+
+        # Ties (and missing values) keep filename order
+        tests.sort(key=lambda t: t["filename"])
+        if sort != "filename":
+            present = [t for t in tests if t[sort] is not None]
+            missing = [t for t in tests if t[sort] is None]
+            present.sort(key=lambda t: str(t[sort]), reverse=descending)
+            tests = present + missing
+        elif descending:
+            tests.reverse()
+
+        total = len(tests)
+        page = tests[offset : offset + limit if limit is not None else None]
+        return [dict(t) for t in page], total
+
+    def _refresh_index(self) -> None:
+        """Re-parse new and changed files and drop deleted ones from the index."""
+        seen = set()
+        with os.scandir(self.tests_path) as entries:
+            for dir_entry in entries:
+                if not dir_entry.name.endswith(".yaml") or not dir_entry.is_file():
+                    continue
+                filename = dir_entry.name[: -len(".yaml")]
+                seen.add(filename)
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                cached = self._index.get(filename)
+                if cached and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                self._index[filename] = _IndexEntry(
+                    stat.st_mtime_ns, stat.st_size, self._read_metadata(Path(dir_entry.path), stat)
                 )
 
-        return tests
+        for filename in self._index.keys() - seen:
+            del self._index[filename]
+
+    def _read_metadata(self, file_path: Path, stat: os.stat_result) -> dict[str, Any]:
+        """Parse a test file's listing metadata."""
+        try:
+            parsed = yaml.load(file_path.read_text(encoding="utf-8"), Loader=YAML_LOADER) or {}
+            if not isinstance(parsed, dict):
+                raise yaml.YAMLError("Test file must contain a mapping")
+            tags = parsed.get("tags") or []
+            return {
+                "filename": file_path.stem,
+                "name": parsed.get("name", file_path.stem),
+                "description": parsed.get("description", ""),
+                "category": parsed.get("category"),
+                "provider": parsed.get("provider"),
+                "model": parsed.get("model"),
+                "tags": [str(tag) for tag in tags] if isinstance(tags, list) else [],
+                "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                "updated_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            }
+        except (yaml.YAMLError, OSError) as e:
+            # Log error but continue listing
+            print(f"Warning: Could not parse {file_path.name}: {e}")
+            return {
+                "filename": file_path.stem,
+                "name": file_path.stem,
+                "description": "Error loading test",
+                "category": None,
+                "provider": None,
+                "model": None,
+                "tags": [],
+                "created_at": None,
+                "updated_at": None,
+                "error": str(e),
+            }
 
     def delete_test(self, filename: str) -> bool:
         """Delete test file.
@@ -241,6 +339,7 @@ class TestFileService:
             return False
 
         file_path.unlink()
+        self._index.pop(filename, None)
         return True
 
     def rename_test(self, old_filename: str, new_name: str) -> tuple[str, dict[str, Any]]:
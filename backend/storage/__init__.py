@@ -4,17 +4,47 @@ Storage layer for Sentinel.
 Provides data persistence for tests, runs, and results.
 """
 
-from .database import Database, get_database, reset_database
-from .models import TestDefinition, TestResult, TestRun
-from .repositories import RunRepository, TestRepository
+from .async_repositories import (
+    AsyncOutputVectorRepository,
+    AsyncRecordingRepository,
+    AsyncRollupRepository,
+    AsyncRunRepository,
+    AsyncTestRepository,
+)
+from .database import Database, SQLiteProfile, get_database, reset_database
+from .models import OutputVector, RunRollup, TestDefinition, TestResult, TestRun
+from .pagination import CountCache, count_cache, decode_cursor, encode_cursor, next_cursor
+from .repositories import (
+    OutputVectorRepository,
+    RollupRepository,
+    RunRepository,
+    TestRepository,
+)
+from .sketch import QuantileSketch
 
 __all__ = [
     "Database",
+    "SQLiteProfile",
     "get_database",
     "reset_database",
     "TestDefinition",
     "TestRun",
     "TestResult",
+    "RunRollup",
+    "OutputVector",
+    "QuantileSketch",
+    "CountCache",
+    "count_cache",
+    "encode_cursor",
+    "decode_cursor",
+    "next_cursor",
     "TestRepository",
     "RunRepository",
+    "RollupRepository",
+    "OutputVectorRepository",
+    "AsyncTestRepository",
+    "AsyncRunRepository",
+    "AsyncRollupRepository",
+    "AsyncOutputVectorRepository",
+    "AsyncRecordingRepository",
 ]
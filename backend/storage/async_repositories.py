@@ -0,0 +1,275 @@
+"""
+Async data access layer for the API routers.
+
+The async repositories run the synchronous repositories on an AsyncSession
+(via ``AsyncSession.run_sync``), so queries are defined once and database
+I/O does not block the event loop that is also awaiting model providers.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..services.recording_analysis import RecordingAnalysisState
+from .models import (
+    RecordingEvent,
+    RecordingSession,
+    RunRollup,
+    TestDefinition,
+    TestResult,
+    TestRun,
+)
+from .repositories import (
+    OutputVectorRepository,
+    RecordingRepository,
+    RollupRepository,
+    RunRepository,
+    TestRepository,
+)
+
+if TYPE_CHECKING:
+    from ..regression.similarity import SimilarityBackend
+
+T = TypeVar("T")
+
+
+class _AsyncRepository:
+    """Base class running a synchronous repository's methods on an AsyncSession."""
+
+    repository_class: type
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository.
+
+        Args:
+            session: Async database session
+        """
+        self.session = session
+
+    async def _run(self, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call a synchronous repository method on the session's sync view."""
+        return await self.session.run_sync(
+            lambda sync_session: method(self.repository_class(sync_session), *args, **kwargs)
+        )
+
+
+class AsyncTestRepository(_AsyncRepository):
+    """Async repository for test definitions (see TestRepository)."""
+
+    repository_class = TestRepository
+
+    async def create(self, name: str, spec: dict[str, Any], **kwargs: Any) -> TestDefinition:
+        """Create a new test definition."""
+        return await self._run(TestRepository.create, name, spec, **kwargs)
+
+    async def get_by_id(self, test_id: int) -> TestDefinition | None:
+        """Get test definition by ID."""
+        return await self._run(TestRepository.get_by_id, test_id)
+
+    async def get_by_name(self, name: str) -> TestDefinition | None:
+        """Get test definition by name."""
+        return await self._run(TestRepository.get_by_name, name)
+
+    async def get_all(
+        self, limit: int = 100, offset: int = 0, cursor: str | None = None
+    ) -> list[TestDefinition]:
+        """Get all test definitions."""
+        return await self._run(TestRepository.get_all, limit, offset, cursor)
+
+    async def count(self) -> int:
+        """Count all test definitions."""
+        return await self._run(TestRepository.count)
+
+    async def get_by_filename(self, filename: str) -> TestDefinition | None:
+        """Get test definition by filename."""
+        return await self._run(TestRepository.get_by_filename, filename)
+
+    async def update(self, test_id: int, **kwargs: Any) -> TestDefinition | None:
+        """Update test definition."""
+        return await self._run(TestRepository.update, test_id, **kwargs)
+
+    async def update_last_run(self, test_id: int) -> TestDefinition | None:
+        """Update last_run_at timestamp for a test."""
+        return await self._run(TestRepository.update_last_run, test_id)
+
+    async def delete(self, test_id: int) -> bool:
+        """Delete test definition."""
+        return await self._run(TestRepository.delete, test_id)
+
+
+class AsyncRunRepository(_AsyncRepository):
+    """Async repository for test runs (see RunRepository)."""
+
+    repository_class = RunRepository
+
+    async def create(self, test_definition_id: int, provider: str, model: str) -> TestRun:
+        """Create a new test run."""
+        return await self._run(RunRepository.create, test_definition_id, provider, model)
+
+    async def update_status(self, run_id: int, status: str, **kwargs: Any) -> TestRun | None:
+        """Update test run status and metrics."""
+        return await self._run(RunRepository.update_status, run_id, status, **kwargs)
+
+    async def get_by_id(self, run_id: int, with_output: bool = False) -> TestRun | None:
+        """Get test run by ID."""
+        return await self._run(RunRepository.get_by_id, run_id, with_output)
+
+    async def get_by_test(
+        self,
+        test_definition_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> list[TestRun]:
+        """Get runs for a specific test."""
+        return await self._run(RunRepository.get_by_test, test_definition_id, limit, offset, cursor)
+
+    async def get_completed_by_test(
+        self, test_definition_id: int, limit: int = 100
+    ) -> list[TestRun]:
+        """Get the latest completed runs of a test with their outputs and results loaded."""
+        return await self._run(RunRepository.get_completed_by_test, test_definition_id, limit)
+
+    async def get_history_by_test(
+        self, test_definition_id: int, limit_per_model: int = 100, model: str | None = None
+    ) -> list[TestRun]:
+        """Get the latest finished runs of a test for each provider and model."""
+        return await self._run(
+            RunRepository.get_history_by_test, test_definition_id, limit_per_model, model
+        )
+
+    async def get_metrics_by_ids(self, run_ids: list[int]) -> list[dict[str, Any]]:
+        """Get the status and metrics of many runs, with their test's name."""
+        return await self._run(RunRepository.get_metrics_by_ids, run_ids)
+
+    async def get_output_hashes_by_test(
+        self, test_definition_id: int, model: str | None = None, limit: int = 1000
+    ) -> list[dict[str, Any]]:
+        """Get the latest finished runs of a test that have a stored output."""
+        return await self._run(
+            RunRepository.get_output_hashes_by_test, test_definition_id, model, limit
+        )
+
+    async def get_assertion_results_by_runs(
+        self, run_ids: list[int]
+    ) -> dict[int, list[dict[str, Any]]]:
+        """Get the assertion outcomes of many runs."""
+        return await self._run(RunRepository.get_assertion_results_by_runs, run_ids)
+
+    async def get_all(
+        self, limit: int = 100, offset: int = 0, cursor: str | None = None
+    ) -> list[TestRun]:
+        """Get all test runs."""
+        return await self._run(RunRepository.get_all, limit, offset, cursor)
+
+    async def count(self, test_definition_id: int | None = None) -> int:
+        """Count test runs."""
+        return await self._run(RunRepository.count, test_definition_id)
+
+    async def create_result(
+        self, run_id: int, assertion_type: str, passed: bool, **kwargs: Any
+    ) -> TestResult:
+        """Create assertion result for a run."""
+        return await self._run(
+            RunRepository.create_result, run_id, assertion_type, passed, **kwargs
+        )
+
+    async def create_results_bulk(
+        self, run_id: int, results: list[dict[str, Any]], status: str, **kwargs: Any
+    ) -> TestRun | None:
+        """Complete a run with all of its assertion results in one transaction."""
+        return await self._run(RunRepository.create_results_bulk, run_id, results, status, **kwargs)
+
+    async def get_results_by_run(self, run_id: int) -> list[TestResult]:
+        """Get all results for a test run."""
+        return await self._run(RunRepository.get_results_by_run, run_id)
+
+
+class AsyncRollupRepository(_AsyncRepository):
+    """Async repository for run metric rollups (see RollupRepository)."""
+
+    repository_class = RollupRepository
+
+    async def get_buckets(
+        self,
+        granularity: str = "day",
+        test_definition_id: int | None = None,
+        model: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[RunRollup]:
+        """Get rollup buckets in a time range."""
+        return await self._run(
+            RollupRepository.get_buckets, granularity, test_definition_id, model, start, end
+        )
+
+
+class AsyncOutputVectorRepository(_AsyncRepository):
+    """Async repository for output similarity vectors (see OutputVectorRepository)."""
+
+    repository_class = OutputVectorRepository
+
+    async def index_outputs(self, hashes: list[str], backend: "SimilarityBackend") -> int:
+        """Vectorize the stored outputs that have no vector for a backend yet."""
+        return await self._run(OutputVectorRepository.index_outputs, hashes, backend)
+
+    async def get_vectors(self, hashes: list[str], backend_name: str) -> dict[str, np.ndarray]:
+        """Get the cached vectors of outputs."""
+        return await self._run(OutputVectorRepository.get_vectors, hashes, backend_name)
+
+
+class AsyncRecordingRepository(_AsyncRepository):
+    """Async repository for recording sessions and events (see RecordingRepository)."""
+
+    repository_class = RecordingRepository
+
+    async def create_session(self, name: str, description: str | None = None) -> RecordingSession:
+        """Create a new recording session."""
+        return await self._run(RecordingRepository.create_session, name, description)
+
+    async def get_session_by_id(self, session_id: int) -> RecordingSession | None:
+        """Get recording session by ID."""
+        return await self._run(RecordingRepository.get_session_by_id, session_id)
+
+    async def get_active_session(self) -> RecordingSession | None:
+        """Get the currently active (recording) session."""
+        return await self._run(RecordingRepository.get_active_session)
+
+    async def update_session_status(self, session_id: int, status: str) -> RecordingSession | None:
+        """Update recording session status."""
+        return await self._run(RecordingRepository.update_session_status, session_id, status)
+
+    async def set_generated_test(self, session_id: int, test_id: int) -> RecordingSession | None:
+        """Link recording session to generated test."""
+        return await self._run(RecordingRepository.set_generated_test, session_id, test_id)
+
+    async def add_event(
+        self, session_id: int, event_type: str, data: dict[str, Any]
+    ) -> RecordingEvent:
+        """Add an event to a recording session."""
+        return await self._run(RecordingRepository.add_event, session_id, event_type, data)
+
+    async def add_events(
+        self, session_id: int, events: list[tuple[str, dict[str, Any]]]
+    ) -> list[RecordingEvent]:
+        """Add a batch of events to a recording session in one transaction."""
+        return await self._run(RecordingRepository.add_events, session_id, events)
+
+    async def get_analysis(self, session_id: int) -> RecordingAnalysisState | None:
+        """Get the incremental analysis state of a recording session."""
+        return await self._run(RecordingRepository.get_analysis, session_id)
+
+    async def get_events(self, session_id: int) -> list[RecordingEvent]:
+        """Get all events for a recording session."""
+        return await self._run(RecordingRepository.get_events, session_id)
+
+    async def get_all_sessions(self, limit: int = 50, offset: int = 0) -> list[RecordingSession]:
+        """Get all recording sessions."""
+        return await self._run(RecordingRepository.get_all_sessions, limit, offset)
+
+    async def delete_session(self, session_id: int) -> bool:
+        """Delete a recording session and all its events."""
+        return await self._run(RecordingRepository.delete_session, session_id)
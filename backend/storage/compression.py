@@ -0,0 +1,144 @@
+"""
+Transparent compression for large JSON payload columns.
+
+Payload columns (raw responses, recording event data, test specs, canvas
+state) are stored as BLOBs: a one-byte codec header followed by the payload.
+Rows written before compression was added hold plain TEXT and are read
+unchanged until the background migration rewrites them.
+
+Models expose each payload through ``compressed_text``, a property that
+decompresses on first access. Loading rows only reads the compressed bytes;
+the cost of inflating a payload is paid when ``to_dict`` actually needs it.
+"""
+
+import zlib
+from typing import Any
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# Codec header bytes
+CODEC_RAW = 0x00  # UTF-8, stored as-is (too small to benefit)
+CODEC_ZLIB_DICT_V1 = 0x01  # zlib with ZLIB_DICTIONARY_V1
+
+# Payloads shorter than this are stored uncompressed
+MIN_COMPRESS_BYTES = 128
+
+# Preset dictionary of substrings common to Sentinel payloads: provider
+# responses, recording events, test specs and React Flow canvas state. zlib
+# can back-reference it from the first byte, which is where most of the
+# savings on small and medium payloads come from. Most frequent strings go
+# last. Changing it requires a new codec byte (old rows keep decoding with
+# the dictionary they were written with).
+ZLIB_DICTIONARY_V1 = b"".join(
+    [
+        b'"position": {"x": 100, "y": "animated": true, "source": "target": "id": "e',
+        b'"type": "assertion", "assertionType": "assertionValue": "label": "Assert: ',
+        b'"type": "model", "data": {"label": "Model: "provider": "temperature": ',
+        b'"type": "input", "query": "type": "system", "systemPrompt": "toolName": ',
+        b'"nodes": [{"id": "edges": [{"id": "e1", "inputs": {"query": "system_prompt": ',
+        b'"assertions": [{"must_contain": "must_not_contain": "must_call_tool": ',
+        b'"max_latency_ms": "max_tokens": "min_tokens": "output_type": "json"',
+        b'"model_config": {"temperature": 0.7, "max_tokens": 1000}, "tools": [{"name": ',
+        b'"event_type": "model_call", "tool_call", "output", "execution_complete", ',
+        b'"finish_reason": "stop", "tool_calls": [{"id": "call_", "function": {"arguments": ',
+        b'"choices": [{"index": 0, "message": {"role": "assistant", "content": ',
+        b'"object": "chat.completion", "created": "system_fingerprint": "fp_',
+        b'"prompt_tokens": "completion_tokens": "total_tokens": "logprobs": null, ',
+        b'"stop_reason": "end_turn", "stop_sequence": null, "tool_use", "input": {',
+        b'"usage": {"input_tokens": "output_tokens": "cache_creation_input_tokens": ',
+        b'"cache_read_input_tokens": 0, "service_tier": "standard"}, ',
+        b'{"id": "msg_01", "type": "message", "role": "assistant", "model": "claude-',
+        b'"content": [{"type": "text", "text": "',
+    ]
+)
+
+
+def compress_text(value: str | None) -> bytes | None:
+    """Encode a payload for storage.
+
+    Args:
+        value: Payload text
+
+    Returns:
+        Header byte followed by the (possibly compressed) payload, or None
+    """
+    if value is None:
+        return None
+    raw = value.encode("utf-8")
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        compressor = zlib.compressobj(level=6, zdict=ZLIB_DICTIONARY_V1)
+        compressed = compressor.compress(raw) + compressor.flush()
+        if len(compressed) < len(raw):
+            return bytes([CODEC_ZLIB_DICT_V1]) + compressed
+    return bytes([CODEC_RAW]) + raw
+
+
+def decompress_text(value: bytes | str | None) -> str | None:
+    """Decode a stored payload.
+
+    Args:
+        value: Stored value (bytes from compress_text, or legacy plain text)
+
+    Returns:
+        Payload text or None
+
+    Raises:
+        ValueError: If the codec header is unknown
+    """
+    if value is None or isinstance(value, str):
+        return value
+    codec, payload = value[0], value[1:]
+    if codec == CODEC_RAW:
+        return payload.decode("utf-8")
+    if codec == CODEC_ZLIB_DICT_V1:
+        decompressor = zlib.decompressobj(zdict=ZLIB_DICTIONARY_V1)
+        return (decompressor.decompress(payload) + decompressor.flush()).decode("utf-8")
+    raise ValueError(f"Unknown payload codec: {codec:#04x}")
+
+
+class CompressedText(TypeDecorator):
+    """BLOB column holding compress_text output.
+
+    Plain strings bound to the column are compressed; loaded values are
+    returned still encoded (see compressed_text for lazy decoding).
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> bytes | None:
+        """Compress strings on the way in."""
+        if isinstance(value, str):
+            return compress_text(value)
+        return value
+
+
+def compressed_text(column_attr: str, doc: str | None = None) -> property:
+    """Create a property exposing a CompressedText column as text.
+
+    The stored bytes are decompressed on first access and memoized until
+    the column changes.
+
+    Args:
+        column_attr: Name of the mapped CompressedText attribute
+        doc: Property docstring
+
+    Returns:
+        Property reading and writing the payload as text
+    """
+    cache_attr = f"{column_attr}_text"
+
+    def fget(self: Any) -> str | None:
+        stored = getattr(self, column_attr)
+        cached = self.__dict__.get(cache_attr)
+        if cached is not None and cached[0] is stored:
+            return cached[1]
+        text = decompress_text(stored)
+        self.__dict__[cache_attr] = (stored, text)
+        return text
+
+    def fset(self: Any, value: str | None) -> None:
+        setattr(self, column_attr, compress_text(value))
+
+    return property(fget, fset, doc=doc)
@@ -4,31 +4,121 @@ Database connection and session management.
 Supports SQLite for local/desktop mode and PostgreSQL for server mode.
 """
 
-from collections.abc import Generator
+import asyncio
+import logging
+import os
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
-
-from sqlalchemy import create_engine, event, inspect, text
+from typing import Literal
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, event, inspect, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+logger = logging.getLogger(__name__)
+
 # Create base class for models
 Base = declarative_base()
 
+# Payload columns stored with CompressedText (see compression.py)
+COMPRESSED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "test_definitions": ("spec_json", "canvas_state"),
+    "test_runs": ("raw_response_json",),
+    "test_results": ("raw_response_json",),
+    "recording_events": ("data_json",),
+}
+
+
+class SQLiteProfile(BaseModel):
+    """SQLite connection pragmas.
+
+    The defaults favour concurrency and write throughput: WAL lets readers
+    (e.g. the UI polling run lists) proceed while a suite is writing results,
+    and synchronous=NORMAL only fsyncs at checkpoints, which is safe against
+    application crashes in WAL mode (a power loss may drop the last commits).
+    """
+
+    journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # Bytes of the file to memory-map (0: disabled)
+    cache_size: int = -64 * 1024  # Pages if positive, KiB if negative (64 MiB)
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    busy_timeout_ms: int = 5000  # Wait for locks instead of failing with "database is locked"
+    maintenance_interval_seconds: int = 600  # Checkpoint/optimize period (0: disabled)
+
+    @classmethod
+    def compat(cls) -> "SQLiteProfile":
+        """SQLite's own defaults (rollback journal, full fsync on every commit)."""
+        return cls(
+            journal_mode="DELETE",
+            synchronous="FULL",
+            mmap_size=0,
+            cache_size=-2000,
+            temp_store="DEFAULT",
+            busy_timeout_ms=5000,  # Python sqlite3 driver default
+            maintenance_interval_seconds=0,
+        )
 
-def _enable_sqlite_foreign_keys(dbapi_conn, connection_record):
-    """Enable foreign key constraints for SQLite."""
-    cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+    @classmethod
+    def from_env(cls) -> "SQLiteProfile":
+        """Build a profile from SENTINEL_SQLITE_* environment variables.
+
+        SENTINEL_SQLITE_PROFILE selects the base profile ("performance", the
+        default, or "compat"); individual pragmas can then be overridden with
+        SENTINEL_SQLITE_JOURNAL_MODE, _SYNCHRONOUS, _MMAP_SIZE, _CACHE_SIZE,
+        _TEMP_STORE, _BUSY_TIMEOUT_MS and _MAINTENANCE_INTERVAL.
+        """
+        base = cls.compat() if os.getenv("SENTINEL_SQLITE_PROFILE") == "compat" else cls()
+        overrides = {
+            "journal_mode": os.getenv("SENTINEL_SQLITE_JOURNAL_MODE"),
+            "synchronous": os.getenv("SENTINEL_SQLITE_SYNCHRONOUS"),
+            "mmap_size": os.getenv("SENTINEL_SQLITE_MMAP_SIZE"),
+            "cache_size": os.getenv("SENTINEL_SQLITE_CACHE_SIZE"),
+            "temp_store": os.getenv("SENTINEL_SQLITE_TEMP_STORE"),
+            "busy_timeout_ms": os.getenv("SENTINEL_SQLITE_BUSY_TIMEOUT_MS"),
+            "maintenance_interval_seconds": os.getenv("SENTINEL_SQLITE_MAINTENANCE_INTERVAL"),
+        }
+        configured = {
+            key: value.upper() if key in ("journal_mode", "synchronous", "temp_store") else value
+            for key, value in overrides.items()
+            if value
+        }
+        return cls.model_validate({**base.model_dump(), **configured})
+
+    def pragmas(self) -> list[str]:
+        """PRAGMA statements to run on every new connection."""
+        return [
+            "PRAGMA foreign_keys=ON",
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA temp_store={self.temp_store}",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+        ]
+
+
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
 
 class Database:
     """Database connection manager."""
 
-    def __init__(self, database_url: str | None = None):
+    def __init__(
+        self, database_url: str | None = None, sqlite_profile: SQLiteProfile | None = None
+    ):
         """Initialize database connection.
 
         Args:
             database_url: Database URL (default: SQLite in ~/.sentinel/sentinel.db)
+            sqlite_profile: SQLite pragmas (default: from SENTINEL_SQLITE_* environment)
         """
         if database_url is None:
             # Default to SQLite in user's home directory
@@ -45,9 +135,11 @@ class Database:
             connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
         )
 
-        # Enable foreign keys for SQLite
-        if "sqlite" in database_url:
-            event.listen(self.engine, "connect", _enable_sqlite_foreign_keys)
+        # Apply the SQLite profile (foreign keys, WAL, ...) to every connection
+        self.is_sqlite = "sqlite" in database_url
+        self.sqlite_profile = sqlite_profile or SQLiteProfile.from_env()
+        if self.is_sqlite:
+            event.listen(self.engine, "connect", self._apply_sqlite_pragmas)
 
         # Create session factory
         self.SessionLocal = sessionmaker(
@@ -56,10 +148,211 @@ class Database:
             bind=self.engine,
         )
 
+        # Async engine for the API routers (created on first use)
+        self._async_engine: AsyncEngine | None = None
+        self._async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Async engine on the same database (aiosqlite for SQLite, asyncpg for PostgreSQL).
+
+        In-memory SQLite databases are not shared between the sync and async
+        engines, so use a file database when mixing both.
+        """
+        if self._async_engine is None:
+            url = make_url(self.database_url)
+            backend = url.get_backend_name()
+            if backend in ASYNC_DRIVERS:
+                url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+            self._async_engine = create_async_engine(url, echo=False, pool_pre_ping=True)
+            if self.is_sqlite:
+                event.listen(self._async_engine.sync_engine, "connect", self._apply_sqlite_pragmas)
+        return self._async_engine
+
+    @property
+    def async_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        """Async session factory bound to async_engine."""
+        if self._async_session_factory is None:
+            self._async_session_factory = async_sessionmaker(
+                bind=self.async_engine,
+                autoflush=False,
+                # Objects returned by repositories stay usable after commit
+                # without implicit (blocking) refreshes
+                expire_on_commit=False,
+            )
+        return self._async_session_factory
+
+    def _apply_sqlite_pragmas(self, dbapi_conn, connection_record):
+        """Run the profile's PRAGMA statements on a new SQLite connection."""
+        cursor = dbapi_conn.cursor()
+        for pragma in self.sqlite_profile.pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    def run_maintenance(self) -> None:
+        """Checkpoint the WAL and refresh query planner statistics (SQLite only).
+
+        A TRUNCATE checkpoint keeps the -wal file from growing without bound
+        during long sessions; PRAGMA optimize re-analyzes tables whose
+        statistics are stale.
+        """
+        if not self.is_sqlite:
+            return
+        with self.engine.connect() as conn:
+            if self.sqlite_profile.journal_mode == "WAL":
+                conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            conn.execute(text("PRAGMA optimize"))
+            conn.commit()
+
+    async def maintenance_loop(self) -> None:
+        """Run maintenance periodically until cancelled.
+
+        Uses the profile's maintenance_interval_seconds; returns immediately
+        when maintenance is disabled or the database is not SQLite.
+        """
+        interval = self.sqlite_profile.maintenance_interval_seconds
+        if not self.is_sqlite or interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.run_maintenance)
+            except Exception:
+                logger.exception("SQLite maintenance failed")
+
+    def compress_legacy_payloads(self, batch_size: int = 500) -> int:
+        """Compress one batch of payloads stored as plain text (SQLite only).
+
+        Rows written before payload compression keep plain TEXT values, which
+        are still read correctly; this rewrites them in the compressed format.
+
+        Args:
+            batch_size: Maximum rows to rewrite per table
+
+        Returns:
+            Number of values rewritten (0 when nothing is left)
+        """
+        from .compression import compress_text
+
+        if not self.is_sqlite:
+            return 0
+
+        rewritten = 0
+        inspector = inspect(self.engine)
+        tables = set(inspector.get_table_names())
+        with self.engine.connect() as conn:
+            for table, columns in COMPRESSED_COLUMNS.items():
+                if table not in tables:
+                    continue
+                for column in columns:
+                    rows = conn.execute(
+                        text(
+                            f"SELECT id, {column} FROM {table} "
+                            f"WHERE typeof({column}) = 'text' LIMIT :limit"
+                        ),
+                        {"limit": batch_size},
+                    ).fetchall()
+                    for row_id, value in rows:
+                        conn.execute(
+                            text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+                            {"value": compress_text(value), "id": row_id},
+                        )
+                    rewritten += len(rows)
+            conn.commit()
+        return rewritten
+
+    def deduplicate_legacy_outputs(self, batch_size: int = 500) -> int:
+        """Move one batch of inline output copies into the outputs table (SQLite only).
+
+        Runs and results stored before output deduplication keep their own
+        copy of the output text; this replaces it with a reference to the
+        shared, content-addressed blob.
+
+        Args:
+            batch_size: Maximum rows to rewrite per table
+
+        Returns:
+            Number of rows rewritten (0 when nothing is left)
+        """
+        from .compression import compress_text
+        from .models import OutputBlob
+
+        if not self.is_sqlite:
+            return 0
+
+        rewritten = 0
+        with self.engine.connect() as conn:
+            for table in ("test_runs", "test_results"):
+                rows = conn.execute(
+                    text(
+                        f"SELECT id, output_text FROM {table} "
+                        "WHERE output_text IS NOT NULL AND output_hash IS NULL LIMIT :limit"
+                    ),
+                    {"limit": batch_size},
+                ).fetchall()
+                for row_id, output_text in rows:
+                    digest = OutputBlob.hash_text(output_text)
+                    conn.execute(
+                        text(
+                            "INSERT OR IGNORE INTO outputs (hash, text, size, created_at) "
+                            "VALUES (:hash, :text, :size, CURRENT_TIMESTAMP)"
+                        ),
+                        {
+                            "hash": digest,
+                            "text": compress_text(output_text),
+                            "size": len(output_text),
+                        },
+                    )
+                    conn.execute(
+                        text(
+                            f"UPDATE {table} SET output_hash = :hash, output_text = NULL "
+                            "WHERE id = :id"
+                        ),
+                        {"hash": digest, "id": row_id},
+                    )
+                rewritten += len(rows)
+            conn.commit()
+        return rewritten
+
+    async def migrate_legacy_payloads_in_background(self, batch_size: int = 500) -> None:
+        """Compress plain text payloads and deduplicate inline outputs, batch by batch.
+
+        Each batch is its own short transaction, so requests interleave with
+        the migration instead of waiting for it.
+
+        Args:
+            batch_size: Maximum rows to rewrite per table per batch
+        """
+        while True:
+            try:
+                rewritten = await asyncio.to_thread(self.compress_legacy_payloads, batch_size)
+                rewritten += await asyncio.to_thread(self.deduplicate_legacy_outputs, batch_size)
+            except Exception:
+                logger.exception("Legacy payload migration failed")
+                return
+            if rewritten == 0:
+                return
+            logger.info("Migrated %d legacy payloads", rewritten)
+            await asyncio.sleep(0)
+
     def create_tables(self):
         """Create all database tables."""
+        existing = set(inspect(self.engine).get_table_names())
         Base.metadata.create_all(bind=self.engine)
 
+        # Backfill rollups of databases that have runs from before rollups existed
+        if "test_runs" in existing and "run_rollups" not in existing:
+            from .repositories import RollupRepository
+
+            session = self.SessionLocal()
+            try:
+                runs = RollupRepository(session).rebuild()
+            finally:
+                session.close()
+            if runs:
+                logger.info("Backfilled run rollups from %d runs", runs)
+
     def run_migrations(self):
         """Run schema migrations for existing databases.
 
@@ -82,7 +375,45 @@ class Database:
 
                 # Add last_run_at column if missing (added in v0.32.0)
                 if "last_run_at" not in columns:
-                    conn.execute(text("ALTER TABLE test_definitions ADD COLUMN last_run_at DATETIME"))
+                    conn.execute(
+                        text("ALTER TABLE test_definitions ADD COLUMN last_run_at DATETIME")
+                    )
+                    conn.commit()
+
+        # Check test_runs table for new columns
+        if "test_runs" in inspector.get_table_names():
+            columns = {col["name"] for col in inspector.get_columns("test_runs")}
+
+            with self.engine.connect() as conn:
+                # Add streaming timing columns if missing
+                if "ttft_ms" not in columns:
+                    conn.execute(text("ALTER TABLE test_runs ADD COLUMN ttft_ms INTEGER"))
+                    conn.commit()
+                if "tokens_per_second" not in columns:
+                    conn.execute(text("ALTER TABLE test_runs ADD COLUMN tokens_per_second FLOAT"))
+                    conn.commit()
+
+                # Add run-level output columns if missing
+                for column in ("output_text", "tool_calls_json", "raw_response_json"):
+                    if column not in columns:
+                        conn.execute(text(f"ALTER TABLE test_runs ADD COLUMN {column} TEXT"))
+                        conn.commit()
+
+                # Add content-addressed output reference if missing
+                if "output_hash" not in columns:
+                    conn.execute(text("ALTER TABLE test_runs ADD COLUMN output_hash VARCHAR(64)"))
+                    conn.commit()
+
+        # Check test_results table for new columns
+        if "test_results" in inspector.get_table_names():
+            columns = {col["name"] for col in inspector.get_columns("test_results")}
+
+            with self.engine.connect() as conn:
+                # Add content-addressed output reference if missing
+                if "output_hash" not in columns:
+                    conn.execute(
+                        text("ALTER TABLE test_results ADD COLUMN output_hash VARCHAR(64)")
+                    )
                     conn.commit()
 
         # Check for recording_sessions table columns
@@ -90,8 +421,60 @@ class Database:
             columns = {col["name"] for col in inspector.get_columns("recording_sessions")}
 
             with self.engine.connect() as conn:
-                # Add any missing columns here for future migrations
-                pass
+                # Add denormalized event_count column if missing, backfilled from events
+                if "event_count" not in columns:
+                    conn.execute(
+                        text(
+                            "ALTER TABLE recording_sessions "
+                            "ADD COLUMN event_count INTEGER NOT NULL DEFAULT 0"
+                        )
+                    )
+                    if "recording_events" in inspector.get_table_names():
+                        conn.execute(
+                            text(
+                                "UPDATE recording_sessions SET event_count = ("
+                                "SELECT COUNT(*) FROM recording_events "
+                                "WHERE recording_events.recording_session_id = recording_sessions.id)"
+                            )
+                        )
+                    conn.commit()
+
+                # Add per-session sequence counter if missing, backfilled from events
+                if "last_sequence_number" not in columns:
+                    conn.execute(
+                        text(
+                            "ALTER TABLE recording_sessions "
+                            "ADD COLUMN last_sequence_number INTEGER NOT NULL DEFAULT 0"
+                        )
+                    )
+                    if "recording_events" in inspector.get_table_names():
+                        conn.execute(
+                            text(
+                                "UPDATE recording_sessions SET last_sequence_number = ("
+                                "SELECT COALESCE(MAX(sequence_number), 0) FROM recording_events "
+                                "WHERE recording_events.recording_session_id = recording_sessions.id)"
+                            )
+                        )
+                    conn.commit()
+
+                # Add analysis state column if missing (rebuilt from events on first read)
+                if "analysis_json" not in columns:
+                    conn.execute(
+                        text("ALTER TABLE recording_sessions ADD COLUMN analysis_json TEXT")
+                    )
+                    conn.commit()
+
+        # Create indexes added to existing tables (create_all only indexes new tables)
+        inspector = inspect(self.engine)  # Fresh inspector: columns may have been added above
+        tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for index in table.indexes:
+                if index.name not in existing and {c.name for c in index.columns} <= columns:
+                    index.create(bind=self.engine)
 
     def drop_tables(self):
         """Drop all database tables (use with caution!)."""
@@ -121,6 +504,32 @@ class Database:
         finally:
             session.close()
 
+    async def get_async_session(self) -> AsyncGenerator[AsyncSession]:
+        """Get async database session with automatic cleanup.
+
+        Yields:
+            Async database session
+
+        Example:
+            ```python
+            async for session in db.get_async_session():
+                repo = AsyncTestRepository(session)
+                tests = await repo.get_all()
+            ```
+        """
+        async with self.async_session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def dispose_async_engine(self) -> None:
+        """Close all connections of the async engine."""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
 
 # Global database instance
 _db_instance: Database | None = None
@@ -145,5 +554,8 @@ def get_database(database_url: str | None = None) -> Database:
 
 def reset_database():
     """Reset global database instance (for testing)."""
+    from .pagination import count_cache
+
     global _db_instance
     _db_instance = None
+    count_cache.clear()
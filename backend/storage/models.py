@@ -2,13 +2,26 @@
 SQLAlchemy models for test definitions, runs, and results.
 """
 
+import hashlib
 import json
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
+from .compression import CompressedText, compressed_text
 from .database import Base
 
 
@@ -16,6 +29,10 @@ class TestDefinition(Base):
     """Test definition stored in database."""
 
     __tablename__ = "test_definitions"
+    __table_args__ = (
+        # Keyset pagination of the test list on (updated_at, id)
+        Index("ix_test_definitions_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -33,11 +50,13 @@ class TestDefinition(Base):
     )  # YAML filename in artifacts/tests/
 
     # Test specification (stored as JSON)
-    spec_json = Column(Text, nullable=False)  # Full TestSpec as JSON
+    _spec_json = Column("spec_json", CompressedText, nullable=False)  # Full TestSpec as JSON
+    spec_json = compressed_text("_spec_json")
     spec_yaml = Column(Text, nullable=True)  # Optional YAML representation
 
     # Canvas state (stored as JSON)
-    canvas_state = Column(Text, nullable=True)  # React Flow nodes and edges
+    _canvas_state = Column("canvas_state", CompressedText, nullable=True)  # React Flow nodes/edges
+    canvas_state = compressed_text("_canvas_state")
 
     # Metadata
     provider = Column(String(50), nullable=True, index=True)
@@ -51,6 +70,7 @@ class TestDefinition(Base):
 
     # Relationships
     runs = relationship("TestRun", back_populates="test_definition", cascade="all, delete-orphan")
+    rollups = relationship("RunRollup", cascade="all, delete-orphan")
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -77,6 +97,11 @@ class TestRun(Base):
     """Test run execution record."""
 
     __tablename__ = "test_runs"
+    __table_args__ = (
+        # Keyset pagination of run history on (started_at, id), overall and per test
+        Index("ix_test_runs_started_at_id", "started_at", "id"),
+        Index("ix_test_runs_test_started_at_id", "test_definition_id", "started_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     test_definition_id = Column(
@@ -94,6 +119,8 @@ class TestRun(Base):
 
     # Execution metrics
     latency_ms = Column(Integer, nullable=True)
+    ttft_ms = Column(Integer, nullable=True)  # Time to first token
+    tokens_per_second = Column(Float, nullable=True)  # Output decoding throughput
     tokens_input = Column(Integer, nullable=True)
     tokens_output = Column(Integer, nullable=True)
     cost_usd = Column(Float, nullable=True)
@@ -101,9 +128,25 @@ class TestRun(Base):
     # Error information
     error_message = Column(Text, nullable=True)
 
+    # Output captured (once per run, shared by all assertion results). The text
+    # lives in the content-addressed outputs table (loaded on request, see
+    # RunRepository.get_by_id); output_text is the inline copy of runs stored
+    # before deduplication.
+    output_hash = Column(String(64), ForeignKey("outputs.hash"), nullable=True, index=True)
+    _output_text = Column("output_text", Text, nullable=True)
+    tool_calls_json = Column(Text, nullable=True)  # Tool calls as JSON
+    _raw_response_json = Column("raw_response_json", CompressedText, nullable=True)  # Full response
+    raw_response_json = compressed_text("_raw_response_json")
+
     # Relationships
     test_definition = relationship("TestDefinition", back_populates="runs")
     results = relationship("TestResult", back_populates="test_run", cascade="all, delete-orphan")
+    output = relationship("OutputBlob")
+
+    @property
+    def output_text(self) -> str | None:
+        """Output text, from the outputs table or the legacy inline copy."""
+        return self.output.text if self.output is not None else self._output_text
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -116,12 +159,24 @@ class TestRun(Base):
             "provider": self.provider,
             "model": self.model,
             "latency_ms": self.latency_ms,
+            "ttft_ms": self.ttft_ms,
+            "tokens_per_second": self.tokens_per_second,
             "tokens_input": self.tokens_input,
             "tokens_output": self.tokens_output,
             "cost_usd": self.cost_usd,
             "error_message": self.error_message,
         }
 
+    def to_detail_dict(self) -> dict[str, Any]:
+        """Convert to dictionary including the output, tool calls, and raw response."""
+        return {
+            **self.to_dict(),
+            "output_text": self.output_text,
+            "output_hash": self.output_hash,
+            "tool_calls": json.loads(self.tool_calls_json) if self.tool_calls_json else None,
+            "raw_response": json.loads(self.raw_response_json) if self.raw_response_json else None,
+        }
+
 
 class TestResult(Base):
     """Individual assertion result for a test run."""
@@ -140,13 +195,21 @@ class TestResult(Base):
     actual_value = Column(Text, nullable=True)
     failure_reason = Column(Text, nullable=True)
 
-    # Output captured
-    output_text = Column(Text, nullable=True)
+    # Output captured (legacy per-assertion copy; new runs store it on TestRun)
+    output_hash = Column(String(64), ForeignKey("outputs.hash"), nullable=True)
+    _output_text = Column("output_text", Text, nullable=True)
     tool_calls_json = Column(Text, nullable=True)  # Tool calls as JSON
-    raw_response_json = Column(Text, nullable=True)  # Full response as JSON
+    _raw_response_json = Column("raw_response_json", CompressedText, nullable=True)  # Full response
+    raw_response_json = compressed_text("_raw_response_json")
 
     # Relationships
     test_run = relationship("TestRun", back_populates="results")
+    output = relationship("OutputBlob")
+
+    @property
+    def output_text(self) -> str | None:
+        """Output text, from the outputs table or the legacy inline copy."""
+        return self.output.text if self.output is not None else self._output_text
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -159,11 +222,85 @@ class TestResult(Base):
             "actual_value": self.actual_value,
             "failure_reason": self.failure_reason,
             "output_text": self.output_text,
+            "output_hash": self.output_hash,
             "tool_calls": json.loads(self.tool_calls_json) if self.tool_calls_json else None,
             "raw_response": json.loads(self.raw_response_json) if self.raw_response_json else None,
         }
 
 
+class OutputBlob(Base):
+    """Model output text stored once per distinct content (content-addressed)."""
+
+    __tablename__ = "outputs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 of the UTF-8 text
+    _text = Column("text", CompressedText, nullable=False)
+    text = compressed_text("_text")
+    size = Column(Integer, nullable=False)  # Length in characters
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Content hash identifying an output."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class OutputVector(Base):
+    """Similarity vector of a stored output, computed once per similarity backend."""
+
+    __tablename__ = "output_vectors"
+
+    output_hash = Column(String(64), ForeignKey("outputs.hash"), primary_key=True)
+    backend = Column(String(100), primary_key=True)  # SimilarityBackend.name
+    dimensions = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32, little-endian
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RunRollup(Base):
+    """Aggregated run metrics of one test and model over an hour or a day.
+
+    Maintained incrementally as runs finish, so trend queries read a few
+    rows per bucket instead of every run.
+    """
+
+    __tablename__ = "run_rollups"
+    __table_args__ = (
+        # One row per bucket; also serves range scans per test and model
+        Index(
+            "ix_run_rollups_bucket",
+            "test_definition_id",
+            "model",
+            "granularity",
+            "bucket_start",
+            unique=True,
+        ),
+        Index("ix_run_rollups_granularity_start", "granularity", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    test_definition_id = Column(Integer, ForeignKey("test_definitions.id"), nullable=False)
+    model = Column(String(100), nullable=False)
+    granularity = Column(String(10), nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False)  # UTC start of the hour or day
+
+    # Counts
+    run_count = Column(Integer, default=0, nullable=False)  # Finished runs
+    failed_count = Column(Integer, default=0, nullable=False)  # Runs with status failed
+    passed_count = Column(Integer, default=0, nullable=False)  # Completed, no failed assertion
+
+    # Sums of run metrics (runs without a value are not counted)
+    latency_count = Column(Integer, default=0, nullable=False)
+    latency_sum = Column(Float, default=0.0, nullable=False)
+    cost_count = Column(Integer, default=0, nullable=False)
+    cost_sum = Column(Float, default=0.0, nullable=False)
+    tokens_input_sum = Column(Integer, default=0, nullable=False)
+    tokens_output_sum = Column(Integer, default=0, nullable=False)
+
+    # QuantileSketch (JSON) of latency_ms
+    latency_sketch = Column(Text, nullable=True)
+
+
 class RecordingSession(Base):
     """Recording session for capturing agent interactions."""
 
@@ -181,6 +318,17 @@ class RecordingSession(Base):
     # Generated test (if converted to test)
     generated_test_id = Column(Integer, ForeignKey("test_definitions.id"), nullable=True)
 
+    # Number of events, maintained by RecordingRepository.add_event so listing
+    # sessions doesn't load every event
+    event_count = Column(Integer, default=0, nullable=False)
+
+    # Last assigned event sequence number (per-session counter)
+    last_sequence_number = Column(Integer, default=0, nullable=False)
+
+    # Incremental analysis state (RecordingAnalysisState as JSON), maintained
+    # by RecordingRepository.add_events
+    analysis_json = Column(Text, nullable=True)
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -199,7 +347,7 @@ class RecordingSession(Base):
             "stopped_at": self.stopped_at.isoformat() if self.stopped_at else None,
             "generated_test_id": self.generated_test_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "event_count": len(self.events) if self.events else 0,
+            "event_count": self.event_count or 0,
         }
 
 
@@ -207,6 +355,10 @@ class RecordingEvent(Base):
     """Individual event captured during a recording session."""
 
     __tablename__ = "recording_events"
+    __table_args__ = (
+        # Ordered event reads per session
+        Index("ix_recording_events_session_sequence", "recording_session_id", "sequence_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     recording_session_id = Column(
@@ -219,7 +371,8 @@ class RecordingEvent(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Event data (JSON-serialized)
-    data_json = Column(Text, nullable=False)
+    _data_json = Column("data_json", CompressedText, nullable=False)
+    data_json = compressed_text("_data_json")
 
     # Relationships
     session = relationship("RecordingSession", back_populates="events")
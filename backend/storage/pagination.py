@@ -0,0 +1,126 @@
+"""
+Keyset pagination cursors and cached row counts for list endpoints.
+
+Listings are ordered by ``(sort column, id)`` descending. A cursor encodes
+the last row of a page, so the next page is a range scan on the matching
+composite index instead of an OFFSET that reads and discards every
+preceding row.
+"""
+
+import base64
+import threading
+import time
+from collections.abc import Callable, Hashable
+from datetime import datetime
+
+# Seconds a cached total count stays valid without a write invalidating it
+COUNT_CACHE_TTL_SECONDS = 30.0
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the position after a row as an opaque cursor.
+
+    Args:
+        sort_value: Value of the row's sort column
+        row_id: Row ID (tie-breaker for equal sort values)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (sort value, row ID)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def next_cursor(rows: list, limit: int, sort_attr: str) -> str | None:
+    """Get the cursor for the page after `rows`, or None on the last page.
+
+    Args:
+        rows: Page of model instances
+        limit: Page size that was requested
+        sort_attr: Name of the sort column attribute
+
+    Returns:
+        Cursor string or None
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
+
+
+class CountCache:
+    """Process-wide cache of total row counts.
+
+    Counts are kept for `ttl` seconds and dropped as soon as a repository in
+    this process inserts or deletes rows of the table.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL_SECONDS):
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds before a cached count is recomputed
+        """
+        self.ttl = ttl
+        self._counts: dict[tuple[str, Hashable], tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, table: str, key: Hashable, compute: Callable[[], int]) -> int:
+        """Get a cached count, computing it on a miss.
+
+        Args:
+            table: Table the count is over (used for invalidation)
+            key: Filter the count applies to (e.g. a test ID, or None for all rows)
+            compute: Function running the COUNT query
+
+        Returns:
+            Row count
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get((table, key))
+        if cached is not None and now - cached[0] < self.ttl:
+            return cached[1]
+
+        count = compute()
+        with self._lock:
+            self._counts[(table, key)] = (now, count)
+        return count
+
+    def invalidate(self, *tables: str) -> None:
+        """Drop cached counts for the given tables.
+
+        Args:
+            tables: Table names
+        """
+        with self._lock:
+            for cache_key in [k for k in self._counts if k[0] in tables]:
+                del self._counts[cache_key]
+
+    def clear(self) -> None:
+        """Drop all cached counts."""
+        with self._lock:
+            self._counts.clear()
+
+
+count_cache = CountCache()
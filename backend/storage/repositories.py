@@ -4,12 +4,79 @@ Data access layer (repositories) for tests, runs, and recordings.
 
 import json
 from datetime import datetime
-from typing import Any
-
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
-
-from .models import RecordingEvent, RecordingSession, TestDefinition, TestResult, TestRun
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import desc, func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, selectinload
+
+from ..services.recording_analysis import RecordingAnalysisState
+from .models import (
+    OutputBlob,
+    OutputVector,
+    RecordingEvent,
+    RecordingSession,
+    RunRollup,
+    TestDefinition,
+    TestResult,
+    TestRun,
+)
+from .pagination import count_cache, decode_cursor
+from .sketch import QuantileSketch
+
+if TYPE_CHECKING:
+    from ..regression.similarity import SimilarityBackend
+
+# Bucket sizes of run rollups
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+FINISHED_STATUSES = ("completed", "failed")
+
+# IDs per IN (...) list, below the bound parameter limit of older SQLite builds
+IN_CLAUSE_CHUNK_SIZE = 900
+
+# Outputs vectorized per similarity backend call
+VECTOR_INDEX_BATCH_SIZE = 256
+
+# Summed columns of a rollup bucket
+ROLLUP_SUMS = (
+    "run_count",
+    "failed_count",
+    "passed_count",
+    "latency_count",
+    "latency_sum",
+    "cost_count",
+    "cost_sum",
+    "tokens_input_sum",
+    "tokens_output_sum",
+)
+
+
+def _keyset_page(query: Query, sort_column: Any, id_column: Any, cursor: str | None) -> Query:
+    """Order a query by (sort column, id) descending, starting after `cursor`.
+
+    Args:
+        query: Query to paginate
+        sort_column: Primary sort column
+        id_column: Primary key column (tie-breaker)
+        cursor: Cursor from the previous page, or None for the first page
+
+    Returns:
+        Ordered (and filtered) query
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    return query.order_by(desc(sort_column), desc(id_column))
+
+
+def _database_key(session: Session) -> str:
+    """Identify the database a session is bound to, for the count cache."""
+    return str(session.get_bind().url)
 
 
 class TestRepository:
@@ -36,6 +103,9 @@ class TestRepository:
     ) -> TestDefinition:
         """Create a new test definition.
 
+        A test already linked to `filename` (e.g. imported by the test file
+        sync after the file was saved) is updated instead.
+
         Args:
             name: Test name
             spec: Test specification (as dict)
@@ -47,22 +117,28 @@ class TestRepository:
             filename: Optional YAML filename in artifacts/tests/
 
         Returns:
-            Created test definition
+            Created (or updated) test definition
         """
-        test = TestDefinition(
-            name=name,
-            description=description,
-            category=category,
-            is_template=is_template,
-            filename=filename,
-            spec_json=json.dumps(spec),
-            spec_yaml=spec_yaml,
-            canvas_state=json.dumps(canvas_state) if canvas_state else None,
-            provider=spec.get("provider"),
-            model=spec.get("model"),
-        )
-        self.session.add(test)
+        test = self.get_by_filename(filename) if filename else None
+        if test is None:
+            test = TestDefinition(filename=filename)
+            self.session.add(test)
+        elif json.loads(test.spec_json) != spec:
+            test.version += 1
+            test.updated_at = datetime.utcnow()
+
+        test.name = name
+        test.description = description
+        test.category = category
+        test.is_template = is_template
+        test.spec_json = json.dumps(spec)
+        test.spec_yaml = spec_yaml
+        test.canvas_state = json.dumps(canvas_state) if canvas_state else None
+        test.provider = spec.get("provider")
+        test.model = spec.get("model")
+
         self.session.commit()
+        count_cache.invalidate("test_definitions")
         self.session.refresh(test)
         return test
 
@@ -88,22 +164,39 @@ class TestRepository:
         """
         return self.session.query(TestDefinition).filter(TestDefinition.name == name).first()
 
-    def get_all(self, limit: int = 100, offset: int = 0) -> list[TestDefinition]:
-        """Get all test definitions.
+    def get_all(
+        self, limit: int = 100, offset: int = 0, cursor: str | None = None
+    ) -> list[TestDefinition]:
+        """Get all test definitions, most recently updated first.
 
         Args:
             limit: Maximum number of tests to return
-            offset: Number of tests to skip
+            offset: Number of tests to skip (ignored when `cursor` is given)
+            cursor: Keyset cursor on (updated_at, id) from the previous page
 
         Returns:
             List of test definitions
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        return (
-            self.session.query(TestDefinition)
-            .order_by(desc(TestDefinition.updated_at))
-            .limit(limit)
-            .offset(offset)
-            .all()
+        query = _keyset_page(
+            self.session.query(TestDefinition), TestDefinition.updated_at, TestDefinition.id, cursor
+        )
+        if cursor is None:
+            query = query.offset(offset)
+        return query.limit(limit).all()
+
+    def count(self) -> int:
+        """Count all test definitions (cached, see CountCache).
+
+        Returns:
+            Number of test definitions
+        """
+        return count_cache.get(
+            "test_definitions",
+            _database_key(self.session),
+            lambda: self.session.query(func.count(TestDefinition.id)).scalar() or 0,
         )
 
     def get_by_filename(self, filename: str) -> TestDefinition | None:
@@ -119,6 +212,80 @@ class TestRepository:
             self.session.query(TestDefinition).filter(TestDefinition.filename == filename).first()
         )
 
+    def get_file_contents(self, filenames: set[str] | None = None) -> dict[str, str | None]:
+        """Get the YAML last synced from each linked test file.
+
+        Args:
+            filenames: Only these filenames (default: every test with a filename)
+
+        Returns:
+            Mapping of filename to stored spec_yaml
+        """
+        query = self.session.query(TestDefinition.filename, TestDefinition.spec_yaml).filter(
+            TestDefinition.filename.isnot(None)
+        )
+        if filenames is not None:
+            query = query.filter(TestDefinition.filename.in_(filenames))
+        return dict(query.all())
+
+    def sync_files(self, files: dict[str, tuple[dict[str, Any], str] | None]) -> tuple[int, int]:
+        """Upsert tests from YAML files and detach deleted files, in one transaction.
+
+        A test is matched to its file by filename. Files whose parsed spec
+        matches the stored spec (e.g. saved from the UI with a header
+        comment added) only refresh spec_yaml. Tests whose file was deleted
+        keep their run history: only the filename link is cleared.
+
+        Args:
+            files: Mapping of filename to (parsed spec, YAML content), or to
+                None for a deleted file
+
+        Returns:
+            Tuple of (tests created or updated, tests detached)
+        """
+        existing = {
+            test.filename: test
+            for test in self.session.query(TestDefinition).filter(
+                TestDefinition.filename.in_(files)
+            )
+        }
+        upserted = detached = 0
+        created = False
+
+        for filename, synced in files.items():
+            test = existing.get(filename)
+            if synced is None:
+                if test is not None:
+                    test.filename = None
+                    detached += 1
+                continue
+
+            spec, spec_yaml = synced
+            if test is None:
+                test = TestDefinition(filename=filename, version=1)
+                self.session.add(test)
+                created = True
+            elif json.loads(test.spec_json) == spec:
+                test.spec_yaml = spec_yaml  # Same spec, so later syncs skip the file unparsed
+                continue
+            else:
+                test.version += 1
+                test.updated_at = datetime.utcnow()
+
+            test.name = str(spec.get("name") or filename)
+            test.description = spec.get("description")
+            test.category = spec.get("category")
+            test.spec_json = json.dumps(spec)
+            test.spec_yaml = spec_yaml
+            test.provider = spec.get("provider")
+            test.model = spec.get("model")
+            upserted += 1
+
+        self.session.commit()
+        if created:
+            count_cache.invalidate("test_definitions")
+        return upserted, detached
+
     def update(
         self,
         test_id: int,
@@ -210,6 +377,7 @@ class TestRepository:
 
         self.session.delete(test)
         self.session.commit()
+        count_cache.invalidate("test_definitions", "test_runs")
         return True
 
 
@@ -248,9 +416,42 @@ class RunRepository:
         )
         self.session.add(run)
         self.session.commit()
+        count_cache.invalidate("test_runs")
         self.session.refresh(run)
         return run
 
+    @staticmethod
+    def _apply_status(
+        run: TestRun,
+        status: str,
+        latency_ms: int | None = None,
+        tokens_input: int | None = None,
+        tokens_output: int | None = None,
+        cost_usd: float | None = None,
+        error_message: str | None = None,
+        ttft_ms: int | None = None,
+        tokens_per_second: float | None = None,
+    ) -> None:
+        """Set status and metrics on a run without committing."""
+        run.status = status
+        if status in ("completed", "failed"):
+            run.completed_at = datetime.utcnow()
+
+        if latency_ms is not None:
+            run.latency_ms = latency_ms
+        if tokens_input is not None:
+            run.tokens_input = tokens_input
+        if tokens_output is not None:
+            run.tokens_output = tokens_output
+        if cost_usd is not None:
+            run.cost_usd = cost_usd
+        if error_message is not None:
+            run.error_message = error_message
+        if ttft_ms is not None:
+            run.ttft_ms = ttft_ms
+        if tokens_per_second is not None:
+            run.tokens_per_second = tokens_per_second
+
     def update_status(
         self,
         run_id: int,
@@ -260,6 +461,8 @@ class RunRepository:
         tokens_output: int | None = None,
         cost_usd: float | None = None,
         error_message: str | None = None,
+        ttft_ms: int | None = None,
+        tokens_per_second: float | None = None,
     ) -> TestRun | None:
         """Update test run status.
 
@@ -271,6 +474,8 @@ class RunRepository:
             tokens_output: Optional output tokens
             cost_usd: Optional cost in USD
             error_message: Optional error message
+            ttft_ms: Optional time to first token in milliseconds
+            tokens_per_second: Optional output decoding throughput
 
         Returns:
             Updated test run or None if not found
@@ -279,79 +484,207 @@ class RunRepository:
         if not run:
             return None
 
-        run.status = status
-        if status in ("completed", "failed"):
-            run.completed_at = datetime.utcnow()
-
-        if latency_ms is not None:
-            run.latency_ms = latency_ms
-        if tokens_input is not None:
-            run.tokens_input = tokens_input
-        if tokens_output is not None:
-            run.tokens_output = tokens_output
-        if cost_usd is not None:
-            run.cost_usd = cost_usd
-        if error_message is not None:
-            run.error_message = error_message
+        was_finished = run.status in FINISHED_STATUSES
+        self._apply_status(
+            run,
+            status,
+            latency_ms=latency_ms,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            cost_usd=cost_usd,
+            error_message=error_message,
+            ttft_ms=ttft_ms,
+            tokens_per_second=tokens_per_second,
+        )
+        if status in FINISHED_STATUSES and not was_finished:
+            # Results may have been stored one by one before the status update
+            passed = self.session.query(TestResult.passed).filter(TestResult.test_run_id == run_id)
+            RollupRepository(self.session).add_run(run, passed=all(p for (p,) in passed))
 
         self.session.commit()
         self.session.refresh(run)
         return run
 
-    def get_by_id(self, run_id: int) -> TestRun | None:
+    def get_by_id(self, run_id: int, with_output: bool = False) -> TestRun | None:
         """Get test run by ID.
 
         Args:
             run_id: Run ID
+            with_output: Also load the output text
 
         Returns:
             Test run or None if not found
         """
-        return self.session.query(TestRun).filter(TestRun.id == run_id).first()
+        query = self.session.query(TestRun)
+        if with_output:
+            query = query.options(selectinload(TestRun.output))
+        return query.filter(TestRun.id == run_id).first()
 
     def get_by_test(
         self,
         test_definition_id: int,
         limit: int = 50,
         offset: int = 0,
+        cursor: str | None = None,
     ) -> list[TestRun]:
-        """Get runs for a specific test.
+        """Get runs for a specific test, newest first.
 
         Args:
             test_definition_id: Test definition ID
             limit: Maximum number of runs to return
-            offset: Number of runs to skip
+            offset: Number of runs to skip (ignored when `cursor` is given)
+            cursor: Keyset cursor on (started_at, id) from the previous page
 
         Returns:
             List of test runs
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = _keyset_page(
+            self.session.query(TestRun).filter(TestRun.test_definition_id == test_definition_id),
+            TestRun.started_at,
+            TestRun.id,
+            cursor,
+        )
+        if cursor is None:
+            query = query.offset(offset)
+        return query.limit(limit).all()
+
+    def get_completed_by_test(self, test_definition_id: int, limit: int = 100) -> list[TestRun]:
+        """Get the latest completed runs of a test with their outputs and results loaded.
+
+        Args:
+            test_definition_id: Test definition ID
+            limit: Maximum number of runs to return
+
+        Returns:
+            List of completed test runs, newest first
         """
         return (
             self.session.query(TestRun)
+            .options(
+                selectinload(TestRun.output),
+                selectinload(TestRun.results).selectinload(TestResult.output),
+            )
             .filter(TestRun.test_definition_id == test_definition_id)
-            .order_by(desc(TestRun.started_at))
+            .filter(TestRun.status == "completed")
+            .order_by(desc(TestRun.started_at), desc(TestRun.id))
             .limit(limit)
-            .offset(offset)
             .all()
         )
 
-    def get_all(self, limit: int = 100, offset: int = 0) -> list[TestRun]:
-        """Get all test runs.
+    def get_history_by_test(
+        self, test_definition_id: int, limit_per_model: int = 100, model: str | None = None
+    ) -> list[TestRun]:
+        """Get the latest finished runs of a test for each provider and model.
 
         Args:
-            limit: Maximum number of runs to return
-            offset: Number of runs to skip
+            test_definition_id: Test definition ID
+            limit_per_model: Maximum number of runs per (provider, model)
+            model: Only return runs of this model
 
         Returns:
-            List of test runs
+            Completed and failed runs with their results loaded, grouped by
+            provider and model, newest first within each group
         """
+        order = (desc(TestRun.started_at), desc(TestRun.id))
+        ranked = (
+            self.session.query(
+                TestRun.id.label("run_id"),
+                func.row_number()
+                .over(partition_by=(TestRun.provider, TestRun.model), order_by=order)
+                .label("position"),
+            )
+            .filter(TestRun.test_definition_id == test_definition_id)
+            .filter(TestRun.status.in_(("completed", "failed")))
+        )
+        if model is not None:
+            ranked = ranked.filter(TestRun.model == model)
+        ranked = ranked.subquery()
+
         return (
             self.session.query(TestRun)
-            .order_by(desc(TestRun.started_at))
-            .limit(limit)
-            .offset(offset)
+            .options(selectinload(TestRun.results))
+            .join(ranked, ranked.c.run_id == TestRun.id)
+            .filter(ranked.c.position <= limit_per_model)
+            .order_by(TestRun.provider, TestRun.model, *order)
             .all()
         )
 
+    def get_all(
+        self, limit: int = 100, offset: int = 0, cursor: str | None = None
+    ) -> list[TestRun]:
+        """Get all test runs, newest first.
+
+        Args:
+            limit: Maximum number of runs to return
+            offset: Number of runs to skip (ignored when `cursor` is given)
+            cursor: Keyset cursor on (started_at, id) from the previous page
+
+        Returns:
+            List of test runs
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = _keyset_page(self.session.query(TestRun), TestRun.started_at, TestRun.id, cursor)
+        if cursor is None:
+            query = query.offset(offset)
+        return query.limit(limit).all()
+
+    def count(self, test_definition_id: int | None = None) -> int:
+        """Count test runs (cached, see CountCache).
+
+        Args:
+            test_definition_id: Only count runs of this test
+
+        Returns:
+            Number of runs
+        """
+
+        def compute() -> int:
+            query = self.session.query(func.count(TestRun.id))
+            if test_definition_id is not None:
+                query = query.filter(TestRun.test_definition_id == test_definition_id)
+            return query.scalar() or 0
+
+        return count_cache.get(
+            "test_runs", (_database_key(self.session), test_definition_id), compute
+        )
+
+    def _store_output(self, output_text: str | None) -> OutputBlob | None:
+        """Store output text once per distinct content.
+
+        Args:
+            output_text: Output text
+
+        Returns:
+            The (possibly pre-existing) output blob, or None for no output
+        """
+        if output_text is None:
+            return None
+        digest = OutputBlob.hash_text(output_text)
+        blob = self.session.get(OutputBlob, digest)
+        if blob is not None:
+            return blob
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Concurrent writers of the same output must not collide on the key
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            self.session.execute(
+                insert(OutputBlob)
+                .values(hash=digest, _text=output_text, size=len(output_text))
+                .on_conflict_do_nothing(index_elements=["hash"])
+            )
+            return self.session.get(OutputBlob, digest)
+
+        blob = OutputBlob(hash=digest, size=len(output_text))
+        blob.text = output_text
+        self.session.add(blob)
+        return blob
+
     def create_result(
         self,
         run_id: int,
@@ -387,7 +720,7 @@ class RunRepository:
             passed=passed,
             actual_value=actual_value,
             failure_reason=failure_reason,
-            output_text=output_text,
+            output=self._store_output(output_text),
             tool_calls_json=json.dumps(tool_calls) if tool_calls else None,
             raw_response_json=json.dumps(raw_response) if raw_response else None,
         )
@@ -396,6 +729,207 @@ class RunRepository:
         self.session.refresh(result)
         return result
 
+    def create_results_bulk(
+        self,
+        run_id: int,
+        results: list[dict[str, Any]],
+        status: str,
+        output_text: str | None = None,
+        tool_calls: list[dict[str, Any]] | None = None,
+        raw_response: dict[str, Any] | None = None,
+        latency_ms: int | None = None,
+        tokens_input: int | None = None,
+        tokens_output: int | None = None,
+        cost_usd: float | None = None,
+        error_message: str | None = None,
+        ttft_ms: int | None = None,
+        tokens_per_second: float | None = None,
+    ) -> TestRun | None:
+        """Complete a run with all of its assertion results in one transaction.
+
+        The output, tool calls and raw response are stored once on the run
+        instead of on every assertion result. The test's last_run_at is
+        updated in the same commit.
+
+        Args:
+            run_id: Test run ID
+            results: Assertion results, each a dict with assertion_type and
+                passed, and optionally assertion_value, actual_value and
+                failure_reason
+            status: New status (completed, failed)
+            output_text: Optional output text
+            tool_calls: Optional tool calls
+            raw_response: Optional raw response
+            latency_ms: Optional latency in milliseconds
+            tokens_input: Optional input tokens
+            tokens_output: Optional output tokens
+            cost_usd: Optional cost in USD
+            error_message: Optional error message
+            ttft_ms: Optional time to first token in milliseconds
+            tokens_per_second: Optional output decoding throughput
+
+        Returns:
+            Updated test run or None if not found
+        """
+        run = self.session.query(TestRun).filter(TestRun.id == run_id).first()
+        if not run:
+            return None
+
+        was_finished = run.status in FINISHED_STATUSES
+        self._apply_status(
+            run,
+            status,
+            latency_ms=latency_ms,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            cost_usd=cost_usd,
+            error_message=error_message,
+            ttft_ms=ttft_ms,
+            tokens_per_second=tokens_per_second,
+        )
+        if status in FINISHED_STATUSES and not was_finished:
+            RollupRepository(self.session).add_run(
+                run, passed=all(result["passed"] for result in results)
+            )
+        run.output = self._store_output(output_text)
+        run.tool_calls_json = json.dumps(tool_calls) if tool_calls else None
+        run.raw_response_json = json.dumps(raw_response) if raw_response else None
+
+        self.session.add_all(
+            TestResult(
+                test_run_id=run_id,
+                assertion_type=result["assertion_type"],
+                assertion_value=result.get("assertion_value"),
+                passed=result["passed"],
+                actual_value=result.get("actual_value"),
+                failure_reason=result.get("failure_reason"),
+            )
+            for result in results
+        )
+        self.session.query(TestDefinition).filter(
+            TestDefinition.id == run.test_definition_id
+        ).update({TestDefinition.last_run_at: datetime.utcnow()}, synchronize_session=False)
+
+        self.session.commit()
+        return run
+
+    def get_metrics_by_ids(self, run_ids: list[int]) -> list[dict[str, Any]]:
+        """Get the status and metrics of many runs, with their test's name.
+
+        Only metric columns are read (no outputs or raw responses), in one
+        query per IN_CLAUSE_CHUNK_SIZE IDs.
+
+        Args:
+            run_ids: Run IDs (missing IDs are skipped)
+
+        Returns:
+            Run dicts with the metric keys of TestRun.to_dict() plus test_name
+        """
+        columns = (
+            TestRun.id,
+            TestRun.test_definition_id,
+            TestRun.started_at,
+            TestRun.completed_at,
+            TestRun.status,
+            TestRun.provider,
+            TestRun.model,
+            TestRun.latency_ms,
+            TestRun.ttft_ms,
+            TestRun.tokens_per_second,
+            TestRun.tokens_input,
+            TestRun.tokens_output,
+            TestRun.cost_usd,
+            TestRun.error_message,
+        )
+        runs = []
+        ids = sorted(set(run_ids))
+        for i in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = (
+                self.session.query(*columns, TestDefinition.name.label("test_name"))
+                .join(TestDefinition, TestDefinition.id == TestRun.test_definition_id)
+                .filter(TestRun.id.in_(ids[i : i + IN_CLAUSE_CHUNK_SIZE]))
+                .all()
+            )
+            for row in rows:
+                run = row._asdict()
+                for key in ("started_at", "completed_at"):
+                    run[key] = run[key].isoformat() if run[key] else None
+                runs.append(run)
+        return runs
+
+    def get_output_hashes_by_test(
+        self, test_definition_id: int, model: str | None = None, limit: int = 1000
+    ) -> list[dict[str, Any]]:
+        """Get the latest finished runs of a test that have a stored output.
+
+        Only run metadata and output hashes are read, not the outputs.
+
+        Args:
+            test_definition_id: Test definition ID
+            model: Only return runs of this model
+            limit: Maximum number of runs to return
+
+        Returns:
+            Dicts with id, provider, model, status, started_at (ISO format)
+            and output_hash, newest first
+        """
+        query = self.session.query(
+            TestRun.id,
+            TestRun.provider,
+            TestRun.model,
+            TestRun.status,
+            TestRun.started_at,
+            TestRun.output_hash,
+        ).filter(
+            TestRun.test_definition_id == test_definition_id,
+            TestRun.status.in_(FINISHED_STATUSES),
+            TestRun.output_hash.is_not(None),
+        )
+        if model is not None:
+            query = query.filter(TestRun.model == model)
+        rows = query.order_by(desc(TestRun.started_at), desc(TestRun.id)).limit(limit).all()
+
+        runs = []
+        for row in rows:
+            run = row._asdict()
+            run["started_at"] = run["started_at"].isoformat() if run["started_at"] else None
+            runs.append(run)
+        return runs
+
+    def get_assertion_results_by_runs(self, run_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        """Get the assertion outcomes of many runs.
+
+        Only assertion columns are read (no outputs), in one query per
+        IN_CLAUSE_CHUNK_SIZE IDs.
+
+        Args:
+            run_ids: Run IDs
+
+        Returns:
+            Result dicts (assertion_type, assertion_value, passed, actual_value,
+            failure_reason) by run ID, in insertion order
+        """
+        columns = (
+            TestResult.assertion_type,
+            TestResult.assertion_value,
+            TestResult.passed,
+            TestResult.actual_value,
+            TestResult.failure_reason,
+        )
+        results: dict[int, list[dict[str, Any]]] = {}
+        ids = sorted(set(run_ids))
+        for i in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = (
+                self.session.query(TestResult.test_run_id, *columns)
+                .filter(TestResult.test_run_id.in_(ids[i : i + IN_CLAUSE_CHUNK_SIZE]))
+                .order_by(TestResult.id)
+                .all()
+            )
+            for row in rows:
+                result = row._asdict()
+                results.setdefault(result.pop("test_run_id"), []).append(result)
+        return results
+
     def get_results_by_run(self, run_id: int) -> list[TestResult]:
         """Get all results for a test run.
 
@@ -403,9 +937,327 @@ class RunRepository:
             run_id: Run ID
 
         Returns:
-            List of test results
+            List of test results (with the per-result outputs of older runs loaded)
+        """
+        return (
+            self.session.query(TestResult)
+            .options(selectinload(TestResult.output))
+            .filter(TestResult.test_run_id == run_id)
+            .all()
+        )
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its rollup bucket.
+
+    Raises:
+        ValueError: If the granularity is not hour or day
+    """
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Invalid granularity: {granularity} (use one of {ROLLUP_GRANULARITIES})")
+
+
+class RollupRepository:
+    """Repository for run metric rollups (hourly and daily buckets)."""
+
+    def __init__(self, session: Session):
+        """Initialize repository.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def _get_or_create(
+        self, test_definition_id: int, model: str, granularity: str, start: datetime
+    ) -> RunRollup:
+        """Get a bucket row for update, creating it when missing."""
+        key = {
+            "test_definition_id": test_definition_id,
+            "model": model,
+            "granularity": granularity,
+            "bucket_start": start,
+        }
+        query = self.session.query(RunRollup).filter_by(**key).with_for_update()
+        rollup = query.first()
+        if rollup is not None:
+            return rollup
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Runs finishing concurrently in a new bucket must not collide on the key
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            self.session.execute(
+                insert(RunRollup)
+                .values(**key, **dict.fromkeys(ROLLUP_SUMS, 0))
+                .on_conflict_do_nothing()
+            )
+            return query.one()
+
+        rollup = RunRollup(**key, **dict.fromkeys(ROLLUP_SUMS, 0))
+        self.session.add(rollup)
+        return rollup
+
+    @staticmethod
+    def _accumulate(
+        totals: dict[str, Any],
+        sketch: QuantileSketch,
+        status: str,
+        passed: bool,
+        latency_ms: int | None,
+        cost_usd: float | None,
+        tokens_input: int | None,
+        tokens_output: int | None,
+    ) -> None:
+        """Add one finished run to bucket totals and a latency sketch."""
+        totals["run_count"] += 1
+        if status == "failed":
+            totals["failed_count"] += 1
+        elif passed:
+            totals["passed_count"] += 1
+        if latency_ms is not None:
+            totals["latency_count"] += 1
+            totals["latency_sum"] += latency_ms
+            sketch.add(latency_ms)
+        if cost_usd is not None:
+            totals["cost_count"] += 1
+            totals["cost_sum"] += cost_usd
+        totals["tokens_input_sum"] += tokens_input or 0
+        totals["tokens_output_sum"] += tokens_output or 0
+
+    def add_run(self, run: TestRun, passed: bool) -> None:
+        """Add a finished run to its hourly and daily buckets (without committing).
+
+        Args:
+            run: Run that just finished
+            passed: Whether none of the run's assertions failed
+        """
+        started_at = run.started_at or datetime.utcnow()
+        for granularity in ROLLUP_GRANULARITIES:
+            rollup = self._get_or_create(
+                run.test_definition_id,
+                run.model,
+                granularity,
+                bucket_start(started_at, granularity),
+            )
+            totals = {column: getattr(rollup, column) or 0 for column in ROLLUP_SUMS}
+            sketch = QuantileSketch.from_json(rollup.latency_sketch)
+            self._accumulate(
+                totals,
+                sketch,
+                run.status,
+                passed,
+                run.latency_ms,
+                run.cost_usd,
+                run.tokens_input,
+                run.tokens_output,
+            )
+            for column, value in totals.items():
+                setattr(rollup, column, value)
+            rollup.latency_sketch = sketch.to_json()
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """Recompute every bucket from the finished runs.
+
+        Used once to backfill databases that have runs from before rollups
+        existed. Run columns are streamed without loading run objects, and
+        buckets are written with one bulk insert.
+
+        Args:
+            batch_size: Runs fetched per round trip
+
+        Returns:
+            Number of runs aggregated
+        """
+        # One pass over the failed results (a correlated EXISTS per run is far slower)
+        failed_runs = select(TestResult.test_run_id).where(TestResult.passed.is_(False))
+        rows = (
+            self.session.query(
+                TestRun.test_definition_id,
+                TestRun.model,
+                TestRun.started_at,
+                TestRun.status,
+                TestRun.id.not_in(failed_runs),
+                TestRun.latency_ms,
+                TestRun.cost_usd,
+                TestRun.tokens_input,
+                TestRun.tokens_output,
+            )
+            .filter(TestRun.status.in_(FINISHED_STATUSES))
+            .yield_per(batch_size)
+        )
+
+        buckets: dict[tuple[Any, ...], tuple[dict[str, Any], QuantileSketch]] = {}
+        total = 0
+        for test_definition_id, model, started_at, *metrics in rows:
+            for granularity in ROLLUP_GRANULARITIES:
+                key = (
+                    test_definition_id,
+                    model,
+                    granularity,
+                    bucket_start(started_at, granularity),
+                )
+                if key not in buckets:
+                    buckets[key] = (dict.fromkeys(ROLLUP_SUMS, 0), QuantileSketch())
+                self._accumulate(*buckets[key], *metrics)
+            total += 1
+
+        self.session.query(RunRollup).delete(synchronize_session=False)
+        if buckets:
+            self.session.execute(
+                RunRollup.__table__.insert(),
+                [
+                    {
+                        "test_definition_id": test_definition_id,
+                        "model": model,
+                        "granularity": granularity,
+                        "bucket_start": start,
+                        **totals,
+                        "latency_sketch": sketch.to_json(),
+                    }
+                    for (test_definition_id, model, granularity, start), (
+                        totals,
+                        sketch,
+                    ) in buckets.items()
+                ],
+            )
+        self.session.commit()
+        return total
+
+    def get_buckets(
+        self,
+        granularity: str = "day",
+        test_definition_id: int | None = None,
+        model: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[RunRollup]:
+        """Get rollup buckets in a time range.
+
+        Args:
+            granularity: Bucket size (hour or day)
+            test_definition_id: Only buckets of this test
+            model: Only buckets of this model
+            start: Earliest bucket start (inclusive)
+            end: Latest bucket start (exclusive)
+
+        Returns:
+            Buckets ordered by test, model and bucket start
         """
-        return self.session.query(TestResult).filter(TestResult.test_run_id == run_id).all()
+        query = self.session.query(RunRollup).filter(RunRollup.granularity == granularity)
+        if test_definition_id is not None:
+            query = query.filter(RunRollup.test_definition_id == test_definition_id)
+        if model is not None:
+            query = query.filter(RunRollup.model == model)
+        if start is not None:
+            query = query.filter(RunRollup.bucket_start >= start)
+        if end is not None:
+            query = query.filter(RunRollup.bucket_start < end)
+        return query.order_by(
+            RunRollup.test_definition_id, RunRollup.model, RunRollup.bucket_start
+        ).all()
+
+
+class OutputVectorRepository:
+    """Repository for the similarity vectors of stored outputs (the vector index)."""
+
+    def __init__(self, session: Session):
+        """Initialize repository.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def _indexed_hashes(self, hashes: list[str], backend_name: str) -> set[str]:
+        """Hashes among `hashes` that already have a vector for the backend."""
+        indexed = set()
+        for i in range(0, len(hashes), IN_CLAUSE_CHUNK_SIZE):
+            indexed.update(
+                self.session.scalars(
+                    select(OutputVector.output_hash).where(
+                        OutputVector.backend == backend_name,
+                        OutputVector.output_hash.in_(hashes[i : i + IN_CLAUSE_CHUNK_SIZE]),
+                    )
+                )
+            )
+        return indexed
+
+    def _insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert vectors, skipping ones a concurrent request already stored."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            self.session.execute(
+                insert(OutputVector)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["output_hash", "backend"])
+            )
+        else:
+            self.session.add_all(OutputVector(**row) for row in rows)
+
+    def index_outputs(self, hashes: list[str], backend: "SimilarityBackend") -> int:
+        """Vectorize the stored outputs that have no vector for a backend yet.
+
+        Args:
+            hashes: Output hashes (unknown hashes are skipped)
+            backend: Similarity backend
+
+        Returns:
+            Number of outputs vectorized
+        """
+        missing = sorted(set(hashes) - self._indexed_hashes(sorted(set(hashes)), backend.name))
+        indexed = 0
+        for i in range(0, len(missing), VECTOR_INDEX_BATCH_SIZE):
+            blobs = (
+                self.session.query(OutputBlob)
+                .filter(OutputBlob.hash.in_(missing[i : i + VECTOR_INDEX_BATCH_SIZE]))
+                .all()
+            )
+            if not blobs:
+                continue
+            vectors = backend.embed([blob.text for blob in blobs])
+            self._insert(
+                [
+                    {
+                        "output_hash": blob.hash,
+                        "backend": backend.name,
+                        "dimensions": backend.dimensions,
+                        "vector": vector.astype("<f4").tobytes(),
+                        "created_at": datetime.utcnow(),
+                    }
+                    for blob, vector in zip(blobs, vectors, strict=True)
+                ]
+            )
+            self.session.commit()
+            indexed += len(blobs)
+        return indexed
+
+    def get_vectors(self, hashes: list[str], backend_name: str) -> dict[str, np.ndarray]:
+        """Get the cached vectors of outputs.
+
+        Args:
+            hashes: Output hashes
+            backend_name: SimilarityBackend.name
+
+        Returns:
+            float32 vectors by output hash (outputs without a vector are missing)
+        """
+        vectors = {}
+        unique = sorted(set(hashes))
+        for i in range(0, len(unique), IN_CLAUSE_CHUNK_SIZE):
+            rows = self.session.execute(
+                select(OutputVector.output_hash, OutputVector.vector).where(
+                    OutputVector.backend == backend_name,
+                    OutputVector.output_hash.in_(unique[i : i + IN_CLAUSE_CHUNK_SIZE]),
+                )
+            )
+            for output_hash, vector in rows:
+                vectors[output_hash] = np.frombuffer(vector, dtype="<f4")
+        return vectors
 
 
 class RecordingRepository:
@@ -534,25 +1386,112 @@ class RecordingRepository:
         Returns:
             Created recording event
         """
-        # Get the current sequence number
-        max_seq = (
-            self.session.query(RecordingEvent.sequence_number)
-            .filter(RecordingEvent.recording_session_id == session_id)
-            .order_by(desc(RecordingEvent.sequence_number))
-            .first()
-        )
-        next_seq = (max_seq[0] + 1) if max_seq else 1
+        (event,) = self.add_events(session_id, [(event_type, data)])
+        return event
 
-        event = RecordingEvent(
-            recording_session_id=session_id,
-            event_type=event_type,
-            sequence_number=next_seq,
-            data_json=json.dumps(data),
+    def add_events(
+        self,
+        session_id: int,
+        events: list[tuple[str, dict[str, Any]]],
+    ) -> list[RecordingEvent]:
+        """Add a batch of events to a recording session in one transaction.
+
+        Sequence numbers are reserved by atomically advancing the session's
+        counter, so concurrent writers never get the same numbers.
+
+        Args:
+            session_id: Recording session ID
+            events: (event_type, data) pairs in recording order
+
+        Returns:
+            Created recording events
+
+        Raises:
+            ValueError: If the recording session does not exist
+        """
+        if not events:
+            return []
+
+        last_seq = self.session.execute(
+            update(RecordingSession)
+            .where(RecordingSession.id == session_id)
+            .values(
+                last_sequence_number=RecordingSession.last_sequence_number + len(events),
+                event_count=RecordingSession.event_count + len(events),
+            )
+            .returning(RecordingSession.last_sequence_number)
+        ).scalar_one_or_none()
+        if last_seq is None:
+            self.session.rollback()
+            raise ValueError(f"Recording session {session_id} not found")
+
+        # The counter update above holds the session's write lock, so the
+        # read-modify-write of the analysis state is serialized too
+        first_seq = last_seq - len(events) + 1
+        analysis = self._load_analysis(session_id, existing_events=first_seq - 1)
+        for event_type, data in events:
+            analysis.apply(event_type, data)
+        self.session.query(RecordingSession).filter(RecordingSession.id == session_id).update(
+            {RecordingSession.analysis_json: analysis.to_json()}
         )
-        self.session.add(event)
+
+        created = [
+            RecordingEvent(
+                recording_session_id=session_id,
+                event_type=event_type,
+                sequence_number=first_seq + i,
+                data_json=json.dumps(data),
+            )
+            for i, (event_type, data) in enumerate(events)
+        ]
+        self.session.add_all(created)
         self.session.commit()
-        self.session.refresh(event)
-        return event
+        return created
+
+    def _load_analysis(self, session_id: int, existing_events: int) -> RecordingAnalysisState:
+        """Load a session's analysis state, rebuilding it for older recordings.
+
+        Args:
+            session_id: Recording session ID
+            existing_events: Number of events the session had before this write
+
+        Returns:
+            Analysis state
+        """
+        stored = (
+            self.session.query(RecordingSession.analysis_json)
+            .filter(RecordingSession.id == session_id)
+            .scalar()
+        )
+        if stored:
+            return RecordingAnalysisState.from_json(stored)
+        if existing_events == 0:
+            return RecordingAnalysisState()
+        # Recorded before analysis state was stored
+        return RecordingAnalysisState.from_events(
+            [event.to_dict() for event in self.get_events(session_id)]
+        )
+
+    def get_analysis(self, session_id: int) -> RecordingAnalysisState | None:
+        """Get the incremental analysis state of a recording session.
+
+        Args:
+            session_id: Recording session ID
+
+        Returns:
+            Analysis state or None if the session is not found
+        """
+        recording = self.get_session_by_id(session_id)
+        if not recording:
+            return None
+        if recording.analysis_json:
+            return RecordingAnalysisState.from_json(recording.analysis_json)
+
+        analysis = self._load_analysis(session_id, existing_events=recording.event_count or 0)
+        if analysis.event_count:
+            recording.analysis_json = analysis.to_json()
+            self.session.commit()
+        return analysis
 
     def get_events(self, session_id: int) -> list[RecordingEvent]:
         """Get all events for a recording session.
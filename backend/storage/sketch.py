@@ -0,0 +1,119 @@
+"""
+Mergeable quantile sketch for metric rollups.
+
+QuantileSketch is a DDSketch: values are counted in logarithmically sized
+bins, so any quantile is estimated within a fixed relative error, and two
+sketches merge by adding bin counts. Rollup buckets store one sketch each;
+a p95 over months of runs is the merge of the daily sketches.
+"""
+
+import json
+import math
+
+# Relative error of quantile estimates (1%)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Values at or below this are counted as zero
+SKETCH_MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """DDSketch over non-negative values with bounded relative error."""
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Relative error of quantile estimates
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value (negative values are counted as zero)."""
+        if value <= SKETCH_MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the values of another sketch with the same accuracy.
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Estimated value, or None for an empty sketch
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: list[float]) -> list[float | None]:
+        """Estimate several quantiles in one pass over the bins.
+
+        Args:
+            qs: Quantiles between 0 and 1
+
+        Returns:
+            Estimated values in the order of qs (None for an empty sketch)
+        """
+        if self.count == 0:
+            return [None] * len(qs)
+        ranks = sorted((q * (self.count - 1), i) for i, q in enumerate(qs))
+        values: list[float | None] = [None] * len(qs)
+        done = 0  # Ranks assigned so far
+
+        seen = self.zero_count
+        while done < len(ranks) and ranks[done][0] < seen:
+            values[ranks[done][1]] = 0.0
+            done += 1
+        for index in sorted(self.bins):
+            if done == len(ranks):
+                break
+            seen += self.bins[index]
+            while done < len(ranks) and ranks[done][0] < seen:
+                values[ranks[done][1]] = 2 * self.gamma**index / (self.gamma + 1)
+                done += 1
+        return values
+
+    def to_json(self) -> str:
+        """Serialize the sketch (bin counts as a dense list from the lowest bin)."""
+        offset = min(self.bins, default=0)
+        counts = [0] * (max(self.bins, default=-1) - offset + 1)
+        for index, count in self.bins.items():
+            counts[index - offset] = count
+        return json.dumps(
+            {"a": self.relative_accuracy, "z": self.zero_count, "o": offset, "c": counts},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str | None) -> "QuantileSketch":
+        """Deserialize a sketch (None gives an empty sketch)."""
+        if not data:
+            return cls()
+        state = json.loads(data)
+        sketch = cls(state["a"])
+        offset = state["o"]
+        sketch.bins = {offset + i: count for i, count in enumerate(state["c"]) if count}
+        sketch.zero_count = state["z"]
+        sketch.count = sketch.zero_count + sum(state["c"])
+        return sketch
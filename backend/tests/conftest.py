@@ -0,0 +1,23 @@
+"""
+Shared fixtures for backend tests.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Create a test client backed by a temporary database.
+
+    Test file sync is disabled, so the app does not import artifacts/tests/.
+    """
+    from backend.main import app
+    from backend.storage.database import get_database, reset_database
+
+    monkeypatch.setenv("SENTINEL_TEST_FILE_SYNC", "0")
+    reset_database()
+    get_database(f"sqlite:///{tmp_path / 'api.db'}")
+    with TestClient(app) as client:
+        yield client
+    reset_database()
@@ -0,0 +1,95 @@
+"""
+Tests for the streaming execution endpoint.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend.main import app
+from backend.providers.base import StreamEvent
+from backend.storage import RunRepository, TestRepository
+
+SPEC = {
+    "name": "Streamed",
+    "model": "gpt-5-nano",
+    "inputs": {"query": "hi"},
+    "assertions": [{"max_latency_ms": 60000}],
+}
+
+
+class _FakeExecutor:
+    """Executor streaming canned events from an OpenAI model."""
+
+    def __init__(self, events: list[StreamEvent]):
+        self.events = events
+
+    def _get_provider_for_model(self, model):
+        return SimpleNamespace(provider_name="openai")
+
+    async def stream(self, spec, cache_mode=None):
+        for event in self.events:
+            yield event
+
+
+def _events(response) -> list[tuple[str, dict]]:
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+class TestExecuteStream:
+    """Tests for POST /api/execution/execute-stream."""
+
+    @pytest.fixture
+    def test_id(self, client) -> int:
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        test_id = TestRepository(session).create(name="streamed", spec=SPEC).id
+        session.close()
+        return test_id
+
+    def _run_status(self, test_id: int) -> str:
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        (run,) = RunRepository(session).get_by_test(test_id)
+        status = run.status
+        session.close()
+        return status
+
+    def test_stream_without_done_event(self, client, test_id, monkeypatch):
+        """Test a stream ending without a result reports an error and fails the run."""
+        monkeypatch.setattr(
+            app.state, "executor", _FakeExecutor([StreamEvent(type="delta", text="partial")])
+        )
+
+        response = client.post(
+            "/api/execution/execute-stream", json={"test_spec": SPEC, "test_id": test_id}
+        )
+
+        events = _events(response)
+        assert [name for name, _ in events] == ["first_token", "delta", "error"]
+        assert "without a result" in events[-1][1]["detail"]
+        assert self._run_status(test_id) == "failed"
+
+    def test_cancelled_stream_uses_resolved_provider(self, client, test_id, monkeypatch):
+        """Test a cancelled stream reports the provider serving the model."""
+        monkeypatch.setattr(
+            app.state, "executor", _FakeExecutor([StreamEvent(type="delta", text="a secret")])
+        )
+        spec = {**SPEC, "assertions": [{"must_not_contain": "secret"}]}
+
+        response = client.post(
+            "/api/execution/execute-stream", json={"test_spec": spec, "test_id": test_id}
+        )
+
+        name, data = _events(response)[-1]
+        assert name == "result"
+        assert data["cancelled"] is True
+        assert data["result"]["provider"] == "openai"
+        assert self._run_status(test_id) == "failed"
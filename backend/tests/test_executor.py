@@ -2,10 +2,59 @@
 Tests for test executor.
 """
 
+import asyncio
+import time
+
 import pytest
 
-from backend.core.schema import InputSpec, TestSpec
-from backend.executor import ExecutorConfig, TestExecutor
+from backend.core.schema import InputSpec, TestSpec, TestSuite
+from backend.executor import CacheMissError, ExecutorConfig, ResponseCache, TestExecutor
+from backend.providers.base import ExecutionResult, ModelProvider, ProviderConfig, StreamEvent
+
+
+class FakeProvider(ModelProvider):
+    """Provider that records concurrency instead of calling an API."""
+
+    def __init__(self, name: str = "anthropic", delay: float = 0.01):
+        super().__init__(ProviderConfig(api_key="fake"))
+        self.name = name
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    @property
+    def provider_name(self) -> str:
+        return self.name
+
+    def list_models(self) -> list[str]:
+        return []
+
+    async def execute(
+        self, model, messages, temperature=0.7, max_tokens=None, tools=None, **kwargs
+    ):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return ExecutionResult(
+            success=True,
+            output=messages[-1]["content"],
+            model=model,
+            provider=self.name,
+            latency_ms=int(self.delay * 1000),
+        )
+
+
+def make_spec(name: str, model: str = "claude-sonnet-4-5-20250929") -> TestSpec:
+    """Create a minimal test spec."""
+    return TestSpec(
+        name=name,
+        model=model,
+        inputs=InputSpec(query=name),
+        assertions=[{"must_contain": name}],
+    )
 
 
 class TestExecutorConfig:
@@ -112,3 +161,249 @@ class TestTestExecutor:
         # Should return error result, not raise exception
         assert result.success is False
         assert result.error is not None
+
+
+class TestExecuteSuite:
+    """Test concurrent suite execution."""
+
+    @pytest.mark.asyncio
+    async def test_execute_suite_runs_all_tests(self):
+        """Test every test in the suite yields exactly one result."""
+        executor = TestExecutor(ExecutorConfig())
+        executor.providers["anthropic"] = FakeProvider()
+        suite = TestSuite(name="Suite", tests=[make_spec(f"test-{i}") for i in range(6)])
+
+        results = [r async for r in executor.execute_suite(suite)]
+
+        assert sorted(r.index for r in results) == list(range(6))
+        assert all(r.result is not None and r.result.success for r in results)
+        assert {r.result.output for r in results} == {f"test-{i}" for i in range(6)}
+
+    @pytest.mark.asyncio
+    async def test_execute_suite_respects_global_limit(self):
+        """Test no more than max_concurrency tests run at once."""
+        executor = TestExecutor(ExecutorConfig())
+        provider = FakeProvider()
+        executor.providers["anthropic"] = provider
+
+        specs = [make_spec(f"test-{i}") for i in range(10)]
+        results = [r async for r in executor.execute_suite(specs, max_concurrency=3)]
+
+        assert len(results) == 10
+        assert provider.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_suite_respects_per_provider_limit(self):
+        """Test the per-provider limit applies independently to each provider."""
+        executor = TestExecutor(ExecutorConfig(max_concurrency=10, max_concurrency_per_provider=2))
+        anthropic = FakeProvider("anthropic")
+        openai = FakeProvider("openai")
+        executor.providers["anthropic"] = anthropic
+        executor.providers["openai"] = openai
+
+        specs = [make_spec(f"claude-{i}") for i in range(5)]
+        specs += [make_spec(f"gpt-{i}", model="gpt-5.1") for i in range(5)]
+        results = [r async for r in executor.execute_suite(specs)]
+
+        assert len(results) == 10
+        assert anthropic.max_in_flight == 2
+        assert openai.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_suite_reports_errors_per_test(self):
+        """Test a test without a configured provider does not abort the suite."""
+        executor = TestExecutor(ExecutorConfig())
+        executor.providers["anthropic"] = FakeProvider()
+
+        specs = [make_spec("ok"), make_spec("missing", model="gpt-5.1")]
+        results = {r.name: r async for r in executor.execute_suite(specs)}
+
+        assert results["ok"].result is not None
+        assert results["missing"].result is None
+        assert "No provider configured" in results["missing"].error
+
+
+class TestResponseCache:
+    """Test the content-addressed response cache."""
+
+    def make_result(self, output: str = "cached output") -> ExecutionResult:
+        return ExecutionResult(
+            success=True,
+            output=output,
+            model="claude-sonnet-4-5-20250929",
+            provider="anthropic",
+            latency_ms=1200,
+        )
+
+    def test_key_ignores_none_parameters(self):
+        """Test omitted and None parameters hash to the same key."""
+        request = {"model": "gpt-5.1", "messages": [{"role": "user", "content": "Hi"}]}
+        assert ResponseCache.make_key(request) == ResponseCache.make_key({**request, "top_p": None})
+        assert ResponseCache.make_key(request) != ResponseCache.make_key({**request, "seed": 42})
+
+    def test_put_and_get(self, tmp_path):
+        """Test stored results are returned marked as cached."""
+        cache = ResponseCache(path=tmp_path / "cache.db")
+        cache.put("key", self.make_result())
+
+        result = cache.get("key")
+        assert result is not None
+        assert result.output == "cached output"
+        assert result.cached is True
+        assert cache.get("missing") is None
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test entries older than the TTL are not served."""
+        cache = ResponseCache(path=tmp_path / "cache.db", ttl_seconds=0)
+        cache.put("key", self.make_result())
+        time.sleep(0.01)
+
+        assert cache.get("key") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used entries are evicted over the size budget."""
+        entry_size = len(self.make_result("x" * 1000).model_dump_json())
+        cache = ResponseCache(path=tmp_path / "cache.db", max_size_bytes=entry_size * 3)
+        cache.put("a", self.make_result("x" * 1000))
+        cache.put("b", self.make_result("y" * 1000))
+        cache.put("c", self.make_result("z" * 1000))
+        cache.get("a")  # "b" is now least recently used
+        cache.put("d", self.make_result("w" * 1000))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+        assert cache.stats()["size_bytes"] <= entry_size * 3
+
+
+class TestExecutorCacheModes:
+    """Test executor cache modes."""
+
+    def make_executor(self, tmp_path, mode="live") -> tuple[TestExecutor, FakeProvider]:
+        executor = TestExecutor(
+            ExecutorConfig(cache_mode=mode, cache_path=str(tmp_path / "cache.db"))
+        )
+        provider = FakeProvider()
+        executor.providers["anthropic"] = provider
+        return executor, provider
+
+    @pytest.mark.asyncio
+    async def test_live_mode_never_caches(self, tmp_path):
+        """Test live mode always calls the provider."""
+        executor, provider = self.make_executor(tmp_path)
+        await executor.execute(make_spec("hello"))
+        await executor.execute(make_spec("hello"))
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_or_live_reuses_responses(self, tmp_path):
+        """Test identical requests are served from the cache after the first call."""
+        executor, provider = self.make_executor(tmp_path, "replay-or-live")
+        first = await executor.execute(make_spec("hello"))
+        second = await executor.execute(make_spec("hello"))
+
+        assert provider.calls == 1
+        assert first.cached is False
+        assert second.cached is True
+        assert second.output == first.output
+
+    @pytest.mark.asyncio
+    async def test_replay_after_record_without_provider(self, tmp_path):
+        """Test replay mode serves recorded responses without any provider."""
+        executor, provider = self.make_executor(tmp_path, "record")
+        await executor.execute(make_spec("hello"))
+        await executor.execute(make_spec("hello"))
+        assert provider.calls == 2  # record mode always calls live
+
+        replayer = TestExecutor(
+            ExecutorConfig(cache_mode="replay", cache_path=str(tmp_path / "cache.db"))
+        )
+        result = await replayer.execute(make_spec("hello"))
+        assert result.cached is True
+
+        with pytest.raises(CacheMissError):
+            await replayer.execute(make_spec("never recorded"))
+
+    @pytest.mark.asyncio
+    async def test_seed_is_part_of_key(self, tmp_path):
+        """Test a different seed produces a cache miss."""
+        executor, provider = self.make_executor(tmp_path, "replay-or-live")
+        spec = make_spec("hello")
+        await executor.execute(spec)
+        await executor.execute(spec.model_copy(update={"seed": 7}))
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_rejected(self, tmp_path):
+        """Test an unknown cache mode fails instead of recording live calls."""
+        executor, provider = self.make_executor(tmp_path)
+        with pytest.raises(ValueError, match="Unknown cache mode"):
+            await executor.execute(make_spec("hello"), cache_mode="replay_only")
+        assert provider.calls == 0
+
+    def test_unknown_env_mode_rejected(self, monkeypatch):
+        """Test SENTINEL_CACHE_MODE is validated at startup."""
+        from backend.main import _cache_mode_from_env
+
+        monkeypatch.setenv("SENTINEL_CACHE_MODE", "replay_only")
+        with pytest.raises(ValueError, match="SENTINEL_CACHE_MODE"):
+            _cache_mode_from_env()
+        monkeypatch.setenv("SENTINEL_CACHE_MODE", "replay-or-live")
+        assert _cache_mode_from_env() == "replay-or-live"
+
+
+class TestExecutorStream:
+    """Test streaming execution."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas_then_result(self):
+        """Test the stream ends with a done event carrying the full result."""
+        executor = TestExecutor(ExecutorConfig())
+        executor.providers["anthropic"] = FakeProvider()
+
+        events = [event async for event in executor.stream(make_spec("hello"))]
+
+        assert [event.type for event in events] == ["delta", "done"]
+        assert events[0].text == "hello"
+        assert events[-1].result.output == "hello"
+
+    @pytest.mark.asyncio
+    async def test_stream_without_provider(self):
+        """Test streaming fails like execute when no provider is configured."""
+        executor = TestExecutor(ExecutorConfig())
+
+        with pytest.raises(ValueError, match="No provider configured"):
+            async for _ in executor.stream(make_spec("hello")):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_cached_response(self, tmp_path):
+        """Test cached responses are streamed without calling the provider."""
+        executor = TestExecutor(
+            ExecutorConfig(cache_mode="replay-or-live", cache_path=str(tmp_path / "cache.db"))
+        )
+        provider = FakeProvider()
+        executor.providers["anthropic"] = provider
+
+        first = [event async for event in executor.stream(make_spec("hello"))]
+        second = [event async for event in executor.stream(make_spec("hello"))]
+
+        assert provider.calls == 1
+        assert first[-1].result.cached is False
+        assert second[-1].result.cached is True
+        assert second[0].text == "hello"
+
+    @pytest.mark.asyncio
+    async def test_execute_fails_when_stream_has_no_result(self):
+        """Test a stream ending without a done event raises a clear error."""
+
+        class TruncatedProvider(FakeProvider):
+            async def stream(self, model, messages, **kwargs):
+                yield StreamEvent(type="delta", text="partial")
+
+        executor = TestExecutor(ExecutorConfig())
+        executor.providers["anthropic"] = TruncatedProvider()
+
+        with pytest.raises(RuntimeError, match="without a done event"):
+            await executor.execute(make_spec("hello"))
@@ -186,6 +186,99 @@ category: qa
         assert tests[0]["category"] == "qa"
 
 
+class TestQueryTests:
+    """Tests for the indexed, filtered listing."""
+
+    def _write(self, directory, filename, **fields):
+        lines = [f"name: {fields.pop('name', filename)}"]
+        for key, value in fields.items():
+            if isinstance(value, list):
+                lines.append(f"{key}: [{', '.join(value)}]")
+            else:
+                lines.append(f"{key}: {value}")
+        Path(directory, f"{filename}.yaml").write_text("\n".join(lines) + "\n")
+
+    @pytest.fixture
+    def populated(self, service, temp_tests_dir):
+        self._write(
+            temp_tests_dir,
+            "a",
+            name="Zeta",
+            category="qa",
+            provider="openai",
+            model="gpt-5.1",
+            tags=["smoke", "fast"],
+        )
+        self._write(
+            temp_tests_dir,
+            "b",
+            name="Alpha",
+            category="qa",
+            provider="anthropic",
+            model="claude-sonnet-4-5",
+            tags=["smoke"],
+        )
+        self._write(
+            temp_tests_dir,
+            "c",
+            name="Mid",
+            category="safety",
+            provider="anthropic",
+            model="claude-sonnet-4-5",
+        )
+        return service
+
+    def test_filters(self, populated):
+        """Test filtering by category, provider, model and tags."""
+        assert populated.query_tests(category="qa")[1] == 2
+        assert [t["filename"] for t in populated.query_tests(provider="anthropic")[0]] == [
+            "b",
+            "c",
+        ]
+        assert populated.query_tests(model="gpt-5.1")[0][0]["filename"] == "a"
+        assert [t["filename"] for t in populated.query_tests(tags=["smoke", "fast"])[0]] == ["a"]
+
+    def test_sort_and_page(self, populated):
+        """Test sorting by a field and paging, with the total of all matches."""
+        tests, total = populated.query_tests(sort="name", limit=2)
+        assert [t["name"] for t in tests] == ["Alpha", "Mid"]
+        assert total == 3
+
+        tests, _ = populated.query_tests(sort="name", descending=True, offset=1)
+        assert [t["name"] for t in tests] == ["Mid", "Alpha"]
+
+    def test_invalid_sort(self, service):
+        """Test sorting by an unknown field raises ValueError."""
+        with pytest.raises(ValueError):
+            service.query_tests(sort="secret")
+
+    def test_only_changed_files_are_parsed(self, populated, temp_tests_dir, monkeypatch):
+        """Test unchanged files are served from the index."""
+        populated.list_tests()
+        parsed = []
+        original = populated._read_metadata
+        monkeypatch.setattr(
+            populated,
+            "_read_metadata",
+            lambda path, stat: parsed.append(path.name) or original(path, stat),
+        )
+
+        self._write(temp_tests_dir, "c", name="Mid renamed", category="safety")
+        Path(temp_tests_dir, "a.yaml").unlink()
+        tests = populated.list_tests()
+
+        assert parsed == ["c.yaml"]
+        assert [t["name"] for t in tests] == ["Alpha", "Mid renamed"]
+
+    def test_save_refreshes_index(self, service):
+        """Test saving over a file is reflected even with an unchanged mtime and size."""
+        service.save_test("name: One\n", filename="same")
+        service.list_tests()
+        service.save_test("name: Two\n", filename="same")
+
+        assert service.list_tests()[0]["name"] == "Two"
+
+
 class TestDeleteTest:
     """Tests for deleting test files."""
 
@@ -0,0 +1,177 @@
+"""
+Tests for syncing test YAML files into the database.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.services import test_file_sync
+from backend.services.test_file_sync import TestFileSync
+from backend.storage import RunRepository, TestRepository
+from backend.storage.database import get_database, reset_database
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Use a temporary database as the global database."""
+    reset_database()
+    db = get_database(f"sqlite:///{tmp_path / 'sync.db'}")
+    yield db
+    reset_database()
+
+
+@pytest.fixture
+def tests_dir(tmp_path):
+    """Create an empty test files directory."""
+    path = tmp_path / "tests"
+    path.mkdir()
+    return path
+
+
+def _write(tests_dir: Path, filename: str, name: str, **fields) -> None:
+    lines = [f"name: {name}", "model: gpt-5.1"] + [f"{k}: {v}" for k, v in fields.items()]
+    (tests_dir / f"{filename}.yaml").write_text("\n".join(lines) + "\n")
+
+
+def _test(database, filename: str):
+    session = database.SessionLocal()
+    try:
+        return TestRepository(session).get_by_filename(filename)
+    finally:
+        session.close()
+
+
+class TestFileSyncReconcile:
+    """Tests for applying file state to test_definitions."""
+
+    def test_full_sync_creates_tests(self, database, tests_dir):
+        """Test every test file becomes a test definition."""
+        _write(tests_dir, "one", "One", category="qa", provider="openai")
+        _write(tests_dir, "two", "Two")
+        (tests_dir / "broken.yaml").write_text("name: [unclosed")
+
+        stats = TestFileSync(tests_dir).full_sync()
+
+        assert (stats.upserted, stats.invalid) == (2, 1)
+        test = _test(database, "one")
+        assert (test.name, test.category, test.provider, test.model) == (
+            "One",
+            "qa",
+            "openai",
+            "gpt-5.1",
+        )
+        assert _test(database, "broken") is None
+
+    def test_unchanged_files_are_skipped(self, database, tests_dir):
+        """Test files matching the stored YAML are not written again."""
+        _write(tests_dir, "one", "One")
+        sync = TestFileSync(tests_dir)
+        sync.full_sync()
+
+        stats = sync.full_sync()
+
+        assert (stats.upserted, stats.unchanged) == (0, 1)
+        assert _test(database, "one").version == 1
+
+    def test_modified_file_updates_test(self, database, tests_dir):
+        """Test editing a file updates its test in place."""
+        _write(tests_dir, "one", "One", category="qa")
+        sync = TestFileSync(tests_dir)
+        sync.full_sync()
+        test_id = _test(database, "one").id
+
+        _write(tests_dir, "one", "One renamed")
+        sync.sync_files({"one"})
+
+        test = _test(database, "one")
+        assert (test.id, test.name, test.category, test.version) == (
+            test_id,
+            "One renamed",
+            None,
+            2,
+        )
+
+    def test_saved_file_matches_created_test(self, database, tests_dir):
+        """Test a file saved from the UI (with a header) keeps its test unchanged."""
+        spec = {"name": "One", "model": "gpt-5.1"}
+        session = database.SessionLocal()
+        TestRepository(session).create(
+            name="One (canvas)", spec=spec, spec_yaml="name: One\n", filename="one"
+        )
+        session.close()
+        (tests_dir / "one.yaml").write_text(
+            "# Sentinel Test Definition\nname: One\nmodel: gpt-5.1\n"
+        )
+
+        stats = TestFileSync(tests_dir).sync_files({"one"})
+
+        test = _test(database, "one")
+        assert stats.upserted == 0
+        assert (test.name, test.version) == ("One (canvas)", 1)
+        assert test.spec_yaml.startswith("# Sentinel Test Definition")
+
+    def test_create_after_sync_updates_synced_test(self, database, tests_dir):
+        """Test creating a test for an already synced file does not insert another."""
+        _write(tests_dir, "one", "One")
+        TestFileSync(tests_dir).full_sync()
+        synced_id = _test(database, "one").id
+
+        session = database.SessionLocal()
+        test = TestRepository(session).create(
+            name="One (canvas)", spec={"name": "One", "model": "gpt-5.1"}, filename="one"
+        )
+        count = TestRepository(session).count()
+        session.close()
+
+        assert (test.id, test.name, test.version, count) == (synced_id, "One (canvas)", 1, 1)
+
+    def test_deleted_file_detaches_test(self, database, tests_dir):
+        """Test deleting a file unlinks its test but keeps run history."""
+        _write(tests_dir, "one", "One")
+        sync = TestFileSync(tests_dir)
+        sync.full_sync()
+        test_id = _test(database, "one").id
+        session = database.SessionLocal()
+        RunRepository(session).create(test_id, "openai", "gpt-5.1")
+        session.close()
+
+        (tests_dir / "one.yaml").unlink()
+        stats = sync.full_sync()
+
+        assert stats.detached == 1
+        assert _test(database, "one") is None
+        session = database.SessionLocal()
+        assert TestRepository(session).get_by_id(test_id) is not None
+        assert RunRepository(session).count(test_definition_id=test_id) == 1
+        session.close()
+
+
+class TestFileSyncWatch:
+    """Tests for applying changes while running."""
+
+    @pytest.mark.asyncio
+    async def test_polling_applies_changes(self, database, tests_dir, monkeypatch):
+        """Test the polling fallback picks up new and deleted files."""
+        monkeypatch.setattr(test_file_sync, "watchfiles", None)
+        _write(tests_dir, "one", "One")
+        task = asyncio.create_task(
+            TestFileSync(tests_dir, debounce_ms=10, poll_interval=0.02).run()
+        )
+
+        async def wait_for(condition):
+            for _ in range(200):
+                if condition():
+                    return True
+                await asyncio.sleep(0.02)
+            return False
+
+        try:
+            assert await wait_for(lambda: _test(database, "one") is not None)
+            _write(tests_dir, "two", "Two")
+            (tests_dir / "one.yaml").unlink()
+            assert await wait_for(lambda: _test(database, "two") is not None)
+            assert await wait_for(lambda: _test(database, "one") is None)
+        finally:
+            task.cancel()
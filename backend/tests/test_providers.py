@@ -6,6 +6,14 @@ import pytest
 
 from backend.providers.anthropic_provider import AnthropicProvider
 from backend.providers.base import ProviderConfig
+from backend.providers.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    ModelRateLimiter,
+    ProviderRateLimiter,
+    RateLimitConfig,
+    TokenBucket,
+    parse_reset_seconds,
+)
 
 
 class TestProviderConfig:
@@ -66,6 +74,12 @@ class TestAnthropicProvider:
         expected_cost = (1000 / 1_000_000) * 15.0 + (500 / 1_000_000) * 75.0
         assert cost == pytest.approx(expected_cost, rel=1e-6)
 
+    def test_tokens_per_second(self):
+        """Test decoding throughput excludes time to first token."""
+        assert AnthropicProvider._tokens_per_second(100, 1200, 200) == 100.0
+        assert AnthropicProvider._tokens_per_second(100, 1200, None) is None
+        assert AnthropicProvider._tokens_per_second(0, 1200, 200) is None
+
     @pytest.mark.asyncio
     async def test_execute_without_api_key(self):
         """Test execution fails gracefully without valid API key."""
@@ -80,3 +94,119 @@ class TestAnthropicProvider:
         # Should return an error result, not raise exception
         assert result.success is False
         assert result.error is not None
+
+
+class FakeRawResponse:
+    """Stand-in for an SDK raw response."""
+
+    def __init__(self, parsed, headers=None):
+        self.parsed = parsed
+        self.headers = headers or {}
+
+    def parse(self):
+        return self.parsed
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for an SDK 429 error."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str = "0"):
+        super().__init__("rate limited")
+        self.response = FakeRawResponse(None, {"retry-after": retry_after})
+
+
+class TestRateLimiting:
+    """Test the shared provider rate-limiting layer."""
+
+    def test_parse_reset_seconds(self):
+        """Test parsing the reset formats used by providers."""
+        assert parse_reset_seconds("2") == 2.0
+        assert parse_reset_seconds("6m0s") == 360.0
+        assert parse_reset_seconds("20ms") == pytest.approx(0.02)
+        assert parse_reset_seconds("1h2m3s") == 3723.0
+        assert parse_reset_seconds("2000-01-01T00:00:00Z") == 0.0
+        assert parse_reset_seconds("soon") is None
+
+    def test_token_bucket_wait_time(self):
+        """Test bucket reports wait time once exhausted."""
+        bucket = TokenBucket(rate_per_minute=60)  # 1 token per second
+        assert bucket.time_until_available(60) == 0.0
+        bucket.consume(60)
+        assert bucket.time_until_available(1) == pytest.approx(1.0, abs=0.05)
+        bucket.refund(10)
+        assert bucket.time_until_available(10) == pytest.approx(0.0, abs=0.05)
+
+    def test_aimd_concurrency(self):
+        """Test additive increase and multiplicative decrease."""
+        limiter = AdaptiveConcurrencyLimiter(max_concurrency=8, min_concurrency=1)
+        limiter.on_rate_limited()
+        assert limiter.limit == 4.0
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        assert limiter.limit == 1.0  # Clamped at min_concurrency
+        for _ in range(10):
+            limiter.on_success()
+        assert 1.0 < limiter.limit <= 8.0
+
+    def test_per_model_configuration(self):
+        """Test model overrides take precedence over provider defaults."""
+        limiter = ProviderRateLimiter(
+            default=RateLimitConfig(requests_per_minute=50),
+            per_model={"claude-opus-4-1-20250805": RateLimitConfig(requests_per_minute=5)},
+        )
+        assert limiter.for_model("claude-haiku-4-5-20251001").request_bucket.capacity == 50
+        assert limiter.for_model("claude-opus-4-1-20250805").request_bucket.capacity == 5
+        assert limiter.for_model("claude-opus-4-1-20250805") is limiter.for_model(
+            "claude-opus-4-1-20250805"
+        )
+
+    def test_update_from_headers_learns_limits_and_pauses(self):
+        """Test limits are learned from headers and exhausted quota pauses calls."""
+        limiter = ModelRateLimiter(RateLimitConfig())
+        limiter.update_from_headers(
+            {
+                "x-ratelimit-limit-requests": "500",
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "2s",
+            }
+        )
+        assert limiter.request_bucket is not None
+        assert limiter.request_bucket.capacity == 500
+        assert limiter.request_bucket.tokens <= 0
+        assert limiter._paused_until > 0
+
+    @pytest.mark.asyncio
+    async def test_call_retries_rate_limited_requests(self):
+        """Test 429s are retried and reduce concurrency instead of failing."""
+        provider = AnthropicProvider(ProviderConfig(api_key="test_key"))
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise FakeRateLimitError()
+            return FakeRawResponse({"tokens": 10})
+
+        response = await provider._call_with_rate_limit(
+            "claude-haiku-4-5-20251001", 100, call, lambda r: r["tokens"]
+        )
+
+        assert response == {"tokens": 10}
+        assert attempts == 3
+        limiter = provider.rate_limiter.for_model("claude-haiku-4-5-20251001")
+        assert limiter.concurrency.limit < limiter.config.max_concurrency
+
+    @pytest.mark.asyncio
+    async def test_call_gives_up_after_max_retries(self):
+        """Test the last 429 is raised once retries are exhausted."""
+        provider = AnthropicProvider(ProviderConfig(api_key="test_key", max_retries=1))
+
+        async def call():
+            raise FakeRateLimitError()
+
+        with pytest.raises(FakeRateLimitError):
+            await provider._call_with_rate_limit("claude-haiku-4-5-20251001", 100, call, len)
@@ -5,11 +5,28 @@ Tests for regression detection engine and comparator.
 import sys
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 # Add backend to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.regression.comparator import RunComparator, RunMetrics
+from backend.regression import diff as diff_module
+from backend.regression.batch import analyze_run_groups
+from backend.regression.comparator import OUTPUT_EXCERPT_CHARS, RunComparator, RunMetrics
+from backend.regression.diff import diff_texts, shingle_similarity, tokenize
 from backend.regression.engine import MetricDelta, RegressionEngine, RegressionSeverity
+from backend.regression.history import (
+    HistoryRegressionEngine,
+    mann_whitney_u,
+    robust_summary,
+    two_proportion_test,
+)
+from backend.regression.similarity import (
+    HashedNgramBackend,
+    get_similarity_backend,
+    rank_output_drift,
+)
 
 
 class TestMetricDelta:
@@ -304,6 +321,47 @@ class TestRegressionEngine:
         assert result.has_regressions is True
         assert result.severity == RegressionSeverity.CRITICAL
 
+    def test_analyze_ttft_regression(self):
+        """Test slower first responses are reported separately from decoding speed."""
+        engine = RegressionEngine()
+
+        baseline_run = {"latency_ms": 1000, "ttft_ms": 200, "tokens_per_second": 50.0}
+        current_run = {"latency_ms": 1400, "ttft_ms": 600, "tokens_per_second": 50.0}
+
+        result = engine.analyze(baseline_run, current_run)
+
+        ttft_delta = next(d for d in result.metric_deltas if d.metric_name == "Time to First Token")
+        throughput_delta = next(
+            d for d in result.metric_deltas if d.metric_name == "Output Throughput"
+        )
+        assert ttft_delta.severity == RegressionSeverity.CRITICAL
+        assert throughput_delta.severity == RegressionSeverity.INFO
+
+    def test_analyze_throughput_drop_is_regression(self):
+        """Test lower tokens/sec counts as a regression."""
+        engine = RegressionEngine()
+
+        baseline_run = {"latency_ms": 1000, "ttft_ms": 200, "tokens_per_second": 100.0}
+        current_run = {"latency_ms": 1300, "ttft_ms": 200, "tokens_per_second": 70.0}
+
+        result = engine.analyze(baseline_run, current_run)
+
+        throughput_delta = next(
+            d for d in result.metric_deltas if d.metric_name == "Output Throughput"
+        )
+        assert throughput_delta.severity == RegressionSeverity.WARNING
+        assert result.has_regressions is True
+
+    def test_analyze_skips_streaming_metrics_without_data(self):
+        """Test runs without streaming metrics keep the basic metric set."""
+        engine = RegressionEngine()
+
+        result = engine.analyze({"latency_ms": 100}, {"latency_ms": 100})
+
+        names = {d.metric_name for d in result.metric_deltas}
+        assert "Time to First Token" not in names
+        assert "Output Throughput" not in names
+
     def test_analyze_custom_thresholds(self):
         """Test analysis with custom thresholds."""
         engine = RegressionEngine(
@@ -474,6 +532,66 @@ class TestRunComparator:
         assert result.current_length == 26
         assert result.length_delta == 13
 
+    def test_compare_outputs_diff_and_similarity(self):
+        """Test changed outputs carry a diff and similarity scores."""
+        comparator = RunComparator()
+
+        result = comparator.compare_outputs(
+            baseline_output="The capital of France is Paris.",
+            current_output="The capital of France is Lyon.",
+        )
+
+        assert result.diff.ops == [
+            {"op": "equal", "count": 10},
+            {"op": "delete", "text": "Paris"},
+            {"op": "insert", "text": "Lyon"},
+            {"op": "equal", "count": 1},
+        ]
+        assert 0.8 < result.similarity < 1
+        assert result.token_jaccard_method == "exact"
+        assert result.token_jaccard == pytest.approx(3 / 5)
+
+    def test_compare_outputs_excerpts_long_outputs(self):
+        """Test long outputs are returned as excerpts around the first change."""
+        comparator = RunComparator()
+        baseline = "".join(f"word{i % 1000:03d} " for i in range(3000))
+        current = baseline[:16000] + "CHANGED " + baseline[16000:]
+
+        result = comparator.compare_outputs(baseline, current)
+
+        assert result.excerpt_start == 16000 - 100
+        assert len(result.current_excerpt) == OUTPUT_EXCERPT_CHARS
+        assert "CHANGED" in result.current_excerpt
+        assert result.diff.granularity == "word"
+        assert [op["op"] for op in result.diff.ops] == ["equal", "insert", "equal"]
+        assert result.token_jaccard_method == "minhash"
+        assert result.token_jaccard > 0.5
+
+    def test_compare_outputs_semantic_similarity(self):
+        """Test the similarity backend scores related outputs above unrelated ones."""
+        comparator = RunComparator(similarity_backend=HashedNgramBackend())
+        baseline = "The capital of France is Paris, a city on the Seine."
+
+        related = comparator.compare_outputs(
+            baseline, "The capital of France is Paris, on the river Seine."
+        )
+        unrelated = comparator.compare_outputs(baseline, "Photosynthesis converts light.")
+        identical = comparator.compare_outputs(baseline, baseline)
+
+        assert related.similarity_backend == "hashed-ngram-1024"
+        assert related.semantic_similarity > 0.5 > unrelated.semantic_similarity
+        assert identical.semantic_similarity == 1.0
+
+    def test_compare_outputs_cached_vectors(self):
+        """Test given vectors are used instead of vectorizing the outputs."""
+        comparator = RunComparator()
+
+        result = comparator.compare_outputs(
+            "a", "b", baseline_vector=np.array([1.0, 0.0]), current_vector=np.array([0.6, 0.8])
+        )
+
+        assert result.semantic_similarity == pytest.approx(0.6)
+
     def test_compare_outputs_identical(self):
         """Test comparison of identical outputs."""
         comparator = RunComparator()
@@ -486,6 +604,20 @@ class TestRunComparator:
         assert result.outputs_differ is False
         assert result.length_delta == 0
 
+    def test_compare_outputs_by_hash(self):
+        """Test that known content hashes decide equality without comparing text."""
+        comparator = RunComparator()
+
+        same = comparator.compare_outputs("Hello", "Hello", baseline_hash="a1", current_hash="a1")
+        different = comparator.compare_outputs(
+            "Hello", "Hello!", baseline_hash="a1", current_hash="b2"
+        )
+
+        assert same.outputs_differ is False
+        assert same.length_delta == 0
+        assert different.outputs_differ is True
+        assert different.length_delta == 1
+
     def test_comparison_result_to_dict(self):
         """Test ComparisonResult serialization."""
         comparator = RunComparator()
@@ -582,3 +714,535 @@ class TestRunMetrics:
         assert result["run_id"] == 1
         assert result["model"] == "gpt-5.1"
         assert result["latency_ms"] == 150
+
+
+def _history(latencies: list[int], status: str = "completed") -> list[dict]:
+    """Build run dicts (newest first) with the given latencies."""
+    return [
+        {
+            "provider": "anthropic",
+            "model": "claude-sonnet-4-5-20250929",
+            "status": status,
+            "latency_ms": latency,
+            "tokens_output": 100,
+        }
+        for latency in latencies
+    ]
+
+
+class TestHistoryStatistics:
+    """Tests for the statistics behind history regression detection."""
+
+    def test_mann_whitney_separated_samples(self):
+        """Test fully separated samples match the normal approximation."""
+        u, p_value = mann_whitney_u(np.array([6.0, 7, 8, 9, 10]), np.array([1.0, 2, 3, 4, 5]))
+
+        assert u == 0
+        assert p_value == pytest.approx(0.0122, abs=1e-4)
+
+    def test_mann_whitney_identical_samples(self):
+        """Test identical constant samples are not significant."""
+        _, p_value = mann_whitney_u(np.full(5, 3.0), np.full(5, 3.0))
+
+        assert p_value == 1.0
+
+    def test_robust_summary(self):
+        """Test median and MAD ignore an outlier."""
+        summary = robust_summary(np.array([10.0, 11, 12, 13, 1000]))
+
+        assert summary["n"] == 5
+        assert summary["median"] == 12
+        assert summary["mad"] == 1
+
+    def test_two_proportion_test(self):
+        """Test a large jump in failure rate is significant."""
+        assert two_proportion_test(1, 50, 20, 50) < 0.001
+        assert two_proportion_test(0, 10, 0, 10) == 1.0
+
+
+class TestHistoryRegressionEngine:
+    """Tests for HistoryRegressionEngine."""
+
+    def test_noise_is_not_a_regression(self):
+        """Test run-to-run noise without a shift is not flagged."""
+        rng = np.random.default_rng(1)
+        latencies = rng.normal(1000, 150, 60).astype(int).tolist()
+
+        result = HistoryRegressionEngine().analyze(_history(latencies), current_window=10)
+
+        assert result.has_regressions is False
+        assert (result.baseline_runs, result.current_runs) == (50, 10)
+        latency = next(m for m in result.metrics if m.metric_name == "Latency")
+        assert latency.severity == RegressionSeverity.INFO
+
+    def test_latency_shift_is_a_regression(self):
+        """Test a sustained latency increase is flagged."""
+        rng = np.random.default_rng(2)
+        current = rng.normal(1400, 100, 10).astype(int).tolist()
+        baseline = rng.normal(1000, 100, 40).astype(int).tolist()
+
+        result = HistoryRegressionEngine().analyze(_history(current + baseline), 10)
+
+        latency = next(m for m in result.metrics if m.metric_name == "Latency")
+        assert latency.significant is True
+        assert latency.ci_low > 0
+        assert latency.severity == RegressionSeverity.WARNING
+        assert result.has_regressions is True
+        assert result.model == "claude-sonnet-4-5-20250929"
+
+    def test_latency_drop_is_an_improvement(self):
+        """Test a sustained latency decrease is an improvement."""
+        result = HistoryRegressionEngine().analyze(
+            _history([500, 510, 490, 505, 495] + [1000, 1010, 990, 1005, 995, 1002]), 5
+        )
+
+        assert result.severity == RegressionSeverity.IMPROVEMENT
+        assert result.has_regressions is False
+
+    def test_insufficient_history(self):
+        """Test windows smaller than the minimum sample are not tested."""
+        result = HistoryRegressionEngine().analyze(_history([100, 200, 300, 5000]), 2)
+
+        latency = next(m for m in result.metrics if m.metric_name == "Latency")
+        assert latency.p_value is None
+        assert "Not enough data" in latency.description
+        assert result.has_regressions is False
+
+    def test_failure_rate_increase_is_critical(self):
+        """Test runs starting to fail are a critical regression."""
+        runs = _history([1000] * 10, status="failed") + _history([1000] * 30)
+
+        result = HistoryRegressionEngine().analyze(runs, 10)
+
+        assert result.failure_rate["current_rate"] == 1.0
+        assert result.failure_rate["significant"] is True
+        assert result.severity == RegressionSeverity.CRITICAL
+
+
+class TestHistoryRegressionEndpoint:
+    """Tests for GET /api/runs/regression/history/{test_id}."""
+
+    def _seed(self) -> int:
+        from backend.storage import RunRepository, TestRepository
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        test = TestRepository(session).create(name="latency", spec={"model": "m"})
+        repo = RunRepository(session)
+        # Oldest first: 20 fast runs, then 10 slow runs of model "m"; 6 runs of "other"
+        for latency in [1000 + i % 5 * 10 for i in range(20)] + [2000 + i * 10 for i in range(10)]:
+            run = repo.create(test.id, "anthropic", "m")
+            repo.update_status(run.id, "completed", latency_ms=latency)
+        for _ in range(6):
+            run = repo.create(test.id, "openai", "other")
+            repo.update_status(run.id, "completed", latency_ms=500)
+        repo.create(test.id, "anthropic", "m")  # Still running, not analyzed
+        test_id = test.id
+        session.close()
+        return test_id
+
+    def test_analyzes_each_model(self, client):
+        """Test each provider and model gets its own analysis."""
+        test_id = self._seed()
+
+        response = client.get(f"/api/runs/regression/history/{test_id}?window=10&limit=25")
+        assert response.status_code == 200
+        analyses = {a["model"]: a for a in response.json()["analyses"]}
+
+        assert set(analyses) == {"m", "other"}
+        assert (analyses["m"]["baseline_runs"], analyses["m"]["current_runs"]) == (15, 10)
+        assert analyses["m"]["severity"] == "critical"
+        assert analyses["m"]["has_regressions"] is True
+        assert analyses["other"]["has_regressions"] is False
+
+    def test_filters_by_model(self, client):
+        """Test the model query parameter restricts the analysis."""
+        test_id = self._seed()
+
+        response = client.get(f"/api/runs/regression/history/{test_id}?model=other&window=3")
+        analyses = response.json()["analyses"]
+
+        assert [a["model"] for a in analyses] == ["other"]
+
+    def test_window_must_leave_a_baseline(self, client):
+        """Test a window covering every run is rejected."""
+        response = client.get("/api/runs/regression/history/1?window=10&limit=10")
+        assert response.status_code == 400
+
+    def test_unknown_test(self, client):
+        """Test a missing test returns 404."""
+        response = client.get("/api/runs/regression/history/999")
+        assert response.status_code == 404
+
+
+def _run(run_id: int, test_id: int, latency: int, status: str = "completed", started: str = ""):
+    return {
+        "id": run_id,
+        "test_definition_id": test_id,
+        "test_name": f"test {test_id}",
+        "started_at": started or f"2026-01-01T00:00:{run_id:02d}",
+        "status": status,
+        "latency_ms": latency,
+        "tokens_input": 100,
+        "tokens_output": 100,
+        "cost_usd": 0.01,
+    }
+
+
+class TestAnalyzeRunGroups:
+    """Tests for batch regression reports over two run groups."""
+
+    def test_pairs_runs_by_test_and_sorts_by_severity(self):
+        """Test each test is compared once and the worst tests come first."""
+        baseline = [_run(1, 1, 1000), _run(2, 2, 1000), _run(3, 3, 1000), _run(4, 4, 1000)]
+        current = [
+            _run(11, 1, 1000),
+            _run(12, 2, 1300),  # Warning
+            _run(13, 3, 1000, status="failed"),  # Critical
+            _run(14, 4, 500),  # Improvement
+        ]
+
+        report = analyze_run_groups(RegressionEngine(), baseline, current, {})
+
+        assert [e.test_id for e in report.entries] == [3, 2, 4, 1]
+        assert report.severity == RegressionSeverity.CRITICAL
+        assert report.has_regressions is True
+        assert report.severity_counts == {
+            "critical": 1,
+            "warning": 1,
+            "improvement": 1,
+            "info": 1,
+        }
+        assert (report.entries[0].baseline_run_id, report.entries[0].current_run_id) == (3, 13)
+
+    def test_latest_run_per_test_is_used(self):
+        """Test a group with several runs of a test compares its latest run."""
+        baseline = [_run(1, 1, 1000)]
+        current = [
+            _run(2, 1, 5000, started="2026-01-02T00:00:00"),
+            _run(3, 1, 1000, started="2026-01-03T00:00:00"),
+        ]
+
+        report = analyze_run_groups(RegressionEngine(), baseline, current, {})
+
+        assert [e.current_run_id for e in report.entries] == [3]
+        assert report.has_regressions is False
+
+    def test_new_assertion_failures_are_critical(self):
+        """Test assertion results are compared per pair."""
+        results = {
+            1: [{"assertion_type": "must_contain", "passed": True}],
+            2: [{"assertion_type": "must_contain", "passed": False, "failure_reason": "x"}],
+        }
+
+        report = analyze_run_groups(
+            RegressionEngine(), [_run(1, 1, 1000)], [_run(2, 1, 1000)], results
+        )
+
+        assert report.entries[0].result.severity == RegressionSeverity.CRITICAL
+        assert report.entries[0].result.assertion_changes["has_new_failures"] is True
+
+    def test_unpaired_tests_are_reported(self):
+        """Test tests present in only one group are listed, not compared."""
+        report = analyze_run_groups(
+            RegressionEngine(),
+            [_run(1, 1, 100), _run(2, 2, 100)],
+            [_run(3, 2, 100), _run(4, 3, 100)],
+            {},
+        )
+
+        assert [e.test_id for e in report.entries] == [2]
+        assert (report.missing_baseline, report.missing_current) == ([3], [1])
+        assert "1 test(s) compared" in report.summary
+
+
+class TestBatchRegressionEndpoint:
+    """Tests for POST /api/runs/regression/batch."""
+
+    def _seed(self) -> tuple[list[int], list[int]]:
+        from backend.storage import RunRepository, TestRepository
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        repo = RunRepository(session)
+        baseline, current = [], []
+        for name, latencies, passed in [
+            ("steady", (1000, 1000), (True, True)),
+            ("slower", (1000, 1500), (True, True)),
+            ("broken", (1000, 1000), (True, False)),
+        ]:
+            test = TestRepository(session).create(name=name, spec={"model": "m"})
+            for group, latency, ok in zip((baseline, current), latencies, passed, strict=True):
+                run = repo.create(test.id, "anthropic", "m")
+                repo.create_results_bulk(
+                    run.id,
+                    [{"assertion_type": "must_contain", "passed": ok}],
+                    status="completed",
+                    latency_ms=latency,
+                    output_text="output",
+                )
+                group.append(run.id)
+        session.close()
+        return baseline, current
+
+    def test_report_sorted_by_severity(self, client):
+        """Test every pair is analyzed and the report is ordered by severity."""
+        baseline, current = self._seed()
+
+        response = client.post(
+            "/api/runs/regression/batch",
+            json={"baseline_run_ids": baseline, "current_run_ids": current + [999]},
+        )
+        assert response.status_code == 200
+        report = response.json()
+
+        assert [e["test_name"] for e in report["entries"]] == ["broken", "slower", "steady"]
+        assert [e["regression_analysis"]["severity"] for e in report["entries"]] == [
+            "critical",
+            "warning",
+            "info",
+        ]
+        assert report["has_regressions"] is True
+        assert report["unknown_run_ids"] == [999]
+        assert report["severity_counts"]["critical"] == 1
+
+    def test_thresholds_apply_to_every_pair(self, client):
+        """Test request thresholds are used for the whole batch."""
+        baseline, current = self._seed()
+
+        response = client.post(
+            "/api/runs/regression/batch",
+            json={
+                "baseline_run_ids": baseline[:2],
+                "current_run_ids": current[:2],
+                "latency_threshold": 100.0,
+            },
+        )
+        report = response.json()
+
+        assert report["has_regressions"] is False
+        assert {e["test_name"] for e in report["entries"]} == {"steady", "slower"}
+
+    def test_requires_both_groups(self, client):
+        """Test empty run groups are rejected."""
+        response = client.post(
+            "/api/runs/regression/batch", json={"baseline_run_ids": [], "current_run_ids": [1]}
+        )
+        assert response.status_code == 422
+
+
+class TestSimilarityBackends:
+    """Tests for output vectors and drift ranking."""
+
+    def test_hashed_ngram_vectors(self):
+        """Test hashed n-gram vectors are unit length, and zero for empty text."""
+        backend = HashedNgramBackend(dimensions=64)
+
+        vectors = backend.embed(["one two three", "one two three", ""])
+
+        assert vectors.shape == (3, 64)
+        assert vectors.dtype == np.float32
+        assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+        assert float(vectors[0] @ vectors[1]) == pytest.approx(1.0)
+        assert not vectors[2].any()
+
+    def test_get_similarity_backend(self):
+        """Test backends are shared per name and unknown names are rejected."""
+        assert get_similarity_backend("hashed-ngram") is get_similarity_backend("hashed-ngram")
+        with pytest.raises(ValueError, match="Unknown similarity backend"):
+            get_similarity_backend("nope")
+
+    def test_embedding_backend_requires_dependency(self, monkeypatch):
+        """Test the embedding backend explains how to install its dependency."""
+        from backend.regression.similarity import EmbeddingBackend
+
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+        with pytest.raises(ImportError, match="sentinel-backend\\[embeddings\\]"):
+            EmbeddingBackend()
+
+    def test_rank_output_drift(self):
+        """Test runs are ranked by distance from the reference centroid."""
+        vectors = np.array([[1.0, 0.0], [0.0, 1.0], [0.8, 0.6]], dtype=np.float32)
+        reference = np.array([[1.0, 0.0], [1.0, 0.0]], dtype=np.float32)
+
+        drifts = rank_output_drift([1, 2, 3], vectors, reference, top=2)
+
+        assert [d.run_id for d in drifts] == [2, 3]
+        assert drifts[0].drift == pytest.approx(1.0)
+        assert drifts[1].similarity == pytest.approx(0.8)
+
+
+class TestOutputDriftEndpoint:
+    """Tests for GET /api/runs/drift/{test_id} and semantic similarity in comparisons."""
+
+    def _seed(self, outputs: list[str]) -> tuple[int, list[int]]:
+        """Store one completed run per output, oldest first."""
+        from backend.storage import RunRepository, TestRepository
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        test = TestRepository(session).create(name="drift", spec={"model": "m"})
+        repo = RunRepository(session)
+        run_ids = []
+        for output in outputs:
+            run = repo.create(test.id, "anthropic", "m")
+            repo.create_results_bulk(run.id, [], status="completed", output_text=output)
+            run_ids.append(run.id)
+        test_id = test.id
+        session.close()
+        return test_id, run_ids
+
+    def test_most_drifted_runs_first(self, client):
+        """Test drifted outputs rank first and vectors are computed only once."""
+        stable = "The capital of France is Paris. It lies on the Seine."
+        test_id, run_ids = self._seed(
+            [stable] * 3 + [stable + " Paris is large.", "Bananas are yellow fruit.", stable]
+        )
+
+        response = client.get(f"/api/runs/drift/{test_id}?baseline=3&top=2")
+        assert response.status_code == 200
+        body = response.json()
+
+        assert body["reference_run_ids"] == run_ids[:3][::-1]
+        assert body["runs_compared"] == 3
+        assert body["indexed"] == 3  # Distinct outputs
+        assert [r["run_id"] for r in body["runs"]] == [run_ids[4], run_ids[3]]
+        assert body["runs"][0]["drift"] > 0.9
+        assert 0 < body["runs"][1]["drift"] < 0.5
+
+        again = client.get(f"/api/runs/drift/{test_id}?baseline=3&top=2").json()
+        assert again["indexed"] == 0
+        assert again["runs"] == body["runs"]
+
+    def test_baseline_run_reference(self, client):
+        """Test a single run's output can be the reference."""
+        test_id, run_ids = self._seed(["alpha beta gamma", "alpha beta gamma", "delta"])
+
+        body = client.get(f"/api/runs/drift/{test_id}?baseline_run_id={run_ids[0]}").json()
+
+        assert body["reference_run_ids"] == [run_ids[0]]
+        assert [(r["run_id"], round(r["drift"], 6)) for r in body["runs"]] == [
+            (run_ids[2], 1.0),
+            (run_ids[1], 0.0),
+        ]
+
+    def test_not_enough_runs(self, client):
+        """Test a reference needs runs beyond the baseline window."""
+        test_id, _ = self._seed(["a", "b"])
+
+        assert client.get(f"/api/runs/drift/{test_id}?baseline=2").status_code == 400
+        assert client.get("/api/runs/drift/999").status_code == 404
+        assert client.get(f"/api/runs/drift/{test_id}?similarity_backend=nope").status_code == 400
+
+    def test_compare_reports_semantic_similarity(self, client):
+        """Test run comparisons score outputs with the similarity backend."""
+        _, run_ids = self._seed(["the cat sat on the mat", "the cat sat on a mat"])
+
+        response = client.get(f"/api/runs/compare/{run_ids[0]}/{run_ids[1]}")
+        comparison = response.json()["output_comparison"]
+
+        assert comparison["similarity_backend"] == "hashed-ngram-1024"
+        assert 0.3 < comparison["semantic_similarity"] < 1.0
+
+
+def _apply_ops(baseline: str, ops: list[dict], granularity: str) -> str:
+    """Rebuild the current text from the baseline and a complete diff."""
+    tokens = tokenize(baseline, granularity)
+    position, parts = 0, []
+    for op in ops:
+        if op["op"] == "equal":
+            parts.extend(tokens[position : position + op["count"]])
+            position += op["count"]
+        elif op["op"] == "delete":
+            deleted = ""
+            while len(deleted) < len(op["text"]):
+                deleted += tokens[position]
+                position += 1
+            assert deleted == op["text"]
+        else:
+            parts.append(op["text"])
+    assert position == len(tokens)
+    return "".join(parts)
+
+
+class TestDiffTexts:
+    """Tests for output diffing and similarity."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_ops_rebuild_current_text(self, seed):
+        """Test random edits produce a minimal diff that rebuilds the new text."""
+        import difflib
+        import random
+
+        rng = random.Random(seed)
+        vocabulary = ["alpha", "beta", "gamma", "delta", "\n", ".", ","]
+        baseline = [rng.choice(vocabulary) for _ in range(rng.randint(0, 60))]
+        current = list(baseline)
+        for _ in range(rng.randint(0, 8)):
+            position = rng.randint(0, len(current))
+            if current and rng.random() < 0.5:
+                del current[min(position, len(current) - 1)]
+            else:
+                current.insert(position, rng.choice(vocabulary))
+        a, b = " ".join(baseline), " ".join(current)
+
+        for granularity in ("word", "line"):
+            result = diff_texts(a, b, granularity)
+            assert result.complete
+            assert _apply_ops(a, result.ops, granularity) == b
+            matcher = difflib.SequenceMatcher(
+                None, tokenize(a, granularity), tokenize(b, granularity), autojunk=False
+            )
+            # Myers finds a shortest edit script: never more edits than difflib
+            difflib_edits = sum(
+                max(i2 - i1, 0) + max(j2 - j1, 0)
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+                if tag != "equal"
+            )
+            assert result.edit_distance <= difflib_edits
+
+    def test_granularity_by_line_count(self):
+        """Test long multi-line outputs are diffed line by line."""
+        baseline = "".join(f"line {i}\n" for i in range(50))
+        current = baseline.replace("line 25\n", "line twenty-five\n")
+
+        result = diff_texts(baseline, current)
+
+        assert result.granularity == "line"
+        assert result.ops == [
+            {"op": "equal", "count": 25},
+            {"op": "delete", "text": "line 25\n"},
+            {"op": "insert", "text": "line twenty-five\n"},
+            {"op": "equal", "count": 24},
+        ]
+
+    def test_unrelated_outputs_hit_edit_cap(self, monkeypatch):
+        """Test the diff gives up instead of exploring large edit scripts."""
+        monkeypatch.setattr(diff_module, "DIFF_MAX_EDITS", 10)
+
+        result = diff_texts("a b c d e f g h", "1 2 3 4 5 6 7 8")
+
+        assert result.complete is False
+        assert result.ops == []
+        assert result.similarity is None
+
+    def test_changed_text_is_clipped(self):
+        """Test long insertions are clipped with their full length."""
+        result = diff_texts("start end", "start " + "x" * 1000 + " end")
+
+        insert = next(op for op in result.ops if op["op"] == "insert")
+        assert len(insert["text"]) == diff_module.DIFF_MAX_OP_CHARS
+        assert insert["length"] == 1001
+
+    def test_minhash_estimates_jaccard(self):
+        """Test MinHash stays close to the exact shingle Jaccard similarity."""
+        words = [f"w{i}" for i in range(2000)]
+        baseline = " ".join(words)
+        current = " ".join(words[:1500] + [f"x{i}" for i in range(500)])
+        a, b = diff_module.shingles(baseline), diff_module.shingles(current)
+        exact = len(a & b) / len(a | b)
+
+        estimate, method = shingle_similarity(baseline, current)
+
+        assert method == "minhash"
+        assert estimate == pytest.approx(exact, abs=0.1)
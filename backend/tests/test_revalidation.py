@@ -0,0 +1,172 @@
+"""
+Tests for bulk re-validation of stored run outputs.
+"""
+
+import json
+
+import pytest
+
+from backend.services.revalidation import (
+    RevalidationSummary,
+    StoredOutput,
+    revalidate_outputs,
+    revalidate_stream,
+    shutdown_revalidation_pool,
+)
+from backend.storage import Database, RunRepository, TestRepository
+
+
+def _stored(run_id: int, output: str, previously_passed: bool | None = True) -> StoredOutput:
+    return StoredOutput(
+        run_id=run_id,
+        started_at=None,
+        provider="anthropic",
+        model="claude-sonnet-4-5-20250929",
+        output=output,
+        tool_calls=[{"id": "1", "name": "search", "input": {}}],
+        latency_ms=100,
+        previously_passed=previously_passed,
+    )
+
+
+class TestRevalidateOutputs:
+    """Tests for replaying assertions against stored outputs."""
+
+    def test_validates_each_output(self):
+        """Test each stored output gets its own assertion results."""
+        assertions = [{"must_contain": "paris"}, {"must_call_tool": "search"}]
+        outputs = [_stored(1, "Paris is the capital"), _stored(2, "I don't know")]
+
+        revalidated = revalidate_outputs(assertions, outputs)
+
+        assert [r.run_id for r in revalidated] == [1, 2]
+        assert revalidated[0].passed is True
+        assert revalidated[1].passed is False
+        assert [a.passed for a in revalidated[1].assertions] == [False, True]
+
+    def test_summary_counts_changes(self):
+        """Test the summary counts failures per assertion and changed outcomes."""
+        assertions = [{"must_contain": "paris"}, {"max_latency_ms": 50}]
+        outputs = [
+            _stored(1, "Paris", previously_passed=True),
+            _stored(2, "London", previously_passed=True),
+            _stored(3, "Paris", previously_passed=False),
+        ]
+        summary = RevalidationSummary()
+        for run in revalidate_outputs([assertions[0]], outputs[2:]):
+            summary.add(run)
+        for run in revalidate_outputs(assertions, outputs[:2]):
+            summary.add(run)
+
+        assert (summary.runs, summary.passed, summary.failed) == (3, 1, 2)
+        assert summary.newly_passing == 1
+        assert summary.newly_failing == 2
+        assert summary.failures_by_assertion == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_process_pool(self):
+        """Test pooled chunks yield every run exactly once."""
+        outputs = [_stored(i, "yes" if i % 2 else "no") for i in range(7)]
+        try:
+            revalidated = [
+                run
+                async for run in revalidate_stream(
+                    [{"must_contain": "yes"}], outputs, chunk_size=3, inline_max=0
+                )
+            ]
+        finally:
+            shutdown_revalidation_pool()
+
+        assert sorted(r.run_id for r in revalidated) == list(range(7))
+        assert all(r.passed == (r.run_id % 2 == 1) for r in revalidated)
+
+
+class TestStoredOutput:
+    """Tests for loading stored outputs from runs."""
+
+    def test_from_run_falls_back_to_result_copy(self, tmp_path):
+        """Test older runs with the output stored on each result are replayed."""
+        db = Database(f"sqlite:///{tmp_path / 'stored.db'}")
+        db.create_tables()
+        session = db.SessionLocal()
+        test = TestRepository(session).create(name="t", spec={"model": "m"})
+        repo = RunRepository(session)
+
+        run = repo.create(test.id, "anthropic", "m")
+        repo.create_result(run.id, "must_contain", False, output_text="legacy output")
+        repo.update_status(run.id, "completed")
+        empty = repo.create(test.id, "anthropic", "m")
+        repo.update_status(empty.id, "completed")
+
+        runs = repo.get_completed_by_test(test.id)
+        stored = StoredOutput.from_run(next(r for r in runs if r.id == run.id))
+
+        assert stored.output == "legacy output"
+        assert stored.previously_passed is False
+        assert StoredOutput.from_run(next(r for r in runs if r.id == empty.id)) is None
+        session.close()
+        db.engine.dispose()
+
+
+class TestRevalidateEndpoint:
+    """Tests for POST /api/runs/test/{test_id}/revalidate."""
+
+    def _seed(self) -> int:
+        from backend.storage.database import get_database
+
+        session = get_database().SessionLocal()
+        test = TestRepository(session).create(
+            name="capital",
+            spec={"model": "m", "assertions": [{"must_contain": "Paris"}]},
+        )
+        repo = RunRepository(session)
+        for output in ["Paris", "Paris, France", "Lyon"]:
+            run = repo.create(test.id, "anthropic", "m")
+            repo.create_results_bulk(
+                run.id,
+                [{"assertion_type": "must_contain", "passed": "Paris" in output}],
+                status="completed",
+                output_text=output,
+            )
+        repo.create(test.id, "anthropic", "m")  # Still running, not replayed
+        test_id = test.id
+        session.close()
+        return test_id
+
+    def _lines(self, response) -> list[dict]:
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_replays_stored_assertions(self, client):
+        """Test the test's own assertions are replayed by default."""
+        test_id = self._seed()
+
+        response = client.post(f"/api/runs/test/{test_id}/revalidate", json={})
+        assert response.status_code == 200
+        lines = self._lines(response)
+
+        runs = [line for line in lines if line["type"] == "run"]
+        summary = lines[-1]
+        assert len(runs) == 3
+        assert summary["type"] == "summary"
+        assert (summary["passed"], summary["failed"]) == (2, 1)
+        assert summary["newly_failing"] == 0
+
+    def test_replays_new_assertions(self, client):
+        """Test assertions in the request replace the stored ones."""
+        test_id = self._seed()
+
+        response = client.post(
+            f"/api/runs/test/{test_id}/revalidate",
+            json={"assertions": [{"must_contain": "france"}], "limit": 2},
+        )
+        summary = self._lines(response)[-1]
+
+        # The latest two runs: "Lyon" (already failing) and "Paris, France"
+        assert summary["runs"] == 2
+        assert summary["failures_by_assertion"] == [1]
+        assert summary["newly_failing"] == 0
+
+    def test_unknown_test(self, client):
+        """Test a missing test returns 404."""
+        response = client.post("/api/runs/test/999/revalidate", json={})
+        assert response.status_code == 404
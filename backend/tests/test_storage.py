@@ -2,19 +2,33 @@
 Tests for storage layer (database, models, repositories).
 """
 
+import json
 import os
 import tempfile
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from ..storage import (
+    AsyncRecordingRepository,
+    AsyncRunRepository,
+    AsyncTestRepository,
     Database,
+    OutputVectorRepository,
+    QuantileSketch,
+    RollupRepository,
     RunRepository,
+    RunRollup,
+    SQLiteProfile,
     TestRepository,
+    TestRun,
     get_database,
+    next_cursor,
     reset_database,
 )
+from ..storage.compression import compress_text, decompress_text
 
 
 @pytest.fixture
@@ -68,11 +82,117 @@ class TestDatabase:
         expected_path = Path.home() / ".sentinel" / "sentinel.db"
         assert str(expected_path) in db.database_url
 
+    def test_sqlite_performance_profile_applied(self, tmp_path):
+        """Test the default profile's pragmas are set on new connections."""
+        from sqlalchemy import text
+
+        db = Database(f"sqlite:///{tmp_path / 'perf.db'}", sqlite_profile=SQLiteProfile())
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+    def test_sqlite_compat_profile(self, tmp_path):
+        """Test the compat profile keeps SQLite's rollback journal."""
+        from sqlalchemy import text
+
+        db = Database(f"sqlite:///{tmp_path / 'compat.db'}", sqlite_profile=SQLiteProfile.compat())
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 2  # FULL
+
+    def test_sqlite_profile_from_env(self, monkeypatch):
+        """Test SENTINEL_SQLITE_* variables select and override the profile."""
+        monkeypatch.setenv("SENTINEL_SQLITE_PROFILE", "compat")
+        monkeypatch.setenv("SENTINEL_SQLITE_SYNCHRONOUS", "normal")
+        monkeypatch.setenv("SENTINEL_SQLITE_MMAP_SIZE", "1048576")
+
+        profile = SQLiteProfile.from_env()
+
+        assert profile.journal_mode == "DELETE"
+        assert profile.synchronous == "NORMAL"
+        assert profile.mmap_size == 1048576
+
+    def test_run_maintenance(self, test_db, session):
+        """Test WAL checkpoint and optimize run without error."""
+        RunRepository(session).get_all()
+        test_db.run_maintenance()
+
     def test_create_tables(self, test_db):
         """Test creating database tables."""
         test_db.create_tables()
         # No exception means success
 
+    def test_migrations_add_streaming_metric_columns(self, tmp_path):
+        """Test migrating a test_runs table created before the timing columns."""
+        from sqlalchemy import inspect, text
+
+        db = Database(f"sqlite:///{tmp_path / 'old.db'}")
+        with db.engine.connect() as conn:
+            conn.execute(
+                text("CREATE TABLE test_runs (id INTEGER PRIMARY KEY, latency_ms INTEGER)")
+            )
+            conn.commit()
+
+        db.run_migrations()
+
+        columns = {col["name"] for col in inspect(db.engine).get_columns("test_runs")}
+        assert {"ttft_ms", "tokens_per_second"} <= columns
+
+    def test_migrations_backfill_recording_counters(self, tmp_path):
+        """Test that event_count and the sequence counter are backfilled for existing recordings."""
+        from sqlalchemy import text
+
+        db = Database(f"sqlite:///{tmp_path / 'old.db'}")
+        with db.engine.connect() as conn:
+            conn.execute(text("CREATE TABLE recording_sessions (id INTEGER PRIMARY KEY)"))
+            conn.execute(
+                text(
+                    "CREATE TABLE recording_events "
+                    "(id INTEGER PRIMARY KEY, recording_session_id INTEGER, sequence_number INTEGER)"
+                )
+            )
+            conn.execute(text("INSERT INTO recording_sessions (id) VALUES (1), (2)"))
+            conn.execute(
+                text(
+                    "INSERT INTO recording_events (recording_session_id, sequence_number) "
+                    "VALUES (1, 1), (1, 2), (1, 3)"
+                )
+            )
+            conn.commit()
+
+        db.run_migrations()
+
+        with db.engine.connect() as conn:
+            counts = conn.execute(
+                text(
+                    "SELECT id, event_count, last_sequence_number "
+                    "FROM recording_sessions ORDER BY id"
+                )
+            ).fetchall()
+        assert [tuple(row) for row in counts] == [(1, 3, 3), (2, 0, 0)]
+
+    def test_migrations_add_pagination_indexes(self, tmp_path):
+        """Test that keyset pagination indexes are added to existing tables."""
+        from sqlalchemy import inspect, text
+
+        db = Database(f"sqlite:///{tmp_path / 'old.db'}")
+        with db.engine.connect() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE test_runs (id INTEGER PRIMARY KEY, "
+                    "test_definition_id INTEGER, started_at DATETIME)"
+                )
+            )
+            conn.commit()
+
+        db.run_migrations()
+
+        indexes = {index["name"] for index in inspect(db.engine).get_indexes("test_runs")}
+        assert {"ix_test_runs_started_at_id", "ix_test_runs_test_started_at_id"} <= indexes
+
     def test_session_context_manager(self, test_db):
         """Test session context manager works."""
         for session in test_db.get_session():
@@ -165,6 +285,23 @@ class TestTestRepository:
         assert len(page2) == 5
         assert page1[0].id != page2[0].id
 
+    def test_get_all_with_cursor(self, session):
+        """Test keyset pagination in get_all."""
+        repo = TestRepository(session)
+        created = [repo.create(name=f"Test {i}", spec={"model": "gpt-5.1"}) for i in range(7)]
+
+        page1 = repo.get_all(limit=4)
+        page2 = repo.get_all(limit=4, cursor=next_cursor(page1, 4, "updated_at"))
+
+        assert [t.id for t in page1 + page2] == [t.id for t in reversed(created)]
+        assert next_cursor(page2, 4, "updated_at") is None
+        assert repo.count() == 7
+
+    def test_get_all_with_invalid_cursor(self, session):
+        """Test that a malformed cursor is rejected."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            TestRepository(session).get_all(cursor="not-a-cursor")
+
     def test_update_test(self, session):
         """Test updating a test."""
         repo = TestRepository(session)
@@ -257,6 +394,22 @@ class TestRunRepository:
         assert updated.tokens_output == 200
         assert updated.cost_usd == 0.0015
 
+    def test_update_run_status_with_streaming_metrics(self, session):
+        """Test storing time to first token and throughput."""
+        test_repo = TestRepository(session)
+        test = test_repo.create(name="Test", spec={"model": "gpt-5.1"})
+
+        run_repo = RunRepository(session)
+        run = run_repo.create(test.id, "openai", "gpt-5.1")
+
+        updated = run_repo.update_status(
+            run.id, status="completed", latency_ms=1500, ttft_ms=300, tokens_per_second=42.5
+        )
+
+        assert updated.ttft_ms == 300
+        assert updated.tokens_per_second == 42.5
+        assert updated.to_dict()["ttft_ms"] == 300
+
     def test_update_run_status_failed(self, session):
         """Test updating run status to failed."""
         test_repo = TestRepository(session)
@@ -314,6 +467,42 @@ class TestRunRepository:
         all_runs = run_repo.get_all()
         assert len(all_runs) == 2
 
+    def test_get_runs_with_cursor_and_tied_timestamps(self, session):
+        """Test keyset pagination when runs share a started_at timestamp."""
+        test = TestRepository(session).create(name="Test", spec={"model": "gpt-5.1"})
+        run_repo = RunRepository(session)
+        runs = [run_repo.create(test.id, "openai", "gpt-5.1") for _ in range(5)]
+        for run in runs:
+            run.started_at = datetime(2025, 1, 1)
+        session.commit()
+
+        seen, cursor = [], None
+        while True:
+            page = run_repo.get_by_test(test.id, limit=2, cursor=cursor)
+            seen.extend(run.id for run in page)
+            cursor = next_cursor(page, 2, "started_at")
+            if cursor is None:
+                break
+
+        assert seen == sorted((run.id for run in runs), reverse=True)
+
+    def test_count_runs_is_cached_and_invalidated(self, session):
+        """Test that run counts are cached until a run is created."""
+        test = TestRepository(session).create(name="Test", spec={"model": "gpt-5.1"})
+        run_repo = RunRepository(session)
+        run_repo.create(test.id, "openai", "gpt-5.1")
+        assert run_repo.count() == 1
+        assert run_repo.count(test_definition_id=test.id) == 1
+
+        # A write that bypasses the repository is not seen until the entry expires
+        session.add(TestRun(test_definition_id=test.id, provider="openai", model="m", status="x"))
+        session.commit()
+        assert run_repo.count() == 1
+
+        run_repo.create(test.id, "openai", "gpt-5.1")
+        assert run_repo.count() == 3
+        assert run_repo.count(test_definition_id=test.id) == 3
+
     def test_create_result(self, session):
         """Test creating an assertion result."""
         test_repo = TestRepository(session)
@@ -374,3 +563,447 @@ class TestRunRepository:
         assert len(results) == 3
         assert sum(1 for r in results if r.passed) == 2
         assert sum(1 for r in results if not r.passed) == 1
+
+    def test_create_results_bulk(self, session):
+        """Test completing a run with all results in a single commit."""
+        from sqlalchemy import event
+
+        test_repo = TestRepository(session)
+        test = test_repo.create(name="Test", spec={"model": "gpt-5.1"})
+
+        run_repo = RunRepository(session)
+        run = run_repo.create(test.id, "openai", "gpt-5.1")
+
+        commits = []
+        event.listen(session, "after_commit", lambda s: commits.append(s))
+
+        updated = run_repo.create_results_bulk(
+            run.id,
+            results=[
+                {"assertion_type": "must_contain", "passed": True, "assertion_value": "Hello"},
+                {"assertion_type": "max_tokens", "passed": False, "failure_reason": "Too long"},
+            ],
+            status="completed",
+            output_text="Hello, World!",
+            tool_calls=[{"name": "search", "input": {}}],
+            raw_response={"id": "msg_1"},
+            latency_ms=1200,
+        )
+
+        assert len(commits) == 1
+        assert updated.status == "completed"
+        assert updated.latency_ms == 1200
+        assert updated.to_detail_dict()["output_text"] == "Hello, World!"
+        assert updated.to_detail_dict()["tool_calls"] == [{"name": "search", "input": {}}]
+        assert "output_text" not in updated.to_dict()  # Metrics only
+        assert test_repo.get_by_id(test.id).last_run_at is not None
+
+        results = run_repo.get_results_by_run(run.id)
+        assert len(results) == 2
+        assert [r.failure_reason for r in results] == [None, "Too long"]
+        assert all(r.output_text is None for r in results)  # Stored once on the run
+
+    def test_identical_outputs_stored_once(self, session):
+        """Test that runs with the same output share one outputs row."""
+        from sqlalchemy import text
+
+        test = TestRepository(session).create(name="Test", spec={"model": "gpt-5.1"})
+        run_repo = RunRepository(session)
+        runs = []
+        for output in ("Deterministic output", "Deterministic output", "Other output"):
+            run = run_repo.create(test.id, "openai", "gpt-5.1")
+            runs.append(run_repo.create_results_bulk(run.id, [], "completed", output_text=output))
+
+        assert runs[0].output_hash == runs[1].output_hash != runs[2].output_hash
+        assert session.execute(text("SELECT COUNT(*) FROM outputs")).scalar() == 2
+        assert (
+            session.execute(text("SELECT output_text FROM test_runs")).scalars().all() == [None] * 3
+        )
+
+        session.expire_all()
+        assert (
+            run_repo.get_by_id(runs[1].id).to_detail_dict()["output_text"] == "Deterministic output"
+        )
+
+    def test_output_loaded_on_request(self, session):
+        """Test that run queries only load the output text when asked to."""
+        from sqlalchemy import inspect
+
+        test = TestRepository(session).create(name="Test", spec={"model": "gpt-5.1"})
+        run_repo = RunRepository(session)
+        run = run_repo.create(test.id, "openai", "gpt-5.1")
+        run_repo.create_results_bulk(run.id, [], "completed", output_text="Hello")
+
+        session.expire_all()
+        assert "output" in inspect(run_repo.get_by_id(run.id)).unloaded
+        session.expire_all()
+        loaded = run_repo.get_by_id(run.id, with_output=True)
+        assert "output" not in inspect(loaded).unloaded
+        assert loaded.output_text == "Hello"
+
+    def test_create_results_bulk_run_not_found(self, session):
+        """Test completing a missing run."""
+        run_repo = RunRepository(session)
+        assert run_repo.create_results_bulk(999, results=[], status="completed") is None
+
+
+class TestBulkRunLoading:
+    """Tests for set-based loading of run metrics and assertion results."""
+
+    def test_metrics_and_results_by_ids(self, session, monkeypatch):
+        """Test many runs load in chunked queries without their outputs."""
+        from ..storage import repositories
+
+        monkeypatch.setattr(repositories, "IN_CLAUSE_CHUNK_SIZE", 2)
+        test = TestRepository(session).create(name="Bulk", spec={"model": "m"})
+        repo = RunRepository(session)
+        run_ids = []
+        for i in range(5):
+            run = repo.create(test.id, "anthropic", "m")
+            repo.create_results_bulk(
+                run.id,
+                [
+                    {"assertion_type": "must_contain", "passed": True},
+                    {"assertion_type": "max_latency_ms", "passed": i % 2 == 0},
+                ],
+                status="completed",
+                latency_ms=100 + i,
+                output_text="output",
+            )
+            run_ids.append(run.id)
+
+        runs = repo.get_metrics_by_ids(run_ids + [999])
+        results = repo.get_assertion_results_by_runs(run_ids)
+
+        assert sorted(r["id"] for r in runs) == run_ids
+        first = next(r for r in runs if r["id"] == run_ids[0])
+        assert (first["test_name"], first["latency_ms"], first["status"]) == (
+            "Bulk",
+            100,
+            "completed",
+        )
+        assert "output_text" not in first
+        assert [r["assertion_type"] for r in results[run_ids[1]]] == [
+            "must_contain",
+            "max_latency_ms",
+        ]
+        assert results[run_ids[1]][1]["passed"] is False
+
+
+class TestOutputVectorIndex:
+    """Tests for the cached similarity vectors of stored outputs."""
+
+    def test_outputs_are_vectorized_once(self, session):
+        """Test only outputs without a cached vector are vectorized."""
+        from ..regression.similarity import HashedNgramBackend
+
+        class CountingBackend(HashedNgramBackend):
+            def __init__(self):
+                super().__init__(dimensions=32)
+                self.texts: list[str] = []
+
+            def embed(self, texts):
+                self.texts.extend(texts)
+                return super().embed(texts)
+
+        test = TestRepository(session).create(name="Vectors", spec={"model": "m"})
+        repo = RunRepository(session)
+        for output in ("first output", "second output", "first output"):
+            run = repo.create(test.id, "anthropic", "m")
+            repo.create_results_bulk(run.id, [], status="completed", output_text=output)
+        runs = repo.get_output_hashes_by_test(test.id)
+        hashes = [run["output_hash"] for run in runs]
+        backend = CountingBackend()
+        vectors_repo = OutputVectorRepository(session)
+
+        assert vectors_repo.index_outputs(hashes + ["unknown"], backend) == 2
+        assert vectors_repo.index_outputs(hashes, backend) == 0
+        assert sorted(backend.texts) == ["first output", "second output"]
+
+        vectors = vectors_repo.get_vectors(hashes, backend.name)
+        expected = backend.embed(["first output"])[0]
+        assert np.array_equal(vectors[hashes[0]], expected)
+        assert vectors_repo.get_vectors(hashes, "other-backend") == {}
+
+
+class TestAsyncRepositories:
+    """Tests for the async repositories used by the API routers."""
+
+    @pytest.mark.asyncio
+    async def test_async_session_commits(self, test_db):
+        """Test that async writes are visible to sync sessions."""
+        async for session in test_db.get_async_session():
+            test = await AsyncTestRepository(session).create(name="Async", spec={"model": "m"})
+
+        sync_session = test_db.SessionLocal()
+        assert TestRepository(sync_session).get_by_id(test.id).name == "Async"
+        sync_session.close()
+        await test_db.dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_async_run_lifecycle(self, test_db):
+        """Test creating and completing a run through the async repositories."""
+        async with test_db.async_session_factory() as session:
+            test = await AsyncTestRepository(session).create(name="Async", spec={"model": "m"})
+            run_repo = AsyncRunRepository(session)
+            run = await run_repo.create(test.id, "anthropic", "claude-sonnet-4-5-20250929")
+            await run_repo.create_results_bulk(
+                run.id,
+                results=[{"assertion_type": "must_contain", "passed": True}],
+                status="completed",
+                output_text="Hello",
+            )
+
+            completed = await run_repo.get_by_id(run.id, with_output=True)
+            assert completed.status == "completed"
+            assert completed.to_detail_dict()["output_text"] == "Hello"
+            assert len(await run_repo.get_results_by_run(run.id)) == 1
+            assert len(await run_repo.get_all()) == 1
+        await test_db.dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_async_recording_events(self, test_db):
+        """Test recording sessions serialize outside run_sync (no lazy loads)."""
+        async with test_db.async_session_factory() as session:
+            repo = AsyncRecordingRepository(session)
+            recording = await repo.create_session("Session")
+            await repo.add_event(recording.id, "model_call", {"model": "m"})
+            await repo.add_event(recording.id, "output", {"content": "hi"})
+
+            recording = await repo.get_session_by_id(recording.id)
+            assert recording.to_dict()["event_count"] == 2
+            assert [e.sequence_number for e in await repo.get_events(recording.id)] == [1, 2]
+        await test_db.dispose_async_engine()
+
+
+class TestPayloadCompression:
+    """Tests for compressed payload columns."""
+
+    def test_compress_round_trip(self):
+        """Test that payloads survive compression, small ones stored raw."""
+        large = json.dumps({"content": [{"type": "text", "text": "Hello " * 100}]})
+
+        assert decompress_text(compress_text(large)) == large
+        assert len(compress_text(large)) < len(large) / 5
+        assert compress_text("{}") == b"\x00{}"
+        assert decompress_text(compress_text("{}")) == "{}"
+        assert decompress_text("legacy text") == "legacy text"
+        assert compress_text(None) is None
+
+    def test_unknown_codec(self):
+        """Test that an unknown codec header is rejected."""
+        with pytest.raises(ValueError, match="Unknown payload codec"):
+            decompress_text(b"\x7fdata")
+
+    def test_payload_stored_compressed_and_decoded_lazily(self, session):
+        """Test that payloads are stored as BLOBs and decoded on access."""
+        from sqlalchemy import text
+
+        spec = {"model": "gpt-5.1", "inputs": {"query": "What is 2+2? " * 50}}
+        test = TestRepository(session).create(name="Compressed", spec=spec)
+
+        stored_type = session.execute(
+            text("SELECT typeof(spec_json) FROM test_definitions WHERE id = :id"), {"id": test.id}
+        ).scalar()
+        assert stored_type == "blob"
+
+        session.expire_all()
+        loaded = TestRepository(session).get_by_id(test.id)
+        assert isinstance(loaded._spec_json, bytes)
+        assert "_spec_json_text" not in loaded.__dict__  # Not decoded yet
+        assert loaded.to_dict()["spec"] == spec
+
+    def test_compress_legacy_payloads(self, test_db, session):
+        """Test that plain text payloads are read and then migrated."""
+        from sqlalchemy import text
+
+        test = TestRepository(session).create(name="Legacy", spec={"model": "m"})
+        legacy_spec = json.dumps({"model": "legacy", "inputs": {"query": "x" * 500}})
+        session.execute(
+            text("UPDATE test_definitions SET spec_json = :spec WHERE id = :id"),
+            {"spec": legacy_spec, "id": test.id},
+        )
+        session.commit()
+        session.expire_all()
+        assert TestRepository(session).get_by_id(test.id).to_dict()["spec"]["model"] == "legacy"
+
+        assert test_db.compress_legacy_payloads(batch_size=10) == 1
+        assert test_db.compress_legacy_payloads(batch_size=10) == 0
+
+        session.expire_all()
+        migrated = TestRepository(session).get_by_id(test.id)
+        assert isinstance(migrated._spec_json, bytes)
+        assert migrated.spec_json == legacy_spec
+
+    def test_deduplicate_legacy_outputs(self, test_db, session):
+        """Test that inline outputs of older runs move to the outputs table."""
+        from sqlalchemy import text
+
+        test = TestRepository(session).create(name="Legacy", spec={"model": "m"})
+        run_repo = RunRepository(session)
+        run_ids = [run_repo.create(test.id, "openai", "m").id for _ in range(2)]
+        session.execute(text("UPDATE test_runs SET output_text = 'Same legacy output'"))
+        session.commit()
+
+        assert test_db.deduplicate_legacy_outputs() == 2
+        assert test_db.deduplicate_legacy_outputs() == 0
+
+        session.expire_all()
+        runs = [run_repo.get_by_id(run_id) for run_id in run_ids]
+        assert runs[0].output_hash == runs[1].output_hash is not None
+        assert runs[0].output_text == "Same legacy output"
+        assert session.execute(text("SELECT COUNT(*) FROM outputs")).scalar() == 1
+
+
+class TestRunRollups:
+    """Tests for incrementally maintained run rollups."""
+
+    def _finish(self, session, test_id: int, model: str, latency_ms: int, passed: bool = True):
+        repo = RunRepository(session)
+        run = repo.create(test_id, "anthropic", model)
+        repo.create_results_bulk(
+            run.id,
+            [{"assertion_type": "must_contain", "passed": passed}],
+            status="completed",
+            latency_ms=latency_ms,
+            cost_usd=0.01,
+            tokens_input=10,
+            tokens_output=20,
+        )
+        return run
+
+    def _buckets(self, session, granularity: str = "day") -> list[RunRollup]:
+        session.expire_all()
+        return RollupRepository(session).get_buckets(granularity)
+
+    def test_sketch_quantiles(self):
+        """Test quantile estimates stay within the relative accuracy."""
+        sketch = QuantileSketch()
+        for value in range(1, 1001):
+            sketch.add(value)
+        other = QuantileSketch.from_json(sketch.to_json())
+        other.merge(sketch)
+
+        assert other.count == 2000
+        assert other.quantile(0.5) == pytest.approx(500, rel=0.02)
+        assert other.quantile(0.95) == pytest.approx(950, rel=0.02)
+        assert QuantileSketch().quantile(0.5) is None
+
+    def test_finished_runs_update_buckets(self, session):
+        """Test each finished run is added to its hourly and daily bucket."""
+        test = TestRepository(session).create(name="Rollup", spec={"model": "m"})
+        self._finish(session, test.id, "m", 100)
+        self._finish(session, test.id, "m", 300, passed=False)
+        run_repo = RunRepository(session)
+        failed = run_repo.create(test.id, "anthropic", "m")
+        run_repo.update_status(failed.id, "failed", error_message="boom")
+        run_repo.create(test.id, "anthropic", "m")  # Still running
+
+        (day,) = self._buckets(session)
+        assert (day.run_count, day.passed_count, day.failed_count) == (3, 1, 1)
+        assert (day.latency_count, day.latency_sum) == (2, 400)
+        assert day.cost_sum == pytest.approx(0.02)
+        assert (day.tokens_input_sum, day.tokens_output_sum) == (20, 40)
+        assert QuantileSketch.from_json(day.latency_sketch).count == 2
+        assert len(self._buckets(session, "hour")) == 1
+
+    def test_status_updates_after_finish_are_not_counted_twice(self, session):
+        """Test only the transition to a finished status is counted."""
+        test = TestRepository(session).create(name="Rollup", spec={"model": "m"})
+        run_repo = RunRepository(session)
+        run = run_repo.create(test.id, "anthropic", "m")
+        run_repo.create_result(run.id, "must_contain", False)
+        run_repo.update_status(run.id, "completed", latency_ms=100)
+        run_repo.update_status(run.id, "completed", latency_ms=100)
+
+        (day,) = self._buckets(session)
+        assert (day.run_count, day.passed_count) == (1, 0)
+
+    def test_rebuild_matches_incremental(self, session):
+        """Test rebuilding from runs gives the incrementally maintained buckets."""
+        test_repo = TestRepository(session)
+        first = test_repo.create(name="First", spec={"model": "m"})
+        second = test_repo.create(name="Second", spec={"model": "m"})
+        for latency in (100, 200, 300):
+            self._finish(session, first.id, "m", latency)
+        self._finish(session, first.id, "other", 50, passed=False)
+        self._finish(session, second.id, "m", 400)
+
+        def snapshot():
+            return sorted(
+                (
+                    r.test_definition_id,
+                    r.model,
+                    r.granularity,
+                    r.bucket_start,
+                    r.run_count,
+                    r.passed_count,
+                    r.latency_sum,
+                    QuantileSketch.from_json(r.latency_sketch).bins,
+                )
+                for r in self._buckets(session) + self._buckets(session, "hour")
+            )
+
+        incremental = snapshot()
+        assert RollupRepository(session).rebuild() == 5
+        assert snapshot() == incremental
+
+    def test_backfill_on_new_rollup_table(self, test_db, session):
+        """Test databases with runs from before rollups are backfilled."""
+        from sqlalchemy import text
+
+        test = TestRepository(session).create(name="Legacy", spec={"model": "m"})
+        self._finish(session, test.id, "m", 100)
+        session.execute(text("DROP TABLE run_rollups"))
+        session.commit()
+
+        test_db.create_tables()
+
+        (day,) = self._buckets(session)
+        assert day.run_count == 1
+
+    def test_deleting_test_deletes_rollups(self, session):
+        """Test a test's rollups are removed with it."""
+        test = TestRepository(session).create(name="Rollup", spec={"model": "m"})
+        self._finish(session, test.id, "m", 100)
+
+        assert TestRepository(session).delete(test.id)
+        assert self._buckets(session) == []
+
+
+class TestRunStatsEndpoint:
+    """Tests for GET /api/runs/stats."""
+
+    def test_serves_series_from_rollups(self, client):
+        """Test each test and model gets a series with merged totals."""
+        session = get_database().SessionLocal()
+        test = TestRepository(session).create(name="Stats", spec={"model": "m"})
+        repo = RunRepository(session)
+        for model, latency, passed in [("m", 100, True), ("m", 300, False), ("n", 50, True)]:
+            run = repo.create(test.id, "anthropic", model)
+            repo.create_results_bulk(
+                run.id,
+                [{"assertion_type": "must_contain", "passed": passed}],
+                status="completed",
+                latency_ms=latency,
+                cost_usd=0.5,
+            )
+        test_id = test.id
+        session.close()
+
+        response = client.get(f"/api/runs/stats?test_id={test_id}&granularity=hour")
+        assert response.status_code == 200
+        body = response.json()
+        series = {s["model"]: s for s in body["series"]}
+
+        assert body["granularity"] == "hour"
+        assert set(series) == {"m", "n"}
+        total = series["m"]["total"]
+        assert (total["runs"], total["pass_rate"], total["latency_avg_ms"]) == (2, 0.5, 200)
+        assert total["latency_p50_ms"] == pytest.approx(100, rel=0.02)
+        assert total["cost_usd"] == pytest.approx(1.0)
+        assert len(series["m"]["buckets"]) == 1
+
+    def test_rejects_unknown_granularity(self, client):
+        """Test only hour and day buckets exist."""
+        assert client.get("/api/runs/stats?granularity=week").status_code == 422
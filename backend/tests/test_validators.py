@@ -4,10 +4,14 @@ Tests for assertion validation.
 
 from backend.providers.base import ExecutionResult
 from backend.validators.assertion_validator import (
+    AssertionPlan,
     AssertionValidator,
+    StreamingAssertionChecker,
     ValidationResult,
+    compile_assertions,
     validate_assertions,
 )
+from backend.validators.substring_matcher import SubstringMatcher
 
 
 class TestValidationResult:
@@ -635,3 +639,136 @@ class TestAssertionValidatorIntegration:
         assert all(v.passed for v in validations), [
             f"{v.assertion_type}: {v.message}" for v in validations if not v.passed
         ]
+
+
+class TestStreamingAssertionChecker:
+    """Tests for incremental assertion checks on streamed output."""
+
+    def test_inactive_without_streamable_assertions(self):
+        """Test assertions that need the full output are not checked."""
+        checker = StreamingAssertionChecker([{"must_contain": "x"}, {"regex_match": "y"}])
+        assert checker.active is False
+        assert checker.feed("anything", elapsed_ms=10) is None
+
+    def test_must_not_contain_detected(self):
+        """Test forbidden text fails as soon as it appears (case-insensitive)."""
+        checker = StreamingAssertionChecker([{"must_contain": "a"}, {"must_not_contain": "Error"}])
+        assert checker.feed("All good so far. ", elapsed_ms=10) is None
+
+        index, failure = checker.feed("An ERROR occurred", elapsed_ms=20)
+        assert index == 1
+        assert failure.assertion_type == "must_not_contain"
+        assert failure.passed is False
+
+    def test_must_not_contain_split_across_deltas(self):
+        """Test forbidden text spanning several deltas is detected."""
+        checker = StreamingAssertionChecker([{"must_not_contain": "forbidden"}])
+        assert checker.feed("this is for", elapsed_ms=0) is None
+        assert checker.feed("bid", elapsed_ms=0) is None
+        assert checker.feed("den text", elapsed_ms=0) is not None
+
+    def test_max_tokens_exceeded_by_delta_count(self):
+        """Test more deltas than allowed tokens is a definitive failure."""
+        checker = StreamingAssertionChecker([{"max_tokens": 2}])
+        assert checker.feed("one", elapsed_ms=0) is None
+        assert checker.feed(" two", elapsed_ms=0) is None
+
+        index, failure = checker.feed(" three", elapsed_ms=0)
+        assert index == 0
+        assert failure.assertion_type == "max_tokens"
+        assert failure.actual == 3
+
+    def test_max_latency_exceeded(self):
+        """Test elapsed time beyond the limit is a definitive failure."""
+        checker = StreamingAssertionChecker([{"max_latency_ms": 100}])
+        assert checker.feed("fast", elapsed_ms=50) is None
+
+        _, failure = checker.feed("slow", elapsed_ms=150)
+        assert failure.assertion_type == "max_latency_ms"
+        assert failure.details == {"difference_ms": 50}
+
+
+class TestSubstringMatcher:
+    """Tests for multi-pattern substring search."""
+
+    def test_finds_present_patterns(self):
+        """Test only the patterns present in the text are returned."""
+        matcher = SubstringMatcher(["price", "error", "laptop"])
+        assert matcher.search("the laptop price is $999") == {"price", "laptop"}
+
+    def test_empty_pattern_always_found(self):
+        """Test the empty pattern matches like `'' in text`."""
+        assert SubstringMatcher(["", "x"]).search("abc") == {""}
+
+    def test_automaton_matches_in_operator(self):
+        """Test the Aho-Corasick pass agrees with `in` for overlapping patterns."""
+        patterns = ["he", "she", "his", "hers", "ers", "s", "hershey", "zz", "ushe"]
+        automaton = SubstringMatcher(patterns, min_automaton_patterns=1)
+        for text in ["ushers", "hershey bar", "this", "", "zzz", "abc"]:
+            assert automaton.search(text) == {p for p in patterns if p in text}, text
+
+
+class TestAssertionPlan:
+    """Tests for compiled assertion plans."""
+
+    ASSERTIONS = [
+        {"must_contain": "Laptop"},
+        {"must_contain": "tablet"},
+        {"must_not_contain": "ERROR"},
+        {"must_not_contain": "laptop"},
+        {"regex_match": r"\$\d+"},
+        {"regex_match": "[invalid"},
+        {"must_call_tool": "search"},
+        {"max_latency_ms": 100},
+        {"must_contain": 5},
+        {"bogus": 1},
+        "not a dict",
+    ]
+
+    def _result(self, output: str) -> ExecutionResult:
+        return ExecutionResult(
+            success=True,
+            output=output,
+            model="gpt-5-nano",
+            provider="openai",
+            latency_ms=50,
+            tool_calls=[{"id": "1", "name": "search", "input": {}}],
+        )
+
+    def test_plan_matches_individual_validators(self):
+        """Test the plan gives the same results as each validator on its own."""
+        validator = AssertionValidator()
+        plan = AssertionPlan(self.ASSERTIONS)
+
+        for output in ["A LAPTOP costs $999", "no match here", "x" * 300 + " error"]:
+            result = self._result(output)
+            expected = []
+            for assertion in self.ASSERTIONS:
+                if not isinstance(assertion, dict):
+                    expected.append(None)
+                    continue
+                ((assertion_type, value),) = assertion.items()
+                fn = validator.validators.get(assertion_type)
+                try:
+                    expected.append(fn(value, result).model_dump() if fn else None)
+                except Exception:
+                    expected.append("error")
+
+            actual = plan.run(result)
+            assert len(actual) == len(self.ASSERTIONS)
+            for want, got in zip(expected, actual, strict=True):
+                if want is None:
+                    assert got.passed is False
+                elif want == "error":
+                    assert got.message.startswith("Validation error")
+                else:
+                    assert got.model_dump() == want
+
+    def test_compile_assertions_is_cached(self):
+        """Test equal assertion lists share one compiled plan."""
+        first = compile_assertions([{"must_contain": "a"}, {"regex_match": "b+"}])
+        second = compile_assertions([{"must_contain": "a"}, {"regex_match": "b+"}])
+        other = compile_assertions([{"must_contain": "c"}])
+
+        assert first is second
+        assert other is not first
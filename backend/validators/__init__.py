@@ -2,6 +2,22 @@
 Assertion validation for test results.
 """
 
-from .assertion_validator import AssertionValidator, ValidationResult, validate_assertions
+from .assertion_validator import (
+    AssertionPlan,
+    AssertionValidator,
+    StreamingAssertionChecker,
+    ValidationResult,
+    compile_assertions,
+    validate_assertions,
+)
+from .substring_matcher import SubstringMatcher
 
-__all__ = ["AssertionValidator", "ValidationResult", "validate_assertions"]
+__all__ = [
+    "AssertionPlan",
+    "AssertionValidator",
+    "StreamingAssertionChecker",
+    "SubstringMatcher",
+    "ValidationResult",
+    "compile_assertions",
+    "validate_assertions",
+]
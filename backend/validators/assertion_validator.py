@@ -13,11 +13,26 @@ Supports 8 assertion types:
 
 import json
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel
 
 from ..providers.base import ExecutionResult
+from .substring_matcher import SubstringMatcher
+
+# Compiled regex_match patterns kept across validations
+REGEX_CACHE_SIZE = 512
+
+# Compiled assertion lists kept by validate_assertions
+PLAN_CACHE_SIZE = 256
+
+# Output characters included in ValidationResult.actual
+OUTPUT_PREVIEW_CHARS = 200
+
+TEXT_ASSERTION_TYPES = ("must_contain", "must_not_contain")
 
 
 class ValidationResult(BaseModel):
@@ -31,6 +46,73 @@ class ValidationResult(BaseModel):
     details: dict[str, Any] | None = None
 
 
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(pattern: str) -> re.Pattern:
+    """Compile a regex_match pattern (cached).
+
+    Args:
+        pattern: Regular expression pattern
+
+    Returns:
+        Compiled pattern (multiline, dot matches newline)
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    return re.compile(pattern, re.MULTILINE | re.DOTALL)
+
+
+def _output_preview(output: str) -> str:
+    if len(output) > OUTPUT_PREVIEW_CHARS:
+        return output[:OUTPUT_PREVIEW_CHARS] + "..."
+    return output
+
+
+def _text_result(
+    assertion_type: str, expected: str, contained: bool, preview: str
+) -> ValidationResult:
+    """Build the result of a must_contain / must_not_contain check."""
+    passed = contained if assertion_type == "must_contain" else not contained
+    return ValidationResult(
+        assertion_type=assertion_type,
+        passed=passed,
+        message=(
+            f"Output contains '{expected}'"
+            if contained
+            else f"Output does not contain '{expected}'"
+        ),
+        expected=expected,
+        actual=preview,
+    )
+
+
+def _regex_result(pattern: str, regex: re.Pattern, output: str, preview: str) -> ValidationResult:
+    """Build the result of a regex_match check."""
+    match = regex.search(output)
+    passed = match is not None
+    return ValidationResult(
+        assertion_type="regex_match",
+        passed=passed,
+        message=(
+            f"Output matches pattern '{pattern}'"
+            if passed
+            else f"Output does not match pattern '{pattern}'"
+        ),
+        expected=pattern,
+        actual=preview,
+        details={"matched_text": match.group(0) if match else None},
+    )
+
+
+def _invalid_regex_result(pattern: str, error: re.error) -> ValidationResult:
+    return ValidationResult(
+        assertion_type="regex_match",
+        passed=False,
+        message=f"Invalid regex pattern: {str(error)}",
+        expected=pattern,
+    )
+
+
 class AssertionValidator:
     """Validates execution results against assertion specifications."""
 
@@ -59,51 +141,7 @@ class AssertionValidator:
         Returns:
             List of ValidationResult objects, one per assertion
         """
-        validation_results = []
-
-        for assertion in assertions:
-            # Each assertion is a dict with a single key (the assertion type)
-            # and value (the assertion parameters)
-            if not isinstance(assertion, dict) or len(assertion) != 1:
-                validation_results.append(
-                    ValidationResult(
-                        assertion_type="unknown",
-                        passed=False,
-                        message=f"Invalid assertion format: {assertion}",
-                    )
-                )
-                continue
-
-            assertion_type = list(assertion.keys())[0]
-            assertion_value = assertion[assertion_type]
-
-            # Get validator function
-            validator_fn = self.validators.get(assertion_type)
-
-            if not validator_fn:
-                validation_results.append(
-                    ValidationResult(
-                        assertion_type=assertion_type,
-                        passed=False,
-                        message=f"Unknown assertion type: {assertion_type}",
-                    )
-                )
-                continue
-
-            # Run validation
-            try:
-                validation_result = validator_fn(assertion_value, result)
-                validation_results.append(validation_result)
-            except Exception as e:
-                validation_results.append(
-                    ValidationResult(
-                        assertion_type=assertion_type,
-                        passed=False,
-                        message=f"Validation error: {str(e)}",
-                    )
-                )
-
-        return validation_results
+        return AssertionPlan(assertions, self).run(result)
 
     # ========================================================================
     # Text Matching Validators
@@ -119,21 +157,8 @@ class AssertionValidator:
         Returns:
             ValidationResult with pass/fail status
         """
-        output = result.output.lower()
-        expected_lower = expected.lower()
-        passed = expected_lower in output
-
-        return ValidationResult(
-            assertion_type="must_contain",
-            passed=passed,
-            message=(
-                f"Output contains '{expected}'"
-                if passed
-                else f"Output does not contain '{expected}'"
-            ),
-            expected=expected,
-            actual=result.output[:200] + "..." if len(result.output) > 200 else result.output,
-        )
+        contained = expected.lower() in result.output.lower()
+        return _text_result("must_contain", expected, contained, _output_preview(result.output))
 
     def _validate_must_not_contain(
         self, expected: str, result: ExecutionResult
@@ -147,21 +172,8 @@ class AssertionValidator:
         Returns:
             ValidationResult with pass/fail status
         """
-        output = result.output.lower()
-        expected_lower = expected.lower()
-        passed = expected_lower not in output
-
-        return ValidationResult(
-            assertion_type="must_not_contain",
-            passed=passed,
-            message=(
-                f"Output does not contain '{expected}'"
-                if passed
-                else f"Output contains '{expected}'"
-            ),
-            expected=expected,
-            actual=result.output[:200] + "..." if len(result.output) > 200 else result.output,
-        )
+        contained = expected.lower() in result.output.lower()
+        return _text_result("must_not_contain", expected, contained, _output_preview(result.output))
 
     def _validate_regex_match(self, pattern: str, result: ExecutionResult) -> ValidationResult:
         """Validate that output matches regex pattern.
@@ -174,29 +186,10 @@ class AssertionValidator:
             ValidationResult with pass/fail status
         """
         try:
-            regex = re.compile(pattern, re.MULTILINE | re.DOTALL)
-            match = regex.search(result.output)
-            passed = match is not None
-
-            return ValidationResult(
-                assertion_type="regex_match",
-                passed=passed,
-                message=(
-                    f"Output matches pattern '{pattern}'"
-                    if passed
-                    else f"Output does not match pattern '{pattern}'"
-                ),
-                expected=pattern,
-                actual=result.output[:200] + "..." if len(result.output) > 200 else result.output,
-                details={"matched_text": match.group(0) if match else None},
-            )
+            regex = compile_regex(pattern)
         except re.error as e:
-            return ValidationResult(
-                assertion_type="regex_match",
-                passed=False,
-                message=f"Invalid regex pattern: {str(e)}",
-                expected=pattern,
-            )
+            return _invalid_regex_result(pattern, e)
+        return _regex_result(pattern, regex, result.output, _output_preview(result.output))
 
     # ========================================================================
     # Tool Call Validators
@@ -429,17 +422,254 @@ class AssertionValidator:
         )
 
 
+class AssertionPlan:
+    """Assertions compiled once and run against many results.
+
+    Regexes are compiled up front, the output is lowercased once per result
+    and every must_contain / must_not_contain pattern is looked up in a
+    single SubstringMatcher search. Results are identical to validating each
+    assertion on its own.
+    """
+
+    def __init__(
+        self, assertions: list[dict[str, Any]], validator: AssertionValidator | None = None
+    ):
+        """Compile the assertions.
+
+        Args:
+            assertions: List of assertion specifications
+            validator: Validator used for the remaining assertion types
+        """
+        self._validator = validator or AssertionValidator()
+        self._steps: list[tuple[str, Any]] = []
+        substrings: list[str] = []
+
+        for assertion in assertions:
+            # Each assertion is a dict with a single key (the assertion type)
+            # and value (the assertion parameters)
+            if not isinstance(assertion, dict) or len(assertion) != 1:
+                self._steps.append(("invalid", assertion))
+                continue
+
+            assertion_type, value = next(iter(assertion.items()))
+            if assertion_type in TEXT_ASSERTION_TYPES and isinstance(value, str):
+                substrings.append(value.lower())
+                self._steps.append((assertion_type, (value, substrings[-1])))
+            elif assertion_type == "regex_match" and isinstance(value, str):
+                try:
+                    self._steps.append(("regex_match", (value, compile_regex(value))))
+                except re.error as e:
+                    self._steps.append(("regex_error", (value, e)))
+            elif assertion_type in self._validator.validators:
+                self._steps.append(("validator", (assertion_type, value)))
+            else:
+                self._steps.append(("unknown", assertion_type))
+
+        self._matcher = SubstringMatcher(substrings) if substrings else None
+
+    def run(self, result: ExecutionResult) -> list[ValidationResult]:
+        """Validate an execution result.
+
+        Args:
+            result: Execution result to validate against
+
+        Returns:
+            List of ValidationResult objects, one per assertion
+        """
+        found = self._matcher.search(result.output.lower()) if self._matcher else set()
+        preview = _output_preview(result.output)
+        validation_results = []
+
+        for kind, value in self._steps:
+            if kind in TEXT_ASSERTION_TYPES:
+                expected, expected_lower = value
+                contained = expected_lower in found
+                validation_results.append(_text_result(kind, expected, contained, preview))
+            elif kind == "regex_match":
+                validation_results.append(_regex_result(value[0], value[1], result.output, preview))
+            elif kind == "regex_error":
+                validation_results.append(_invalid_regex_result(*value))
+            elif kind == "validator":
+                validation_results.append(self._run_validator(*value, result))
+            elif kind == "invalid":
+                validation_results.append(
+                    ValidationResult(
+                        assertion_type="unknown",
+                        passed=False,
+                        message=f"Invalid assertion format: {value}",
+                    )
+                )
+            else:
+                validation_results.append(
+                    ValidationResult(
+                        assertion_type=value,
+                        passed=False,
+                        message=f"Unknown assertion type: {value}",
+                    )
+                )
+
+        return validation_results
+
+    def _run_validator(
+        self, assertion_type: str, value: Any, result: ExecutionResult
+    ) -> ValidationResult:
+        try:
+            return self._validator.validators[assertion_type](value, result)
+        except Exception as e:
+            return ValidationResult(
+                assertion_type=assertion_type,
+                passed=False,
+                message=f"Validation error: {str(e)}",
+            )
+
+
+class StreamingAssertionChecker:
+    """Detects definitive assertion failures while output is still streaming.
+
+    Only assertions whose failure cannot be undone by more output are checked:
+    must_not_contain (the text has appeared), max_tokens (more deltas than
+    allowed tokens, as every delta carries at least one token) and
+    max_latency_ms (the limit has already elapsed). Everything else has to
+    wait for the complete result and is left to AssertionValidator.
+    """
+
+    def __init__(self, assertions: list[dict[str, Any]]):
+        """Initialize the checker.
+
+        Args:
+            assertions: List of assertion specifications (same format as validate())
+        """
+        self._forbidden: list[tuple[int, str]] = []
+        self._max_tokens: list[tuple[int, int]] = []
+        self._max_latency: list[tuple[int, int]] = []
+
+        for index, assertion in enumerate(assertions):
+            if not isinstance(assertion, dict) or len(assertion) != 1:
+                continue
+            assertion_type, value = next(iter(assertion.items()))
+            if assertion_type == "must_not_contain" and isinstance(value, str) and value:
+                self._forbidden.append((index, value))
+            elif assertion_type == "max_tokens" and isinstance(value, int):
+                self._max_tokens.append((index, value))
+            elif assertion_type == "max_latency_ms" and isinstance(value, int):
+                self._max_latency.append((index, value))
+
+        # Only the tail of the output that could hold the start of a match is rescanned
+        self._overlap = max((len(text) for _, text in self._forbidden), default=1) - 1
+        self._tail = ""
+        self._output_length = 0
+        self._delta_count = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether any assertion can fail before the stream ends."""
+        return bool(self._forbidden or self._max_tokens or self._max_latency)
+
+    def feed(self, text: str, elapsed_ms: int) -> tuple[int, ValidationResult] | None:
+        """Check a new output delta.
+
+        Args:
+            text: Output text delta
+            elapsed_ms: Milliseconds since the request started
+
+        Returns:
+            Tuple of (assertion index, failed ValidationResult) for the first
+            definitive failure, or None if every assertion may still pass
+        """
+        self._delta_count += 1
+        self._output_length += len(text)
+        window = self._tail + text.lower()
+        self._tail = window[-self._overlap :] if self._overlap else ""
+
+        for index, expected in self._forbidden:
+            if expected.lower() in window:
+                return index, ValidationResult(
+                    assertion_type="must_not_contain",
+                    passed=False,
+                    message=f"Output contains '{expected}'",
+                    expected=expected,
+                    details={"detected_at_char": self._output_length},
+                )
+
+        for index, max_tokens in self._max_tokens:
+            if self._delta_count > max_tokens:
+                return index, ValidationResult(
+                    assertion_type="max_tokens",
+                    passed=False,
+                    message=(
+                        f"Output tokens exceed limit of {max_tokens} "
+                        f"(at least {self._delta_count} streamed)"
+                    ),
+                    expected=max_tokens,
+                    actual=self._delta_count,
+                )
+
+        return self.check_latency(elapsed_ms)
+
+    def check_latency(self, elapsed_ms: int) -> tuple[int, ValidationResult] | None:
+        """Check latency limits without new output.
+
+        Args:
+            elapsed_ms: Milliseconds since the request started
+
+        Returns:
+            Tuple of (assertion index, failed ValidationResult) or None
+        """
+        for index, max_ms in self._max_latency:
+            if elapsed_ms > max_ms:
+                return index, ValidationResult(
+                    assertion_type="max_latency_ms",
+                    passed=False,
+                    message=f"Latency {elapsed_ms}ms exceeds limit of {max_ms}ms",
+                    expected=max_ms,
+                    actual=elapsed_ms,
+                    details={"difference_ms": elapsed_ms - max_ms},
+                )
+        return None
+
+
 # ============================================================================
 # Convenience Functions
 # ============================================================================
 
 
+_plan_cache: "OrderedDict[str, AssertionPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def compile_assertions(assertions: list[dict[str, Any]]) -> AssertionPlan:
+    """Get the compiled plan for a list of assertions.
+
+    Plans are cached by the assertions' content, so validating many results
+    against the same TestSpec compiles it only once.
+
+    Args:
+        assertions: List of assertion specifications
+
+    Returns:
+        AssertionPlan for the assertions
+    """
+    key = json.dumps(assertions, sort_keys=True, default=repr)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = AssertionPlan(assertions)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
 def validate_assertions(
     assertions: list[dict[str, Any]], result: ExecutionResult
 ) -> list[ValidationResult]:
     """Validate assertions against execution result.
 
-    Convenience function that creates a validator and runs validations.
+    Convenience function that runs the cached plan for the assertions.
 
     Args:
         assertions: List of assertion specifications
@@ -448,5 +678,4 @@ def validate_assertions(
     Returns:
         List of ValidationResult objects
     """
-    validator = AssertionValidator()
-    return validator.validate(assertions, result)
+    return compile_assertions(assertions).run(result)
@@ -0,0 +1,99 @@
+"""
+Multi-pattern substring search for text assertions.
+
+must_contain and must_not_contain assertions are all checked against the same
+lowercased output. SubstringMatcher deduplicates their patterns and finds
+every one of them in a single pass over the text with an Aho-Corasick
+automaton.
+
+The automaton runs in pure Python, one step per character, while ``in`` is a
+C loop per pattern. Scanning once only pays off with many patterns, so
+smaller sets are checked with ``in`` against the shared lowercased text.
+"""
+
+from collections import deque
+
+# Pattern count from which a single automaton pass beats one `in` per pattern
+AHO_CORASICK_MIN_PATTERNS = 256
+
+
+class SubstringMatcher:
+    """Finds which of a fixed set of substrings occur in a text."""
+
+    def __init__(
+        self, patterns: list[str], min_automaton_patterns: int = AHO_CORASICK_MIN_PATTERNS
+    ):
+        """Compile the patterns.
+
+        Args:
+            patterns: Substrings to look for (matched as-is; lowercase them
+                beforehand for case-insensitive checks)
+            min_automaton_patterns: Distinct non-empty patterns required
+                before the Aho-Corasick automaton is used
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        self._searchable = [p for p in self.patterns if p]
+        self._use_automaton = len(self._searchable) >= min_automaton_patterns
+
+        # Trie transitions, output bitmask (indices into _searchable) and failure links
+        self._goto: list[dict[str, int]] = [{}]
+        self._output: list[int] = [0]
+        self._fail: list[int] = [0]
+        if self._use_automaton:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        for index, pattern in enumerate(self._searchable):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._output.append(0)
+                    self._fail.append(0)
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state] |= 1 << index
+
+        # Breadth-first, so a state's failure target is final before its children use it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> set[str]:
+        """Find the patterns that occur in text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Set of patterns found (the empty pattern is always found)
+        """
+        found: set[str] = {p for p in self.patterns if not p}
+        if not self._use_automaton:
+            found.update(p for p in self._searchable if p in text)
+            return found
+
+        goto, fail, output = self._goto, self._fail, self._output
+        complete = (1 << len(self._searchable)) - 1
+        state = 0
+        matched = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matched |= output[state]
+                if matched == complete:
+                    break
+
+        found.update(p for i, p in enumerate(self._searchable) if matched >> i & 1)
+        return found
@@ -129,8 +129,9 @@ describe('ComparisonView', () => {
 			},
 		],
 		output_comparison: {
-			baseline_output: 'Hello',
-			current_output: 'Hello World',
+			baseline_excerpt: 'Hello',
+			current_excerpt: 'Hello World',
+			excerpt_start: 0,
 			outputs_differ: true,
 			baseline_length: 5,
 			current_length: 11,
@@ -7,6 +7,7 @@
 
 import type {
 	TestFileInfo,
+	TestFileListOptions,
 	TestFileListResponse,
 	TestFileContent,
 } from '../types/test-spec';
@@ -14,7 +15,7 @@ import type {
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 // Re-export types for convenience
-export type { TestFileInfo, TestFileListResponse, TestFileContent };
+export type { TestFileInfo, TestFileListOptions, TestFileListResponse, TestFileContent };
 
 /**
  * Save a test as a YAML file.
@@ -50,12 +51,26 @@ export async function saveTestFile(
 }
 
 /**
- * List all test files.
+ * List test files.
  *
+ * @param options - Optional filters, sort order and paging
  * @returns List of test files with metadata
  */
-export async function listTestFiles(): Promise<TestFileListResponse> {
-	const response = await fetch(`${API_BASE_URL}/api/tests/files`);
+export async function listTestFiles(
+	options: TestFileListOptions = {}
+): Promise<TestFileListResponse> {
+	const params = new URLSearchParams();
+	const { tags, ...rest } = options;
+	for (const [key, value] of Object.entries(rest)) {
+		if (value !== undefined) {
+			params.append(key, String(value));
+		}
+	}
+	for (const tag of tags ?? []) {
+		params.append('tag', tag);
+	}
+	const query = params.toString();
+	const response = await fetch(`${API_BASE_URL}/api/tests/files${query ? `?${query}` : ''}`);
 
 	if (!response.ok) {
 		throw new Error('Failed to fetch test files');
@@ -230,16 +230,28 @@ export interface TestFileInfo {
 	category?: string;
 	provider?: string;
 	model?: string;
+	tags?: string[];
 	created_at?: string;
 	updated_at?: string;
 }
 
 export interface TestFileListResponse {
 	tests: TestFileInfo[];
-	total: number;
+	total: number; // Total matching tests, not just this page
 	path: string;
 }
 
+export interface TestFileListOptions {
+	category?: string;
+	provider?: string;
+	model?: string;
+	tags?: string[]; // Tests must have all of these tags
+	sort?: 'filename' | 'name' | 'category' | 'provider' | 'model' | 'created_at' | 'updated_at';
+	order?: 'asc' | 'desc';
+	limit?: number;
+	offset?: number;
+}
+
 export interface SaveTestFileRequest {
 	yaml_content: string;
 	filename?: string;
@@ -259,6 +271,7 @@ export interface TestFileContent {
 export interface TestListResponse {
 	tests: TestDefinition[];
 	total: number;
+	next_cursor?: string | null;
 }
 
 // ============================================================================
@@ -359,6 +372,7 @@ export interface TestRunResult {
 export interface RunListResponse {
 	runs: TestRun[];
 	total: number;
+	next_cursor?: string | null;
 }
 
 export type RegressionSeverity = 'critical' | 'warning' | 'info' | 'improvement';
@@ -405,13 +419,35 @@ export interface AssertionComparison {
 	status: 'unchanged' | 'improved' | 'regressed' | 'new' | 'removed';
 }
 
+export interface DiffOp {
+	op: 'equal' | 'insert' | 'delete';
+	count?: number | null;
+	text?: string | null;
+	length?: number | null;
+}
+
+export interface OutputDiff {
+	granularity: 'word' | 'line';
+	ops: DiffOp[];
+	edit_distance: number | null;
+	similarity: number | null;
+	complete: boolean;
+}
+
 export interface OutputComparison {
-	baseline_output: string | null;
-	current_output: string | null;
+	baseline_excerpt: string | null;
+	current_excerpt: string | null;
+	excerpt_start: number;
 	outputs_differ: boolean;
 	baseline_length: number;
 	current_length: number;
 	length_delta: number;
+	similarity?: number | null;
+	token_jaccard?: number | null;
+	token_jaccard_method?: 'exact' | 'minhash' | null;
+	diff?: OutputDiff | null;
+	semantic_similarity?: number | null;
+	similarity_backend?: string | null;
 }
 
 export interface RunMetrics {
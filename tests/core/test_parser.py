@@ -10,10 +10,11 @@ These tests ensure that:
 """
 
 import json
+import os
 import pytest
 from pathlib import Path
 
-from backend.core.parser import ParsingError, TestSpecParser
+from backend.core.parser import ParsingError, SpecParseCache, TestSpecParser
 from backend.core.schema import TestSpec, TestSuite
 
 
@@ -479,3 +480,110 @@ class TestValidateSpec:
 
         with pytest.raises(ParsingError, match="Validation failed"):
             TestSpecParser.validate_spec(spec)
+
+
+class TestParseDirectory:
+    """Tests for bulk directory parsing and the parse cache."""
+
+    VALID = (
+        'name: "Test {n}"\nmodel: "gpt-4"\ninputs:\n  query: "Q"\n'
+        'assertions:\n  - must_contain: "A"\n'
+    )
+
+    def _json_spec(self, name: str) -> dict:
+        return {
+            "name": name,
+            "model": "gpt-4",
+            "inputs": {"query": "Q"},
+            "assertions": [{"must_contain": "A"}],
+        }
+
+    def _write_specs(self, root: Path) -> None:
+        (root / "nested").mkdir()
+        (root / "a.yaml").write_text(self.VALID.format(n=1))
+        (root / "nested" / "b.yml").write_text(self.VALID.format(n=2))
+        (root / "c.json").write_text(json.dumps(self._json_spec("Test 3")))
+        (root / "broken.yaml").write_text("name: [unclosed")
+        (root / "invalid.yaml").write_text('description: "no name or model"\n')
+        (root / "notes.txt").write_text("ignored")
+
+    def test_parses_all_spec_files(self, tmp_path):
+        """Test specs and per-file errors are collected, other files ignored."""
+        self._write_specs(tmp_path)
+
+        result = TestSpecParser.parse_directory(tmp_path)
+
+        assert sorted(p.name for p in result.specs) == ["a.yaml", "b.yml", "c.json"]
+        assert sorted(p.name for p in result.errors) == ["broken.yaml", "invalid.yaml"]
+        assert result.errors[tmp_path / "invalid.yaml"].errors
+        assert result.cache_hits == 0
+
+    def test_non_recursive(self, tmp_path):
+        """Test subdirectories are skipped when recursive=False."""
+        self._write_specs(tmp_path)
+
+        result = TestSpecParser.parse_directory(tmp_path, recursive=False)
+
+        assert "b.yml" not in {p.name for p in result.specs}
+
+    def test_missing_directory(self, tmp_path):
+        """Test a missing directory raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            TestSpecParser.parse_directory(tmp_path / "missing")
+
+    def test_cache_skips_unchanged_files(self, tmp_path):
+        """Test unchanged files are served from the cache."""
+        self._write_specs(tmp_path)
+        cache = SpecParseCache()
+        first = TestSpecParser.parse_directory(tmp_path, cache=cache)
+
+        second = TestSpecParser.parse_directory(tmp_path, cache=cache)
+
+        assert second.cache_hits == 3
+        assert second.specs[tmp_path / "a.yaml"] is first.specs[tmp_path / "a.yaml"]
+        assert len(second.errors) == 2  # Failed files are parsed again
+
+    def test_cache_invalidation(self, tmp_path):
+        """Test changed content is re-parsed, touched files and deletions handled."""
+        self._write_specs(tmp_path)
+        cache = SpecParseCache()
+        TestSpecParser.parse_directory(tmp_path, cache=cache)
+
+        # Same content, new mtime: reused after hashing
+        a = tmp_path / "a.yaml"
+        os.utime(a, ns=(a.stat().st_atime_ns, a.stat().st_mtime_ns + 10**9))
+        # New content
+        (tmp_path / "c.json").write_text(json.dumps(self._json_spec("Renamed")))
+        (tmp_path / "nested" / "b.yml").unlink()
+
+        result = TestSpecParser.parse_directory(tmp_path, cache=cache)
+
+        assert result.cache_hits == 1
+        assert result.specs[tmp_path / "c.json"].name == "Renamed"
+        assert len(cache) == 2
+
+    def test_cache_save_and_load(self, tmp_path):
+        """Test a saved cache serves the next process's parse."""
+        specs = tmp_path / "specs"
+        specs.mkdir()
+        self._write_specs(specs)
+        cache = SpecParseCache()
+        TestSpecParser.parse_directory(specs, cache=cache)
+        cache.save(tmp_path / "cache" / "specs.pickle")
+
+        loaded = SpecParseCache.load(tmp_path / "cache" / "specs.pickle")
+        result = TestSpecParser.parse_directory(specs, cache=loaded)
+
+        assert result.cache_hits == 3
+        assert len(SpecParseCache.load(tmp_path / "missing.pickle")) == 0
+
+    def test_process_pool(self, tmp_path):
+        """Test parsing across worker processes, including error details."""
+        self._write_specs(tmp_path)
+
+        result = TestSpecParser.parse_directory(tmp_path, max_workers=2, parallel_min_files=1)
+
+        assert len(result.specs) == 3
+        error = result.errors[tmp_path / "invalid.yaml"]
+        assert isinstance(error, ParsingError)
+        assert error.errors